@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+CORTHEX 대용량 본문 압축 이관 (content_blobs)
+실행: python scripts/migrate_content_store.py [--dry-run] [--vacuum]
+
+변경 내용:
+  1. DB 스냅샷 백업 (corthex_backup_blobs_{timestamp}.db)
+  2. content_blobs 테이블 생성 (없으면)
+  3. tasks.result_data / archives.content 중 4KB 이상 본문을 압축 blob으로 이관
+     (같은 본문은 blob 1개로 중복 제거, 원래 컬럼에는 참조 문자열만 남김)
+  4. 참조 없는 blob 정리
+  5. --vacuum 지정 시 VACUUM으로 파일 크기 회수
+
+여러 번 실행해도 안전합니다 (이미 이관된 행은 건너뜀).
+"""
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+_WEB_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "web")
+sys.path.insert(0, _WEB_DIR)
+
+from db import DB_PATH  # noqa: E402  (web/db.py와 동일 경로 로직)
+import content_store  # noqa: E402
+
+DRY_RUN = "--dry-run" in sys.argv
+VACUUM = "--vacuum" in sys.argv
+
+
+def log(msg: str):
+    print(f"  {msg}")
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1024 / 1024:.1f}MB"
+
+
+def run_migration():
+    if not os.path.exists(DB_PATH):
+        print(f"❌ DB 파일 없음: {DB_PATH}")
+        sys.exit(1)
+
+    print(f"\n{'[DRY-RUN] ' if DRY_RUN else ''}CORTHEX 본문 압축 이관")
+    print(f"  대상 DB: {DB_PATH} ({_mb(os.path.getsize(DB_PATH))})")
+    print(f"  기준: {content_store.MIN_BYTES}B 이상, codec="
+          f"{'zstd' if content_store._HAS_ZSTD else 'zlib'}")
+    print()
+
+    # ── 1. 백업 ──────────────────────────────────────────────────────────────
+    backup_path = os.path.join(
+        os.path.dirname(DB_PATH),
+        f"corthex_backup_blobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db",
+    )
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=10000")
+    if not DRY_RUN:
+        # WAL 모드에서도 일관된 스냅샷을 얻도록 backup API 사용
+        dst = sqlite3.connect(backup_path)
+        conn.backup(dst)
+        dst.close()
+        log(f"✅ 백업 완료: {backup_path}")
+    else:
+        log(f"[DRY-RUN] 백업 생략 → {backup_path}")
+
+    try:
+        # ── 2~4. 이관 + 고아 blob 정리 ──────────────────────────────────────
+        print("  [STEP 2] 본문 이관")
+        stats = content_store.migrate_existing(conn, dry_run=DRY_RUN)
+        for table, _, _ in content_store.REF_COLUMNS:
+            st = stats[table]
+            log(f"  {'[DRY-RUN] ' if DRY_RUN else ''}{table}: {st['rows']}행 ({_mb(st['raw_bytes'])})")
+        if not DRY_RUN:
+            log(f"  고아 blob 정리: {stats['orphans_removed']}개")
+        blobs = stats["blobs"]
+        log(f"  content_blobs: {blobs['count']}개, 원본 {_mb(blobs['raw_bytes'])} → "
+            f"저장 {_mb(blobs['stored_bytes'])}")
+
+        # ── 5. VACUUM ────────────────────────────────────────────────────────
+        if VACUUM and not DRY_RUN:
+            print("  [STEP 3] VACUUM")
+            conn.execute("VACUUM")
+            log(f"  ✅ VACUUM 완료 → {_mb(os.path.getsize(DB_PATH))}")
+
+        print()
+        if DRY_RUN:
+            print("[DRY-RUN] 실제 변경 없이 시뮬레이션 완료.")
+            print("  실제 실행: python scripts/migrate_content_store.py [--vacuum]")
+        else:
+            print("✅ 이관 완료!")
+    except Exception as e:
+        conn.rollback()
+        print(f"\n❌ 오류 발생: {e}")
+        if not DRY_RUN:
+            print(f"  롤백 완료. 백업에서 복구: {backup_path}")
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    run_migration()
@@ -187,11 +187,11 @@ class BaseAgent(ABC):
             match = _re.search(r'\[.*\]', response.content, _re.DOTALL)
             if match:
                 items = _json.loads(match.group())
-                for item in items[:3]:
-                    key = item.get("key", "")
-                    value = item.get("value", "")
-                    if key and value:
-                        self._memory_manager.add(self.agent_id, key, value, source="auto")
+                pairs = [
+                    (item.get("key", ""), item.get("value", ""))
+                    for item in items[:3] if item.get("key") and item.get("value")
+                ]
+                await self._memory_manager.aadd_many(self.agent_id, pairs, source="auto")
         except Exception as e:
             logger.debug("[%s] 메모리 추출 실패 (무시): %s", self.agent_id, e)
 
@@ -212,7 +212,7 @@ class BaseAgent(ABC):
         """Call the LLM through the model router with memory injection."""
         # 메모리 주입: 시스템 프롬프트에 장기 기억 추가
         if self._memory_manager:
-            mem_context = self._memory_manager.get_context_string(self.agent_id)
+            mem_context = await self._memory_manager.aget_context_string(self.agent_id)
             if mem_context and messages and messages[0].get("role") == "system":
                 messages = list(messages)  # 원본 보호
                 messages[0] = {
@@ -3,14 +3,26 @@
 
 SQLite DB (corthex.db)에 저장 — 배포 시 데이터 유지됨.
 기존 JSON 파일(data/memory/{agent_id}.json)이 있으면 자동 마이그레이션.
+
+이전에는 load / add / delete / get_context_string마다 sqlite3.connect를 새로 열고 닫았고,
+그 호출이 async 경로(think, 메모리 추출, API)에서 그대로 동기로 실행됐습니다. 이제는:
+- 전용 스레드 1개가 연결 1개를 계속 들고 모든 쿼리를 실행 (스레드 한정 — 연결 공유 문제 없음)
+- SQL은 모듈 상수 → sqlite3 문장 캐시(cached_statements)로 준비된 문장 재사용
+- add_many / delete_many: 여러 건을 트랜잭션 1번·커밋(fsync) 1번으로
+- 에이전트별 읽기 캐시 (쓰기 시 해당 에이전트만 무효화) → think()의 기억 주입은 대부분 메모리에서
+- (agent_id, created_at) 인덱스
+- async 코드는 a* 메서드(aload, aadd_many, aget_context_string ...)로 이벤트 루프를 막지 않음
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
 import sqlite3
+import threading
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
@@ -77,53 +89,94 @@ class MemoryEntry:
         )
 
 
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS memories (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id    TEXT NOT NULL,
+    memory_id   TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    source      TEXT NOT NULL DEFAULT 'manual',
+    created_at  TEXT NOT NULL,
+    UNIQUE(agent_id, memory_id)
+);
+CREATE INDEX IF NOT EXISTS idx_memories_agent_created ON memories(agent_id, created_at);
+DROP INDEX IF EXISTS idx_memories_agent;
+"""
+_SQL_LOAD = (
+    "SELECT memory_id, key, value, source, created_at FROM memories "
+    "WHERE agent_id = ? ORDER BY created_at, id"
+)
+_SQL_COUNT = "SELECT COUNT(*) FROM memories WHERE agent_id = ?"
+_SQL_INSERT = (
+    "INSERT OR IGNORE INTO memories "
+    "(agent_id, memory_id, key, value, source, created_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SQL_DELETE = "DELETE FROM memories WHERE agent_id = ? AND memory_id = ?"
+
+CONTEXT_LIMIT = 20   # 시스템 프롬프트에 주입하는 최근 기억 수
+
+
 class MemoryManager:
     """에이전트별 장기 기억 관리자 — SQLite 기반.
 
     기존 JSON 방식에서 SQLite로 교체됨 (2026-02-18).
     공개 API는 동일 — app.py / agent.py 수정 불필요.
+    동기 메서드는 기존 호출부용, async 코드에서는 a* 메서드 사용.
     """
 
     def __init__(self, data_dir: Path) -> None:
         # data_dir은 JSON 마이그레이션용으로 보존 (기존 호출부 호환)
         self._data_dir = data_dir
         self._db_path = _get_db_path()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-db")
+        self._conn: sqlite3.Connection | None = None   # 전용 스레드에서만 접근
+        self._cache: dict[str, list[MemoryEntry]] = {}
+        self._cache_lock = threading.Lock()
         self._ensure_table()
         self._migrate_json_if_needed(data_dir)
 
     # ── 내부 헬퍼 ──────────────────────────────────────────────────────────
 
     def _get_conn(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path, timeout=10)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA journal_mode=WAL")
-        conn.execute("PRAGMA busy_timeout=5000")
-        return conn
+        """전용 스레드의 장수 연결 (처음 쓸 때 생성)."""
+        if self._conn is None:
+            conn = sqlite3.connect(self._db_path, timeout=10, cached_statements=64)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            conn.execute("PRAGMA synchronous=NORMAL")   # WAL에선 커밋마다 fsync 불필요
+            self._conn = conn
+        return self._conn
+
+    def _submit(self, fn, *args) -> Future:
+        return self._executor.submit(lambda: fn(self._get_conn(), *args))
+
+    def _run(self, fn, *args):
+        """전용 스레드에서 fn(conn, *args) 실행 후 결과 대기 (동기 호출부용)."""
+        return self._submit(fn, *args).result()
+
+    async def _arun(self, fn, *args):
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def _cached(self, agent_id: str) -> list[MemoryEntry] | None:
+        with self._cache_lock:
+            return self._cache.get(agent_id)
+
+    def _invalidate(self, agent_id: str) -> None:
+        with self._cache_lock:
+            self._cache.pop(agent_id, None)
 
     def _ensure_table(self) -> None:
-        """memories 테이블이 없으면 생성합니다."""
-        conn = self._get_conn()
-        try:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS memories (
-                    id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                    agent_id    TEXT NOT NULL,
-                    memory_id   TEXT NOT NULL,
-                    key         TEXT NOT NULL,
-                    value       TEXT NOT NULL,
-                    source      TEXT NOT NULL DEFAULT 'manual',
-                    created_at  TEXT NOT NULL,
-                    UNIQUE(agent_id, memory_id)
-                )
-            """)
-            conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_memories_agent ON memories(agent_id)"
-            )
+        """memories 테이블·인덱스가 없으면 생성합니다."""
+        def _create(conn: sqlite3.Connection) -> None:
+            conn.executescript(_SCHEMA_SQL)
             conn.commit()
+        try:
+            self._run(_create)
         except Exception as e:
             logger.warning("memories 테이블 생성 실패: %s", e)
-        finally:
-            conn.close()
 
     def _migrate_json_if_needed(self, data_dir: Path) -> None:
         """기존 JSON 파일을 DB로 일회성 마이그레이션합니다.
@@ -134,46 +187,70 @@ class MemoryManager:
             return
         for fp in data_dir.glob("*.json"):
             agent_id = fp.stem
-            conn = self._get_conn()
             try:
-                count = conn.execute(
-                    "SELECT COUNT(*) FROM memories WHERE agent_id = ?", (agent_id,)
-                ).fetchone()[0]
-                if count > 0:
+                if self._run(lambda c: c.execute(_SQL_COUNT, (agent_id,)).fetchone()[0]) > 0:
                     continue  # 이미 마이그레이션됨
                 raw = json.loads(fp.read_text(encoding="utf-8"))
-                for d in raw:
-                    entry = MemoryEntry.from_dict(d)
-                    conn.execute(
-                        "INSERT OR IGNORE INTO memories "
-                        "(agent_id, memory_id, key, value, source, created_at) "
-                        "VALUES (?, ?, ?, ?, ?, ?)",
-                        (agent_id, entry.memory_id, entry.key, entry.value,
-                         entry.source, entry.created_at),
-                    )
-                conn.commit()
+                self._run(self._insert_entries, agent_id, [MemoryEntry.from_dict(d) for d in raw])
                 logger.info("기억 JSON→DB 마이그레이션: %s (%d건)", agent_id, len(raw))
             except Exception as e:
                 logger.warning("기억 마이그레이션 실패 (%s): %s", agent_id, e)
-            finally:
-                conn.close()
 
-    # ── 공개 API ───────────────────────────────────────────────────────────
+    # ── 전용 스레드에서 실행되는 쿼리 ──
+
+    def _load_rows(self, conn: sqlite3.Connection, agent_id: str) -> list[MemoryEntry]:
+        entries = [MemoryEntry.from_row(row) for row in conn.execute(_SQL_LOAD, (agent_id,))]
+        with self._cache_lock:
+            self._cache[agent_id] = entries
+        return entries
+
+    def _insert_entries(self, conn: sqlite3.Connection, agent_id: str,
+                        entries: list[MemoryEntry]) -> None:
+        with conn:   # 트랜잭션 1번 = 커밋 1번
+            conn.executemany(_SQL_INSERT, [
+                (agent_id, e.memory_id, e.key, e.value, e.source, e.created_at) for e in entries
+            ])
+        self._invalidate(agent_id)
+
+    def _delete_ids(self, conn: sqlite3.Connection, agent_id: str, memory_ids: list[str]) -> int:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(_SQL_DELETE, [(agent_id, mid) for mid in memory_ids])
+            deleted = conn.total_changes - before
+        self._invalidate(agent_id)
+        return deleted
+
+    @staticmethod
+    def _new_entries(items: list[tuple[str, str]], source: str) -> list[MemoryEntry]:
+        return [
+            MemoryEntry(memory_id=str(uuid.uuid4())[:8], key=key, value=value, source=source)
+            for key, value in items
+        ]
+
+    @staticmethod
+    def _format_context(entries: list[MemoryEntry]) -> str:
+        if not entries:
+            return ""
+        lines = [f"- {e.key}: {e.value}" for e in entries[-CONTEXT_LIMIT:]]
+        return (
+            "\n\n---\n"
+            "## 장기 기억 (이전 작업에서 학습한 내용)\n"
+            + "\n".join(lines)
+            + "\n---\n"
+        )
+
+    # ── 공개 API (동기) ────────────────────────────────────────────────────
 
     def load(self, agent_id: str) -> list[MemoryEntry]:
-        """에이전트의 모든 기억을 로드합니다."""
-        conn = self._get_conn()
+        """에이전트의 모든 기억을 로드합니다 (캐시 우선)."""
+        cached = self._cached(agent_id)
+        if cached is not None:
+            return list(cached)
         try:
-            rows = conn.execute(
-                "SELECT * FROM memories WHERE agent_id = ? ORDER BY created_at",
-                (agent_id,),
-            ).fetchall()
-            return [MemoryEntry.from_row(row) for row in rows]
+            return list(self._run(self._load_rows, agent_id))
         except Exception as e:
             logger.warning("기억 로드 실패 (%s): %s", agent_id, e)
             return []
-        finally:
-            conn.close()
 
     def add(
         self,
@@ -183,70 +260,111 @@ class MemoryManager:
         source: str = "manual",
     ) -> MemoryEntry:
         """새 기억을 추가합니다."""
-        entry = MemoryEntry(
-            memory_id=str(uuid.uuid4())[:8],
-            key=key,
-            value=value,
-            source=source,
-        )
-        conn = self._get_conn()
+        return self.add_many(agent_id, [(key, value)], source=source)[0]
+
+    def add_many(
+        self,
+        agent_id: str,
+        items: list[tuple[str, str]],
+        source: str = "manual",
+    ) -> list[MemoryEntry]:
+        """(key, value) 여러 건을 트랜잭션 1번으로 추가합니다."""
+        entries = self._new_entries(items, source)
+        if not entries:
+            return []
         try:
-            conn.execute(
-                "INSERT OR IGNORE INTO memories "
-                "(agent_id, memory_id, key, value, source, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?)",
-                (agent_id, entry.memory_id, entry.key, entry.value,
-                 entry.source, entry.created_at),
-            )
-            conn.commit()
+            self._run(self._insert_entries, agent_id, entries)
         except Exception as e:
             logger.warning("기억 추가 실패 (%s): %s", agent_id, e)
-        finally:
-            conn.close()
-        logger.info("기억 추가: %s / %s = %s", agent_id, key, value[:50])
-        return entry
+        for e in entries:
+            logger.info("기억 추가: %s / %s = %s", agent_id, e.key, e.value[:50])
+        return entries
 
     def delete(self, agent_id: str, memory_id: str) -> bool:
         """기억을 삭제합니다."""
-        conn = self._get_conn()
+        return self.delete_many(agent_id, [memory_id]) > 0
+
+    def delete_many(self, agent_id: str, memory_ids: list[str]) -> int:
+        """여러 기억을 트랜잭션 1번으로 삭제합니다. 삭제된 수 반환."""
+        if not memory_ids:
+            return 0
         try:
-            cursor = conn.execute(
-                "DELETE FROM memories WHERE agent_id = ? AND memory_id = ?",
-                (agent_id, memory_id),
-            )
-            conn.commit()
-            return cursor.rowcount > 0
+            return self._run(self._delete_ids, agent_id, list(memory_ids))
         except Exception as e:
             logger.warning("기억 삭제 실패 (%s): %s", agent_id, e)
-            return False
-        finally:
-            conn.close()
+            return 0
 
-    def get_all(self, agent_id: str) -> list[dict]:
-        """에이전트의 모든 기억을 dict 리스트로 반환합니다."""
-        return [e.to_dict() for e in self.load(agent_id)]
+    def get_all(self, agent_id: str, limit: int | None = None) -> list[dict]:
+        """에이전트의 기억을 dict 리스트로 반환합니다 (limit 지정 시 최근 limit건)."""
+        entries = self.load(agent_id)
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return [e.to_dict() for e in entries]
 
     def get_context_string(self, agent_id: str) -> str:
         """시스템 프롬프트에 주입할 기억 문자열을 반환합니다."""
-        conn = self._get_conn()
+        return self._format_context(self.load(agent_id))
+
+    # ── 공개 API (async — 이벤트 루프를 막지 않음) ──────────────────────────
+
+    async def aload(self, agent_id: str) -> list[MemoryEntry]:
+        cached = self._cached(agent_id)
+        if cached is not None:
+            return list(cached)
         try:
-            rows = conn.execute(
-                "SELECT key, value FROM memories "
-                "WHERE agent_id = ? ORDER BY created_at DESC LIMIT 20",
-                (agent_id,),
-            ).fetchall()
-        except Exception:
-            return ""
-        finally:
-            conn.close()
+            return list(await self._arun(self._load_rows, agent_id))
+        except Exception as e:
+            logger.warning("기억 로드 실패 (%s): %s", agent_id, e)
+            return []
 
-        if not rows:
-            return ""
+    async def aadd_many(
+        self,
+        agent_id: str,
+        items: list[tuple[str, str]],
+        source: str = "manual",
+    ) -> list[MemoryEntry]:
+        entries = self._new_entries(items, source)
+        if not entries:
+            return []
+        try:
+            await self._arun(self._insert_entries, agent_id, entries)
+        except Exception as e:
+            logger.warning("기억 추가 실패 (%s): %s", agent_id, e)
+        logger.info("기억 추가: %s / %d건", agent_id, len(entries))
+        return entries
 
-        lines = [f"- {row['key']}: {row['value']}" for row in reversed(rows)]
-        return (
-            "\n\n---\n"
-            "## 장기 기억 (이전 작업에서 학습한 내용)\n"
-            + "\n".join(lines)
-            + "\n---\n"
-        )
+    async def aadd(self, agent_id: str, key: str, value: str, source: str = "manual") -> MemoryEntry:
+        return (await self.aadd_many(agent_id, [(key, value)], source=source))[0]
+
+    async def adelete_many(self, agent_id: str, memory_ids: list[str]) -> int:
+        if not memory_ids:
+            return 0
+        try:
+            return await self._arun(self._delete_ids, agent_id, list(memory_ids))
+        except Exception as e:
+            logger.warning("기억 삭제 실패 (%s): %s", agent_id, e)
+            return 0
+
+    async def adelete(self, agent_id: str, memory_id: str) -> bool:
+        return await self.adelete_many(agent_id, [memory_id]) > 0
+
+    async def aget_all(self, agent_id: str, limit: int | None = None) -> list[dict]:
+        entries = await self.aload(agent_id)
+        if limit is not None:
+            entries = entries[-limit:] if limit > 0 else []
+        return [e.to_dict() for e in entries]
+
+    async def aget_context_string(self, agent_id: str) -> str:
+        return self._format_context(await self.aload(agent_id))
+
+    def close(self) -> None:
+        """연결 닫기 + 전용 스레드 종료 (서버 종료 시)."""
+        def _close(_conn: sqlite3.Connection) -> None:
+            self._conn.close()
+            self._conn = None
+        if self._conn is not None:
+            try:
+                self._run(_close)
+            except Exception as e:
+                logger.debug("기억 DB 연결 종료 실패: %s", e)
+        self._executor.shutdown(wait=False)
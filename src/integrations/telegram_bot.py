@@ -144,9 +144,6 @@ class CorthexTelegramBot:
             await update.message.reply_text(f"오류: {e}")
 
     async def _send_long_message(self, chat_id: int, text: str) -> None:
-        """텔레그램 4096자 제한 → 자동 분할 전송."""
-        bot = self._app.bot
-        max_len = 4000
-        for i in range(0, len(text), max_len):
-            chunk = text[i:i + max_len]
-            await bot.send_message(chat_id, chunk)
+        """텔레그램 4096자 제한 → 발신 대기열이 줄·문단 경계로 분할 전송."""
+        from src.telegram.outbox import get_outbox
+        await get_outbox(self._app.bot).send(chat_id, text)
@@ -0,0 +1,183 @@
+"""
+MCP 프록시 ↔ 메인 서버 도구 호출 채널 (Unix 도메인 소켓) — 프레이밍 + 클라이언트.
+
+이전에는 MCP 프록시(src/mcp_tool_server.py)의 도구 호출 1건마다 HTTP 요청 1건이었습니다:
+요청 파싱 → 미들웨어 체인 → 라우팅 → JSON 응답. CLI 에이전트는 작업 하나에 도구를
+수십 번 부르므로 그 고정 비용이 매번 쌓였습니다. 여기서는:
+- 프레임 = 4바이트 길이(big-endian) + JSON 본문 (orjson 있으면 orjson)
+- 연결 1개로 여러 요청을 동시에 (요청마다 id — 응답은 끝난 순서대로 옴)
+- 큰 결과는 CHUNK_CHARS 단위 조각 프레임으로 나눠 전송 → 받는 쪽에서 이어 붙임
+
+프로토콜:
+    요청: {"id": 1, "tool": "kr_stock", "arguments": {...}, "caller_id": "cli_agent"}
+    응답: {"id": 1, "chunk": "..."} × 0~n번, 마지막에 {"id": 1, "end": true, "text": "..."}
+          실패 시 마지막 프레임이 {"id": 1, "end": true, "error": "..."}
+
+서버는 web/tool_ipc.py (메인 서버 프로세스 안에서 실행).
+
+사용법 (클라이언트):
+    client = ToolIPCClient(socket_path)
+    text = await client.invoke("kr_stock", {"action": "quote"}, caller_id="cli_agent")
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+import stat
+import struct
+import tempfile
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+MAX_FRAME = 32 * 1024 * 1024      # 프레임 1개 최대 크기 (손상된 길이 헤더 방어)
+CHUNK_CHARS = 256 * 1024          # 결과 조각 크기
+_HEADER = struct.Struct(">I")
+
+
+class IPCSendError(ConnectionError):
+    """요청을 보내기 전에 실패 (연결·쓰기) — 서버는 아무것도 실행하지 않았으므로 다른 경로로 재시도해도 안전."""
+
+
+def default_socket_path() -> str:
+    """CORTHEX_TOOL_SOCKET 또는 임시 디렉토리의 corthex_mcp/tools.sock (MCP 설정 파일과 같은 곳)."""
+    return os.getenv("CORTHEX_TOOL_SOCKET") or os.path.join(tempfile.gettempdir(), "corthex_mcp", "tools.sock")
+
+
+def secure_socket_dir(path: str) -> None:
+    """소켓 디렉토리를 0700으로 준비. 다른 사용자가 먼저 만든 디렉토리면 OSError (공유 /tmp 대비)."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.lstat(directory)
+    if not stat.S_ISDIR(st.st_mode) or (hasattr(os, "getuid") and st.st_uid != os.getuid()):
+        raise OSError(f"소켓 디렉토리를 쓸 수 없음 (소유자 불일치 또는 링크): {directory}")
+    os.chmod(directory, 0o700)
+
+
+def encode(obj: dict) -> bytes:
+    if _HAS_ORJSON:
+        try:
+            body = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            body = json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+    else:
+        body = json.dumps(obj, ensure_ascii=False, default=str).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict | None:
+    """프레임 1개. 연결이 끊기면 None."""
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"프레임 크기 초과: {size}")
+    body = await reader.readexactly(size)
+    return orjson.loads(body) if _HAS_ORJSON else json.loads(body)
+
+
+def result_text(result) -> str:
+    """도구 결과 → 텍스트 (dict/list는 JSON)."""
+    if isinstance(result, (dict, list)):
+        return json.dumps(result, ensure_ascii=False, default=str)
+    return str(result)
+
+
+class ToolIPCClient:
+    """연결 1개를 공유하는 다중화 클라이언트. 끊기면 다음 호출 때 다시 연결."""
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = path or default_socket_path()
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._pending: dict[int, tuple[asyncio.Future, list[str]]] = {}
+        self._ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+    def available(self) -> bool:
+        return os.path.exists(self.path)
+
+    async def _ensure_connected(self) -> None:
+        async with self._connect_lock:
+            if self._writer is not None and not self._writer.is_closing():
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(self.path, limit=MAX_FRAME)
+            self._reader_task = asyncio.create_task(self._read_loop(self._reader))
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        error: Exception = ConnectionError("도구 채널 연결 끊김")
+        try:
+            while True:
+                frame = await read_frame(reader)
+                if frame is None:
+                    break
+                entry = self._pending.get(frame.get("id"))
+                if entry is None:
+                    continue
+                future, parts = entry
+                if "chunk" in frame:
+                    parts.append(frame["chunk"])
+                    continue
+                self._pending.pop(frame["id"], None)
+                if future.done():
+                    continue
+                if "error" in frame:
+                    future.set_exception(RuntimeError(frame["error"]))
+                else:
+                    parts.append(frame.get("text", ""))
+                    future.set_result("".join(parts))
+        except Exception as e:
+            error = e
+        finally:
+            # 남은 요청은 전부 실패 처리 (호출부가 HTTP로 폴백할 수 있게)
+            for future, _ in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+            if self._writer is not None:
+                self._writer.close()
+            self._writer = None
+
+    async def invoke(self, tool: str, arguments: dict, caller_id: str = "cli_agent") -> str:
+        """도구 실행 결과 텍스트.
+
+        IPCSendError = 요청이 나가기 전 실패 (재시도 안전). 그 밖의 예외는 요청이 이미 전송됐을 수
+        있으므로 호출부가 다른 경로로 재시도하면 안 됨 (도구 중복 실행).
+        """
+        try:
+            await self._ensure_connected()
+        except OSError as e:
+            raise IPCSendError(f"도구 채널 연결 실패: {e}") from e
+        req_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[req_id] = (future, [])
+        try:
+            async with self._write_lock:
+                writer = self._writer
+                if writer is None or writer.is_closing():
+                    raise IPCSendError("도구 채널 연결 끊김 (요청 전송 전)")
+                try:
+                    writer.write(encode({"id": req_id, "tool": tool,
+                                         "arguments": arguments, "caller_id": caller_id}))
+                except Exception as e:
+                    raise IPCSendError(f"도구 요청 쓰기 실패: {e}") from e
+                await writer.drain()   # 여기부터는 서버가 받았을 수 있음
+        except Exception:
+            self._pending.pop(req_id, None)
+            raise
+        return await future
+
+    async def aclose(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
@@ -6,6 +6,11 @@ Claude CLI가 --mcp-config로 이 서버를 시작하면,
 도구 실행은 메인 CORTHEX 서버(localhost:8000)에 HTTP로 위임하여
 ToolPool 중복 로드 없이 동작합니다.
 
+- 스키마: 메인 서버가 미리 변환해 둔 스냅샷(MCP_SCHEMA_SNAPSHOT)을 그대로 읽음 (YAML 파싱 없음)
+- 연결: MCP_TOOL_SOCKET이 있으면 메인 서버의 내부 도구 소켓(src/mcp_ipc.py) — HTTP 스택 없이
+  연결 1개로 여러 호출을 동시에, 큰 결과는 조각으로 받음. 소켓 실패 시 HTTP로 폴백
+- HTTP: 프로세스 수명 동안 keep-alive 클라이언트 1개 재사용 (MCP_SERVER_UDS가 있으면 Unix 소켓)
+
 Usage (claude CLI가 자동 실행):
   claude -p --mcp-config config.json "message"
 """
@@ -27,6 +32,21 @@ logger = logging.getLogger("corthex.mcp")
 _CALLER_ID = os.getenv("MCP_CALLER_ID", "cli_agent")
 _ALLOWED_TOOLS = os.getenv("MCP_ALLOWED_TOOLS", "")
 _SERVER_URL = os.getenv("MCP_SERVER_URL", "http://127.0.0.1:8000")
+_SERVER_UDS = os.getenv("MCP_SERVER_UDS", "")
+_SCHEMA_SNAPSHOT = os.getenv("MCP_SCHEMA_SNAPSHOT", "")
+_TOOL_SOCKET = os.getenv("MCP_TOOL_SOCKET", "")
+
+
+def _load_schema_snapshot() -> dict[str, dict] | None:
+    """메인 서버가 만든 스냅샷 {tool_id: {description, inputSchema}}. 없으면 None."""
+    if not _SCHEMA_SNAPSHOT:
+        return None
+    try:
+        with open(_SCHEMA_SNAPSHOT, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning("스키마 스냅샷 로드 실패 (tools.yaml로 폴백): %s", e)
+        return None
 
 
 def _load_tool_schemas() -> dict[str, dict]:
@@ -51,53 +71,84 @@ async def main():
     from mcp.server.stdio import stdio_server
     from mcp.types import Tool, TextContent
 
-    tool_schemas = _load_tool_schemas()
-    allowed = set(_ALLOWED_TOOLS.split(",")) if _ALLOWED_TOOLS else None
-
-    server = Server("corthex-tools")
+    import httpx
 
-    @server.list_tools()
-    async def list_tools():
-        tools = []
-        for tid, schema in tool_schemas.items():
+    allowed = set(_ALLOWED_TOOLS.split(",")) if _ALLOWED_TOOLS else None
+    snapshot = _load_schema_snapshot()
+    if snapshot is not None:
+        tool_defs = {tid: d for tid, d in snapshot.items() if not allowed or tid in allowed}
+    else:
+        tool_defs = {}
+        for tid, schema in _load_tool_schemas().items():
             if allowed and tid not in allowed:
                 continue
             input_schema = schema.get("parameters", {"type": "object", "properties": {}})
             if not isinstance(input_schema, dict):
                 input_schema = {"type": "object", "properties": {}}
-            tools.append(Tool(
-                name=tid,
-                description=schema.get("description", schema.get("name_ko", tid))[:200],
-                inputSchema=input_schema,
-            ))
-        return tools
+            tool_defs[tid] = {
+                "description": schema.get("description", schema.get("name_ko", tid))[:200],
+                "inputSchema": input_schema,
+            }
+    mcp_tools = [Tool(name=tid, description=d["description"], inputSchema=d["inputSchema"])
+                 for tid, d in tool_defs.items()]
+
+    # 프로세스 수명 동안 재사용하는 keep-alive 클라이언트
+    limits = httpx.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=300)
+    client = httpx.AsyncClient(
+        base_url=_SERVER_URL,
+        timeout=300,
+        limits=limits,
+        transport=httpx.AsyncHTTPTransport(uds=_SERVER_UDS, limits=limits) if _SERVER_UDS else None,
+    )
+
+    ipc = None
+    if _TOOL_SOCKET:
+        from mcp_ipc import IPCSendError, ToolIPCClient   # 스크립트로 실행 → sys.path[0]이 src/
+        ipc = ToolIPCClient(_TOOL_SOCKET)
+
+    server = Server("corthex-tools")
+
+    @server.list_tools()
+    async def list_tools():
+        return mcp_tools
 
     @server.call_tool()
     async def call_tool(name: str, arguments: dict):
-        """CORTHEX 서버에 HTTP로 도구 실행 위임."""
-        import httpx
+        """CORTHEX 서버에 도구 실행 위임 (내부 소켓 우선, 요청 전송 전 실패 시에만 HTTP)."""
+        if ipc is not None and ipc.available():
+            try:
+                return [TextContent(type="text", text=await ipc.invoke(name, arguments, caller_id=_CALLER_ID))]
+            except IPCSendError as e:
+                # 요청이 나가기 전 실패만 폴백 — 전송 후 끊김까지 재시도하면 도구가 두 번 실행됨
+                logger.warning("도구 소켓 호출 실패 → HTTP 폴백: %s", e)
+            except Exception as e:
+                return [TextContent(type="text", text=f"도구 '{name}' 실행 오류: {e}")]
         try:
-            async with httpx.AsyncClient(timeout=300) as client:
-                resp = await client.post(
-                    f"{_SERVER_URL}/api/internal/tool-invoke",
-                    json={
-                        "tool_name": name,
-                        "arguments": arguments,
-                        "caller_id": _CALLER_ID,
-                    },
-                )
-                data = resp.json()
-                result = data.get("result", data.get("error", "알 수 없는 오류"))
-                text = json.dumps(result, ensure_ascii=False, default=str) if isinstance(result, (dict, list)) else str(result)
-                return [TextContent(type="text", text=text)]
+            resp = await client.post(
+                "/api/internal/tool-invoke",
+                json={
+                    "tool_name": name,
+                    "arguments": arguments,
+                    "caller_id": _CALLER_ID,
+                },
+            )
+            data = resp.json()
+            result = data.get("result", data.get("error", "알 수 없는 오류"))
+            text = json.dumps(result, ensure_ascii=False, default=str) if isinstance(result, (dict, list)) else str(result)
+            return [TextContent(type="text", text=text)]
         except httpx.ConnectError:
             return [TextContent(type="text", text=f"CORTHEX 서버 연결 불가 ({_SERVER_URL}). 서버가 실행 중인지 확인하세요.")]
         except Exception as e:
             return [TextContent(type="text", text=f"도구 '{name}' 실행 오류: {e}")]
 
-    logger.warning("CORTHEX MCP 서버 시작 (도구 %d개, caller=%s)", len(tool_schemas), _CALLER_ID)
-    async with stdio_server() as streams:
-        await server.run(streams[0], streams[1], server.create_initialization_options())
+    logger.warning("CORTHEX MCP 서버 시작 (도구 %d개, caller=%s)", len(mcp_tools), _CALLER_ID)
+    try:
+        async with stdio_server() as streams:
+            await server.run(streams[0], streams[1], server.create_initialization_options())
+    finally:
+        await client.aclose()
+        if ipc is not None:
+            await ipc.aclose()
 
 
 if __name__ == "__main__":
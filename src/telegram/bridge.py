@@ -12,6 +12,7 @@ import logging
 from typing import TYPE_CHECKING
 
 from src.telegram import formatter
+from src.telegram.outbox import get_outbox
 
 if TYPE_CHECKING:
     from telegram import Bot
@@ -42,6 +43,7 @@ class TelegramBridge:
         task_store: TaskStore | None = None,
     ) -> None:
         self.bot = bot
+        self.outbox = get_outbox(bot)
         self.orchestrator = orchestrator
         self.ws_manager = ws_manager
         self.model_router = model_router
@@ -55,31 +57,29 @@ class TelegramBridge:
         self._last_command: str = ""
         # 마지막 전체 보고서 캐시 (/detail 명령에 사용)
         self._last_full_report: str | None = None
-        # 에이전트별 진행 상황 메시지 ID (메시지 수정용)
-        self._status_messages: dict[str, int] = {}
 
     async def handle_command(self, text: str) -> None:
         """텔레그램 CEO 명령을 CORTHEX로 전달하고 결과를 양쪽에 전송."""
         async with self._lock:
             if self._processing:
-                await self.bot.send_message(
-                    chat_id=self.ceo_chat_id,
-                    text="\u23f3 이전 명령을 처리 중입니다. 완료 후 다시 보내주세요.",
+                await self.outbox.send(
+                    self.ceo_chat_id,
+                    "\u23f3 이전 명령을 처리 중입니다. 완료 후 다시 보내주세요.",
                 )
                 return
 
             self._processing = True
 
         self._last_command = text
-        self._status_messages.clear()
+        self.outbox.forget_status(self.ceo_chat_id)
 
         try:
             # 1. 처리 시작 알림 (텔레그램)
-            status_msg = await self.bot.send_message(
-                chat_id=self.ceo_chat_id,
-                text=formatter.format_processing(text),
+            status_msg = (await self.outbox.send(
+                self.ceo_chat_id,
+                formatter.format_processing(text),
                 parse_mode="Markdown",
-            )
+            ))[-1]
 
             # 2. 웹 대시보드에 텔레그램 명령 알림
             await self.ws_manager.broadcast("telegram_command", {
@@ -111,13 +111,11 @@ class TelegramBridge:
                 # 부서 데이터가 없으면 기존 방식 사용
                 messages = formatter.format_result(result)
 
-            for msg_text in messages:
-                await self.bot.send_message(
-                    chat_id=self.ceo_chat_id,
-                    text=msg_text,
-                    parse_mode="Markdown",
-                )
-                await asyncio.sleep(0.3)  # 메시지 순서 보장
+            # 같은 채팅 대기열이라 순서 보장 — 간격·RetryAfter는 대기열이 처리
+            await asyncio.gather(*(
+                self.outbox.enqueue(self.ceo_chat_id, msg_text, parse_mode="Markdown")
+                for msg_text in messages
+            ))
 
             # 7. 웹 대시보드에 결과 전달
             await self.ws_manager.broadcast("result", {
@@ -144,13 +142,10 @@ class TelegramBridge:
 
         except Exception as e:
             logger.error("텔레그램 명령 처리 실패: %s", e)
-            await self.bot.send_message(
-                chat_id=self.ceo_chat_id,
-                text=f"\u274c 오류 발생: {e}",
-            )
+            await self.outbox.send(self.ceo_chat_id, f"\u274c 오류 발생: {e}")
         finally:
+            # 상태 메시지 매핑은 다음 명령 시작 때 정리 (아직 대기 중인 완료 표시가 같은 메시지를 수정하도록)
             self._processing = False
-            self._status_messages.clear()
 
     async def on_agent_event(self, msg: Message) -> None:
         """에이전트 이벤트를 텔레그램에 실시간 전달.
@@ -158,6 +153,9 @@ class TelegramBridge:
         - TASK_REQUEST: 작업 시작 알림 (새 메시지)
         - STATUS_UPDATE: 진행 상황 업데이트 (기존 메시지 수정)
         - TASK_RESULT: 작업 완료 알림 (기존 메시지 수정)
+
+        에이전트별 상태 메시지 1개를 발신 대기열의 status()로 수정 — 갱신이 몰리면
+        아직 안 보낸 갱신은 최신 내용으로 합쳐짐. 전송은 기다리지 않음.
         """
         from src.core.message import MessageType
 
@@ -166,17 +164,11 @@ class TelegramBridge:
 
         try:
             if msg.type == MessageType.TASK_REQUEST:
-                # 새 에이전트에게 작업 배정 → 새 메시지 전송
                 agent_id = msg.receiver_id
                 name_ko, division = self._get_agent_info(agent_id)
                 text = formatter.format_agent_working(agent_id, name_ko, division)
-                sent = await self.bot.send_message(
-                    chat_id=self.ceo_chat_id, text=text, parse_mode="Markdown",
-                )
-                self._status_messages[agent_id] = sent.message_id
 
             elif msg.type == MessageType.STATUS_UPDATE:
-                # 진행 상황 → 기존 메시지 수정 (메시지 폭탄 방지)
                 agent_id = msg.sender_id
                 name_ko, division = self._get_agent_info(agent_id)
                 text = formatter.format_progress_update(
@@ -186,51 +178,17 @@ class TelegramBridge:
                     current_step=msg.current_step,
                     detail=msg.detail,
                 )
-                prev_msg_id = self._status_messages.get(agent_id)
-                if prev_msg_id:
-                    try:
-                        await self.bot.edit_message_text(
-                            chat_id=self.ceo_chat_id,
-                            message_id=prev_msg_id,
-                            text=text,
-                            parse_mode="Markdown",
-                        )
-                    except Exception:
-                        # 메시지 수정 실패 시 새 메시지 전송
-                        sent = await self.bot.send_message(
-                            chat_id=self.ceo_chat_id, text=text, parse_mode="Markdown",
-                        )
-                        self._status_messages[agent_id] = sent.message_id
-                else:
-                    sent = await self.bot.send_message(
-                        chat_id=self.ceo_chat_id, text=text, parse_mode="Markdown",
-                    )
-                    self._status_messages[agent_id] = sent.message_id
 
             elif msg.type == MessageType.TASK_RESULT:
-                # 작업 완료 → 기존 메시지를 완료 상태로 수정
                 agent_id = msg.sender_id
                 name_ko, division = self._get_agent_info(agent_id)
                 text = formatter.format_agent_done(
                     name_ko, division, msg.execution_time_seconds,
                 )
-                prev_msg_id = self._status_messages.get(agent_id)
-                if prev_msg_id:
-                    try:
-                        await self.bot.edit_message_text(
-                            chat_id=self.ceo_chat_id,
-                            message_id=prev_msg_id,
-                            text=text,
-                            parse_mode="Markdown",
-                        )
-                    except Exception:
-                        await self.bot.send_message(
-                            chat_id=self.ceo_chat_id, text=text, parse_mode="Markdown",
-                        )
-                else:
-                    await self.bot.send_message(
-                        chat_id=self.ceo_chat_id, text=text, parse_mode="Markdown",
-                    )
+            else:
+                return
+
+            self.outbox.status(self.ceo_chat_id, f"agent:{agent_id}", text, parse_mode="Markdown")
 
         except Exception as e:
             logger.debug("텔레그램 상태 전송 실패 (무시): %s", e)
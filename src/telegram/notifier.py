@@ -14,6 +14,7 @@ from typing import TYPE_CHECKING, Any
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
 
 from src.telegram import formatter
+from src.telegram.outbox import get_outbox
 
 if TYPE_CHECKING:
     from telegram import Bot
@@ -27,6 +28,7 @@ class TelegramNotifier:
     def __init__(self, bot: Bot, ceo_chat_id: int) -> None:
         self.bot = bot
         self.ceo_chat_id = ceo_chat_id
+        self.outbox = get_outbox(bot)   # 속도 제한·RetryAfter·분할은 발신 대기열이 처리
 
     # ─── SNS 발행 승인 요청 ───
 
@@ -72,9 +74,9 @@ class TelegramNotifier:
         ])
 
         try:
-            await self.bot.send_message(
-                chat_id=self.ceo_chat_id,
-                text=text,
+            await self.outbox.send(
+                self.ceo_chat_id,
+                text,
                 parse_mode="Markdown",
                 reply_markup=keyboard,
             )
@@ -122,9 +124,9 @@ class TelegramNotifier:
             text += f"\n{detail}"
 
         try:
-            await self.bot.send_message(
-                chat_id=self.ceo_chat_id,
-                text=text,
+            await self.outbox.send(
+                self.ceo_chat_id,
+                text,
                 parse_mode="Markdown",
             )
             logger.info("비용 경고 알림 전송: $%.4f / $%.2f (%.1f%%)", current_cost, budget_limit, pct)
@@ -158,9 +160,9 @@ class TelegramNotifier:
             text += f"\n\U0001f4cb 상세:\n{detail[:500]}"
 
         try:
-            await self.bot.send_message(
-                chat_id=self.ceo_chat_id,
-                text=text,
+            await self.outbox.send(
+                self.ceo_chat_id,
+                text,
                 parse_mode="Markdown",
             )
             logger.info("에러 알림 전송: %s", error_source)
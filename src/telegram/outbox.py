@@ -0,0 +1,274 @@
+"""
+텔레그램 발신 대기열 — 모든 bot.send_message / edit_message_text를 한곳으로.
+
+이전에는 웹 응답 전달, /토론·/전체 같은 긴 명령 결과, 트레이딩 알림, Notifier가 제각각
+bot.send_message를 직접 불렀습니다. 긴 응답은 4096자에서 잘라 버렸고,
+429 RetryAfter가 오면 그 전송은 그냥 실패했습니다. 여기서는:
+- 채팅별 대기열 + 채팅별 작업자 (채팅 안에서는 순서 보장, 채팅끼리는 동시에 전송)
+- 채팅당 PER_CHAT_INTERVAL초 1건, 전체 GLOBAL_RATE건/초 이하로 간격 조절
+- RetryAfter면 지정 시간만큼 그 채팅을 멈췄다가 같은 메시지를 재전송 (유실 없음),
+  네트워크 오류는 짧게 재시도, Markdown 파싱 오류면 서식 없이 재전송
+- 긴 메시지는 문단 → 줄 → 공백 순으로 나눠 여러 건으로 (``` 코드블록은 닫고 다음 조각에서 다시 엶)
+- 진행 상황 메시지(status)는 키별로 메시지 1개를 수정 — 대기 중인 갱신이 있으면 최신 내용으로 덮어씀
+
+사용법:
+    from src.telegram.outbox import get_outbox
+    outbox = get_outbox(bot)
+    await outbox.send(chat_id, text, parse_mode="Markdown")   # 보낸 Message 리스트
+    outbox.enqueue(chat_id, text).add_done_callback(log_failure("크론 결과"))   # 기다리지 않음
+    outbox.status(chat_id, "agent:cio", "진행 60%")           # 같은 키는 메시지 1개를 수정
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger = logging.getLogger("corthex.telegram.outbox")
+
+MAX_LEN = 4096
+PER_CHAT_INTERVAL = 1.0      # 채팅당 초당 1건
+GLOBAL_RATE = 30             # 봇 전체 초당 30건
+MAX_RETRY_AFTER = 5          # RetryAfter 재시도 횟수
+MAX_NETWORK_RETRY = 3
+_FENCE = "```"
+
+
+# ── 분할 ──
+
+def split_text(text: str, limit: int = MAX_LEN) -> list[str]:
+    """limit자 이하 조각으로 분할. 문단·줄·공백 경계 우선, 코드블록은 조각마다 닫고 다시 엶."""
+    if len(text) <= limit:
+        return [text]
+    budget = limit - len(_FENCE) * 2 - 2   # 코드블록을 닫고 여는 여유
+    parts: list[str] = []
+    rest = text
+    reopen = False
+    while rest:
+        if reopen:
+            rest = _FENCE + "\n" + rest
+        if len(rest) <= limit:
+            parts.append(rest)
+            break
+        cut = -1
+        for sep in ("\n\n", "\n", " "):
+            cut = rest.rfind(sep, 0, budget)
+            if cut >= budget // 2:
+                break
+        if cut < budget // 2:
+            cut = budget
+            # 강제 절단 위치가 ``` 표시 한가운데면 표시 앞으로 물림 (표시가 두 조각으로 갈라지지 않게)
+            fence_at = rest.rfind(_FENCE, cut - len(_FENCE) + 1, cut + len(_FENCE) - 1)
+            if 0 < fence_at < cut:
+                cut = fence_at
+        chunk, rest = rest[:cut], rest[cut:].lstrip("\n ")
+        reopen = chunk.count(_FENCE) % 2 == 1
+        if reopen:
+            chunk += "\n" + _FENCE
+        parts.append(chunk)
+    return parts
+
+
+# ── 대기열 항목 ──
+
+@dataclass
+class _Item:
+    chat_id: int | str
+    text: str
+    kwargs: dict
+    future: asyncio.Future
+    status_key: str | None = None    # status() 항목이면 키 (보낼 때 수정/신규 결정)
+    results: list = field(default_factory=list)
+    last: bool = True                # 분할된 메시지의 마지막 조각이면 future 완료
+
+
+class TelegramOutbox:
+    """봇 1개당 발신 대기열 1개."""
+
+    def __init__(self, bot: Any) -> None:
+        self.bot = bot
+        # 채팅 키는 호출자가 준 chat_id 그대로 (숫자 id, "@channel" 모두)
+        self._queues: dict[int | str, deque[_Item]] = {}
+        self._workers: dict[int | str, asyncio.Task] = {}
+        self._chat_next: dict[int | str, float] = {}     # 채팅별 다음 전송 가능 시각 (monotonic)
+        self._global_lock = asyncio.Lock()
+        self._global_next = 0.0
+        self._status_ids: dict[tuple[int | str, str], int] = {}   # (채팅, 키) → message_id
+        self._pending_status: dict[tuple[int | str, str], _Item] = {}
+        self._stats = {"sent": 0, "edited": 0, "coalesced": 0, "retry_after": 0, "failed": 0, "split": 0}
+
+    # ── 공개 API ──
+
+    def enqueue(self, chat_id: int | str, text: str, **kwargs) -> asyncio.Future:
+        """전송 예약. Future는 보낸 Message 리스트(분할 시 여러 개)로 완료."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        chunks = split_text(text)
+        if len(chunks) > 1:
+            self._stats["split"] += 1
+        reply_markup = kwargs.pop("reply_markup", None)      # 마지막 조각에만
+        reply_to = kwargs.pop("reply_to_message_id", None)   # 첫 조각에만
+        results: list = []
+        for i, chunk in enumerate(chunks):
+            last = i == len(chunks) - 1
+            kw = dict(kwargs)
+            if i == 0 and reply_to is not None:
+                kw["reply_to_message_id"] = reply_to
+            if last and reply_markup:
+                kw["reply_markup"] = reply_markup
+            self._push(_Item(chat_id, chunk, kw, future, results=results, last=last))
+        return future
+
+    async def send(self, chat_id: int | str, text: str, **kwargs) -> list:
+        """전송하고 완료까지 대기. 실패하면 예외."""
+        return await self.enqueue(chat_id, text, **kwargs)
+
+    def status(self, chat_id: int | str, key: str, text: str, **kwargs) -> asyncio.Future:
+        """키별 진행 상황 메시지 — 처음엔 새로 보내고 이후엔 같은 메시지를 수정.
+
+        아직 안 보낸 갱신이 대기 중이면 새로 넣지 않고 그 항목의 내용만 바꿈.
+        """
+        text = text[:MAX_LEN]
+        pending = self._pending_status.get((chat_id, key))
+        if pending is not None:
+            pending.text, pending.kwargs = text, kwargs
+            self._stats["coalesced"] += 1
+            return pending.future
+        item = _Item(chat_id, text, kwargs, asyncio.get_running_loop().create_future(), status_key=key)
+        self._pending_status[(chat_id, key)] = item
+        self._push(item)
+        return item.future
+
+    def forget_status(self, chat_id: int | str, key: str | None = None) -> None:
+        """상태 메시지 매핑 삭제 (다음 status()는 새 메시지). key=None이면 채팅 전체."""
+        for k in [k for k in self._status_ids if k[0] == chat_id and (key is None or k[1] == key)]:
+            del self._status_ids[k]
+
+    def stats(self) -> dict:
+        return {**self._stats, "queued": sum(len(q) for q in self._queues.values()),
+                "active_chats": len(self._workers)}
+
+    # ── 작업자 ──
+
+    def _push(self, item: _Item) -> None:
+        self._queues.setdefault(item.chat_id, deque()).append(item)
+        worker = self._workers.get(item.chat_id)
+        if worker is None or worker.done():
+            self._workers[item.chat_id] = asyncio.get_running_loop().create_task(self._drain(item.chat_id))
+
+    async def _drain(self, chat_id: int | str) -> None:
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                item = queue[0]
+                if item.future.done() and not item.future.cancelled() and item.future.exception():
+                    queue.popleft()   # 앞 조각이 실패한 분할 메시지 — 나머지는 버림
+                    continue
+                await self._wait_slot(chat_id)
+                if item.status_key is not None:
+                    # 여기서부터의 갱신은 새 항목으로 (이 항목은 지금 보냄)
+                    self._pending_status.pop((chat_id, item.status_key), None)
+                try:
+                    msg = await self._deliver(item)
+                    item.results.append(msg)
+                    if item.last and not item.future.done():
+                        item.future.set_result(list(item.results))
+                except Exception as e:
+                    self._stats["failed"] += 1
+                    logger.warning("[TG] 전송 실패 (chat=%s): %s", chat_id, e)
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                        item.future.exception()   # 기다리는 쪽이 없어도 경고 안 남게
+                queue.popleft()
+        finally:
+            self._workers.pop(chat_id, None)
+            if not queue:
+                self._queues.pop(chat_id, None)
+
+    async def _wait_slot(self, chat_id: int | str) -> None:
+        """채팅 간격 + 전체 간격 둘 다 지킬 때까지 대기."""
+        wait = self._chat_next.get(chat_id, 0.0) - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        async with self._global_lock:
+            now = time.monotonic()
+            wait = self._global_next - now
+            self._global_next = max(now, self._global_next) + 1.0 / GLOBAL_RATE
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._chat_next[chat_id] = time.monotonic() + PER_CHAT_INTERVAL
+
+    async def _deliver(self, item: _Item):
+        """전송 1건 — RetryAfter·네트워크 오류·Markdown 오류 처리."""
+        flood_tries = net_tries = 0
+        while True:
+            try:
+                return await self._call(item)
+            except Exception as e:
+                retry_after = getattr(e, "retry_after", None)
+                if retry_after is not None and flood_tries < MAX_RETRY_AFTER:
+                    flood_tries += 1
+                    self._stats["retry_after"] += 1
+                    delay = retry_after.total_seconds() if hasattr(retry_after, "total_seconds") else float(retry_after)
+                    logger.info("[TG] RetryAfter %.0f초 (chat=%s)", delay, item.chat_id)
+                    self._chat_next[item.chat_id] = time.monotonic() + delay
+                    await asyncio.sleep(delay)
+                    continue
+                name = type(e).__name__
+                if name in ("TimedOut", "NetworkError") and net_tries < MAX_NETWORK_RETRY:
+                    net_tries += 1
+                    await asyncio.sleep(2 ** net_tries)
+                    continue
+                if name == "BadRequest" and item.kwargs.get("parse_mode") and "parse" in str(e).lower():
+                    # Markdown 엔티티 파싱 실패 → 서식 없이 다시
+                    item.kwargs = {k: v for k, v in item.kwargs.items() if k != "parse_mode"}
+                    continue
+                if name == "BadRequest" and item.kwargs.get("reply_to_message_id") and "repl" in str(e).lower():
+                    # 답장 대상 메시지가 지워짐 → 답장 없이 다시
+                    item.kwargs = {k: v for k, v in item.kwargs.items() if k != "reply_to_message_id"}
+                    continue
+                raise
+
+    async def _call(self, item: _Item):
+        key = (item.chat_id, item.status_key) if item.status_key is not None else None
+        message_id = self._status_ids.get(key) if key else None
+        if message_id is not None:
+            try:
+                msg = await self.bot.edit_message_text(
+                    chat_id=item.chat_id, message_id=message_id, text=item.text, **item.kwargs)
+                self._stats["edited"] += 1
+                return msg
+            except Exception as e:
+                if getattr(e, "retry_after", None) is not None:
+                    raise
+                if "not modified" in str(e).lower():   # 내용이 같으면 성공으로 간주
+                    return None
+                # 원본이 지워졌거나 수정 불가 → 새 메시지로
+                self._status_ids.pop(key, None)
+        msg = await self.bot.send_message(chat_id=item.chat_id, text=item.text, **item.kwargs)
+        self._stats["sent"] += 1
+        if key and msg is not None:
+            self._status_ids[key] = msg.message_id
+        return msg
+
+
+def log_failure(label: str) -> Callable[[asyncio.Future], None]:
+    """enqueue() Future용 done-callback — 기다리지 않는 백그라운드 전송의 실패를 로그로 남김."""
+    def _done(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("[TG] %s 전송 실패: %s", label, future.exception())
+    return _done
+
+
+_outboxes: dict[int, TelegramOutbox] = {}
+
+
+def get_outbox(bot: Any) -> TelegramOutbox:
+    """봇별 공유 대기열 (같은 봇이면 항상 같은 인스턴스 — 속도 제한을 함께 지킴)."""
+    outbox = _outboxes.get(id(bot))
+    if outbox is None or outbox.bot is not bot:
+        outbox = _outboxes[id(bot)] = TelegramOutbox(bot)
+    return outbox
@@ -0,0 +1,359 @@
+"""
+임베딩 서비스 — vector_knowledge / embedding_tool 공통 (프로세스 전역).
+
+이전에는 두 도구가 호출마다 동기 OpenAI 클라이언트를 새로 만들고 (async 메서드 안에서 블로킹),
+청크마다 HTTP 1회, 유사도는 순수 Python 코사인, 클러스터링은 O(n²) 탐욕 그룹핑이었습니다.
+여기서는:
+- 동시에 들어온 임베딩 요청을 모델별로 모아 공급자 배치 크기 단위로 한 번에 호출 (coalescing)
+- 이미 대기·전송 중인 본문 해시는 다시 보내지 않고 그 Future를 함께 기다림 (in-flight 공유)
+- 임베딩을 (모델, 본문 해시) 키로 SQLite에 캐시 → 같은 청크 재색인/재검색 시 API 호출 없음
+- AsyncOpenAI 클라이언트 1개를 재사용
+- 벡터 연산은 NumPy: top-k (argpartition), 코사인 행렬, 미니배치 k-means
+- 로컬 해시 임베더 (LOCAL_MODEL) — API 키 없이 결정적 벡터 (테스트/오프라인용)
+
+사용법:
+    from src.tools._embedding_service import embedding_service, EmbeddingError
+    vecs = await embedding_service.embed(["문장1", "문장2"])    # float32 (n, d), L2 정규화
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+logger = logging.getLogger("corthex.tools.embedding_service")
+
+DEFAULT_MODEL = "text-embedding-3-small"
+LOCAL_MODEL = "local-hash-256"       # 결정적 로컬 임베더 (CORTHEX_EMBEDDING_MODEL로 기본값 교체 가능)
+# 프로젝트 루트의 data/ (os.getcwd() 의존 제거 — 서버는 web/에서 실행됨)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DB_PATH = os.path.join(_PROJECT_ROOT, "data", "embedding_cache.db")
+
+MAX_BATCH_INPUTS = 256               # 요청 1회당 입력 수 (OpenAI 상한 2048보다 보수적)
+MAX_BATCH_CHARS = 200_000            # 요청 1회당 총 글자 수 (토큰 상한 대비 여유)
+MAX_INPUT_CHARS = 24_000             # 입력 1개 최대 글자 수 (8191 토큰 상한 대비)
+COALESCE_WINDOW = 0.01               # 동시 요청을 모으는 대기 시간 (초)
+
+
+class EmbeddingError(Exception):
+    """임베딩 생성 실패 — 메시지는 사용자에게 그대로 보여줄 수 있는 한국어."""
+
+
+def default_model() -> str:
+    return os.getenv("CORTHEX_EMBEDDING_MODEL", "") or DEFAULT_MODEL
+
+
+def content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ── 로컬 해시 임베더 ──
+
+_LOCAL_DIM = 256
+_WORD_RE = re.compile(r"[가-힣]+|[a-zA-Z]+|\d+")
+
+
+def hash_embed(texts: list[str], dim: int = _LOCAL_DIM) -> np.ndarray:
+    """단어 + 글자 3-gram을 부호 있는 해시 버킷에 누적 (feature hashing). 같은 입력 → 같은 벡터."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        lowered = text.lower()
+        feats = _WORD_RE.findall(lowered)
+        compact = re.sub(r"\s+", " ", lowered)
+        feats += [compact[i:i + 3] for i in range(max(0, len(compact) - 2))]
+        for f in feats:
+            h = int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=8).digest(), "little")
+            out[row, h % dim] += 1.0 if (h >> 63) & 1 else -1.0
+    return normalize(out)
+
+
+# ── 벡터 연산 ──
+
+def normalize(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=-1, keepdims=True)
+    return x / np.where(norms == 0, 1.0, norms)
+
+
+def cosine_matrix(a: np.ndarray, b: np.ndarray | None = None) -> np.ndarray:
+    a = normalize(a)
+    return a @ (a if b is None else normalize(b)).T
+
+
+def top_k(query: np.ndarray, matrix: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+    """코사인 유사도 상위 k. 반환: (인덱스, 유사도) — 유사도 내림차순."""
+    sims = normalize(matrix) @ normalize(query).ravel()
+    k = min(k, sims.size)
+    if k <= 0:
+        return np.array([], dtype=int), np.array([], dtype=np.float32)
+    idx = np.argpartition(-sims, k - 1)[:k]
+    idx = idx[np.argsort(-sims[idx], kind="stable")]
+    return idx, sims[idx]
+
+
+def minibatch_kmeans(x: np.ndarray, k: int, batch_size: int = 256, max_iter: int = 100,
+                     seed: int = 42, tol: float = 1e-4) -> tuple[np.ndarray, np.ndarray]:
+    """구면 미니배치 k-means (Sculley, 2010). 반환: (라벨, 중심)."""
+    x = normalize(x)
+    n = x.shape[0]
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(seed)
+    # k-means++ 초기화
+    centers = [x[rng.integers(n)]]
+    for _ in range(1, k):
+        d = 1.0 - np.max(x @ np.array(centers).T, axis=1)
+        d = np.maximum(d, 0.0)
+        probs = d / d.sum() if d.sum() > 0 else None
+        centers.append(x[rng.choice(n, p=probs)])
+    centers = np.array(centers, dtype=np.float32)
+    counts = np.zeros(k)
+    for _ in range(max_iter):
+        batch = x[rng.choice(n, size=min(batch_size, n), replace=False)]
+        assign = np.argmax(batch @ centers.T, axis=1)
+        prev = centers.copy()
+        for c in np.unique(assign):
+            members = batch[assign == c]
+            counts[c] += len(members)
+            lr = len(members) / counts[c]
+            centers[c] = (1 - lr) * centers[c] + lr * members.mean(axis=0)
+        centers = normalize(centers)
+        if float(np.abs(centers - prev).max()) < tol:
+            break
+    labels = np.argmax(x @ centers.T, axis=1)
+    return labels, centers
+
+
+def threshold_clusters(x: np.ndarray, threshold: float) -> list[list[int]]:
+    """기준 유사도 이상을 앞에서부터 묶는 탐욕 그룹핑 (유사도 행렬은 한 번만 계산)."""
+    sims = cosine_matrix(x)
+    n = sims.shape[0]
+    assigned = np.zeros(n, dtype=bool)
+    clusters: list[list[int]] = []
+    for i in range(n):
+        if assigned[i]:
+            continue
+        members = np.flatnonzero(~assigned & (sims[i] >= threshold) & (np.arange(n) > i))
+        assigned[i] = True
+        assigned[members] = True
+        clusters.append([i, *members.tolist()])
+    return clusters
+
+
+# ── 캐시 ──
+
+class _EmbeddingCache:
+    """(모델, 본문 해시) → float32 벡터 (SQLite)."""
+
+    def __init__(self, path: str = CACHE_DB_PATH) -> None:
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS embeddings ("
+                        " model TEXT NOT NULL, hash TEXT NOT NULL, dim INTEGER NOT NULL,"
+                        " vec BLOB NOT NULL, PRIMARY KEY (model, hash))"
+                    )
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, np.ndarray]:
+        if not hashes:
+            return {}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._conn()
+        try:
+            found: dict[str, np.ndarray] = {}
+            for i in range(0, len(hashes), 500):
+                part = hashes[i:i + 500]
+                rows = conn.execute(
+                    f"SELECT hash, vec FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(part))})",
+                    [model, *part],
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32)
+            return found
+        finally:
+            conn.close()
+
+    def put_many(self, model: str, items: list[tuple[str, np.ndarray]]) -> None:
+        if not items:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = self._conn()
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, hash, dim, vec) VALUES (?, ?, ?, ?)",
+                [(model, h, int(v.size), np.asarray(v, dtype=np.float32).tobytes()) for h, v in items],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+# ── 서비스 ──
+
+def _fail(items: list, err: Exception) -> None:
+    """[(hash, (text, [future]))] 중 아직 안 끝난 future에 예외 설정."""
+    for _, (_, futs) in items:
+        for fut in futs:
+            if not fut.done():
+                fut.set_exception(err)
+
+
+def _untrack(inflight: dict[str, asyncio.Future], h: str, fut: asyncio.Future) -> None:
+    """완료된 Future를 in-flight 맵에서 제거 (대기자가 모두 취소돼도 예외 경고 안 남게 조회)."""
+    if inflight.get(h) is fut:
+        del inflight[h]
+    if not fut.cancelled():
+        fut.exception()
+
+
+class EmbeddingService:
+    """임베딩 요청 병합 + 캐시 + 공급자 호출 (프로세스 전역 1개)."""
+
+    def __init__(self, cache: _EmbeddingCache | None = None) -> None:
+        self.cache = cache or _EmbeddingCache()
+        self._client = None
+        self._pending: dict[str, dict[str, tuple[str, list[asyncio.Future]]]] = {}
+        # 모델 → 해시 → 결과 Future. 대기열에 넣을 때 등록하고 완료되면 제거
+        # (_flush가 _pending에서 꺼내 전송 중인 해시도 여기엔 남아 있어 중복 전송 없음)
+        self._inflight: dict[str, dict[str, asyncio.Future]] = {}
+        self._flush_tasks: dict[str, asyncio.Task] = {}
+        self.stats = {"requested": 0, "cache_hits": 0, "api_calls": 0, "embedded": 0}
+
+    async def embed(self, texts: list[str], model: str | None = None) -> np.ndarray:
+        """텍스트 목록 → L2 정규화된 float32 (n, d). 실패 시 EmbeddingError."""
+        model = model or default_model()
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        texts = [t[:MAX_INPUT_CHARS] for t in texts]
+        hashes = [content_hash(t) for t in texts]
+        self.stats["requested"] += len(texts)
+
+        unique = list(dict.fromkeys(hashes))
+        found = await asyncio.to_thread(self.cache.get_many, model, unique)
+        self.stats["cache_hits"] += sum(1 for h in hashes if h in found)
+
+        missing = [h for h in unique if h not in found]
+        if missing:
+            by_hash = dict(zip(hashes, texts))
+            loop = asyncio.get_running_loop()
+            waits = []
+            pending = self._pending.setdefault(model, {})
+            inflight = self._inflight.setdefault(model, {})
+            for h in missing:
+                fut = inflight.get(h)
+                if fut is None:
+                    fut = inflight[h] = loop.create_future()
+                    fut.add_done_callback(lambda f, h=h: _untrack(inflight, h, f))
+                    pending[h] = (by_hash[h], [fut])
+                waits.append((h, fut))
+            if pending:
+                self._schedule_flush(model)
+            # shield: 공유 Future라 기다리던 호출 하나가 취소돼도 다른 대기자에게 영향 없게
+            results = await asyncio.gather(*(asyncio.shield(fut) for _, fut in waits),
+                                           return_exceptions=True)
+            for (h, _), res in zip(waits, results):
+                if isinstance(res, BaseException):
+                    raise res
+                found[h] = res
+        return np.stack([found[h] for h in hashes]).astype(np.float32, copy=False)
+
+    async def embed_one(self, text: str, model: str | None = None) -> np.ndarray:
+        return (await self.embed([text], model))[0]
+
+    # ── 병합 배치 ──
+
+    def _schedule_flush(self, model: str) -> None:
+        task = self._flush_tasks.get(model)
+        if task is None or task.done():
+            self._flush_tasks[model] = asyncio.get_running_loop().create_task(self._flush(model))
+
+    async def _flush(self, model: str) -> None:
+        current: list = []
+        try:
+            await asyncio.sleep(COALESCE_WINDOW)
+            while self._pending.get(model):
+                current = list(self._pending.pop(model).items())
+                for batch in _batches(current):
+                    try:
+                        vecs = await self._call_provider(model, [text for _, (text, _) in batch])
+                    except Exception as e:
+                        err = e if isinstance(e, EmbeddingError) else EmbeddingError(f"임베딩 생성 실패: {e}")
+                        _fail(batch, err)
+                        continue
+                    # 결과를 먼저 돌려주고 캐시는 나중에 — 캐시 저장 실패가 대기자를 막지 않게
+                    for (_, (_, futs)), v in zip(batch, vecs):
+                        for fut in futs:
+                            if not fut.done():
+                                fut.set_result(v)
+                    try:
+                        await asyncio.to_thread(
+                            self.cache.put_many, model, [(h, v) for (h, _), v in zip(batch, vecs)],
+                        )
+                    except Exception as e:
+                        logger.warning("임베딩 캐시 저장 실패 (결과는 반환됨): %s", e)
+        finally:
+            # 예외·취소로 빠져나오면 아직 못 끝낸 대기자 전부 실패 처리 (embed()가 영원히 기다리지 않게)
+            leftover = current + list(self._pending.pop(model, {}).items())
+            _fail(leftover, EmbeddingError("임베딩 작업이 중단되었습니다. 다시 시도해주세요."))
+
+    async def _call_provider(self, model: str, texts: list[str]) -> np.ndarray:
+        self.stats["api_calls"] += 1
+        self.stats["embedded"] += len(texts)
+        if model.startswith("local-hash"):
+            return await asyncio.to_thread(hash_embed, texts)
+
+        client = self._get_client()
+        response = await client.embeddings.create(model=model, input=texts)
+        data = sorted(response.data, key=lambda d: d.index)
+        return normalize(np.array([d.embedding for d in data], dtype=np.float32))
+
+    def _get_client(self):
+        if self._client is None:
+            try:
+                from openai import AsyncOpenAI
+            except ImportError:
+                raise EmbeddingError("openai 라이브러리가 설치되지 않았습니다. pip install openai")
+            api_key = os.getenv("OPENAI_API_KEY", "")
+            if not api_key:
+                raise EmbeddingError(
+                    "OPENAI_API_KEY 환경변수가 설정되지 않았습니다.\n"
+                    f"API 키 없이 쓰려면 model=\"{LOCAL_MODEL}\" (로컬 해시 임베딩)을 지정하세요."
+                )
+            self._client = AsyncOpenAI(api_key=api_key)
+        return self._client
+
+
+def _batches(items: list) -> list[list]:
+    """(hash, (text, futures)) 목록 → 입력 수/글자 수 상한을 지키는 배치들."""
+    batches: list[list] = []
+    current: list = []
+    chars = 0
+    for item in items:
+        size = len(item[1][0])
+        if current and (len(current) >= MAX_BATCH_INPUTS or chars + size > MAX_BATCH_CHARS):
+            batches.append(current)
+            current, chars = [], 0
+        current.append(item)
+        chars += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+embedding_service = EmbeddingService()
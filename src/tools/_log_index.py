@@ -0,0 +1,379 @@
+"""
+로그 파일 시간 인덱스 — log_analyzer가 긴 로그를 통째로 읽지 않도록 하는 내부 헬퍼.
+
+이전에는 action마다 로그 파일 전체를 read_text().splitlines()로 읽고 모든 줄을
+정규식 + strptime으로 파싱한 뒤 시간 컷오프로 걸렀습니다. 이제는:
+- 시간(YYYY-MM-DD HH)별 버킷에 시작 바이트 오프셋 + 레벨/모듈/에러 시그니처 건수를 저장
+- 처음엔 파일 끝에서 거꾸로 읽어 필요한 시간까지만 인덱싱, 이후엔 늘어난 부분만 이어서 인덱싱
+- 인덱스는 로그 폴더의 .log_index/{파일명}.json에 저장 (재시작 후에도 재사용)
+- 로테이션된 파일(corthex.log.1, corthex.log.2.gz 등)은 기간이 모자랄 때만 이어서 읽음
+- 컷오프가 걸친 시간 버킷 1개만 실제로 줄 단위 파싱, 나머지는 인덱스 합산
+
+사용법:
+    from src.tools._log_index import window_stats, iter_window
+    stats = window_stats("logs/corthex.log", hours=1, level="ERROR")
+    for entry in iter_window("logs/corthex.log", hours=1): ...
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterator
+
+logger = logging.getLogger("corthex.tools.log_index")
+
+KST = timezone(timedelta(hours=9))
+
+# 표준 파이썬 로그 형식 파싱
+LOG_PATTERN = re.compile(
+    r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}),?\d*\s*[-–]\s*"
+    r"([\w.]+)\s*[-–]\s*(DEBUG|INFO|WARNING|ERROR|CRITICAL)\s*[-–]\s*(.*)"
+)
+
+# 메시지 정규화용 패턴 (변수 부분을 치환하여 그룹핑)
+NORMALIZE_PATTERNS = [
+    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[.\d]*"), "{TIMESTAMP}"),
+    (re.compile(r"https?://\S+"), "{URL}"),
+    (re.compile(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"), "{IP}"),
+    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "{UUID}"),
+    (re.compile(r"\b\d+\b"), "{N}"),
+]
+
+SIG_LEVELS = ("WARNING", "ERROR", "CRITICAL")  # 시그니처를 인덱스에 누적하는 레벨
+_INDEX_VERSION = 1
+_BLOCK = 1 << 16
+_HEAD_BYTES = 256           # 파일 교체(로테이션/truncate) 감지용 앞부분 지문
+_MAX_SIGS_PER_BUCKET = 300  # 버킷당 시그니처 종류 상한 (초과분은 _OTHER_SIG로 합산)
+_OTHER_SIG = "{기타}"
+
+
+def normalize_message(message: str) -> str:
+    """에러 메시지에서 변수 부분을 제거하여 패턴화합니다."""
+    for pattern, replacement in NORMALIZE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+def _parse(raw: bytes) -> tuple[str, str, str, str] | None:
+    """한 줄 → (ts 'YYYY-MM-DD HH:MM:SS', logger, level, message). 형식이 아니면 None."""
+    m = LOG_PATTERN.match(raw.decode("utf-8", errors="replace").strip())
+    if not m:
+        return None
+    ts, name, level, message = m.groups()
+    if ts[10] != " ":
+        ts = ts[:10] + " " + ts[10:].lstrip()
+    return ts, name, level, message.strip()
+
+
+@dataclass
+class WindowStats:
+    """기간 내 로그 집계."""
+    level_counts: Counter = field(default_factory=Counter)
+    module_counts: Counter = field(default_factory=Counter)     # 레벨 필터 적용
+    signatures: Counter = field(default_factory=Counter)        # 레벨 필터 적용
+    hour_counts: Counter = field(default_factory=Counter)       # 시(0~23) → 건수, 레벨 필터 적용
+    total: int = 0                                              # 레벨 필터 적용 건수
+
+
+@dataclass
+class WindowEntry:
+    timestamp: datetime
+    logger_name: str
+    level: str
+    message: str
+
+
+# ── 파일 1개의 인덱스 ──
+
+def _open(path: Path):
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def _head_digest(path: Path) -> str:
+    try:
+        with _open(path) as f:
+            return hashlib.sha1(f.read(_HEAD_BYTES)).hexdigest()
+    except OSError:
+        return ""
+
+
+def _iter_forward(f, start: int, end: int | None) -> Iterator[tuple[int, bytes]]:
+    """start부터 end(없으면 EOF)까지 (줄 시작 오프셋, 줄) — 개행으로 끝난 줄만."""
+    f.seek(start)
+    pos = start
+    for raw in f:
+        if not raw.endswith(b"\n"):
+            break  # 아직 쓰는 중인 마지막 줄
+        if end is not None and pos >= end:
+            break
+        yield pos, raw
+        pos += len(raw)
+
+
+def _iter_backward(f, end: int) -> Iterator[tuple[int, bytes]]:
+    """end(줄 경계)부터 거꾸로 (줄 시작 오프셋, 줄)."""
+    pos = end
+    tail = b""
+    while pos > 0:
+        step = min(_BLOCK, pos)
+        pos -= step
+        f.seek(pos)
+        chunk = f.read(step) + tail
+        lines = chunk.split(b"\n")
+        tail = lines[0]  # 블록 경계에 걸린 앞부분 — 다음 블록과 합침
+        off = pos + len(chunk)
+        for line in reversed(lines[1:]):
+            off -= len(line) + 1
+            if line:
+                yield off + 1, line + b"\n"
+    if tail:
+        yield 0, tail + b"\n"
+
+
+class _FileIndex:
+    """로그 파일 1개의 시간 버킷 인덱스 (JSON 영속)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.index_path = path.parent / ".log_index" / f"{path.name}.json"
+        self.lock = threading.Lock()
+        self.state = self._load()
+        self.dirty = False
+
+    @staticmethod
+    def _empty(ident: list, head: str, end: int) -> dict:
+        # lo~hi: 인덱싱한 바이트 범위, covered: 이 시간 이후 버킷은 완전함 (None=아직 없음)
+        return {"v": _INDEX_VERSION, "ident": ident, "head": head,
+                "lo": end, "hi": end, "covered": None, "buckets": {}}
+
+    def _load(self) -> dict:
+        try:
+            state = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if state.get("v") == _INDEX_VERSION:
+                return state
+        except (OSError, ValueError):
+            pass
+        return self._empty([], "", 0)
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.state, ensure_ascii=False, separators=(",", ":")),
+                           encoding="utf-8")
+            os.replace(tmp, self.index_path)
+            self.dirty = False
+        except OSError as e:
+            logger.debug("로그 인덱스 저장 실패 (%s): %s", self.index_path, e)
+
+    @property
+    def is_gz(self) -> bool:
+        return self.path.suffix == ".gz"
+
+    def _add(self, off: int, raw: bytes) -> None:
+        parsed = _parse(raw)
+        if not parsed:
+            return
+        ts, name, level, message = parsed
+        b = self.state["buckets"].get(ts[:13])
+        if b is None:
+            b = self.state["buckets"][ts[:13]] = {"off": off, "lv": {}, "mod": {}, "sig": {}}
+        elif off < b["off"]:
+            b["off"] = off
+        b["lv"][level] = b["lv"].get(level, 0) + 1
+        mods = b["mod"].setdefault(level, {})
+        mods[name] = mods.get(name, 0) + 1
+        if level in SIG_LEVELS:
+            sigs = b["sig"].setdefault(level, {})
+            sig = normalize_message(message)
+            if sig not in sigs and len(sigs) >= _MAX_SIGS_PER_BUCKET:
+                sig = _OTHER_SIG
+            sigs[sig] = sigs.get(sig, 0) + 1
+
+    def refresh(self, need_hour: str) -> None:
+        """파일 변화 반영 + need_hour 이후 버킷이 완전해지도록 인덱스 확장."""
+        try:
+            st = self.path.stat()
+        except OSError:
+            self.state = self._empty([], "", 0)
+            return
+        ident = [st.st_dev, st.st_ino]
+        s = self.state
+        if self.is_gz:
+            # 압축된 로테이션 파일은 불변 — 한 번 전체를 앞에서부터 인덱싱
+            ident.append(st.st_size)
+            if s["ident"] != ident:
+                s = self.state = self._empty(ident, "", 0)
+                with _open(self.path) as f:
+                    for off, raw in _iter_forward(f, 0, None):
+                        self._add(off, raw)
+                        s["hi"] = off + len(raw)
+                s["lo"], s["covered"] = 0, ""
+                self.dirty = True
+            return
+
+        head = _head_digest(self.path)
+        if s["ident"] != ident or s["head"] != head or st.st_size < s["hi"]:
+            # 새 파일이거나 로테이션/truncate됨 → 끝에서부터 다시
+            end = 0
+            with open(self.path, "rb") as f:
+                start = max(0, st.st_size - _BLOCK)
+                f.seek(start)
+                cut = f.read(st.st_size - start).rfind(b"\n")
+                if cut >= 0:
+                    end = start + cut + 1
+            s = self.state = self._empty(ident, head, end)
+            self.dirty = True
+
+        with open(self.path, "rb") as f:
+            # 1) 늘어난 부분 이어서 인덱싱
+            if st.st_size > s["hi"]:
+                for off, raw in _iter_forward(f, s["hi"], None):
+                    self._add(off, raw)
+                    s["hi"] = off + len(raw)
+                self.dirty = True
+            # 2) 필요한 시간까지 거꾸로 확장
+            if s["lo"] > 0 and (s["covered"] is None or need_hour < s["covered"]):
+                new_lo = s["lo"]
+                for off, raw in _iter_backward(f, s["lo"]):
+                    parsed = _parse(raw)
+                    if parsed and parsed[0][:13] < need_hour:
+                        break
+                    self._add(off, raw)
+                    new_lo = off
+                else:
+                    new_lo = 0
+                s["lo"] = new_lo
+                s["covered"] = need_hour if new_lo > 0 else ""
+                self.dirty = True
+
+    def bucket_range(self, hour: str) -> tuple[int, int]:
+        """버킷의 바이트 범위 [시작, 다음 버킷 시작)."""
+        buckets = self.state["buckets"]
+        start = buckets[hour]["off"]
+        later = [b["off"] for h, b in buckets.items() if h > hour]
+        return start, min(later) if later else self.state["hi"]
+
+
+_indexes: dict[str, _FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _get_index(path: Path) -> _FileIndex:
+    key = str(path.resolve())
+    with _indexes_lock:
+        idx = _indexes.get(key)
+        if idx is None:
+            idx = _indexes[key] = _FileIndex(path)
+        return idx
+
+
+def _log_files(log_file: str) -> list[Path]:
+    """현재 로그 + 로테이션된 파일 (최신 → 오래된 순)."""
+    path = Path(log_file)
+    files = [path] if path.exists() else []
+    if path.parent.is_dir():
+        rotated = [p for p in path.parent.glob(f"{path.name}.*")
+                   if p.is_file() and not p.name.endswith((".tmp", ".json"))]
+        rotated.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        files += rotated
+    return files
+
+
+def _cutoff(hours: int) -> str:
+    return (datetime.now(KST) - timedelta(hours=hours)).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _windows(log_file: str, hours: int) -> Iterator[tuple[_FileIndex, str]]:
+    """기간에 걸치는 파일 인덱스를 최신 파일부터. 각 인덱스는 잠긴 상태로 넘겨줌."""
+    since = _cutoff(hours)
+    need_hour = since[:13]
+    for path in _log_files(log_file):
+        idx = _get_index(path)
+        with idx.lock:
+            idx.refresh(need_hour)
+            yield idx, since
+            idx.save()
+            if idx.state["lo"] > 0:
+                break  # 이 파일 안에서 컷오프보다 오래된 줄을 만남 → 더 오래된 파일 불필요
+
+
+def _scan(idx: _FileIndex, start: int, end: int | None, since: str) -> Iterator[tuple[str, str, str, str]]:
+    with _open(idx.path) as f:
+        for _, raw in _iter_forward(f, start, end):
+            parsed = _parse(raw)
+            if parsed and parsed[0] >= since:
+                yield parsed
+
+
+def window_stats(log_file: str, hours: int = 24, level: str = "ALL") -> WindowStats:
+    """최근 hours시간 집계. level이 SIG_LEVELS면 시그니처도 인덱스에서 합산."""
+    stats = WindowStats()
+    indexed_sigs = level in SIG_LEVELS
+
+    def _take(ts: str, name: str, lvl: str, message: str, sig: str | None = None) -> None:
+        stats.level_counts[lvl] += 1
+        if level != "ALL" and lvl != level:
+            return
+        stats.total += 1
+        stats.module_counts[name] += 1
+        stats.hour_counts[int(ts[11:13])] += 1
+        stats.signatures[sig or normalize_message(message)] += 1
+
+    for idx, since in _windows(log_file, hours):
+        need_hour = since[:13]
+        for hour, b in idx.state["buckets"].items():
+            if hour < need_hour:
+                continue
+            if hour == need_hour and since[14:] != "00:00":
+                # 컷오프가 걸친 버킷 — 이 구간만 줄 단위로
+                start, end = idx.bucket_range(hour)
+                for parsed in _scan(idx, start, end, since):
+                    _take(*parsed)
+                continue
+            for lvl, n in b["lv"].items():
+                stats.level_counts[lvl] += n
+            levels = [level] if level != "ALL" else list(b["lv"])
+            for lvl in levels:
+                n = b["lv"].get(lvl, 0)
+                if not n:
+                    continue
+                stats.total += n
+                stats.hour_counts[int(hour[11:13])] += n
+                stats.module_counts.update(b["mod"].get(lvl, {}))
+                if indexed_sigs:
+                    stats.signatures.update(b["sig"].get(lvl, {}))
+            if not indexed_sigs and any(b["lv"].get(lvl) for lvl in levels):
+                # INFO/DEBUG/ALL 시그니처는 인덱스에 없음 → 이 버킷만 스캔
+                start, end = idx.bucket_range(hour)
+                for ts, name, lvl, message in _scan(idx, start, end, since):
+                    if level == "ALL" or lvl == level:
+                        stats.signatures[normalize_message(message)] += 1
+    return stats
+
+
+def iter_window(log_file: str, hours: int = 24, level: str = "ALL") -> Iterator[WindowEntry]:
+    """최근 hours시간 로그 줄 (파일별 최신 파일부터, 파일 안에서는 시간순)."""
+    for idx, since in _windows(log_file, hours):
+        buckets = idx.state["buckets"]
+        starts = [b["off"] for h, b in buckets.items() if h >= since[:13]]
+        if not starts:
+            continue
+        for ts, name, lvl, message in _scan(idx, min(starts), idx.state["hi"], since):
+            if level != "ALL" and lvl != level:
+                continue
+            yield WindowEntry(
+                timestamp=datetime.strptime(ts, "%Y-%m-%d %H:%M:%S").replace(tzinfo=KST),
+                logger_name=name, level=lvl, message=message,
+            )
@@ -0,0 +1,309 @@
+"""
+평균-분산(Markowitz) 최적화 엔진 — portfolio_optimizer / portfolio_optimizer_v2 공통 헬퍼.
+
+이전에는 Dirichlet/균등 난수 비중을 1만 개 뽑아 Python 루프로 np.dot을 반복했습니다.
+종목이 많아질수록(20~50개) 무작위 표본이 최적점 근처에 거의 떨어지지 않아 근사도 나빠집니다.
+여기서는 제약 이차계획(QP)을 직접 풉니다:
+- 제약: 비중 합 = 1, 0 ≤ w_i ≤ cap_i (롱온리 + 종목별 상한), 선택적으로 μ'w = 목표수익률
+- 풀이: 경계 제약 active-set 방법 (free 변수에 대해 KKT 선형계 → 막히는 경계 추가 /
+  라그랑주 승수 부호가 틀린 경계 해제). 반복은 보통 종목 수 n 안팎, 각 반복 O(n³)
+- 최대 Sharpe: 프론티어 위 Sharpe는 목표수익률에 대해 단봉 → 황금분할 탐색 후,
+  최종 active set 안에서는 w(r)가 r에 대해 선형이므로 닫힌 형태로 접점(tangency)을 계산
+- 효율적 프론티어: 목표수익률을 올려가며 직전 해를 시작점으로 재사용 (warm start)
+- 리스크 패리티: 위험기여도 균등(ERC) — 순환 좌표하강 (Griveau-Billion et al., 2013)
+
+numpy만 사용합니다 (scipy 불필요).
+
+사용법:
+    from src.tools._mean_variance import max_sharpe, min_variance, efficient_frontier
+    w = max_sharpe(mu, cov, rf=0.045, caps=0.4)
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+_TOL = 1e-10
+_GOLDEN = (math.sqrt(5) - 1) / 2
+
+
+def _caps(caps, n: int) -> np.ndarray:
+    """cap 인자(None/스칼라/배열) → 길이 n 배열. 합이 1 미만이면 1이 되도록 완화."""
+    if caps is None:
+        hi = np.ones(n)
+    else:
+        hi = np.clip(np.broadcast_to(np.asarray(caps, dtype=float), (n,)).copy(), 0.0, 1.0)
+    if hi.sum() < 1.0:
+        hi = np.maximum(hi, 1.0 / n)  # 상한 합이 1 미만이면 풀 수 없음 → 균등 비중까지 완화
+    return hi
+
+
+def project_capped_simplex(v: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """{w : Σw = 1, 0 ≤ w ≤ hi}로의 유클리드 사영 (τ 이분탐색)."""
+    lo_tau, hi_tau = float(np.min(v - hi)) - 1.0, float(np.max(v))
+    for _ in range(100):
+        tau = (lo_tau + hi_tau) / 2
+        s = np.clip(v - tau, 0.0, hi).sum()
+        if s > 1.0:
+            lo_tau = tau
+        else:
+            hi_tau = tau
+    return np.clip(v - (lo_tau + hi_tau) / 2, 0.0, hi)
+
+
+def _solve_qp(Q: np.ndarray, c: np.ndarray, A: np.ndarray, b: np.ndarray,
+              hi: np.ndarray, w0: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """min ½w'Qw + c'w  s.t. Aw = b, 0 ≤ w ≤ hi — 경계 active-set.
+
+    w0는 실현가능해야 함. 반환: (w, state) — state_i: -1 하한, +1 상한, 0 free.
+    """
+    n = len(c)
+    k = A.shape[0]
+    w = np.clip(w0.astype(float), 0.0, hi)
+    state = np.zeros(n, dtype=int)
+    state[w <= _TOL] = -1
+    state[(w >= hi - _TOL) & (state == 0)] = 1
+    lam = np.zeros(k)
+
+    for _ in range(20 * n + 20):
+        free = np.flatnonzero(state == 0)
+        g = Q @ w + c
+        m = len(free)
+        kkt = np.zeros((m + k, m + k))
+        kkt[:m, :m] = Q[np.ix_(free, free)]
+        kkt[:m, m:] = A[:, free].T
+        kkt[m:, :m] = A[:, free]
+        rhs = np.concatenate([-g[free], np.zeros(k)])
+        sol = np.linalg.lstsq(kkt, rhs, rcond=None)[0]
+        p_free, lam = sol[:m], sol[m:]
+
+        if m == 0 or np.max(np.abs(p_free)) <= 1e-12:
+            # 정지점 — 고정된 경계의 승수 부호 확인
+            reduced = g + A.T @ lam
+            viol_lo = np.where(state == -1, -reduced, 0.0)   # 하한: reduced ≥ 0 이어야
+            viol_hi = np.where(state == 1, reduced, 0.0)     # 상한: reduced ≤ 0 이어야
+            viol = np.maximum(viol_lo, viol_hi)
+            j = int(np.argmax(viol))
+            if viol[j] <= 1e-10:
+                break
+            state[j] = 0
+            continue
+
+        # 경계에 막히는 최대 보폭
+        alpha, block, block_state = 1.0, -1, 0
+        w_free = w[free]
+        for idx, (wi, pi) in enumerate(zip(w_free, p_free)):
+            if pi < -1e-15:
+                a = -wi / pi
+                if a < alpha:
+                    alpha, block, block_state = a, free[idx], -1
+            elif pi > 1e-15:
+                a = (hi[free[idx]] - wi) / pi
+                if a < alpha:
+                    alpha, block, block_state = a, free[idx], 1
+        w[free] = w_free + max(alpha, 0.0) * p_free
+        if block >= 0:
+            state[block] = block_state
+            w[block] = 0.0 if block_state == -1 else hi[block]
+    return np.clip(w, 0.0, hi), state
+
+
+def _regularized(cov: np.ndarray) -> np.ndarray:
+    cov = np.asarray(cov, dtype=float)
+    ridge = 1e-12 * max(float(np.trace(cov)) / len(cov), 1e-12)
+    return 2.0 * (cov + ridge * np.eye(len(cov)))
+
+
+def min_variance(cov: np.ndarray, caps=None) -> np.ndarray:
+    """최소 분산 포트폴리오 (롱온리 + 상한)."""
+    n = len(cov)
+    hi = _caps(caps, n)
+    w0 = project_capped_simplex(np.full(n, 1.0 / n), hi)
+    w, _ = _solve_qp(_regularized(cov), np.zeros(n), np.ones((1, n)), np.ones(1), hi, w0)
+    return w
+
+
+def return_bounds(mu: np.ndarray, caps=None) -> tuple[np.ndarray, np.ndarray]:
+    """(최저 수익 포트폴리오, 최고 수익 포트폴리오) — 상한 안에서 수익률 순으로 채움."""
+    mu = np.asarray(mu, dtype=float)
+    hi = _caps(caps, len(mu))
+
+    def _fill(order):
+        w = np.zeros(len(mu))
+        left = 1.0
+        for i in order:
+            w[i] = min(hi[i], left)
+            left -= w[i]
+            if left <= 0:
+                break
+        return w
+
+    return _fill(np.argsort(mu)), _fill(np.argsort(-mu))
+
+
+def target_return(mu: np.ndarray, cov: np.ndarray, target: float, caps=None,
+                  warm: np.ndarray | None = None) -> np.ndarray:
+    """μ'w = target 에서 분산 최소 포트폴리오. 달성 불가능한 target은 범위 끝으로 맞춤."""
+    mu = np.asarray(mu, dtype=float)
+    n = len(mu)
+    hi = _caps(caps, n)
+    w_lo, w_hi = return_bounds(mu, hi)
+    r_lo, r_hi = float(mu @ w_lo), float(mu @ w_hi)
+    target = min(max(target, r_lo), r_hi)
+    if r_hi - r_lo <= _TOL:
+        return min_variance(cov, hi)
+
+    # 실현가능 시작점: warm(또는 최저/최고 수익 포트폴리오)과 반대편 극단의 볼록결합
+    base = warm if warm is not None else w_lo
+    r_base = float(mu @ base)
+    other = w_hi if target >= r_base else w_lo
+    r_other = float(mu @ other)
+    t = 0.0 if abs(r_other - r_base) <= _TOL else (target - r_base) / (r_other - r_base)
+    w0 = (1 - t) * base + t * other
+
+    A = np.vstack([np.ones(n), mu])
+    w, _ = _solve_qp(_regularized(cov), np.zeros(n), A, np.array([1.0, target]), hi, w0)
+    return w
+
+
+def efficient_frontier(mu: np.ndarray, cov: np.ndarray, points: int = 20,
+                       caps=None) -> list[np.ndarray]:
+    """최소분산 수익률 ~ 최고 수익률 구간을 points개로 나눈 프론티어 (warm start)."""
+    mu = np.asarray(mu, dtype=float)
+    hi = _caps(caps, len(mu))
+    w_mv = min_variance(cov, hi)
+    _, w_top = return_bounds(mu, hi)
+    targets = np.linspace(float(mu @ w_mv), float(mu @ w_top), max(points, 2))
+    frontier = [w_mv]
+    for target in targets[1:]:
+        frontier.append(target_return(mu, cov, float(target), hi, warm=frontier[-1]))
+    return frontier
+
+
+def _sharpe(w: np.ndarray, mu: np.ndarray, cov: np.ndarray, rf: float) -> float:
+    vol = math.sqrt(max(float(w @ cov @ w), 0.0))
+    return (float(mu @ w) - rf) / vol if vol > 0 else -math.inf
+
+
+def _tangency_on_face(mu, cov, hi, state, rf) -> np.ndarray | None:
+    """active set 고정 시 w(r) = a + r·d (선형) → Sharpe 최대 r을 닫힌 형태로."""
+    n = len(mu)
+    free = np.flatnonzero(state == 0)
+    if len(free) < 2:
+        return None
+    fixed_w = np.where(state == 1, hi, 0.0)
+    Q = _regularized(cov)
+    m = len(free)
+    A = np.vstack([np.ones(n), mu])[:, free]
+    kkt = np.zeros((m + 2, m + 2))
+    kkt[:m, :m] = Q[np.ix_(free, free)]
+    kkt[:m, m:] = A.T
+    kkt[m:, :m] = A
+    g_fixed = Q[np.ix_(free, np.arange(n))] @ fixed_w
+    budget = 1.0 - fixed_w.sum()
+    ret_fixed = float(mu @ fixed_w)
+    # r에 무관한 부분 / r 계수 부분
+    rhs0 = np.concatenate([-g_fixed, [budget, -ret_fixed]])
+    rhs1 = np.concatenate([np.zeros(m), [0.0, 1.0]])
+    try:
+        s0 = np.linalg.solve(kkt, rhs0)[:m]
+        s1 = np.linalg.solve(kkt, rhs1)[:m]
+    except np.linalg.LinAlgError:
+        return None
+    a = fixed_w.copy()
+    a[free] += s0
+    d = np.zeros(n)
+    d[free] = s1
+    # σ²(r) = qa r² + qb r + qc
+    qa, qb, qc = float(d @ cov @ d), float(2 * a @ cov @ d), float(a @ cov @ a)
+    denom = qb / 2 + qa * rf
+    if abs(denom) <= _TOL:
+        return None
+    r = -(qc + qb * rf / 2) / denom
+    w = a + r * d
+    if np.any(w < -1e-9) or np.any(w > hi + 1e-9):
+        return None  # 접점이 이 face 밖 → 황금분할 결과 사용
+    return np.clip(w, 0.0, hi)
+
+
+def max_sharpe(mu: np.ndarray, cov: np.ndarray, rf: float = 0.0, caps=None) -> np.ndarray:
+    """최대 Sharpe 포트폴리오 (롱온리 + 상한)."""
+    mu = np.asarray(mu, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    hi = _caps(caps, len(mu))
+    w_mv = min_variance(cov, hi)
+    _, w_top = return_bounds(mu, hi)
+    lo_r, hi_r = float(mu @ w_mv), float(mu @ w_top)
+    if hi_r - lo_r <= _TOL:
+        return w_mv
+
+    cache: dict[float, np.ndarray] = {}
+    warm = [w_mv]
+
+    def _eval(r: float) -> float:
+        w = target_return(mu, cov, r, hi, warm=warm[0])
+        warm[0] = w
+        cache[r] = w
+        return _sharpe(w, mu, cov, rf)
+
+    a, b = lo_r, hi_r
+    x1, x2 = b - _GOLDEN * (b - a), a + _GOLDEN * (b - a)
+    f1, f2 = _eval(x1), _eval(x2)
+    for _ in range(60):
+        if b - a <= 1e-9 * max(1.0, abs(hi_r)):
+            break
+        if f1 < f2:
+            a, x1, f1 = x1, x2, f2
+            x2 = a + _GOLDEN * (b - a)
+            f2 = _eval(x2)
+        else:
+            b, x2, f2 = x2, x1, f1
+            x1 = b - _GOLDEN * (b - a)
+            f1 = _eval(x1)
+
+    candidates = [w_mv, w_top, cache[x1], cache[x2]]
+    best = max(candidates, key=lambda w: _sharpe(w, mu, cov, rf))
+    # 최종 face 안에서 닫힌 형태로 다듬기
+    state = np.zeros(len(mu), dtype=int)
+    state[best <= 1e-9] = -1
+    state[(best >= hi - 1e-9) & (state == 0)] = 1
+    polished = _tangency_on_face(mu, cov, hi, state, rf)
+    if polished is not None and _sharpe(polished, mu, cov, rf) >= _sharpe(best, mu, cov, rf) - 1e-12:
+        return polished
+    return best
+
+
+def risk_parity(cov: np.ndarray, caps=None, budgets: np.ndarray | None = None,
+                max_iter: int = 500) -> np.ndarray:
+    """위험기여도 균등(ERC) 포트폴리오 — 순환 좌표하강. caps 초과분은 나머지에 재배분."""
+    cov = np.asarray(cov, dtype=float)
+    n = len(cov)
+    b = np.full(n, 1.0 / n) if budgets is None else np.asarray(budgets, dtype=float) / np.sum(budgets)
+    diag = np.maximum(np.diag(cov), 1e-18)
+    x = 1.0 / np.sqrt(diag)
+    x /= x.sum()
+    for _ in range(max_iter):
+        x_prev = x.copy()
+        for i in range(n):
+            # min ½x'Σx − Σ b_i ln x_i 의 i번째 좌표 최적해
+            s = float(cov[i] @ x) - cov[i, i] * x[i]
+            x[i] = (-s + math.sqrt(s * s + 4 * cov[i, i] * b[i])) / (2 * cov[i, i])
+        if np.max(np.abs(x - x_prev)) <= 1e-12 * np.max(x):
+            break
+    w = x / x.sum()
+    if caps is None:
+        return w
+    hi = _caps(caps, n)
+    # 상한 초과 종목은 상한에 고정, 남은 비중을 나머지에 비례 배분 (water-filling)
+    for _ in range(n):
+        over = w > hi + 1e-12
+        if not over.any():
+            break
+        fixed = w >= hi - 1e-12
+        w = np.where(fixed, hi, w)
+        free_sum = w[~fixed].sum()
+        if free_sum <= 0:
+            break
+        w[~fixed] *= (1.0 - hi[fixed].sum()) / free_sum
+    return w
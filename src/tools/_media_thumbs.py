@@ -0,0 +1,281 @@
+"""
+미디어 썸네일·목록 — 이미지/영상 도구와 media_handler 공용 헬퍼.
+
+이전에는 /api/media/thumbs가 요청 핸들러 안에서 Pillow open → thumbnail(LANCZOS) → save를
+직접 돌려, 캐시 안 된 이미지가 많은 갤러리를 처음 열면 이미지 수만큼 이벤트 루프가 멈췄고
+(그동안 다른 API 전부 대기), /api/media/list는 요청마다 디렉토리를 다시 훑었습니다. 여기서는:
+- 썸네일 생성은 프로세스 풀에서 (원본을 한 번 열어 SIZES 전 크기를 한꺼번에, WebP 우선 · 미지원 시 JPEG)
+  작업 프로세스가 MAX_POOL_BREAKS번 연속 죽으면 스레드 풀로 전환
+- 이미지/영상 도구가 파일을 저장하면 schedule()로 미리 생성 → 갤러리를 열 때는 이미 있음
+- 같은 파일 썸네일을 동시에 요청하면 생성은 1번만 (single-flight)
+- 원본보다 오래된 썸네일은 다시 생성 (mtime 비교)
+- 영상은 ffmpeg가 있으면 1초 지점 프레임으로 포스터 썸네일
+- 미디어 목록은 디렉토리 mtime이 바뀔 때만 다시 읽음
+
+사용법:
+    from src.tools import _media_thumbs as thumbs
+    thumbs.schedule("images", filename)                 # 도구: 저장 직후 (fire-and-forget)
+    path = await thumbs.ensure("images", filename, "md")  # 핸들러: 썸네일 경로 또는 None
+    data = thumbs.manifest()                            # {"images": [...], "videos": [...]}
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger("corthex.tools.media_thumbs")
+
+# 프로젝트 루트의 output/ (media_handler·생성 도구와 같은 위치)
+MEDIA_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "output")
+THUMB_DIR = os.path.join(MEDIA_BASE, "thumbs")
+
+SIZES = {"sm": 160, "md": 320, "lg": 640}   # 긴 변 픽셀 (srcset 폭)
+DEFAULT_SIZE = "md"
+MEDIA_EXT = {"images": ".png", "videos": ".mp4"}
+MAX_WORKERS = 2
+RENDER_TIMEOUT = 60.0
+MAX_POOL_BREAKS = 3        # 프로세스 풀이 연속으로 이만큼 죽으면 스레드 풀로 전환
+
+
+# ── 프로세스 풀에서 실행되는 함수 (모듈 최상위 — pickle 가능해야 함) ──
+
+def _render_variants(src: str, thumb_dir: str, stem: str, sizes: dict[str, int]) -> dict[str, str]:
+    """원본을 한 번 열어 크기별 썸네일 저장. 반환: {크기: 경로}."""
+    from PIL import Image, features
+
+    fmt, ext = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+    os.makedirs(thumb_dir, exist_ok=True)
+    out: dict[str, str] = {}
+    with Image.open(src) as img:
+        img = img.convert("RGBA" if fmt == "WEBP" and img.mode in ("RGBA", "LA", "P") else "RGB")
+        # 큰 크기부터 줄여 가며 재사용 (LANCZOS는 매번 원본에서 하는 것과 품질 차이 거의 없음)
+        for name, px in sorted(sizes.items(), key=lambda kv: -kv[1]):
+            img.thumbnail((px, px), Image.LANCZOS)
+            dst = os.path.join(thumb_dir, f"{stem}_{name}{ext}")
+            tmp = dst + ".tmp"
+            if fmt == "WEBP":
+                img.save(tmp, fmt, quality=78, method=4)
+            else:
+                img.save(tmp, fmt, quality=78)
+            os.replace(tmp, dst)
+            out[name] = dst
+    return out
+
+
+def _render_video_poster(src: str, thumb_dir: str, stem: str, sizes: dict[str, int]) -> dict[str, str]:
+    """영상 1초 지점 프레임 → 크기별 썸네일. ffmpeg 없으면 빈 dict."""
+    ffmpeg = shutil.which("ffmpeg")
+    if not ffmpeg:
+        return {}
+    os.makedirs(thumb_dir, exist_ok=True)
+    frame = os.path.join(thumb_dir, f"{stem}_frame.png")
+    subprocess.run(
+        [ffmpeg, "-y", "-loglevel", "error", "-ss", "1", "-i", src, "-frames:v", "1", frame],
+        check=True, timeout=RENDER_TIMEOUT, capture_output=True,
+    )
+    try:
+        return _render_variants(frame, thumb_dir, stem, sizes)
+    finally:
+        try:
+            os.remove(frame)
+        except OSError:
+            pass
+
+
+# ── 실행기 ──
+
+_executor: Executor | None = None
+_executor_lock = threading.Lock()
+_pool_breaks = 0           # 연속 BrokenProcessPool 횟수 (성공하면 0)
+
+
+def _thread_executor() -> Executor:
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="thumb")
+
+
+def _get_executor() -> Executor:
+    """프로세스 풀 (spawn — 스레드가 많은 서버 프로세스를 fork하지 않음). 실패·반복 붕괴 시 스레드 풀."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            if _pool_breaks >= MAX_POOL_BREAKS:
+                _executor = _thread_executor()
+                return _executor
+            try:
+                _executor = ProcessPoolExecutor(
+                    max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            except Exception as e:   # 샌드박스 등 프로세스 생성 불가 환경
+                logger.warning("썸네일 프로세스 풀 생성 실패 → 스레드 풀 사용: %s", e)
+                _executor = _thread_executor()
+        return _executor
+
+
+def _reset_executor() -> None:
+    """죽은 프로세스 풀 폐기. MAX_POOL_BREAKS번 연속이면 이후로는 스레드 풀 사용."""
+    global _executor, _pool_breaks
+    with _executor_lock:
+        broken, _executor = _executor, None
+        _pool_breaks += 1
+        if _pool_breaks == MAX_POOL_BREAKS:
+            logger.warning("썸네일 프로세스 풀 %d회 연속 중단 → 스레드 풀로 전환", _pool_breaks)
+    if broken is not None:
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _note_success(executor: Executor) -> None:
+    global _pool_breaks
+    if isinstance(executor, ProcessPoolExecutor):
+        _pool_breaks = 0
+
+
+# ── 썸네일 ──
+
+_inflight: dict[tuple[str, str], asyncio.Future] = {}
+_background: set[asyncio.Task] = set()
+
+
+def _source_path(kind: str, filename: str) -> str:
+    return os.path.join(MEDIA_BASE, kind, os.path.basename(filename))
+
+
+def _stem(kind: str, filename: str) -> str:
+    """썸네일 파일명 접두 (영상은 v_ — 같은 이름의 이미지와 겹치지 않게)."""
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return f"v_{stem}" if kind == "videos" else stem
+
+
+def _existing(kind: str, filename: str, size: str) -> str | None:
+    """원본보다 새로운 썸네일이 있으면 경로."""
+    src = _source_path(kind, filename)
+    try:
+        src_mtime = os.stat(src).st_mtime
+    except OSError:
+        return None
+    for ext in (".webp", ".jpg"):
+        path = os.path.join(THUMB_DIR, f"{_stem(kind, filename)}_{size}{ext}")
+        try:
+            if os.stat(path).st_mtime >= src_mtime:
+                return path
+        except OSError:
+            continue
+    return None
+
+
+async def _generate(kind: str, filename: str) -> dict[str, str]:
+    key = (kind, os.path.basename(filename))
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await asyncio.shield(fut)
+
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    _inflight[key] = fut
+    try:
+        fn = _render_variants if kind == "images" else _render_video_poster
+        executor = _get_executor()
+        result = await asyncio.wait_for(
+            loop.run_in_executor(executor, fn, _source_path(kind, filename),
+                                 THUMB_DIR, _stem(kind, filename), SIZES),
+            RENDER_TIMEOUT,
+        )
+        _note_success(executor)
+        fut.set_result(result)
+        return result
+    except Exception as e:
+        logger.warning("[Media] 썸네일 생성 실패 %s/%s: %s", kind, filename, e)
+        if isinstance(e, BrokenProcessPool):   # 작업 프로세스가 죽으면 풀을 새로 만듦 (반복되면 스레드 풀)
+            _reset_executor()
+        return {}
+    finally:
+        if not fut.done():   # 실패·취소 시에도 기다리던 요청은 풀어 줌
+            fut.set_result({})
+        _inflight.pop(key, None)
+
+
+async def ensure(kind: str, filename: str, size: str = DEFAULT_SIZE) -> str | None:
+    """썸네일 경로 (없거나 낡았으면 생성). 생성 실패·원본 없음이면 None."""
+    if kind not in MEDIA_EXT:
+        return None
+    size = size if size in SIZES else DEFAULT_SIZE
+    path = _existing(kind, filename, size)
+    if path:
+        return path
+    if not os.path.isfile(_source_path(kind, filename)):
+        return None
+    return (await _generate(kind, filename)).get(size)
+
+
+def schedule(kind: str, filename: str) -> None:
+    """저장 직후 썸네일 미리 생성 (이벤트 루프 밖에서 호출되면 무시 — 첫 요청 때 생성됨)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_generate(kind, filename))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+def drop(kind: str, filename: str) -> None:
+    """원본 삭제 시 썸네일도 삭제."""
+    stem = _stem(kind, filename)
+    for name in SIZES:
+        for ext in (".webp", ".jpg"):
+            try:
+                os.remove(os.path.join(THUMB_DIR, f"{stem}_{name}{ext}"))
+            except OSError:
+                pass
+
+
+# ── 미디어 목록 ──
+
+_manifest_lock = threading.Lock()
+_manifest_cache: dict[str, tuple[int, list[str]]] = {}   # kind → (디렉토리 mtime_ns, 파일명 목록)
+
+
+def _listing(kind: str) -> list[str]:
+    """디렉토리 mtime이 그대로면 이전 목록 재사용 (파일 추가·삭제 시 디렉토리 mtime이 바뀜)."""
+    directory = os.path.join(MEDIA_BASE, kind)
+    try:
+        mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        return []
+    with _manifest_lock:
+        hit = _manifest_cache.get(kind)
+        if hit and hit[0] == mtime:
+            return hit[1]
+    ext = MEDIA_EXT[kind]
+    names = sorted((f for f in os.listdir(directory) if f.endswith(ext)), reverse=True)
+    with _manifest_lock:
+        _manifest_cache[kind] = (mtime, names)
+    return names
+
+
+def _thumb_fields(kind: str, filename: str) -> dict:
+    base = f"/api/media/thumbs/{filename}" + ("?kind=videos" if kind == "videos" else "")
+    sep = "&" if "?" in base else "?"
+    return {
+        "thumb": base,
+        "srcset": ", ".join(f"{base}{sep}size={name} {px}w" for name, px in SIZES.items()),
+    }
+
+
+def manifest() -> dict:
+    """갤러리 목록 — 원본·썸네일 URL (+ srcset)."""
+    return {
+        "images": [
+            {"filename": f, "url": f"/api/media/images/{f}", **_thumb_fields("images", f)}
+            for f in _listing("images")
+        ],
+        "videos": [
+            {"filename": f, "url": f"/api/media/videos/{f}", **_thumb_fields("videos", f)}
+            for f in _listing("videos")
+        ],
+    }
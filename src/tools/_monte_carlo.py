@@ -0,0 +1,177 @@
+"""
+몬테카를로 시뮬레이션 커널 — scenario_simulator / growth_forecaster / customer_ltv_model 공통 헬퍼.
+
+이전에는 random.triangular를 Python 루프로 1만 번 돌려 정렬·합계를 직접 계산했습니다.
+1만 회는 꼬리(P5, VaR) 추정이 흔들리고, 루프를 늘리면 async 메서드가 이벤트 루프를 막습니다.
+여기서는 전부 NumPy 배열 연산으로:
+- 시드 고정 Generator (PCG64) — 같은 입력이면 같은 결과
+- 분포: triangular / normal / lognormal(산술 평균·표준편차로 지정) / beta(구간 스케일) /
+  uniform / gamma / constant
+- 변수 간 상관: 상관행렬 Cholesky로 만든 상관 정규난수의 순위에 맞춰 각 표본을 재배열
+  (Iman-Conover) — 주변분포는 그대로, 순위상관만 부여하므로 beta 등 역CDF 없이도 동작
+- 요약: 평균/표준편차/백분위/손실확률/VaR/CVaR/히스토그램을 한 번에 벡터 계산
+
+100만 경로도 수십~수백 ms라 도구에서는 asyncio.to_thread로 감싸 이벤트 루프를 막지 않습니다.
+
+사용법:
+    from src.tools import _monte_carlo as mc
+    draws = mc.sample({"rev": mc.triangular(1000, 3000, 5000),
+                       "cost": mc.triangular(800, 1500, 3000)},
+                      n=1_000_000, corr={("rev", "cost"): 0.6})
+    summary = mc.summarize(draws["rev"] - draws["cost"])
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_SEED = 42
+MAX_PATHS = 2_000_000
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+
+
+@dataclass(frozen=True)
+class Dist:
+    """주변분포 명세. kind별 params 의미는 아래 생성 함수 참고."""
+    kind: str
+    params: tuple[float, ...]
+
+
+def triangular(low: float, mode: float, high: float) -> Dist:
+    return Dist("triangular", (low, mode, high))
+
+
+def normal(mean: float, sd: float) -> Dist:
+    return Dist("normal", (mean, sd))
+
+
+def lognormal(mean: float, sd: float) -> Dist:
+    """산술 평균·표준편차로 지정하는 로그정규 (양수 값, 오른쪽 꼬리)."""
+    return Dist("lognormal", (mean, sd))
+
+
+def beta(a: float, b: float, low: float = 0.0, high: float = 1.0) -> Dist:
+    return Dist("beta", (a, b, low, high))
+
+
+def uniform(low: float, high: float) -> Dist:
+    return Dist("uniform", (low, high))
+
+
+def gamma(shape: float, scale: float) -> Dist:
+    return Dist("gamma", (shape, scale))
+
+
+def constant(value: float) -> Dist:
+    return Dist("constant", (value,))
+
+
+def make_rng(seed: int | None = DEFAULT_SEED) -> np.random.Generator:
+    return np.random.default_rng(seed)
+
+
+def clamp_paths(n) -> int:
+    """요청 경로 수를 1 ~ MAX_PATHS로 제한."""
+    try:
+        return max(1, min(int(n), MAX_PATHS))
+    except (TypeError, ValueError):
+        return 1
+
+
+def draw(dist: Dist, n: int, rng: np.random.Generator) -> np.ndarray:
+    """분포 1개에서 n개 독립 표본."""
+    k, p = dist.kind, dist.params
+    if k == "triangular":
+        low, mode, high = p
+        if high <= low:
+            return np.full(n, float(low))
+        return rng.triangular(low, min(max(mode, low), high), high, size=n)
+    if k == "normal":
+        return rng.normal(p[0], max(p[1], 0.0), size=n)
+    if k == "lognormal":
+        mean, sd = p
+        if mean <= 0:
+            return np.zeros(n)
+        sigma2 = np.log1p((sd / mean) ** 2)
+        return rng.lognormal(np.log(mean) - sigma2 / 2, np.sqrt(sigma2), size=n)
+    if k == "beta":
+        a, b, low, high = p
+        return low + (high - low) * rng.beta(max(a, 1e-9), max(b, 1e-9), size=n)
+    if k == "uniform":
+        return rng.uniform(p[0], p[1], size=n)
+    if k == "gamma":
+        return rng.gamma(max(p[0], 1e-9), max(p[1], 1e-300), size=n)
+    if k == "constant":
+        return np.full(n, float(p[0]))
+    raise ValueError(f"알 수 없는 분포: {k}")
+
+
+def _corr_matrix(names: list[str], corr) -> np.ndarray | None:
+    """{(a, b): ρ} 또는 k×k 배열 → 상관행렬 (양정치가 아니면 고유값 보정)."""
+    if corr is None:
+        return None
+    k = len(names)
+    if isinstance(corr, dict):
+        if not corr:
+            return None
+        m = np.eye(k)
+        pos = {nm: i for i, nm in enumerate(names)}
+        for (a, b), rho in corr.items():
+            if a in pos and b in pos and a != b:
+                m[pos[a], pos[b]] = m[pos[b], pos[a]] = float(np.clip(rho, -0.999, 0.999))
+    else:
+        m = np.asarray(corr, dtype=float)
+    vals, vecs = np.linalg.eigh(m)
+    if vals.min() <= 1e-10:
+        m = vecs @ np.diag(np.maximum(vals, 1e-6)) @ vecs.T
+        d = np.sqrt(np.diag(m))
+        m = m / np.outer(d, d)
+    return m
+
+
+def sample(dists: dict[str, Dist], n: int, rng: np.random.Generator | None = None,
+           corr=None) -> dict[str, np.ndarray]:
+    """여러 변수를 n 경로씩 표본 추출. corr가 있으면 순위상관을 부여 (Iman-Conover)."""
+    rng = rng or make_rng()
+    n = clamp_paths(n)
+    names = list(dists)
+    out = {nm: draw(dists[nm], n, rng) for nm in names}
+    m = _corr_matrix(names, corr)
+    if m is None or len(names) < 2:
+        return out
+    z = rng.standard_normal((n, len(names))) @ np.linalg.cholesky(m).T
+    for j, nm in enumerate(names):
+        ranks = np.argsort(np.argsort(z[:, j]))
+        out[nm] = np.sort(out[nm])[ranks]
+    return out
+
+
+def summarize(values: np.ndarray, percentiles=DEFAULT_PERCENTILES, bins: int = 20,
+              var_level: float = 0.95) -> dict:
+    """표본 배열 → 통계 요약 (손실 = 0 미만 기준)."""
+    v = np.asarray(values, dtype=float)
+    pct = np.percentile(v, percentiles)
+    mean = float(v.mean())
+    std = float(v.std())
+    tail_q = float(np.percentile(v, (1 - var_level) * 100))
+    tail = v[v <= tail_q]
+    counts, edges = np.histogram(v, bins=bins)
+    return {
+        "n": int(v.size),
+        "mean": mean,
+        "std": std,
+        "cv": abs(std / mean) if mean else float("inf"),
+        "min": float(v.min()),
+        "max": float(v.max()),
+        "percentiles": {int(q): float(x) for q, x in zip(percentiles, pct)},
+        "loss_prob": float((v < 0).mean()),
+        "var": max(0.0, -tail_q),                                  # 하위 (1-level) 분위 손실
+        "cvar": max(0.0, -float(tail.mean())) if tail.size else 0.0,  # 그 꼬리의 평균 손실
+        "histogram": (counts.tolist(), edges.tolist()),
+    }
+
+
+def compound_paths(start: float, growth: np.ndarray) -> np.ndarray:
+    """연도별 성장률 행렬 (경로 × 연도) → 연말 값 행렬."""
+    return start * np.cumprod(1.0 + np.asarray(growth, dtype=float), axis=1)
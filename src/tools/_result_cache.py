@@ -0,0 +1,134 @@
+"""
+도구 결과 캐시 — ToolPool.invoke 전용 헬퍼.
+
+전문가 여러 명이 같은 명령으로 동시에 kr_stock / dart_api / naver_news 등을 같은 인자로
+부르면, 이전에는 매번 외부 API를 다시 호출했습니다. 여기서는:
+- tools.yaml에서 cache_ttl을 지정한 도구만 캐시 (opt-in)
+- 키 정규화: caller_id와 None 인자 제외, 문자열 strip, 키 정렬 JSON
+  (_caller_model/_caller_temperature는 키에 포함 — 도구 안 LLM 요약이 모델마다 다르므로)
+- single-flight: 같은 키의 동시 호출은 실행 1번을 함께 기다림 (먼저 부른 쪽이 취소돼도 계속 실행)
+- 항목 수 상한 LRU + 항목별 만료 시각
+- 도구별 hit/miss/coalesced 지표
+
+예외, {"error": ...}, ToolFailure 결과, 오류 접두사("❌", "오류:" 등)로 시작하는 문자열은
+캐시하지 않습니다.
+
+사용법:
+    cache = ToolResultCache(max_entries=512)
+    result = await cache.get_or_run(tool_id, kwargs, ttl, lambda: tool.execute(**kwargs))
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from src.tools.base import ToolFailure
+
+DEFAULT_MAX_ENTRIES = 512
+# 도구들이 실패 메시지 앞에 붙이는 관례 접두사 (ToolFailure로 감싸지 않은 기존 도구용)
+ERROR_PREFIXES = ("❌", "[오류]", "오류:", "오류 ", "에러:", "Error:", "ERROR:")
+
+
+def cache_key(tool_id: str, kwargs: dict) -> str:
+    """호출 인자 → 정규화된 캐시 키."""
+    def _norm(v):
+        if isinstance(v, str):
+            return v.strip()
+        if isinstance(v, dict):
+            return {str(k): _norm(x) for k, x in v.items() if x is not None}
+        if isinstance(v, (list, tuple)):
+            return [_norm(x) for x in v]
+        return v
+
+    args = {k: _norm(v) for k, v in kwargs.items()
+            if v is not None and k != "caller_id"}
+    return tool_id + ":" + json.dumps(args, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _cacheable(result: Any) -> bool:
+    if isinstance(result, ToolFailure):
+        return False
+    if isinstance(result, str):
+        return not result.lstrip().startswith(ERROR_PREFIXES)
+    return not (isinstance(result, dict) and result.get("error"))
+
+
+class ToolResultCache:
+    """TTL + LRU 결과 캐시, 같은 키의 동시 실행은 하나로 합침."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()   # key → (만료 시각, 결과)
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    def _count(self, tool_id: str, field: str) -> None:
+        st = self._stats.setdefault(tool_id, {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0})
+        st[field] += 1
+
+    def _get(self, key: str) -> tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, entry[1]
+
+    def _put(self, tool_id: str, key: str, ttl: float, result: Any) -> None:
+        self._entries[key] = (time.monotonic() + ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            old_key, _ = self._entries.popitem(last=False)
+            self._count(old_key.split(":", 1)[0], "evictions")
+
+    async def get_or_run(self, tool_id: str, kwargs: dict, ttl: float,
+                         run: Callable[[], Awaitable[Any]]) -> Any:
+        key = cache_key(tool_id, kwargs)
+        found, value = self._get(key)
+        if found:
+            self._count(tool_id, "hits")
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count(tool_id, "coalesced")
+        else:
+            self._count(tool_id, "misses")
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+
+            def _done(t: asyncio.Task) -> None:
+                self._inflight.pop(key, None)
+                if t.cancelled():
+                    return
+                if t.exception() is None and _cacheable(t.result()):
+                    self._put(tool_id, key, ttl, t.result())
+
+            task.add_done_callback(_done)
+        # shield: 기다리던 호출 하나가 취소돼도 공유 실행은 계속
+        return await asyncio.shield(task)
+
+    def invalidate(self, tool_id: str | None = None) -> int:
+        """도구별(또는 전체) 캐시 삭제. 삭제된 항목 수 반환."""
+        if tool_id is None:
+            n = len(self._entries)
+            self._entries.clear()
+            return n
+        prefix = tool_id + ":"
+        keys = [k for k in self._entries if k.startswith(prefix)]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def stats(self) -> dict:
+        tools = {}
+        for tid, st in self._stats.items():
+            total = st["hits"] + st["misses"] + st["coalesced"]
+            tools[tid] = {**st, "hit_rate": round((st["hits"] + st["coalesced"]) / total, 3) if total else 0.0}
+        return {"entries": len(self._entries), "max_entries": self.max_entries,
+                "inflight": len(self._inflight), "tools": tools}
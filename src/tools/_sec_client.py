@@ -0,0 +1,264 @@
+"""
+SEC EDGAR 클라이언트 — sec_edgar 전용 헬퍼.
+
+이전 _get_cik은 결과를 쓰지도 않는 전문 검색 요청을 먼저 보낸 뒤, company_tickers.json
+(수백 KB)을 호출마다 새로 받아 선형 탐색했고, _fetch_edgar_filings / _search도 각자
+httpx.AsyncClient를 새로 열었습니다. 여기서는:
+- 공유 AsyncClient 1개 (keep-alive) + SEC 공정 사용 한도(초당 10건) 아래로 요청 간격 제한
+- 응답 캐시(SQLite, data/sec_edgar_cache.db): ETag / Last-Modified로 조건부 GET → 304면 본문 재사용
+- 티커 → CIK 인덱스 테이블: company_tickers.json은 하루 1번만 재검증, 바뀌었을 때만 인덱스 재생성
+  → 조회는 로컬 테이블 1행 읽기
+- CIK별 submissions JSON: 10분 안은 캐시 그대로, 이후엔 ETag 재검증
+- 네트워크 오류 시 오래된 캐시라도 있으면 그것을 반환
+
+사용법:
+    from src.tools import _sec_client as sec
+    cik = await sec.cik_for("AAPL")          # "0000320193" 또는 None
+    data = await sec.submissions(cik)        # dict 또는 None
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+logger = logging.getLogger("corthex.tools.sec_client")
+
+SEC_HEADERS = {
+    "User-Agent": "CORTHEX-HQ/1.0 (corthex-hq.com; admin@corthex-hq.com)",
+    "Accept": "application/json",
+}
+TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
+SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
+# 프로젝트 루트의 data/ (os.getcwd() 의존 제거 — 서버는 web/에서 실행됨)
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CACHE_DB_PATH = os.path.join(_PROJECT_ROOT, "data", "sec_edgar_cache.db")
+
+MAX_RPS = 8                      # SEC 한도 10건/초보다 여유 있게
+TICKERS_MAX_AGE = 86400          # 티커 인덱스: 하루 1번 재검증
+SUBMISSIONS_MAX_AGE = 600        # 공시 목록: 10분 안은 재검증 없이 사용
+REQUEST_TIMEOUT = 15.0
+
+
+def _httpx():
+    try:
+        import httpx
+        return httpx
+    except ImportError:
+        return None
+
+
+# ── 캐시 저장소 ──
+
+class _Cache:
+    """URL별 응답 본문(zlib) + 검증자, 티커 → CIK 인덱스 (SQLite)."""
+
+    def __init__(self, path: str = CACHE_DB_PATH) -> None:
+        self.path = path
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(
+                        "CREATE TABLE IF NOT EXISTS http_cache ("
+                        " url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT,"
+                        " fetched_at REAL NOT NULL, body BLOB NOT NULL);"
+                        "CREATE TABLE IF NOT EXISTS cik_index ("
+                        " ticker TEXT PRIMARY KEY, cik TEXT NOT NULL, title TEXT);"
+                    )
+                    conn.commit()
+                    self._ready = True
+        return conn
+
+    def get(self, url: str) -> dict | None:
+        conn = self._conn()
+        try:
+            row = conn.execute(
+                "SELECT etag, last_modified, fetched_at, body FROM http_cache WHERE url=?", (url,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "fetched_at": row[2],
+                "body": zlib.decompress(row[3])}
+
+    def fetched_at(self, url: str) -> float | None:
+        """마지막 수신·재검증 시각 (본문은 읽지 않음)."""
+        conn = self._conn()
+        try:
+            row = conn.execute("SELECT fetched_at FROM http_cache WHERE url=?", (url,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def put(self, url: str, body: bytes, etag: str | None, last_modified: str | None) -> None:
+        conn = self._conn()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, fetched_at, body) "
+                "VALUES (?,?,?,?,?)",
+                (url, etag, last_modified, time.time(), zlib.compress(body, 6)),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def touch(self, url: str) -> None:
+        conn = self._conn()
+        try:
+            conn.execute("UPDATE http_cache SET fetched_at=? WHERE url=?", (time.time(), url))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def rebuild_index(self, tickers: dict) -> int:
+        rows = [(_norm_ticker(v.get("ticker", "")), str(v["cik_str"]).zfill(10), v.get("title", ""))
+                for v in tickers.values() if v.get("ticker") and v.get("cik_str") is not None]
+        conn = self._conn()
+        try:
+            conn.execute("DELETE FROM cik_index")
+            conn.executemany("INSERT OR IGNORE INTO cik_index (ticker, cik, title) VALUES (?,?,?)", rows)
+            conn.commit()
+        finally:
+            conn.close()
+        return len(rows)
+
+    def lookup(self, ticker: str) -> str | None:
+        conn = self._conn()
+        try:
+            row = conn.execute("SELECT cik FROM cik_index WHERE ticker=?", (_norm_ticker(ticker),)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def index_size(self) -> int:
+        conn = self._conn()
+        try:
+            return conn.execute("SELECT COUNT(*) FROM cik_index").fetchone()[0]
+        finally:
+            conn.close()
+
+
+def _norm_ticker(ticker: str) -> str:
+    """BRK.B / BRK-B / brk b → BRK-B."""
+    return ticker.upper().strip().replace(".", "-").replace(" ", "-")
+
+
+_cache = _Cache()
+
+
+# ── 공유 클라이언트 + 속도 제한 ──
+
+_client = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_rate_lock: asyncio.Lock | None = None
+_next_slot = 0.0
+
+
+def _get_client():
+    """이벤트 루프별 공유 AsyncClient (루프가 바뀌면 새로 생성)."""
+    global _client, _client_loop, _rate_lock
+    httpx = _httpx()
+    if httpx is None:
+        return None
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            timeout=REQUEST_TIMEOUT, headers=SEC_HEADERS, follow_redirects=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+        )
+        _client_loop = loop
+        _rate_lock = asyncio.Lock()
+    return _client
+
+
+async def _throttle() -> None:
+    """요청 시작 간격을 1/MAX_RPS초 이상으로 유지."""
+    global _next_slot
+    async with _rate_lock:
+        now = time.monotonic()
+        wait = _next_slot - now
+        _next_slot = max(now, _next_slot) + 1.0 / MAX_RPS
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def get(url: str, params: dict | None = None, headers: dict | None = None):
+    """속도 제한을 지키는 공유 클라이언트 GET. httpx 없으면 None."""
+    client = _get_client()
+    if client is None:
+        return None
+    await _throttle()
+    return await client.get(url, params=params, headers=headers)
+
+
+async def get_json(url: str, max_age: float) -> tuple[dict | None, bool]:
+    """조건부 GET + 캐시. 반환: (JSON, 본문이 바뀌었는지).
+
+    캐시가 max_age초 이내면 요청 없이 캐시, 이후엔 ETag/Last-Modified로 재검증.
+    """
+    cached = await asyncio.to_thread(_cache.get, url)
+    if cached and time.time() - cached["fetched_at"] < max_age:
+        return await asyncio.to_thread(json.loads, cached["body"]), False
+
+    headers = {}
+    if cached:
+        if cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        r = await get(url, headers=headers)
+        if r is None:
+            raise RuntimeError("httpx 미설치")
+        if r.status_code == 304 and cached:
+            await asyncio.to_thread(_cache.touch, url)
+            return await asyncio.to_thread(json.loads, cached["body"]), False
+        if r.status_code != 200:
+            raise RuntimeError(f"HTTP {r.status_code}")
+        await asyncio.to_thread(_cache.put, url, r.content,
+                                r.headers.get("etag"), r.headers.get("last-modified"))
+        return await asyncio.to_thread(json.loads, r.content), True
+    except Exception as e:
+        if cached:
+            logger.warning("[SEC] %s 재검증 실패 → 캐시 사용: %s", url, e)
+            return await asyncio.to_thread(json.loads, cached["body"]), False
+        logger.warning("[SEC] %s 조회 실패: %s", url, e)
+        return None, False
+
+
+async def cik_for(symbol: str) -> str | None:
+    """티커 → 10자리 CIK. 인덱스는 하루 1번 조건부 GET으로 갱신.
+
+    신선도는 캐시 메타(fetched_at)와 인덱스 행 수로만 판단 — 평소 조회는 ~1MB 본문을 읽지 않음.
+    """
+    if not await asyncio.to_thread(_tickers_fresh):
+        data, changed = await get_json(TICKERS_URL, TICKERS_MAX_AGE)
+        if data and (changed or await asyncio.to_thread(_cache.index_size) == 0):
+            n = await asyncio.to_thread(_cache.rebuild_index, data)
+            logger.info("[SEC] 티커→CIK 인덱스 갱신: %d건", n)
+    return await asyncio.to_thread(_cache.lookup, symbol)
+
+
+def _tickers_fresh() -> bool:
+    fetched = _cache.fetched_at(TICKERS_URL)
+    return (fetched is not None and time.time() - fetched < TICKERS_MAX_AGE
+            and _cache.index_size() > 0)
+
+
+async def submissions(cik: str) -> dict | None:
+    """CIK의 submissions JSON (최근 공시 목록 포함)."""
+    data, _ = await get_json(SUBMISSIONS_URL.format(cik=cik), SUBMISSIONS_MAX_AGE)
+    return data
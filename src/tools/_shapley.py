@@ -0,0 +1,117 @@
+"""
+Shapley 기여도 엔진 — marketing_attribution 전용 헬퍼.
+
+이전 구현은 coalition_value(S)를 부를 때마다 전환 경로 전체를 set.issuperset으로 다시 훑었고,
+근사 모드는 5,000개 순열 × 채널 수만큼 그 스캔을 반복해 경로가 수천 개면 수 분이 걸렸습니다.
+여기서는:
+- 경로를 채널 비트마스크로 압축해 마스크별 전환 가치 표를 한 번만 생성
+- 채널 ≤ EXACT_MAX_CHANNELS: 부분집합 합(zeta) 변환으로 2^n개 연합 가치 v(S)를 한꺼번에 계산
+  → 정확한 Shapley 값을 채널별 벡터 연산으로 (20채널에서도 1초 미만)
+- 그보다 많으면 순열 샘플링. 한 순열에서 경로의 가치는 "그 경로 채널 중 가장 늦게 등장한 채널"의
+  한계 기여가 되므로, 순열 배치 × 고유 마스크 행렬의 argmax 한 번으로 계산.
+  채널별 표준오차가 허용치 이하로 수렴하면 조기 종료
+
+사용법:
+    from src.tools import _shapley
+    masks, values = _shapley.path_table(paths, channels)
+    v = _shapley.coalition_values(masks, values, len(channels))
+    phi = _shapley.exact_shapley(v, len(channels))
+"""
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+EXACT_MAX_CHANNELS = 20
+MIN_PERMUTATIONS = 500
+MAX_PERMUTATIONS = 20_000
+_BATCH_CELLS = 4_000_000     # 순열 배치 × 고유 마스크 × 채널 원소 수 상한 (메모리)
+
+
+def path_table(paths: list[dict], channels: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """전환된 경로 → (고유 채널 마스크 배열, 마스크별 전환 가치 합)."""
+    index = {ch: i for i, ch in enumerate(channels)}
+    table: dict[int, float] = {}
+    for p in paths:
+        if not p.get("converted"):
+            continue
+        mask = 0
+        for ch in p.get("path", []):
+            mask |= 1 << index[ch]
+        table[mask] = table.get(mask, 0.0) + float(p.get("value", 0) or 0)
+    masks = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+    values = np.fromiter(table.values(), dtype=float, count=len(table))
+    return masks, values
+
+
+def coalition_values(masks: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """v[S] = S의 부분집합인 경로 가치 합, S = 0 .. 2^n-1 (zeta 변환, O(n·2^n))."""
+    v = np.zeros(1 << n)
+    np.add.at(v, masks, values)
+    for i in range(n):
+        view = v.reshape(-1, 2, 1 << i)
+        view[:, 1, :] += view[:, 0, :]
+    return v
+
+
+def _popcount(size: int) -> np.ndarray:
+    pc = np.zeros(size, dtype=np.int64)
+    bit = 1
+    while bit < size:
+        pc[bit:2 * bit] = pc[:bit] + 1
+        bit <<= 1
+    return pc
+
+
+def exact_shapley(v: np.ndarray, n: int) -> np.ndarray:
+    """φ_i = Σ_{S∌i} |S|!(n-|S|-1)!/n! · [v(S∪{i}) - v(S)]."""
+    weights = np.array([math.factorial(k) * math.factorial(n - k - 1) / math.factorial(n)
+                        for k in range(n)])
+    w_of_mask = weights[np.minimum(_popcount(v.size), n - 1)]
+    phi = np.empty(n)
+    for i in range(n):
+        view = v.reshape(-1, 2, 1 << i)
+        w = w_of_mask.reshape(-1, 2, 1 << i)[:, 0, :]
+        phi[i] = float((w * (view[:, 1, :] - view[:, 0, :])).sum())
+    return phi
+
+
+def sampled_shapley(masks: np.ndarray, values: np.ndarray, n: int,
+                    rng: np.random.Generator | None = None,
+                    max_permutations: int = MAX_PERMUTATIONS,
+                    rel_tol: float = 0.001) -> tuple[np.ndarray, np.ndarray, int]:
+    """순열 샘플링 Shapley. 반환: (추정값, 채널별 표준오차, 사용 순열 수).
+
+    채널별 표준오차 최댓값이 (전체 전환 가치 × rel_tol) 이하가 되면 조기 종료.
+    """
+    rng = rng or np.random.default_rng(42)
+    keep = masks != 0            # 빈 경로는 어느 채널의 한계 기여도 아님
+    masks, values = masks[keep], values[keep]
+    if masks.size == 0:
+        return np.zeros(n), np.zeros(n), 0
+    member = ((masks[:, None] >> np.arange(n)) & 1).astype(bool)     # (P, n)
+    total = float(values.sum())
+    batch = max(16, min(1024, _BATCH_CELLS // max(1, masks.size * n)))
+
+    sums = np.zeros(n)
+    sq_sums = np.zeros(n)
+    done = 0
+    while done < max_permutations:
+        b = min(batch, max_permutations - done)
+        pos = rng.random((b, n)).argsort(axis=1).argsort(axis=1)        # 채널별 등장 순서
+        last = np.where(member[None, :, :], pos[:, None, :], -1).argmax(axis=2)   # (b, P)
+        rows = np.repeat(np.arange(b), masks.size)
+        contrib = np.bincount(rows * n + last.ravel(), weights=np.tile(values, b),
+                              minlength=b * n).reshape(b, n)
+        sums += contrib.sum(axis=0)
+        sq_sums += (contrib ** 2).sum(axis=0)
+        done += b
+        if done >= MIN_PERMUTATIONS:
+            mean = sums / done
+            se = np.sqrt(np.maximum(sq_sums / done - mean ** 2, 0.0) / done)
+            if se.max() <= rel_tol * total:
+                break
+    mean = sums / done
+    se = np.sqrt(np.maximum(sq_sums / done - mean ** 2, 0.0) / done)
+    return mean, se, done
@@ -0,0 +1,182 @@
+"""
+미국 주식 스냅샷 — us_stock 전용 헬퍼.
+
+이전에는 screener / peers가 종목마다 yf.Ticker(sym).info와 .history()를 하나씩,
+그것도 async 메서드 안에서 동기로 호출해 10종목 스크리닝이면 HTTP 왕복 ~20회 동안
+이벤트 루프가 멈췄습니다. quote / financials / indicators도 매번 Ticker를 새로 만들었습니다.
+여기서는:
+- 여러 종목 OHLCV를 yf.download 1회로 일괄 조회 (ARGOS 가격 이력이 기간을 덮으면 그것을 우선)
+- .info는 스레드로 동시 조회 (동시 MAX_CONCURRENCY개)
+- .info·Ticker 객체는 미국 동부 기준 거래일 동안 메모 (재무제표 등 Ticker 내부 캐시도 재사용)
+- 블로킹 호출은 전부 asyncio.to_thread
+
+가격 행 형식은 ARGOS와 같은 {date, open, high, low, close, volume} 리스트입니다.
+
+사용법:
+    from src.tools import _us_snapshot as snap
+    prices, infos = await asyncio.gather(snap.histories(symbols, "5d"), snap.infos(symbols))
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+logger = logging.getLogger("corthex.tools.us_snapshot")
+
+MAX_CONCURRENCY = 8
+FETCH_TIMEOUT = 30.0
+_TICKER_CACHE_MAX = 256
+_PERIOD_DAYS = {"5d": 7, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731}
+
+try:
+    from zoneinfo import ZoneInfo
+    _ET = ZoneInfo("America/New_York")
+except Exception:  # tzdata 없는 환경 → 고정 오프셋 근사
+    _ET = timezone(timedelta(hours=-5))
+
+_lock = threading.Lock()
+_infos: dict[str, tuple[str, dict]] = {}          # symbol → (거래일, info)
+_tickers: dict[str, tuple[str, Any]] = {}         # symbol → (거래일, yf.Ticker)
+
+
+def _yf():
+    try:
+        import yfinance as yf
+        return yf
+    except ImportError:
+        return None
+
+
+def trading_day() -> str:
+    """메모 키 — 미국 동부 기준 날짜 (주말은 직전 금요일)."""
+    now = datetime.now(_ET)
+    while now.weekday() >= 5:
+        now -= timedelta(days=1)
+    return now.strftime("%Y-%m-%d")
+
+
+def ticker(symbol: str):
+    """거래일 동안 재사용하는 yf.Ticker (재무제표·실적 속성은 Ticker 안에서 캐시됨)."""
+    yf = _yf()
+    if yf is None:
+        return None
+    day = trading_day()
+    with _lock:
+        hit = _tickers.get(symbol)
+        if hit and hit[0] == day:
+            return hit[1]
+    t = yf.Ticker(symbol)
+    with _lock:
+        if len(_tickers) >= _TICKER_CACHE_MAX:
+            _tickers.clear()
+        _tickers[symbol] = (day, t)
+    return t
+
+
+def _info_sync(symbol: str) -> dict:
+    day = trading_day()
+    with _lock:
+        hit = _infos.get(symbol)
+        if hit and hit[0] == day:
+            return hit[1]
+    t = ticker(symbol)
+    info = (t.info or {}) if t is not None else {}
+    if info:
+        with _lock:
+            _infos[symbol] = (day, info)
+    return info
+
+
+async def info(symbol: str) -> dict:
+    """종목 기본 정보 (거래일 메모). 실패하면 빈 dict."""
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(_info_sync, symbol), FETCH_TIMEOUT)
+    except Exception as e:
+        logger.debug("info 조회 실패 %s: %s", symbol, e)
+        return {}
+
+
+async def infos(symbols: list[str]) -> dict[str, dict]:
+    """여러 종목 info를 동시에 (동시 MAX_CONCURRENCY개)."""
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async def _one(sym: str) -> dict:
+        async with sem:
+            return await info(sym)
+
+    results = await asyncio.gather(*(_one(s) for s in symbols))
+    return dict(zip(symbols, results))
+
+
+def _argos_rows(symbol: str, period: str) -> list[dict] | None:
+    """ARGOS 가격 이력이 요청 기간을 덮으면 반환, 아니면 None."""
+    days = _PERIOD_DAYS.get(period)
+    if days is None:
+        return None
+    try:
+        from src.tools._argos_reader import get_price_data
+        rows = get_price_data(symbol, days=days)
+    except Exception:
+        return None
+    if not rows or len(rows) < 2:
+        return None
+    try:
+        first = datetime.strptime(str(rows[0]["date"])[:10], "%Y-%m-%d")
+        last = datetime.strptime(str(rows[-1]["date"])[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+    # 시작은 요청 기간의 90% 이상을 덮고, 마지막 행은 4일 이내(주말·휴장 여유)여야 사용
+    if (last - first).days < days * 0.9 - 4 or (datetime.now() - last).days > 4:
+        return None
+    return rows
+
+
+def _frame_rows(df) -> list[dict]:
+    if df is None or df.empty:
+        return []
+    df = df.dropna(subset=["Close"])
+    return [
+        {
+            "date": idx.strftime("%Y-%m-%d") if hasattr(idx, "strftime") else str(idx)[:10],
+            "open": float(r["Open"]), "high": float(r["High"]), "low": float(r["Low"]),
+            "close": float(r["Close"]), "volume": float(r["Volume"] or 0),
+        }
+        for idx, r in df.iterrows()
+    ]
+
+
+def _download_sync(symbols: list[str], period: str) -> dict[str, list[dict]]:
+    yf = _yf()
+    if yf is None or not symbols:
+        return {}
+    data = yf.download(symbols, period=period, interval="1d", group_by="ticker",
+                       auto_adjust=False, threads=True, progress=False)
+    out: dict[str, list[dict]] = {}
+    for sym in symbols:
+        try:
+            # group_by="ticker" → 열이 (종목, 필드) 2단. 구버전 단일 종목은 1단
+            frame = data[sym] if sym in data.columns.get_level_values(0) else data
+            out[sym] = _frame_rows(frame)
+        except (KeyError, AttributeError):
+            out[sym] = []
+    return out
+
+
+async def histories(symbols: list[str], period: str = "5d") -> dict[str, list[dict]]:
+    """여러 종목 일봉 — ARGOS가 덮는 종목은 DB, 나머지는 yf.download 1회."""
+    # ARGOS 조회는 동기 SQLite — 종목 전체를 스레드 1번에서 읽어 이벤트 루프를 막지 않음
+    cached = await asyncio.to_thread(lambda: {sym: _argos_rows(sym, period) for sym in symbols})
+    out: dict[str, list[dict]] = {sym: rows for sym, rows in cached.items() if rows}
+    missing = [sym for sym in symbols if sym not in out]
+    if missing:
+        try:
+            out.update(await asyncio.wait_for(asyncio.to_thread(_download_sync, missing, period),
+                                              FETCH_TIMEOUT))
+        except Exception as e:
+            logger.warning("일괄 시세 조회 실패 (%d종목): %s", len(missing), e)
+    if len(missing) < len(symbols):
+        logger.info("[ARGOS] US 시세 %d/%d종목 캐시 사용", len(symbols) - len(missing), len(symbols))
+    return {sym: out.get(sym, []) for sym in symbols}
@@ -18,6 +18,14 @@ class ToolConfig(BaseModel):
     name_ko: str
     description: str
     model_name: str = ""
+    cache_ttl: float = 0  # 초. 0보다 크면 ToolPool이 같은 인자의 결과를 이 시간 동안 재사용
+
+
+class ToolFailure(str):
+    """실패 결과 표시 — 일반 문자열처럼 그대로 쓰이지만 ToolPool 결과 캐시에는 저장되지 않음.
+
+    외부 API 오류처럼 잠시 뒤 다시 부르면 성공할 수 있는 실패는 ``return ToolFailure(f"... 실패: {e}")``.
+    """
 
 
 class BaseTool(ABC):
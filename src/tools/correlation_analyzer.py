@@ -28,6 +28,7 @@
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -60,6 +61,137 @@ def _to_yf_symbol(sym: str) -> str:
     return sym
 
 
+# ── 가격 수집 (동시·비차단) ──
+# yfinance 호출은 블로킹이라 스레드에서, 동시 실행 수는 제한합니다.
+# 한국 6자리 종목은 ARGOS 수집 캐시(argos_price_history, 90일 보존)가 조회 기간을 덮으면 우선 사용.
+
+_FETCH_CONCURRENCY = 8
+_FETCH_TIMEOUT = 20          # 종목당 최대 대기 (초)
+_ARGOS_MAX_DAYS = 90
+_PERIOD_DAYS = {"5d": 7, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 366, "2y": 731}
+
+
+def _to_daily(series):
+    """tz-aware 인덱스 → 현지 날짜 (서로 다른 거래소 시계열 정렬용)."""
+    import pandas as pd
+    idx = pd.DatetimeIndex(series.index)
+    if idx.tz is not None:
+        idx = idx.tz_localize(None)
+    out = series.astype(float).copy()
+    out.index = idx.normalize()
+    return out[~out.index.duplicated(keep="last")]
+
+
+def _argos_closes(sym: str, days: int):
+    if not (sym.isdigit() and len(sym) == 6) or days > _ARGOS_MAX_DAYS:
+        return None
+    try:
+        from src.tools._argos_reader import get_price_data
+        rows = get_price_data(sym, days)
+    except Exception:
+        return None
+    if not rows or len(rows) < 5:
+        return None
+    import pandas as pd
+    return pd.Series([r["close"] for r in rows],
+                     index=pd.to_datetime([r["date"] for r in rows]), dtype=float)
+
+
+def _yf_closes(sym: str, period: str, with_name: bool):
+    t = _yf().Ticker(_to_yf_symbol(sym))
+    h = t.history(period=period)
+    if h.empty:
+        return None, None
+    name = (t.info or {}).get("shortName") if with_name else None
+    return h["Close"], name
+
+
+async def _fetch_closes(symbols: list, period: str = "1y", min_points: int = 0,
+                        with_names: bool = False) -> tuple[dict, dict]:
+    """종목별 종가 시계열을 동시에 수집. 반환: ({sym: Series}, {sym: 이름}) — 입력 순서 유지."""
+    sem = asyncio.Semaphore(_FETCH_CONCURRENCY)
+    days = _PERIOD_DAYS.get(period, 366)
+
+    async def one(sym):
+        async with sem:
+            try:
+                series = await asyncio.to_thread(_argos_closes, sym, days)
+                name = None
+                if series is not None:
+                    logger.info("[ARGOS] %s 종가 %d일 캐시 사용", sym, len(series))
+                else:
+                    series, name = await asyncio.wait_for(
+                        asyncio.to_thread(_yf_closes, sym, period, with_names), _FETCH_TIMEOUT,
+                    )
+                return series, name
+            except Exception as e:
+                logger.debug("가격 수집 실패 (%s): %s", sym, e)
+                return None, None
+
+    symbols = list(dict.fromkeys(symbols))
+    results = await asyncio.gather(*(one(sym) for sym in symbols))
+    prices, names = {}, {}
+    for sym, (series, name) in zip(symbols, results):
+        if series is not None and len(series) > min_points:
+            prices[sym] = _to_daily(series)
+            names[sym] = name or sym
+    return prices, names
+
+
+def _aligned_returns(prices: dict):
+    """공통 거래일로 정렬한 일간 수익률 DataFrame (열 = 종목)."""
+    import pandas as pd
+    df = pd.DataFrame(prices).dropna()
+    return df.pct_change().dropna()
+
+
+# ── 상관 구조 (벡터 연산) ──
+
+def _rolling_corr(r, window: int):
+    """모든 윈도우의 상관행렬을 누적합으로 한 번에 계산. 반환: (T-window+1, n, n)."""
+    np = _np()
+    t, n = r.shape
+    s1 = np.vstack([np.zeros((1, n)), np.cumsum(r, axis=0)])
+    s2 = np.concatenate([np.zeros((1, n, n)), np.cumsum(r[:, :, None] * r[:, None, :], axis=0)])
+    mx = (s1[window:] - s1[:-window]) / window
+    cov = (s2[window:] - s2[:-window]) / window - mx[:, :, None] * mx[:, None, :]
+    sd = np.sqrt(np.maximum(np.einsum("tii->ti", cov), 1e-18))
+    return np.clip(cov / (sd[:, :, None] * sd[:, None, :]), -1.0, 1.0)
+
+
+def _ewma_corr(r, lam: float = 0.94):
+    """RiskMetrics EWMA 상관 (평균 0 가정, 최근 관측에 가중)."""
+    np = _np()
+    t = r.shape[0]
+    w = (1 - lam) * lam ** np.arange(t - 1, -1, -1)
+    w /= w.sum()
+    cov = np.einsum("t,ti,tj->ij", w, r, r)
+    sd = np.sqrt(np.maximum(np.diag(cov), 1e-18))
+    return np.clip(cov / np.outer(sd, sd), -1.0, 1.0)
+
+
+def _hierarchical_clusters(corr, min_corr: float = 0.5) -> list[list[int]]:
+    """평균 연결 계층 군집 (거리 √((1-ρ)/2)), 거리가 ρ=min_corr 기준을 넘으면 병합 중단."""
+    np = _np()
+    n = corr.shape[0]
+    dist = np.sqrt(np.clip((1 - corr) / 2, 0, None))
+    np.fill_diagonal(dist, np.inf)
+    cut = np.sqrt((1 - min_corr) / 2)
+    members = {i: [i] for i in range(n)}
+    active = np.ones(n, dtype=bool)
+    while active.sum() > 1:
+        masked = np.where(active[:, None] & active[None, :], dist, np.inf)
+        a, b = np.unravel_index(np.argmin(masked), masked.shape)
+        if masked[a, b] > cut:
+            break
+        na, nb = len(members[a]), len(members[b])
+        dist[a, :] = dist[:, a] = (na * dist[a, :] + nb * dist[b, :]) / (na + nb)
+        dist[a, a] = np.inf
+        active[b] = False
+        members[a] = sorted(members[a] + members.pop(b))
+    return sorted((members[i] for i in np.flatnonzero(active)), key=lambda m: (-len(m), m[0]))
+
+
 # 주요 글로벌 자산 ETF (상관관계 분석 기본 세트)
 DEFAULT_ASSETS = {
     "SPY": "S&P 500",
@@ -108,39 +240,30 @@ class CorrelationAnalyzerTool(BaseTool):
         if not yf or not np:
             return "yfinance/numpy 미설치"
 
-        import pandas as pd
+        period = kw.get("period", "1y")
 
         try:
-            # 가격 데이터 수집
-            prices = {}
-            for sym in symbols:
-                try:
-                    t = yf.Ticker(_to_yf_symbol(sym))
-                    h = t.history(period="1y")
-                    if not h.empty and len(h) > 50:
-                        prices[sym] = h["Close"]
-                except Exception:
-                    continue
+            # 가격 데이터 수집 (동시, 이벤트 루프 비차단)
+            prices, _ = await _fetch_closes(symbols, period, min_points=50)
 
             if len(prices) < 2:
                 return "최소 2개 자산의 데이터가 필요합니다."
 
-            df = pd.DataFrame(prices).dropna()
-            returns = df.pct_change().dropna()
+            returns = _aligned_returns(prices)
             valid = list(returns.columns)
             n = len(valid)
+            r = returns.to_numpy()
 
             # 전체 기간 상관관계
-            corr_full = returns.corr()
+            corr_full = np.corrcoef(r, rowvar=False)
 
             # 최근 1개월 상관관계 (동적 비교)
-            recent = returns.tail(21)
-            corr_recent = recent.corr()
+            corr_recent = np.corrcoef(r[-21:], rowvar=False)
 
             lines = [
                 "## 자산 간 상관관계 분석\n",
                 "### Engle(2002) DCC-GARCH: 상관관계는 시간에 따라 변함\n",
-                f"### 1년 상관관계 매트릭스 ({n}개 자산)",
+                f"### 상관관계 매트릭스 ({period}, {n}개 자산)",
             ]
 
             # 상관행렬 테이블
@@ -151,7 +274,7 @@ class CorrelationAnalyzerTool(BaseTool):
             for i, sym_i in enumerate(valid):
                 row = f"| **{sym_i}** |"
                 for j, sym_j in enumerate(valid):
-                    val = float(corr_full.loc[sym_i, sym_j])
+                    val = float(corr_full[i, j])
                     if i == j:
                         row += " 1.00 |"
                     elif val > 0.7:
@@ -172,8 +295,8 @@ class CorrelationAnalyzerTool(BaseTool):
             for i in range(n):
                 for j in range(i+1, n):
                     sym_i, sym_j = valid[i], valid[j]
-                    full_val = float(corr_full.loc[sym_i, sym_j])
-                    recent_val = float(corr_recent.loc[sym_i, sym_j])
+                    full_val = float(corr_full[i, j])
+                    recent_val = float(corr_recent[i, j])
                     change = recent_val - full_val
 
                     if abs(change) > 0.15:
@@ -202,11 +325,8 @@ class CorrelationAnalyzerTool(BaseTool):
 
             # 분산 효과 점수
             # 평균 상관관계가 낮을수록 분산 효과 좋음
-            off_diag = []
-            for i in range(n):
-                for j in range(i+1, n):
-                    off_diag.append(float(corr_recent.iloc[i, j]))
-            avg_corr = sum(off_diag) / len(off_diag) if off_diag else 0
+            upper = np.triu_indices(n, 1)
+            avg_corr = float(np.nanmean(corr_recent[upper])) if n > 1 else 0
 
             lines.append(f"\n### 분산 효과 점수")
             lines.append(f"- 평균 상관관계: **{avg_corr:.2f}**")
@@ -219,6 +339,32 @@ class CorrelationAnalyzerTool(BaseTool):
             else:
                 lines.append("- 🔴 **위험** — 동조화 심각, 위기 시 동시 하락 가능")
 
+            # 롤링 평균 상관 추이 (분기 윈도우, 월 간격)
+            window = 63
+            if len(r) > window + 21:
+                rolling = _rolling_corr(r, window)
+                avg_path = rolling[:, upper[0], upper[1]].mean(axis=1)
+                lines.append(f"\n### 롤링 평균 상관 ({window}거래일 윈도우)")
+                lines.append("| 기준일 | 평균 상관 |")
+                lines.append("|--------|----------|")
+                for k in range(len(avg_path) - 1, -1, -21)[:6][::-1]:
+                    day = returns.index[k + window - 1].strftime("%Y-%m-%d")
+                    lines.append(f"| {day} | {avg_path[k]:.2f} |")
+
+            # EWMA 상관 (최근 관측 가중)
+            corr_ewma = _ewma_corr(r)
+            pairs = sorted(zip(upper[0], upper[1]), key=lambda ij: -abs(corr_ewma[ij]))
+            lines.append("\n### EWMA 상관 (RiskMetrics λ=0.94)")
+            lines.append(f"- 평균 EWMA 상관: **{float(corr_ewma[upper].mean()):.2f}**")
+            for i, j in pairs[:5]:
+                lines.append(f"- {valid[i]}-{valid[j]}: {corr_ewma[i, j]:+.2f} (전체 {corr_full[i, j]:+.2f})")
+
+            # 계층적 군집 (함께 움직이는 자산 묶음)
+            groups = _hierarchical_clusters(corr_full)
+            lines.append("\n### 계층적 군집 (평균 연결, 상관 0.5 이상 묶음)")
+            for g_idx, group in enumerate(groups, 1):
+                lines.append(f"- 그룹 {g_idx}: {', '.join(valid[i] for i in group)}")
+
             return "\n".join(lines)
         except Exception as e:
             return f"상관관계 분석 실패: {e}"
@@ -236,13 +382,24 @@ class CorrelationAnalyzerTool(BaseTool):
                 "## 시장 위기 감지 대시보드\n",
             ]
 
+            # 필요한 시계열을 한 번에 동시 수집 (이벤트 루프 비차단)
+            (month, _), (year, _) = await asyncio.gather(
+                _fetch_closes(["^VIX", "^VIX3M", "HYG", "LQD", "GLD", "IWM"], "1mo"),
+                _fetch_closes(["SPY"], "1y"),
+            )
+            vix = month.get("^VIX")
+            spy_1y = year.get("SPY")
+            spy = None
+            if spy_1y is not None:
+                import pandas as pd
+                spy = spy_1y[spy_1y.index > spy_1y.index[-1] - pd.DateOffset(months=1)]
+
+            def _ret(series) -> float:
+                return float(series.iloc[-1] / series.iloc[0] - 1) * 100
+
             # 1) VIX 수준
-            vix_t = yf.Ticker("^VIX")
-            vix_h = vix_t.history(period="1mo")
-            if not vix_h.empty:
-                vix_current = float(vix_h["Close"].iloc[-1])
-                vix_avg = float(vix_h["Close"].mean())
-                vix_max = float(vix_h["Close"].max())
+            if vix is not None:
+                vix_current = float(vix.iloc[-1])
 
                 if vix_current >= 35:
                     crisis_signals.append(("🔴 위기", f"VIX {vix_current:.1f} (극공포)"))
@@ -255,91 +412,59 @@ class CorrelationAnalyzerTool(BaseTool):
 
             # 2) VIX Term Structure (근월 vs 원월)
             # VIX 근월(VIX) vs 3개월(VIX3M 근사)
-            try:
-                vix3m_t = yf.Ticker("^VIX3M")
-                vix3m_h = vix3m_t.history(period="5d")
-                if not vix3m_h.empty and not vix_h.empty:
-                    vix_spot = float(vix_h["Close"].iloc[-1])
-                    vix_3m = float(vix3m_h["Close"].iloc[-1])
-                    term_spread = vix_3m - vix_spot
-
-                    if term_spread < -2:
-                        crisis_signals.append(("🔴 위기", f"VIX 역전(Backwardation) {term_spread:+.1f}"))
-                    elif term_spread < 0:
-                        crisis_signals.append(("🟡 경계", f"VIX 약한 역전 {term_spread:+.1f}"))
-                    else:
-                        crisis_signals.append(("🟢 안정", f"VIX 정상(Contango) {term_spread:+.1f}"))
-            except Exception:
-                pass
+            vix3m = month.get("^VIX3M")
+            if vix3m is not None and vix is not None:
+                term_spread = float(vix3m.iloc[-1]) - float(vix.iloc[-1])
+
+                if term_spread < -2:
+                    crisis_signals.append(("🔴 위기", f"VIX 역전(Backwardation) {term_spread:+.1f}"))
+                elif term_spread < 0:
+                    crisis_signals.append(("🟡 경계", f"VIX 약한 역전 {term_spread:+.1f}"))
+                else:
+                    crisis_signals.append(("🟢 안정", f"VIX 정상(Contango) {term_spread:+.1f}"))
 
             # 3) 크레딧 스프레드 (HYG vs LQD)
-            try:
-                hyg_t = yf.Ticker("HYG")
-                lqd_t = yf.Ticker("LQD")
-                hyg_h = hyg_t.history(period="1mo")
-                lqd_h = lqd_t.history(period="1mo")
-                if not hyg_h.empty and not lqd_h.empty:
-                    hyg_ret = float(hyg_h["Close"].iloc[-1] / hyg_h["Close"].iloc[0] - 1) * 100
-                    lqd_ret = float(lqd_h["Close"].iloc[-1] / lqd_h["Close"].iloc[0] - 1) * 100
-                    credit = hyg_ret - lqd_ret
-                    if credit < -3:
-                        crisis_signals.append(("🔴 위기", f"크레딧 스프레드 확대 (HYG-LQD: {credit:+.1f}%)"))
-                    elif credit < -1:
-                        crisis_signals.append(("🟡 경계", f"크레딧 스프레드 소폭 확대 ({credit:+.1f}%)"))
-                    else:
-                        crisis_signals.append(("🟢 안정", f"크레딧 스프레드 안정 ({credit:+.1f}%)"))
-            except Exception:
-                pass
+            hyg, lqd = month.get("HYG"), month.get("LQD")
+            if hyg is not None and lqd is not None:
+                credit = _ret(hyg) - _ret(lqd)
+                if credit < -3:
+                    crisis_signals.append(("🔴 위기", f"크레딧 스프레드 확대 (HYG-LQD: {credit:+.1f}%)"))
+                elif credit < -1:
+                    crisis_signals.append(("🟡 경계", f"크레딧 스프레드 소폭 확대 ({credit:+.1f}%)"))
+                else:
+                    crisis_signals.append(("🟢 안정", f"크레딧 스프레드 안정 ({credit:+.1f}%)"))
 
             # 4) 안전자산 쏠림 (금/주식 상대 성과)
-            try:
-                gld_t = yf.Ticker("GLD")
-                spy_t = yf.Ticker("SPY")
-                gld_h = gld_t.history(period="1mo")
-                spy_h = spy_t.history(period="1mo")
-                if not gld_h.empty and not spy_h.empty:
-                    gld_ret = float(gld_h["Close"].iloc[-1] / gld_h["Close"].iloc[0] - 1) * 100
-                    spy_ret = float(spy_h["Close"].iloc[-1] / spy_h["Close"].iloc[0] - 1) * 100
-                    flight = gld_ret - spy_ret
-                    if flight > 8:
-                        crisis_signals.append(("🔴 위기", f"안전자산 극심한 쏠림 (금-SPY: {flight:+.1f}%)"))
-                    elif flight > 3:
-                        crisis_signals.append(("🟡 경계", f"안전자산 쏠림 (금-SPY: {flight:+.1f}%)"))
-                    else:
-                        crisis_signals.append(("🟢 안정", f"안전자산 쏠림 없음 (금-SPY: {flight:+.1f}%)"))
-            except Exception:
-                pass
+            gld = month.get("GLD")
+            if gld is not None and spy is not None:
+                flight = _ret(gld) - _ret(spy)
+                if flight > 8:
+                    crisis_signals.append(("🔴 위기", f"안전자산 극심한 쏠림 (금-SPY: {flight:+.1f}%)"))
+                elif flight > 3:
+                    crisis_signals.append(("🟡 경계", f"안전자산 쏠림 (금-SPY: {flight:+.1f}%)"))
+                else:
+                    crisis_signals.append(("🟢 안정", f"안전자산 쏠림 없음 (금-SPY: {flight:+.1f}%)"))
 
             # 5) 시장 폭 (S&P500 vs Russell2000)
-            try:
-                iwm_t = yf.Ticker("IWM")
-                iwm_h = iwm_t.history(period="1mo")
-                if not iwm_h.empty and not spy_h.empty:
-                    iwm_ret = float(iwm_h["Close"].iloc[-1] / iwm_h["Close"].iloc[0] - 1) * 100
-                    spy_ret2 = float(spy_h["Close"].iloc[-1] / spy_h["Close"].iloc[0] - 1) * 100
-                    breadth = iwm_ret - spy_ret2
-                    if breadth < -5:
-                        crisis_signals.append(("🟡 경계", f"소형주 급약세 (IWM-SPY: {breadth:+.1f}%)"))
-                    else:
-                        crisis_signals.append(("🟢 안정", f"시장 폭 정상 (IWM-SPY: {breadth:+.1f}%)"))
-            except Exception:
-                pass
+            iwm = month.get("IWM")
+            if iwm is not None and spy is not None:
+                breadth = _ret(iwm) - _ret(spy)
+                if breadth < -5:
+                    crisis_signals.append(("🟡 경계", f"소형주 급약세 (IWM-SPY: {breadth:+.1f}%)"))
+                else:
+                    crisis_signals.append(("🟢 안정", f"시장 폭 정상 (IWM-SPY: {breadth:+.1f}%)"))
 
             # 6) S&P500 200일 MA
-            try:
-                spy_1y = spy_t.history(period="1y")
-                if not spy_1y.empty and len(spy_1y) >= 200:
-                    current = float(spy_1y["Close"].iloc[-1])
-                    ma200 = float(spy_1y["Close"].tail(200).mean())
-                    pct_from_ma = (current - ma200) / ma200 * 100
-                    if pct_from_ma < -10:
-                        crisis_signals.append(("🔴 위기", f"S&P500 200일MA {pct_from_ma:+.1f}% 하회"))
-                    elif pct_from_ma < 0:
-                        crisis_signals.append(("🟡 경계", f"S&P500 200일MA 소폭 하회 ({pct_from_ma:+.1f}%)"))
-                    else:
-                        crisis_signals.append(("🟢 안정", f"S&P500 200일MA 상회 ({pct_from_ma:+.1f}%)"))
-            except Exception:
-                pass
+            if spy_1y is not None and len(spy_1y) >= 200:
+                current = float(spy_1y.iloc[-1])
+                ma200 = float(spy_1y.tail(200).mean())
+                pct_from_ma = (current - ma200) / ma200 * 100
+                if pct_from_ma < -10:
+                    crisis_signals.append(("🔴 위기", f"S&P500 200일MA {pct_from_ma:+.1f}% 하회"))
+                elif pct_from_ma < 0:
+                    crisis_signals.append(("🟡 경계", f"S&P500 200일MA 소폭 하회 ({pct_from_ma:+.1f}%)"))
+                else:
+                    crisis_signals.append(("🟢 안정", f"S&P500 200일MA 상회 ({pct_from_ma:+.1f}%)"))
 
             # 종합 판정
             crisis_count = sum(1 for s in crisis_signals if "위기" in s[0])
@@ -401,27 +526,14 @@ class CorrelationAnalyzerTool(BaseTool):
         if not yf or not np:
             return "yfinance/numpy 미설치"
 
-        import pandas as pd
-
         try:
-            prices = {}
-            names = {}
-            for sym in symbols[:8]:  # 최대 8개
-                try:
-                    t = yf.Ticker(_to_yf_symbol(sym))
-                    h = t.history(period="2y")
-                    if not h.empty and len(h) > 100:
-                        prices[sym] = h["Close"]
-                        info = t.info or {}
-                        names[sym] = info.get("shortName") or sym
-                except Exception:
-                    continue
+            # 최대 8개, 동시 수집 (이벤트 루프 비차단)
+            prices, names = await _fetch_closes(symbols[:8], "2y", min_points=100, with_names=True)
 
             if len(prices) < 2:
                 return "최소 2개 자산 데이터 필요"
 
-            df = pd.DataFrame(prices).dropna()
-            returns = df.pct_change().dropna()
+            returns = _aligned_returns(prices)
             valid = list(returns.columns)
             n = len(valid)
 
@@ -547,10 +659,9 @@ class CorrelationAnalyzerTool(BaseTool):
 
     # ── 전체 분석 ──
     async def _full(self, kw: dict) -> str:
-        parts = []
-        for fn in [self._crisis_detection, self._correlation, self._tail_risk]:
-            try:
-                parts.append(await fn(kw))
-            except Exception as e:
-                parts.append(f"[분석 일부 실패: {e}]")
+        results = await asyncio.gather(
+            self._crisis_detection(kw), self._correlation(kw), self._tail_risk(kw),
+            return_exceptions=True,
+        )
+        parts = [f"[분석 일부 실패: {r}]" if isinstance(r, BaseException) else r for r in results]
         return "\n\n---\n\n".join(parts)
@@ -133,6 +133,10 @@ def _get_conn() -> sqlite3.Connection:
             created_at TEXT NOT NULL
         )
     """)
+    # 내부통신 목록 커서 페이지네이션용 (created_at, id) 인덱스
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_cross_agent_created_id ON cross_agent_messages(created_at, id)"
+    )
     conn.commit()
     return conn
 
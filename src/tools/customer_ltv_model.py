@@ -25,12 +25,14 @@
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 from typing import Any
 
 import numpy as np
 
+from src.tools import _monte_carlo as mc
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.customer_ltv_model")
@@ -137,6 +139,9 @@ class CustomerLtvModelTool(BaseTool):
         "default":          (0.350, 5.000, 0.900, 1.800),
     }
 
+    # CLV 신뢰구간 시뮬레이션 경로 수 (n_simulations로 조정, 최대 _monte_carlo.MAX_PATHS)
+    DEFAULT_CLV_SIMULATIONS = 100_000
+
     async def execute(self, **kwargs) -> dict[str, Any]:
         action = kwargs.get("action", "full")
         dispatch = {
@@ -197,13 +202,13 @@ class CustomerLtvModelTool(BaseTool):
         # ─── CLV = 기대 구매횟수 × 기대 객단가 ───
         clv = expected_purchases * expected_monetary
 
-        # 신뢰구간 (몬테카를로 시뮬레이션)
-        clv_simulations = self._simulate_clv(
-            x, t_x, T, monetary, horizon, r, alpha, a, b,
-            p_gg, q_gg, gamma_gg, n_sim=5000
+        # 신뢰구간 (몬테카를로 시뮬레이션, 스레드에서 실행 → 이벤트 루프 비차단)
+        n_sim = mc.clamp_paths(kwargs.get("n_simulations", self.DEFAULT_CLV_SIMULATIONS))
+        clv_simulations = await asyncio.to_thread(
+            self._simulate_clv, x, t_x, T, monetary, horizon, r, alpha, a, b,
+            p_gg, q_gg, gamma_gg, n_sim,
         )
-        ci_lower = float(np.percentile(clv_simulations, 5))
-        ci_upper = float(np.percentile(clv_simulations, 95))
+        ci_lower, ci_upper = (float(v) for v in np.percentile(clv_simulations, [5, 95]))
 
         result = {
             "model": "BG/NBD + Gamma-Gamma",
@@ -699,19 +704,18 @@ class CustomerLtvModelTool(BaseTool):
     def _simulate_clv(x, t_x, T, monetary, horizon,
                       r, alpha, a, b,
                       p_gg, q_gg, gamma_gg,
-                      n_sim: int = 5000) -> np.ndarray:
-        """CLV 신뢰구간을 위한 몬테카를로 시뮬레이션."""
-        rng = np.random.default_rng(42)
-
-        # λ (구매율) 사후 분포: Gamma(r+x, alpha+T)
-        lambda_samples = rng.gamma(r + x, 1.0 / (alpha + T), size=n_sim)
-
-        # p (이탈 확률) 사후 분포: Beta(a, b+x)
-        p_dropout = rng.beta(a, max(0.01, b + x), size=n_sim)
-
-        # 객단가 변동: 정규분포 근사
-        monetary_samples = rng.normal(monetary, monetary * 0.2, size=n_sim)
-        monetary_samples = np.maximum(monetary_samples, 1000)
+                      n_sim: int = 100_000) -> np.ndarray:
+        """CLV 신뢰구간을 위한 몬테카를로 시뮬레이션 (공통 커널 _monte_carlo)."""
+        draws = mc.sample({
+            # λ (구매율) 사후 분포: Gamma(r+x, alpha+T)
+            "lam": mc.gamma(r + x, 1.0 / (alpha + T)),
+            # p (이탈 확률) 사후 분포: Beta(a, b+x)
+            "p": mc.beta(a, max(0.01, b + x)),
+            # 객단가 변동: 정규분포 근사
+            "m": mc.normal(monetary, monetary * 0.2),
+        }, n_sim, rng=mc.make_rng(42))
+        lambda_samples, p_dropout = draws["lam"], draws["p"]
+        monetary_samples = np.maximum(draws["m"], 1000)
 
         # 각 시뮬레이션에서 CLV 계산
         alive_prob = 1 - p_dropout
@@ -25,7 +25,7 @@ from xml.etree import ElementTree
 
 import httpx
 
-from src.tools.base import BaseTool
+from src.tools.base import BaseTool, ToolFailure
 
 logger = logging.getLogger("corthex.tools.dart_api")
 
@@ -85,10 +85,10 @@ class DartApiTool(BaseTool):
                     timeout=15,
                 )
         except httpx.HTTPError as e:
-            return f"DART API 호출 실패: {e}"
+            return ToolFailure(f"DART API 호출 실패: {e}")
 
         if resp.status_code != 200:
-            return f"DART API 오류 ({resp.status_code}): {resp.text[:200]}"
+            return ToolFailure(f"DART API 오류 ({resp.status_code}): {resp.text[:200]}")
 
         data = resp.json()
         status = data.get("status", "")
@@ -97,7 +97,7 @@ class DartApiTool(BaseTool):
             return f"'{company}'의 {year}년 재무제표가 아직 공시되지 않았습니다."
         if status != "000":
             msg = data.get("message", "알 수 없는 오류")
-            return f"DART 오류 ({status}): {msg}"
+            return ToolFailure(f"DART 오류 ({status}): {msg}")
 
         items = data.get("list", [])
         if not items:
@@ -157,14 +157,14 @@ class DartApiTool(BaseTool):
                     timeout=15,
                 )
         except httpx.HTTPError as e:
-            return f"DART API 호출 실패: {e}"
+            return ToolFailure(f"DART API 호출 실패: {e}")
 
         if resp.status_code != 200:
-            return f"DART API 오류: {resp.status_code}"
+            return ToolFailure(f"DART API 오류: {resp.status_code}")
 
         data = resp.json()
         if data.get("status") != "000":
-            return f"DART 오류: {data.get('message', '')}"
+            return ToolFailure(f"DART 오류: {data.get('message', '')}")
 
         lines = [f"### {company} 기업 정보"]
         fields = {
@@ -240,11 +240,11 @@ class DartApiTool(BaseTool):
                     f"{DART_BASE}/list.json", params=params, timeout=15,
                 )
         except httpx.HTTPError as e:
-            return f"DART API 호출 실패: {e}"
+            return ToolFailure(f"DART API 호출 실패: {e}")
 
         data = resp.json()
         if data.get("status") != "000":
-            return f"DART 오류: {data.get('message', '')}"
+            return ToolFailure(f"DART 오류: {data.get('message', '')}")
 
         items = data.get("list", [])
         if not items:
@@ -17,7 +17,7 @@
     → 지식 수준별 요약 깊이 조절
 
 사용 방법:
-  - action="extract"       : 핵심 문장 추출 (TextRank 간소화)
+  - action="extract"       : 핵심 문장 추출 (TextRank, similarity=overlap|tfidf, mmr_lambda로 중복 억제)
   - action="pyramid"       : Minto 피라미드 요약 (3층 구조)
   - action="action_items"  : 실행 항목 추출 (우선순위 정렬)
   - action="compare"       : 다중 문서 비교 요약
@@ -25,15 +25,18 @@
   - action="full"          : 위 5개 종합 분석
 
 필요 환경변수: 없음
-필요 라이브러리: 없음 (순수 Python)
+필요 라이브러리: numpy (TextRank 행렬 연산)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 import re
 from typing import Any
 
+import numpy as np
+
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.document_summarizer")
@@ -109,6 +112,127 @@ STOPWORDS_KO = {
 }
 
 
+# ═══════════════════════════════════════════════════════
+#  TextRank 엔진 (NumPy)
+# ═══════════════════════════════════════════════════════
+
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITER = 50
+TEXTRANK_TOL = 1e-6
+TEXTRANK_CHUNK = 2000     # 이보다 문장이 많으면 구간별 후보 추출 후 후보끼리 재랭킹
+
+
+def _similarity_matrix(sent_words: list[set], method: str = "overlap") -> np.ndarray:
+    """문장 간 유사도 행렬 (대각 0).
+
+    overlap: Mihalcea & Tarau 원 논문 |공통단어| / (log(|s_i|+1) + log(|s_j|+1))
+    tfidf  : TF-IDF 코사인 유사도
+    공통 단어 수는 문장×단어 행렬의 곱 한 번으로 계산 (2개 이상 문장에 나온 단어만 열로 사용).
+    """
+    n = len(sent_words)
+    df: dict[str, int] = {}
+    for words in sent_words:
+        for w in words:
+            df[w] = df.get(w, 0) + 1
+    shared = {w: i for i, w in enumerate(w for w, c in df.items() if c >= 2)}
+    B = np.zeros((n, len(shared)), dtype=np.float32)
+    for i, words in enumerate(sent_words):
+        cols = [shared[w] for w in words if w in shared]
+        if cols:
+            B[i, cols] = 1.0
+
+    if method == "tfidf":
+        idf_all = {w: math.log(n / c) + 1.0 for w, c in df.items()}
+        idf = np.zeros(len(shared), dtype=np.float32)
+        for w, j in shared.items():
+            idf[j] = idf_all[w]
+        norms = np.array([math.sqrt(sum(idf_all[w] ** 2 for w in words)) for words in sent_words])
+        W = B * idf
+        sim = (W @ W.T).astype(np.float64)
+        norms[norms == 0] = 1.0
+        sim /= np.outer(norms, norms)
+    else:
+        lens = np.array([len(words) for words in sent_words], dtype=np.float64)
+        log_len = np.log(np.maximum(lens, 1) + 1)
+        sim = (B @ B.T).astype(np.float64) / (log_len[:, None] + log_len[None, :])
+    np.fill_diagonal(sim, 0.0)
+    return sim
+
+
+def _pagerank(sim: np.ndarray, damping: float = TEXTRANK_DAMPING,
+              max_iter: int = TEXTRANK_MAX_ITER, tol: float = TEXTRANK_TOL) -> tuple[np.ndarray, int]:
+    """가중 PageRank 거듭제곱 반복. 반환: (점수, 반복 횟수)."""
+    n = sim.shape[0]
+    out = sim.sum(axis=1)
+    trans = np.divide(sim, out[:, None], out=np.zeros_like(sim), where=out[:, None] > 0).T
+    scores = np.full(n, 1.0 / n)
+    for iteration in range(1, max_iter + 1):
+        new_scores = (1 - damping) / n + damping * (trans @ scores)
+        delta = float(np.abs(new_scores - scores).sum())
+        scores = new_scores
+        if delta < tol:
+            logger.debug("TextRank converged at iteration %d", iteration)
+            break
+    return scores, iteration
+
+
+def _rank_order(scores: np.ndarray) -> np.ndarray:
+    top = scores.max() if scores.size else 0.0
+    key = np.round(scores / top, 10) if top > 0 else scores
+    return np.argsort(-key, kind="stable")
+
+
+def _mmr_order(scores: np.ndarray, sim: np.ndarray, k: int, mmr_lambda: float) -> list[int]:
+    """점수 순 상위 k개. mmr_lambda < 1이면 MMR로 이미 고른 문장과 비슷한 문장을 감점.
+
+    동점(부동소수 오차 수준 차이)은 앞 문장 우선 — 합산 순서가 달라도 선택이 흔들리지 않도록.
+    """
+    order = _rank_order(scores)
+    if mmr_lambda >= 1.0 or k <= 1:
+        return order[:k].tolist()
+    rel = scores / scores.max() if scores.max() > 0 else scores
+    red_scale = sim.max() or 1.0
+    max_sim = np.zeros(len(scores))
+    chosen = np.zeros(len(scores), dtype=bool)
+    picked: list[int] = []
+    for _ in range(min(k, len(scores))):
+        mmr = mmr_lambda * rel - (1 - mmr_lambda) * max_sim / red_scale
+        mmr[chosen] = -np.inf
+        best = int(np.argmax(mmr))
+        picked.append(best)
+        chosen[best] = True
+        max_sim = np.maximum(max_sim, sim[best])
+    return picked
+
+
+def _textrank_select(sent_words: list[set], k: int, method: str = "overlap",
+                     mmr_lambda: float = 1.0) -> tuple[list[int], np.ndarray, int]:
+    """TextRank 상위 k 문장. 반환: (선택 인덱스, 문장별 점수, 반복 횟수).
+
+    문장이 TEXTRANK_CHUNK개를 넘으면 구간마다 후보를 뽑고 후보끼리 다시 랭킹합니다
+    (n² 행렬을 통째로 만들지 않기 위해).
+    """
+    n = len(sent_words)
+    if n <= TEXTRANK_CHUNK:
+        sim = _similarity_matrix(sent_words, method)
+        scores, iterations = _pagerank(sim)
+        return _mmr_order(scores, sim, k, mmr_lambda), scores, iterations
+
+    per_chunk = max(k * 3, 50)
+    candidates: list[int] = []
+    for start in range(0, n, TEXTRANK_CHUNK):
+        chunk = sent_words[start:start + TEXTRANK_CHUNK]
+        chunk_scores, _ = _pagerank(_similarity_matrix(chunk, method))
+        top = _rank_order(chunk_scores)[:per_chunk]
+        candidates.extend(int(start + i) for i in sorted(top))
+    sim = _similarity_matrix([sent_words[i] for i in candidates], method)
+    cand_scores, iterations = _pagerank(sim)
+    scores = np.zeros(n)
+    scores[candidates] = cand_scores
+    picked = _mmr_order(cand_scores, sim, k, mmr_lambda)
+    return [candidates[i] for i in picked], scores, iterations
+
+
 # ═══════════════════════════════════════════════════════
 #  DocumentSummarizerTool
 # ═══════════════════════════════════════════════════════
@@ -159,68 +283,34 @@ class DocumentSummarizerTool(BaseTool):
                     "extracted_sentences": sentences,
                     "note": "원문 문장 수가 요청 수 이하로, 전체를 반환합니다."}
 
+        similarity = params.get("similarity", "overlap")
+        if similarity not in ("overlap", "tfidf"):
+            similarity = "overlap"
+        try:
+            mmr_lambda = float(params.get("mmr_lambda", 1.0))
+        except (TypeError, ValueError):
+            mmr_lambda = 1.0   # 잘못된 값은 similarity처럼 기본값(MMR 끔)으로
+        mmr_lambda = min(max(mmr_lambda, 0.0), 1.0) if mmr_lambda == mmr_lambda else 1.0   # NaN → 기본값
+
         # 문장별 단어 집합 (불용어 제거)
-        sent_words = []
-        for s in sentences:
-            words = set(_tokenize_words(s)) - STOPWORDS_KO
-            sent_words.append(words)
+        sent_words = [set(_tokenize_words(s)) - STOPWORDS_KO for s in sentences]
 
-        # 문장 간 유사도 행렬 구성 (Mihalcea 원 논문 방식)
+        # 유사도 행렬 + PageRank + (선택) MMR — 행렬 연산이라 스레드에서 실행
         n = len(sentences)
-        similarity_matrix = [[0.0] * n for _ in range(n)]
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                if not sent_words[i] or not sent_words[j]:
-                    continue
-                # sim(s_i, s_j) = |공통단어| / (log|s_i| + log|s_j|)
-                common = sent_words[i] & sent_words[j]
-                len_i = len(sent_words[i])
-                len_j = len(sent_words[j])
-                denominator = math.log(max(len_i, 1) + 1) + math.log(max(len_j, 1) + 1)
-                if denominator > 0:
-                    sim = len(common) / denominator
-                else:
-                    sim = 0.0
-                similarity_matrix[i][j] = sim
-                similarity_matrix[j][i] = sim
-
-        # PageRank 스타일 점수 계산 (반복 수렴)
-        damping = 0.85
-        scores = [1.0 / n] * n
-        max_iterations = 50
-        convergence_threshold = 1e-6
-
-        for iteration in range(max_iterations):
-            new_scores = [0.0] * n
-            for i in range(n):
-                rank_sum = 0.0
-                for j in range(n):
-                    if i == j:
-                        continue
-                    # j에서 나가는 총 유사도
-                    out_sum = sum(similarity_matrix[j])
-                    if out_sum > 0:
-                        rank_sum += (similarity_matrix[j][i] / out_sum) * scores[j]
-                new_scores[i] = (1 - damping) / n + damping * rank_sum
-
-            # 수렴 체크
-            delta = sum(abs(new_scores[i] - scores[i]) for i in range(n))
-            scores = new_scores
-            if delta < convergence_threshold:
-                logger.debug("TextRank converged at iteration %d", iteration + 1)
-                break
+        top_indices, scores, iterations = await asyncio.to_thread(
+            _textrank_select, sent_words, num_sentences, similarity, mmr_lambda,
+        )
 
         # 상위 N문장 추출 (원문 순서 유지)
-        indexed_scores = sorted(enumerate(scores), key=lambda x: -x[1])
-        top_indices = sorted([idx for idx, _ in indexed_scores[:num_sentences]])
+        top_indices = sorted(top_indices)
         extracted = [{"index": idx, "sentence": sentences[idx],
-                      "score": round(scores[idx], 6)} for idx in top_indices]
+                      "score": round(float(scores[idx]), 6)} for idx in top_indices]
 
         return {"status": "success", "analysis": "extract",
                 "total_sentences": n, "extracted_count": len(extracted),
                 "extracted_sentences": extracted,
-                "convergence_iterations": min(iteration + 1, max_iterations)}
+                "similarity": similarity,
+                "convergence_iterations": iterations}
 
     # ═══════════════════════════════════════════════════
     #  2) Minto 피라미드 요약
@@ -1,29 +1,26 @@
-"""임베딩 도구 — 텍스트 벡터화, 유사도 계산, 클러스터링."""
+"""임베딩 도구 — 텍스트 벡터화, 유사도 계산, 클러스터링.
+
+임베딩은 src/tools/_embedding_service.py (요청 병합 배치 + 본문 해시 캐시)를 사용하고,
+유사도·클러스터링은 NumPy 행렬 연산입니다.
+"""
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
-import math
-import os
 from typing import Any
 
+import numpy as np
+
+from src.tools import _embedding_service as es
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.embedding_tool")
 
 
-def _get_openai():
-    try:
-        import openai
-        return openai
-    except ImportError:
-        return None
-
-
 class EmbeddingTool(BaseTool):
     """텍스트를 AI 벡터로 변환하고, 유사도 계산, 클러스터링하는 도구."""
 
-    DEFAULT_MODEL = "text-embedding-3-small"
-
     async def execute(self, **kwargs: Any) -> Any:
         action = kwargs.get("action", "embed")
         if action == "embed":
@@ -41,53 +38,38 @@ class EmbeddingTool(BaseTool):
                 "batch(일괄 임베딩), cluster(그룹핑)"
             )
 
-    @staticmethod
-    def _get_api_key() -> str:
-        return os.getenv("OPENAI_API_KEY", "")
-
-    @staticmethod
-    def _key_msg() -> str:
-        return (
-            "OPENAI_API_KEY 환경변수가 설정되지 않았습니다.\n"
-            "OpenAI API 키를 .env에 추가하세요."
-        )
-
     async def _get_embedding(self, text: str, model: str | None = None) -> list[float] | str:
         """텍스트를 벡터로 변환. 성공 시 float 리스트, 실패 시 에러 문자열."""
-        openai = _get_openai()
-        if openai is None:
-            return "openai 라이브러리가 설치되지 않았습니다. pip install openai"
-
-        api_key = self._get_api_key()
-        if not api_key:
-            return self._key_msg()
+        vecs = await self._get_embeddings([text], model)
+        return vecs if isinstance(vecs, str) else vecs[0].tolist()
 
-        model = model or self.DEFAULT_MODEL
+    async def _get_embeddings(self, texts: list[str], model: str | None = None) -> np.ndarray | str:
+        """여러 텍스트 → (n, d) 행렬 (공통 서비스가 배치·캐시). 실패 시 에러 문자열."""
         try:
-            client = openai.OpenAI(api_key=api_key)
-            response = client.embeddings.create(
-                model=model,
-                input=text,
-            )
-            return response.data[0].embedding
-        except Exception as e:
+            return await es.embedding_service.embed(texts, model)
+        except es.EmbeddingError as e:
             logger.error("임베딩 생성 실패: %s", e)
-            return f"임베딩 생성 실패: {e}"
+            return str(e)
 
     @staticmethod
-    def _cosine_similarity(vec_a: list[float], vec_b: list[float]) -> float:
+    def _cosine_similarity(vec_a, vec_b) -> float:
         """코사인 유사도 계산."""
-        dot = sum(a * b for a, b in zip(vec_a, vec_b))
-        norm_a = math.sqrt(sum(a * a for a in vec_a))
-        norm_b = math.sqrt(sum(b * b for b in vec_b))
-        if norm_a == 0 or norm_b == 0:
-            return 0.0
-        return dot / (norm_a * norm_b)
+        return float(es.cosine_matrix(np.atleast_2d(vec_a), np.atleast_2d(vec_b))[0, 0])
+
+    @staticmethod
+    def _parse_texts(texts) -> list[str]:
+        """texts 인자 (리스트 / JSON 문자열 / 쉼표 구분 문자열) → 문자열 리스트."""
+        if isinstance(texts, str):
+            try:
+                texts = json.loads(texts)
+            except Exception:
+                texts = [t.strip() for t in texts.split(",")]
+        return [str(t) for t in texts]
 
     async def _embed(self, kwargs: dict) -> str:
         """단일 텍스트 임베딩."""
         text = kwargs.get("text", "")
-        model = kwargs.get("model", self.DEFAULT_MODEL)
+        model = kwargs.get("model") or es.default_model()
 
         if not text:
             return "텍스트(text)를 입력해주세요."
@@ -113,20 +95,16 @@ class EmbeddingTool(BaseTool):
         """두 텍스트의 유사도 계산."""
         text_a = kwargs.get("text_a", "")
         text_b = kwargs.get("text_b", "")
-        model = kwargs.get("model", self.DEFAULT_MODEL)
+        model = kwargs.get("model") or es.default_model()
 
         if not text_a or not text_b:
             return "두 텍스트(text_a, text_b)를 입력해주세요."
 
-        vec_a = await self._get_embedding(text_a, model)
-        if isinstance(vec_a, str):
-            return vec_a
-
-        vec_b = await self._get_embedding(text_b, model)
-        if isinstance(vec_b, str):
-            return vec_b
+        vecs = await self._get_embeddings([text_a, text_b], model)
+        if isinstance(vecs, str):
+            return vecs
 
-        similarity = self._cosine_similarity(vec_a, vec_b)
+        similarity = self._cosine_similarity(vecs[0], vecs[1])
 
         # 유사도 해석
         if similarity >= 0.9:
@@ -154,101 +132,63 @@ class EmbeddingTool(BaseTool):
     async def _batch(self, kwargs: dict) -> str:
         """여러 텍스트 일괄 임베딩."""
         texts = kwargs.get("texts", [])
-        model = kwargs.get("model", self.DEFAULT_MODEL)
+        model = kwargs.get("model") or es.default_model()
 
         if not texts:
             return "텍스트 목록(texts)을 입력해주세요. 예: [\"텍스트1\", \"텍스트2\", ...]"
 
-        if isinstance(texts, str):
-            import json
-            try:
-                texts = json.loads(texts)
-            except Exception:
-                texts = [t.strip() for t in texts.split(",")]
+        texts = self._parse_texts(texts)
+        hits_before = es.embedding_service.stats["cache_hits"]
+        embeddings = await self._get_embeddings(texts, model)
+        if isinstance(embeddings, str):
+            return f"일괄 임베딩 실패: {embeddings}"
+        dim = embeddings.shape[1] if len(embeddings) else 0
+        cache_hits = es.embedding_service.stats["cache_hits"] - hits_before
 
-        openai = _get_openai()
-        if openai is None:
-            return "openai 라이브러리가 설치되지 않았습니다. pip install openai"
-
-        api_key = self._get_api_key()
-        if not api_key:
-            return self._key_msg()
-
-        try:
-            client = openai.OpenAI(api_key=api_key)
-            response = client.embeddings.create(model=model, input=texts)
-            embeddings = [item.embedding for item in response.data]
-            dim = len(embeddings[0]) if embeddings else 0
-
-            return (
-                f"## 일괄 임베딩 완료\n\n"
-                f"- 모델: {model}\n"
-                f"- 처리된 텍스트: {len(embeddings)}개\n"
-                f"- 벡터 차원: {dim}\n"
-                f"- 총 토큰: {response.usage.total_tokens:,}\n\n"
-                f"### 처리 목록\n"
-                + "\n".join(f"- {i+1}. {t[:50]}... → {dim}차원 벡터" for i, t in enumerate(texts))
-            )
-        except Exception as e:
-            return f"일괄 임베딩 실패: {e}"
+        return (
+            f"## 일괄 임베딩 완료\n\n"
+            f"- 모델: {model}\n"
+            f"- 처리된 텍스트: {len(embeddings)}개\n"
+            f"- 벡터 차원: {dim}\n"
+            f"- 캐시 재사용: {cache_hits}개\n\n"
+            f"### 처리 목록\n"
+            + "\n".join(f"- {i+1}. {t[:50]}... → {dim}차원 벡터" for i, t in enumerate(texts))
+        )
 
     async def _cluster(self, kwargs: dict) -> str:
-        """텍스트 목록을 유사도 기반 그룹핑."""
+        """텍스트 목록을 유사도 기반 그룹핑 (n_clusters 지정 시 미니배치 k-means)."""
         texts = kwargs.get("texts", [])
         threshold = float(kwargs.get("threshold", 0.7))
+        n_clusters = int(kwargs.get("n_clusters", 0) or 0)
+        model = kwargs.get("model") or es.default_model()
 
         if not texts:
             return "텍스트 목록(texts)을 입력해주세요."
 
-        if isinstance(texts, str):
-            import json
-            try:
-                texts = json.loads(texts)
-            except Exception:
-                texts = [t.strip() for t in texts.split(",")]
-
+        texts = self._parse_texts(texts)
         if len(texts) < 2:
             return "최소 2개 이상의 텍스트가 필요합니다."
 
         # 모든 텍스트 임베딩
-        openai = _get_openai()
-        if openai is None:
-            return "openai 라이브러리가 설치되지 않았습니다. pip install openai"
-
-        api_key = self._get_api_key()
-        if not api_key:
-            return self._key_msg()
-
-        try:
-            client = openai.OpenAI(api_key=api_key)
-            response = client.embeddings.create(model=self.DEFAULT_MODEL, input=texts)
-            embeddings = [item.embedding for item in response.data]
-        except Exception as e:
-            return f"임베딩 생성 실패: {e}"
-
-        # 간단한 클러스터링 (greedy, threshold 기반)
-        clusters: list[list[int]] = []
-        assigned: set[int] = set()
-
-        for i in range(len(texts)):
-            if i in assigned:
-                continue
-            cluster = [i]
-            assigned.add(i)
-            for j in range(i + 1, len(texts)):
-                if j in assigned:
-                    continue
-                sim = self._cosine_similarity(embeddings[i], embeddings[j])
-                if sim >= threshold:
-                    cluster.append(j)
-                    assigned.add(j)
-            clusters.append(cluster)
+        embeddings = await self._get_embeddings(texts, model)
+        if isinstance(embeddings, str):
+            return embeddings
+
+        if n_clusters > 0:
+            labels, _ = await asyncio.to_thread(es.minibatch_kmeans, embeddings, n_clusters)
+            clusters = [c for c in (np.flatnonzero(labels == k).tolist()
+                                    for k in range(n_clusters)) if c]
+            method = f"미니배치 k-means (k={n_clusters})"
+        else:
+            # 탐욕 그룹핑 (threshold 기준, 유사도 행렬은 한 번만 계산)
+            clusters = await asyncio.to_thread(es.threshold_clusters, embeddings, threshold)
+            method = f"유사도 기준 {threshold * 100:.0f}%"
 
         # 결과 포맷팅
         lines = [
             f"## 텍스트 클러스터링 결과\n\n"
             f"- 텍스트 수: {len(texts)}개\n"
-            f"- 유사도 기준: {threshold * 100:.0f}%\n"
+            f"- 방법: {method}\n"
             f"- 그룹 수: {len(clusters)}개\n"
         ]
 
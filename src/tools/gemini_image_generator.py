@@ -20,6 +20,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from src.tools import _media_thumbs as thumbs
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.gemini_image_generator")
@@ -298,6 +299,7 @@ class GeminiImageGeneratorTool(BaseTool):
                     filepath = os.path.join(out_dir, filename)
                     image.save(filepath)
                     saved_files.append(filename)
+                    thumbs.schedule("images", filename)
                     logger.info("이미지 저장: %s", filepath)
 
             if not saved_files:
@@ -14,6 +14,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from src.tools import _media_thumbs as thumbs
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.gemini_video_generator")
@@ -148,6 +149,7 @@ class GeminiVideoGeneratorTool(BaseTool):
                 filepath = os.path.join(out_dir, filename)
                 await asyncio.to_thread(gen_video.video.save, filepath)
                 saved_files.append(filename)
+                thumbs.schedule("videos", filename)
                 logger.info("영상 저장: %s", filepath)
 
             if not saved_files:
@@ -20,18 +20,24 @@ Bass Diffusion Model + S-curve + 기술 채택 라이프사이클 + SaaS 성장
   - action="projection" : N년 성장 시나리오 전망
 
 필요 환경변수: 없음
-필요 라이브러리: 없음 (표준 라이브러리 math, random만 사용)
+필요 라이브러리: numpy (projection 확률 전망 — src/tools/_monte_carlo.py)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
 from typing import Any
 
+import numpy as np
+
+from src.tools import _monte_carlo as mc
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.growth_forecaster")
 
+DEFAULT_PROJECTION_PATHS = 100_000
+
 # ─── Bass Diffusion 산업별 파라미터 (Bass, 1969 + 후속 연구) ─
 
 _BASS_PARAMS: dict[str, dict] = {
@@ -476,4 +482,29 @@ class GrowthForecaster(BaseTool):
                 lines.append(f"| {yr}년차 | {val:,.1f} {currency} | {gr} |")
             lines.append("")
 
+        # 확률 전망: 연 성장률을 정규분포로 흔든 경로 → 연도별 백분위 밴드
+        volatility = float(p.get("growth_volatility", growth_rate * 0.5) or 0)
+        n_paths = mc.clamp_paths(p.get("n_simulations", DEFAULT_PROJECTION_PATHS))
+        if volatility > 0 and years > 0:
+            bands = await asyncio.to_thread(
+                _projection_bands, current_value, growth_rate, volatility, years, n_paths,
+            )
+            lines.extend([
+                f"#### 확률 전망 (Monte Carlo {n_paths:,}경로, 연 성장률 σ={volatility:.0%})",
+                "| 연도 | P10 | P50 | P90 |",
+                "|------|-----|-----|-----|",
+            ])
+            for yr, (p10, p50, p90) in enumerate(bands, 1):
+                lines.append(f"| {yr}년차 | {p10:,.1f} | {p50:,.1f} | {p90:,.1f} |")
+            lines.append("")
+
         return "\n".join(lines)
+
+
+def _projection_bands(current_value: float, growth_rate: float, volatility: float,
+                      years: int, n_paths: int) -> list[tuple[float, float, float]]:
+    """연도별 (P10, P50, P90). 연 성장률은 -95% 아래로 내려가지 않게 제한."""
+    rng = mc.make_rng(42)
+    growth = np.maximum(rng.normal(growth_rate, volatility, size=(n_paths, years)), -0.95)
+    values = mc.compound_paths(current_value, growth)
+    return [tuple(float(v) for v in row) for row in np.percentile(values, [10, 50, 90], axis=0).T]
@@ -7,6 +7,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from src.tools import _media_thumbs as thumbs
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.image_generator")
@@ -100,6 +101,7 @@ class ImageGeneratorTool(BaseTool):
                 with open(filepath, "wb") as f:
                     f.write(img_bytes)
                 saved_files.append(filepath)
+                thumbs.schedule("images", filename)
 
             revised_prompt = getattr(response.data[0], "revised_prompt", prompt)
             files_list = "\n".join(f"- {f}" for f in saved_files)
@@ -158,6 +160,7 @@ class ImageGeneratorTool(BaseTool):
             img_bytes = base64.b64decode(response.data[0].b64_json)
             with open(filepath, "wb") as f:
                 f.write(img_bytes)
+            thumbs.schedule("images", filepath)
 
             return (
                 f"## 이미지 편집 완료\n\n"
@@ -204,6 +207,7 @@ class ImageGeneratorTool(BaseTool):
                 with open(filepath, "wb") as f:
                     f.write(img_bytes)
                 saved.append(filepath)
+                thumbs.schedule("images", filepath)
 
             files_list = "\n".join(f"- {f}" for f in saved)
             return (
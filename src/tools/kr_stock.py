@@ -19,7 +19,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from src.tools.base import BaseTool
+from src.tools.base import BaseTool, ToolFailure
 
 logger = logging.getLogger("corthex.tools.kr_stock")
 
@@ -107,7 +107,7 @@ class KrStockTool(BaseTool):
                     stock.get_market_ohlcv_by_date, start, end, ticker
                 )
             except Exception as e:
-                return f"주가 데이터 조회 실패: {e}"
+                return ToolFailure(f"주가 데이터 조회 실패: {e}")
 
         if df is None or (hasattr(df, 'empty') and df.empty):
             return f"종목코드 {ticker}의 데이터가 없습니다. 종목코드를 확인해주세요."
@@ -190,7 +190,7 @@ class KrStockTool(BaseTool):
                     stock.get_market_ohlcv_by_date, fromdate, todate, ticker
                 )
             except Exception as e:
-                return f"OHLCV 데이터 조회 실패: {e}"
+                return ToolFailure(f"OHLCV 데이터 조회 실패: {e}")
 
         if df is None or (hasattr(df, 'empty') and df.empty):
             return f"종목코드 {ticker}의 데이터가 없습니다."
@@ -250,7 +250,7 @@ class KrStockTool(BaseTool):
                     stock.get_market_ohlcv_by_date, start, end, ticker
                 )
             except Exception as e:
-                return f"데이터 조회 실패: {e}"
+                return ToolFailure(f"데이터 조회 실패: {e}")
 
         if df is None or (hasattr(df, 'empty') and df.empty) or len(df) < 20:
             return f"종목코드 {ticker}의 데이터가 부족합니다 (최소 20일 필요)."
@@ -348,7 +348,7 @@ class KrStockTool(BaseTool):
                 stock.get_market_cap_by_ticker, date, market=market
             )
         except Exception as e:
-            return f"시가총액 데이터 조회 실패: {e}"
+            return ToolFailure(f"시가총액 데이터 조회 실패: {e}")
 
         if df.empty:
             # 주말/공휴일인 경우 이전 영업일 시도
@@ -15,6 +15,7 @@ import os
 from datetime import datetime
 from typing import Any
 
+from src.tools import _media_thumbs as thumbs
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.lipsync_video_generator")
@@ -172,6 +173,7 @@ class LipsyncVideoGeneratorTool(BaseTool):
                         f.write(bytes(output))
 
             logger.info("립싱크 영상 저장: %s", filepath)
+            thumbs.schedule("videos", filename)
 
             img_name = os.path.basename(image_path)
             aud_name = os.path.basename(audio_path)
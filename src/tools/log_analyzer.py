@@ -17,13 +17,13 @@
 from __future__ import annotations
 
 import logging
-import re
-from collections import Counter, defaultdict
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
 
+from src.tools._log_index import iter_window, normalize_message, window_stats
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.log_analyzer")
@@ -32,21 +32,6 @@ KST = timezone(timedelta(hours=9))
 
 DEFAULT_LOG_FILE = "logs/corthex.log"
 
-# 표준 파이썬 로그 형식 파싱
-LOG_PATTERN = re.compile(
-    r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}),?\d*\s*[-–]\s*"
-    r"([\w.]+)\s*[-–]\s*(DEBUG|INFO|WARNING|ERROR|CRITICAL)\s*[-–]\s*(.*)"
-)
-
-# 메시지 정규화용 패턴 (변수 부분을 치환하여 그룹핑)
-NORMALIZE_PATTERNS = [
-    (re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}[.\d]*"), "{TIMESTAMP}"),
-    (re.compile(r"https?://\S+"), "{URL}"),
-    (re.compile(r"\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b"), "{IP}"),
-    (re.compile(r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b", re.I), "{UUID}"),
-    (re.compile(r"\b\d+\b"), "{N}"),
-]
-
 
 @dataclass
 class LogEntry:
@@ -83,47 +68,17 @@ class LogAnalyzerTool(BaseTool):
 
     @staticmethod
     def _parse_log_file(log_file: str, level: str = "ALL", hours: int = 24) -> list[LogEntry]:
-        """로그 파일을 파싱하여 LogEntry 리스트로 변환합니다."""
-        path = Path(log_file)
-        if not path.exists():
-            return []
-
-        cutoff = datetime.now(KST) - timedelta(hours=hours)
-        entries: list[LogEntry] = []
-
-        for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
-            m = LOG_PATTERN.match(line.strip())
-            if not m:
-                continue
-
-            ts_str, logger_name, log_level, message = m.groups()
-            try:
-                ts = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S").replace(tzinfo=KST)
-            except ValueError:
-                continue
-
-            if ts < cutoff:
-                continue
-
-            if level != "ALL" and log_level != level:
-                continue
-
-            entries.append(LogEntry(
-                timestamp=ts,
-                logger_name=logger_name,
-                level=log_level,
-                message=message.strip(),
-            ))
-
-        return entries
+        """최근 hours시간 로그를 LogEntry 리스트로 변환합니다 (시간 인덱스로 해당 구간만 읽음)."""
+        return [
+            LogEntry(timestamp=e.timestamp, logger_name=e.logger_name,
+                     level=e.level, message=e.message)
+            for e in iter_window(log_file, hours, level)
+        ]
 
     @staticmethod
     def _normalize_message(message: str) -> str:
         """에러 메시지에서 변수 부분을 제거하여 패턴화합니다."""
-        result = message
-        for pattern, replacement in NORMALIZE_PATTERNS:
-            result = pattern.sub(replacement, result)
-        return result
+        return normalize_message(message)
 
     # ── action 구현 ──
 
@@ -145,26 +100,15 @@ class LogAnalyzerTool(BaseTool):
         # 로그 파일/디렉토리가 없으면 자동 생성
         self._ensure_log_file(log_file)
 
-        # 전체 레벨 카운트를 위해 ALL로 먼저 파싱
-        all_entries = self._parse_log_file(log_file, "ALL", hours)
+        # 레벨별 건수는 전체, 모듈/패턴은 요청 레벨 기준 (시간 인덱스 합산)
+        stats = window_stats(log_file, hours, level)
 
-        if not all_entries:
+        if not stats.level_counts:
             return f"최근 {hours}시간 내 로그가 없습니다. (파일: {log_file})"
 
-        # 레벨별 건수
-        level_counts = Counter(e.level for e in all_entries)
-
-        # 요청된 레벨만 필터
-        if level != "ALL":
-            filtered = [e for e in all_entries if e.level == level]
-        else:
-            filtered = all_entries
-
-        # 모듈별 분포
-        module_counts = Counter(e.logger_name for e in filtered)
-
-        # 에러 메시지 그룹핑
-        msg_patterns = Counter(self._normalize_message(e.message) for e in filtered)
+        level_counts = stats.level_counts
+        module_counts = stats.module_counts
+        msg_patterns = stats.signatures
 
         lines = [
             f"## 로그 분석 결과",
@@ -177,7 +121,7 @@ class LogAnalyzerTool(BaseTool):
             if cnt > 0:
                 lines.append(f"  {lvl}: {cnt:,}건")
 
-        lines.append(f"\n### 필터된 로그 건수: {len(filtered):,}건")
+        lines.append(f"\n### 필터된 로그 건수: {stats.total:,}건")
 
         if module_counts:
             lines.append("\n### 모듈별 분포")
@@ -215,11 +159,11 @@ class LogAnalyzerTool(BaseTool):
         # 로그 파일/디렉토리가 없으면 자동 생성
         self._ensure_log_file(log_file)
 
-        entries = self._parse_log_file(log_file, "ERROR", hours)
-        if not entries:
+        stats = window_stats(log_file, hours, "ERROR")
+        if not stats.total:
             return f"최근 {hours}시간 내 ERROR 로그가 없습니다. (파일: {log_file})"
 
-        msg_patterns = Counter(self._normalize_message(e.message) for e in entries)
+        msg_patterns = stats.signatures
 
         lines = [f"## 에러 빈도 Top {top_n} (최근 {hours}시간)", ""]
         for rank, (pattern, cnt) in enumerate(msg_patterns.most_common(top_n), 1):
@@ -249,21 +193,19 @@ class LogAnalyzerTool(BaseTool):
         # 로그 파일/디렉토리가 없으면 자동 생성
         self._ensure_log_file(log_file)
 
-        entries = self._parse_log_file(log_file, "ERROR", hours)
-        if not entries:
+        stats = window_stats(log_file, hours, "ERROR")
+        if not stats.total:
             return f"최근 {hours}시간 내 ERROR 로그가 없습니다. (파일: {log_file})"
 
-        # 시간대별 집계
-        hour_counts: dict[int, int] = defaultdict(int)
-        for e in entries:
-            hour_counts[e.timestamp.hour] += 1
+        # 시간대별 집계 (시간 인덱스 버킷 합산)
+        hour_counts = stats.hour_counts
 
         max_count = max(hour_counts.values()) if hour_counts else 1
         bar_max = 30  # 최대 막대 길이
 
         lines = [
             f"## 시간대별 에러 빈도 (최근 {hours}시간)",
-            f"총 에러: {len(entries):,}건",
+            f"총 에러: {stats.total:,}건",
             "",
         ]
 
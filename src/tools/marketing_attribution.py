@@ -21,15 +21,17 @@
   - action="full"        : 종합 분석
 
 필요 환경변수: 없음
-필요 라이브러리: 없음 (순수 Python)
+필요 라이브러리: numpy (Shapley 엔진 src/tools/_shapley.py)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-import math
-from itertools import combinations
 from typing import Any
 
+import numpy as np
+
+from src.tools import _shapley
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.marketing_attribution")
@@ -135,49 +137,27 @@ class MarketingAttributionTool(BaseTool):
         paths = self._parse_paths(kwargs)
         channels = self._get_channels(paths)
         n = len(channels)
+        masks, values = _shapley.path_table(paths, channels)
 
-        if n > 10:
-            # 채널 10개 초과 시 근사 계산 (정확한 Shapley는 2^n 복잡도)
-            return await self._approximate_shapley(paths, channels, kwargs)
+        if n > _shapley.EXACT_MAX_CHANNELS:
+            # 채널 20개 초과 시 순열 샘플링 근사 (정확한 Shapley는 2^n 연합)
+            return await self._approximate_shapley(masks, values, channels)
 
-        # 특성 함수 v(S): 채널 집합 S에서의 전환 가치
-        def coalition_value(channel_set: frozenset) -> float:
-            total = 0.0
-            for p in paths:
-                if p.get("converted") and channel_set.issuperset(set(p["path"])):
-                    total += p.get("value", 0)
-            return total
+        # 특성 함수 v(S): 채널 집합 S(비트마스크)에서의 전환 가치 — 2^n개 한 번에 계산
+        v = await asyncio.to_thread(_shapley.coalition_values, masks, values, n)
 
         # Shapley Value 계산
-        shapley_values = {}
+        phi = await asyncio.to_thread(_shapley.exact_shapley, v, n)
+        shapley_values = {ch: float(phi[i]) for i, ch in enumerate(channels)}
         total_value = sum(p.get("value", 0) for p in paths if p.get("converted"))
 
-        for i, channel in enumerate(channels):
-            phi = 0.0
-            others = [c for c in channels if c != channel]
-
-            for size in range(n):
-                for subset in combinations(others, size):
-                    s_set = frozenset(subset)
-                    s_with_i = frozenset(subset + (channel,))
-
-                    marginal = coalition_value(s_with_i) - coalition_value(s_set)
-
-                    # Shapley 가중치: |S|!(n-|S|-1)!/n!
-                    weight = (math.factorial(size) * math.factorial(n - size - 1)
-                              / math.factorial(n))
-                    phi += weight * marginal
-
-            shapley_values[channel] = phi
-
         # Removal Effect (제거 효과) 분석
         removal_effects = {}
-        all_channels = frozenset(channels)
-        baseline = coalition_value(all_channels)
+        all_mask = (1 << n) - 1
+        baseline = float(v[all_mask]) if n else 0.0
 
-        for channel in channels:
-            without = all_channels - {channel}
-            val_without = coalition_value(without)
+        for i, channel in enumerate(channels):
+            val_without = float(v[all_mask & ~(1 << i)])
             effect = baseline - val_without
             removal_effects[channel] = {
                 "baseline_value": round(baseline),
@@ -187,18 +167,7 @@ class MarketingAttributionTool(BaseTool):
             }
 
         # 정규화 (전체 합이 total_value가 되도록)
-        shapley_sum = sum(abs(v) for v in shapley_values.values())
-        results = []
-        for ch in sorted(shapley_values, key=shapley_values.get, reverse=True):
-            raw = shapley_values[ch]
-            normalized = (raw / shapley_sum * total_value) if shapley_sum > 0 else 0
-            results.append({
-                "channel": ch,
-                "shapley_value": round(raw),
-                "normalized_value": round(normalized),
-                "contribution_pct": f"{(normalized/total_value*100) if total_value > 0 else 0:.1f}%",
-                "rank": len(results) + 1,
-            })
+        results = self._normalized_results(shapley_values, total_value, "shapley_value")
 
         return {
             "method": "Shapley Value (Shapley, 1953)",
@@ -210,48 +179,45 @@ class MarketingAttributionTool(BaseTool):
             "interpretation": self._interpret_shapley(results),
         }
 
-    async def _approximate_shapley(self, paths, channels, kwargs):
-        """채널 10개 초과 시 몬테카를로 근사 Shapley."""
-        import random
+    async def _approximate_shapley(self, masks, values, channels):
+        """채널 20개 초과 시 순열 샘플링 근사 Shapley (표준오차 수렴 시 조기 종료)."""
         n = len(channels)
-        iterations = 5000
-        marginals = {ch: 0.0 for ch in channels}
-
-        def coalition_value(channel_set):
-            total = 0.0
-            for p in paths:
-                if p.get("converted") and channel_set.issuperset(set(p["path"])):
-                    total += p.get("value", 0)
-            return total
-
-        for _ in range(iterations):
-            perm = channels[:]
-            random.shuffle(perm)
-            current_set = set()
-            prev_val = 0.0
-            for ch in perm:
-                current_set.add(ch)
-                new_val = coalition_value(frozenset(current_set))
-                marginals[ch] += (new_val - prev_val)
-                prev_val = new_val
-
-        total_value = sum(p.get("value", 0) for p in paths if p.get("converted"))
-        results = []
-        for ch in sorted(marginals, key=marginals.get, reverse=True):
-            avg = marginals[ch] / iterations
-            results.append({
-                "channel": ch,
-                "shapley_value_approx": round(avg),
-                "contribution_pct": f"{(avg/total_value*100) if total_value > 0 else 0:.1f}%",
-            })
+        phi, se, iterations = await asyncio.to_thread(
+            _shapley.sampled_shapley, masks, values, n, np.random.default_rng(42),
+        )
+        total_value = float(values.sum())
+        results = self._normalized_results(
+            {ch: float(phi[i]) for i, ch in enumerate(channels)}, total_value, "shapley_value_approx",
+        )
+        stderr = {ch: float(se[i]) for i, ch in enumerate(channels)}
+        for item in results:
+            item["std_error"] = round(stderr[item["channel"]])
 
         return {
-            "method": "Approximate Shapley (Monte Carlo, 5000 iterations)",
+            "method": f"Approximate Shapley (Monte Carlo, {iterations} permutations)",
             "total_conversion_value": round(total_value),
+            "channel_count": n,
             "attribution": results,
-            "note": "채널 10개 초과로 근사 계산 적용",
+            "interpretation": self._interpret_shapley(results),
+            "note": f"채널 {_shapley.EXACT_MAX_CHANNELS}개 초과로 근사 계산 적용",
         }
 
+    def _normalized_results(self, shapley_values: dict, total_value: float, raw_key: str) -> list:
+        """Shapley 값 → 전체 전환 가치 기준 정규화 + 순위."""
+        shapley_sum = sum(abs(v) for v in shapley_values.values())
+        results = []
+        for ch in sorted(shapley_values, key=shapley_values.get, reverse=True):
+            raw = shapley_values[ch]
+            normalized = (raw / shapley_sum * total_value) if shapley_sum > 0 else 0
+            results.append({
+                "channel": ch,
+                raw_key: round(raw),
+                "normalized_value": round(normalized),
+                "contribution_pct": f"{(normalized/total_value*100) if total_value > 0 else 0:.1f}%",
+                "rank": len(results) + 1,
+            })
+        return results
+
     def _interpret_shapley(self, results: list) -> str:
         if not results:
             return "분석 데이터 부족"
@@ -21,7 +21,7 @@ from typing import Any
 
 import httpx
 
-from src.tools.base import BaseTool
+from src.tools.base import BaseTool, ToolFailure
 
 logger = logging.getLogger("corthex.tools.naver_news")
 
@@ -117,7 +117,7 @@ class NaverNewsTool(BaseTool):
                     timeout=15,
                 )
         except httpx.HTTPError as e:
-            return f"네이버 뉴스 API 호출 실패: {e}"
+            return ToolFailure(f"네이버 뉴스 API 호출 실패: {e}")
 
         if resp.status_code == 401:
             return (
@@ -127,7 +127,7 @@ class NaverNewsTool(BaseTool):
 
         if resp.status_code != 200:
             logger.error("[NaverNews] 검색 실패 (%d): %s", resp.status_code, resp.text)
-            return f"네이버 API 오류 ({resp.status_code}): {resp.text[:200]}"
+            return ToolFailure(f"네이버 API 오류 ({resp.status_code}): {resp.text[:200]}")
 
         data = resp.json()
         total = data.get("total", 0)
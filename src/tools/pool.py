@@ -2,13 +2,25 @@
 Tool Pool: central registry of all available tools.
 
 Any agent with permission can invoke a tool by name.
+
+도구 모듈은 pandas/yfinance/chromadb/selenium 등 무거운 의존성을 끌고 오므로
+build_from_config는 import 없이 지연 프록시(_LazyTool)만 등록합니다.
+실제 import·생성은 첫 invoke 때 (스레드에서) 한 번만 일어나고,
+tools.yaml의 pool.prewarm(또는 CORTHEX_TOOL_PREWARM) 목록은 백그라운드 스레드로 미리 로드합니다.
+도구 정의에 cache_ttl을 주면 같은 인자의 결과를 TTL 동안 재사용하고 동시 호출은 한 번만 실행합니다.
 """
 from __future__ import annotations
 
+import asyncio
+import importlib
 import logging
+import os
+import threading
+import time
 from typing import Any, TYPE_CHECKING
 
 from src.core.errors import ToolNotFoundError
+from src.tools._result_cache import DEFAULT_MAX_ENTRIES, ToolResultCache
 from src.tools.base import BaseTool, ToolConfig
 
 if TYPE_CHECKING:
@@ -17,14 +29,61 @@ if TYPE_CHECKING:
 logger = logging.getLogger("corthex.tools")
 
 
+class _LazyTool:
+    """도구 지연 프록시 — 첫 resolve() 때 모듈 import + 인스턴스 생성 (스레드 안전)."""
+
+    def __init__(self, config: ToolConfig, import_path: str, model_router: ModelRouter) -> None:
+        self.tool_id = config.tool_id
+        self.config = config
+        self.import_path = import_path
+        self._model_router = model_router
+        self._lock = threading.Lock()
+        self.instance: BaseTool | None = None
+        self.error: str | None = None
+        self.import_ms: float | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.instance is not None
+
+    def resolve(self) -> BaseTool | None:
+        """import·생성 후 인스턴스 반환. 실패하면 None (오류는 self.error에 보관, 재시도 안 함)."""
+        if self.instance is not None or self.error is not None:
+            return self.instance
+        with self._lock:
+            if self.instance is not None or self.error is not None:
+                return self.instance
+            module_path, class_name = self.import_path.rsplit(".", 1)
+            started = time.perf_counter()
+            try:
+                cls = getattr(importlib.import_module(module_path), class_name)
+                self.instance = cls(config=self.config, model_router=self._model_router)
+            except Exception as e:
+                self.error = str(e)
+                logger.warning("도구 '%s' 로드 실패: %s", self.tool_id, e)
+            finally:
+                self.import_ms = (time.perf_counter() - started) * 1000
+            if self.instance is not None:
+                logger.debug("도구 로드: %s (%.0fms)", self.tool_id, self.import_ms)
+            return self.instance
+
+    def __getattr__(self, name: str) -> Any:
+        # BaseTool 속성을 기대하는 기존 호출부 호환 (필요 시 즉시 로드)
+        tool = self.resolve()
+        if tool is None:
+            raise AttributeError(name)
+        return getattr(tool, name)
+
+
 class ToolPool:
     """Central registry and dispatcher for all tools."""
 
     def __init__(self, model_router: ModelRouter) -> None:
-        self._tools: dict[str, BaseTool] = {}
+        self._tools: dict[str, BaseTool | _LazyTool] = {}
         self._model_router = model_router
         self._agent_models: dict[str, str] = {}  # agent_id → model_name 매핑
         self._agent_temperatures: dict[str, float] = {}  # agent_id → temperature
+        self._cache = ToolResultCache()
 
     def set_agent_model(self, agent_id: str, model: str, temperature: float | None = None) -> None:
         """에이전트 모델/temperature를 풀에 등록. 도구가 caller 설정을 따르도록."""
@@ -37,8 +96,8 @@ class ToolPool:
         self._tools[tool.tool_id] = tool
         logger.debug("도구 등록: %s (%s)", tool.tool_id, tool.config.name_ko)
 
-    def build_from_config(self, tools_config: dict) -> None:
-        """Parse tools.yaml and instantiate all tools."""
+    def build_from_config(self, tools_config: dict, lazy: bool = True) -> None:
+        """Parse tools.yaml and register all tools (lazy=False면 즉시 전부 로드)."""
         # 각 도구를 개별적으로 import (하나 실패해도 나머지는 동작)
         _imports: dict[str, str] = {
             # 삭제됨: patent_attorney, tax_accountant, designer, translator (LLM 전용)
@@ -203,32 +262,60 @@ class ToolPool:
             # 전부 SkillTool 단일 클래스로 LLM 호출만 하는 프롬프트 래퍼였음
             # 에이전트가 직접 할 수 있는 것을 "도구"로 포장한 것이므로 제거
         }
-        tool_classes: dict[str, type[BaseTool]] = {}
-        for tool_id, import_path in _imports.items():
-            module_path, class_name = import_path.rsplit(".", 1)
-            try:
-                import importlib
-                mod = importlib.import_module(module_path)
-                tool_classes[tool_id] = getattr(mod, class_name)
-            except Exception as e:
-                logger.warning("도구 '%s' 로드 실패 (건너뜀): %s", tool_id, e)
-
         for tool_def in tools_config.get("tools", []):
             config = ToolConfig(**tool_def)
-            cls = tool_classes.get(config.tool_id)
-            if cls:
-                try:
-                    self.register(cls(config=config, model_router=self._model_router))
-                except Exception as e:
-                    logger.warning("도구 '%s' 등록 실패 (건너뜀): %s", config.tool_id, e)
+            import_path = _imports.get(config.tool_id)
+            if import_path:
+                self.register(_LazyTool(config, import_path, self._model_router))
 
-        logger.info("총 %d개 도구 등록 완료", len(self._tools))
+        pool_cfg = tools_config.get("pool") or {}
+        self._cache = ToolResultCache(pool_cfg.get("cache_max_entries", DEFAULT_MAX_ENTRIES))
 
-    async def invoke(self, tool_id: str, caller_id: str = "", **kwargs: Any) -> Any:
-        if tool_id not in self._tools:
+        if not lazy:
+            self.prewarm(list(self._tools), background=False)
+            for tid in [tid for tid, t in self._tools.items() if isinstance(t, _LazyTool) and t.error]:
+                del self._tools[tid]
+        else:
+            env_hot = os.getenv("CORTHEX_TOOL_PREWARM", "")
+            hot = [t.strip() for t in env_hot.split(",") if t.strip()] if env_hot else pool_cfg.get("prewarm", [])
+            if hot:
+                self.prewarm(hot)
+
+        logger.info("총 %d개 도구 등록 완료%s", len(self._tools), " (지연 로드)" if lazy else "")
+
+    def prewarm(self, tool_ids: list[str], background: bool = True) -> threading.Thread | None:
+        """지정 도구를 미리 import·생성. background=True면 데몬 스레드에서."""
+        proxies = [t for tid in tool_ids if isinstance(t := self._tools.get(tid), _LazyTool)]
+
+        def _run() -> None:
+            started = time.perf_counter()
+            for proxy in proxies:
+                proxy.resolve()
+            logger.info("도구 %d개 사전 로드 완료 (%.1fs)", len(proxies), time.perf_counter() - started)
+
+        if not background:
+            _run()
+            return None
+        thread = threading.Thread(target=_run, name="toolpool-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    async def _resolve(self, tool_id: str) -> BaseTool:
+        entry = self._tools.get(tool_id)
+        if entry is None:
+            raise ToolNotFoundError(tool_id)
+        if not isinstance(entry, _LazyTool):
+            return entry
+        tool = entry.instance or await asyncio.to_thread(entry.resolve)
+        if tool is None:
+            # import/생성 실패 도구는 이후 목록·호출에서 제외 (기존 즉시 로드와 같은 결과)
+            self._tools.pop(tool_id, None)
             raise ToolNotFoundError(tool_id)
+        return tool
+
+    async def invoke(self, tool_id: str, caller_id: str = "", **kwargs: Any) -> Any:
+        tool = await self._resolve(tool_id)
         logger.info("[%s] 도구 호출: %s", caller_id, tool_id)
-        tool = self._tools[tool_id]
         # caller 에이전트의 모델/temperature를 kwargs에 주입
         if caller_id:
             if "_caller_model" not in kwargs:
@@ -242,10 +329,28 @@ class ToolPool:
         # 도구 인스턴스에 caller 설정 주입 — _llm_call()이 자동으로 사용
         tool._current_caller_model = kwargs.get("_caller_model")
         tool._current_caller_temperature = kwargs.get("_caller_temperature")
+        if tool.config.cache_ttl > 0:
+            return await self._cache.get_or_run(
+                tool_id, kwargs, tool.config.cache_ttl,
+                lambda: tool.execute(caller_id=caller_id, **kwargs),
+            )
         return await tool.execute(caller_id=caller_id, **kwargs)
 
+    def cache_stats(self) -> dict:
+        """도구 결과 캐시 지표 (hit/miss/coalesced/evictions)."""
+        return self._cache.stats()
+
+    def loaded_names(self) -> set[str]:
+        """사용 가능한 도구 ID (아직 import 안 한 지연 프록시 포함, 로드 실패 프록시 제외)."""
+        return {tid for tid, t in list(self._tools.items()) if not (isinstance(t, _LazyTool) and t.error)}
+
     def list_tools(self) -> list[dict]:
         return [
-            {"id": t.tool_id, "name": t.config.name_ko, "desc": t.config.description}
-            for t in self._tools.values()
+            {
+                "id": t.tool_id, "name": t.config.name_ko, "desc": t.config.description,
+                "loaded": not isinstance(t, _LazyTool) or t.loaded,
+                "import_ms": round(t.import_ms, 1) if isinstance(t, _LazyTool) and t.import_ms is not None else None,
+            }
+            for t in list(self._tools.values())
+            if not (isinstance(t, _LazyTool) and t.error)
         ]
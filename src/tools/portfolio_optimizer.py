@@ -14,9 +14,10 @@
   - action="equal_weight"  : 동일 비중 대비 비교
   - action="efficient_frontier" : 효율적 프론티어 5개 포인트
   - action="full"          : 종합 분석 (위 전부 포함)
+  - max_weight (선택)      : 종목당 최대 비중 (예: 0.4, 또는 {"삼성전자": 0.3})
 
 필요 환경변수: 없음 (pykrx 무료)
-필요 라이브러리: pykrx, pandas, numpy, scipy
+필요 라이브러리: pykrx, pandas, numpy
 """
 from __future__ import annotations
 
@@ -28,6 +29,7 @@ from typing import Any
 
 import numpy as np
 
+from src.tools import _mean_variance as mv
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.portfolio_optimizer")
@@ -138,35 +140,23 @@ class PortfolioOptimizerTool(BaseTool):
         sharpe = port_return / port_vol if port_vol > 0 else 0
         return port_return, port_vol, sharpe
 
-    def _max_sharpe(self, mean_returns, cov_matrix, n: int) -> np.ndarray:
-        """최대 샤프 비율 포트폴리오 (몬테카를로 시뮬레이션)."""
-        best_sharpe = -999
-        best_weights = np.ones(n) / n
-        np.random.seed(42)
-
-        for _ in range(10000):
-            w = np.random.random(n)
-            w /= w.sum()
-            _, _, sharpe = self._portfolio_stats(w, mean_returns, cov_matrix)
-            if sharpe > best_sharpe:
-                best_sharpe = sharpe
-                best_weights = w
-        return best_weights
-
-    def _min_variance(self, mean_returns, cov_matrix, n: int) -> np.ndarray:
-        """최소 분산 포트폴리오."""
-        best_vol = 999
-        best_weights = np.ones(n) / n
-        np.random.seed(42)
-
-        for _ in range(10000):
-            w = np.random.random(n)
-            w /= w.sum()
-            _, vol, _ = self._portfolio_stats(w, mean_returns, cov_matrix)
-            if vol < best_vol:
-                best_vol = vol
-                best_weights = w
-        return best_weights
+    @staticmethod
+    def _caps(kwargs: dict, names: list) -> np.ndarray | None:
+        """max_weight(숫자 또는 {종목명: 상한}) → 종목별 상한 배열."""
+        raw = kwargs.get("max_weight")
+        if raw in (None, ""):
+            return None
+        if isinstance(raw, dict):
+            return np.array([float(raw.get(nm, 1.0)) for nm in names])
+        return np.full(len(names), float(raw))
+
+    def _max_sharpe(self, mean_returns, cov_matrix, n: int, caps=None) -> np.ndarray:
+        """최대 샤프 비율 포트폴리오 (제약 QP — 롱온리 + 종목별 상한)."""
+        return mv.max_sharpe(mean_returns, cov_matrix, rf=0.0, caps=caps)
+
+    def _min_variance(self, mean_returns, cov_matrix, n: int, caps=None) -> np.ndarray:
+        """최소 분산 포트폴리오 (제약 QP)."""
+        return mv.min_variance(cov_matrix, caps=caps)
 
     # ── 1. 종합 분석 ────────────────────────
 
@@ -180,11 +170,11 @@ class PortfolioOptimizerTool(BaseTool):
         n = len(names)
 
         # 최적 비중
-        opt_w = self._max_sharpe(mean_ret.values, cov.values, n)
+        opt_w = self._max_sharpe(mean_ret.values, cov.values, n, self._caps(kwargs, names))
         opt_ret, opt_vol, opt_sharpe = self._portfolio_stats(opt_w, mean_ret.values, cov.values)
 
         # 최소 위험
-        min_w = self._min_variance(mean_ret.values, cov.values, n)
+        min_w = self._min_variance(mean_ret.values, cov.values, n, self._caps(kwargs, names))
         min_ret, min_vol, min_sharpe = self._portfolio_stats(min_w, mean_ret.values, cov.values)
 
         # 동일 비중
@@ -247,7 +237,7 @@ class PortfolioOptimizerTool(BaseTool):
         mean_ret = returns_df.mean()
         cov = returns_df.cov()
         n = len(names)
-        opt_w = self._max_sharpe(mean_ret.values, cov.values, n)
+        opt_w = self._max_sharpe(mean_ret.values, cov.values, n, self._caps(kwargs, names))
         opt_ret, opt_vol, opt_sharpe = self._portfolio_stats(opt_w, mean_ret.values, cov.values)
 
         results = [f"📊 최적 포트폴리오 비중 (최대 샤프 비율)"]
@@ -268,7 +258,7 @@ class PortfolioOptimizerTool(BaseTool):
         mean_ret = returns_df.mean()
         cov = returns_df.cov()
         n = len(names)
-        min_w = self._min_variance(mean_ret.values, cov.values, n)
+        min_w = self._min_variance(mean_ret.values, cov.values, n, self._caps(kwargs, names))
         min_ret, min_vol, min_sharpe = self._portfolio_stats(min_w, mean_ret.values, cov.values)
 
         results = [f"📊 최소 위험 포트폴리오"]
@@ -292,7 +282,7 @@ class PortfolioOptimizerTool(BaseTool):
         eq_w = np.ones(n) / n
         eq_ret, eq_vol, eq_sharpe = self._portfolio_stats(eq_w, mean_ret.values, cov.values)
 
-        opt_w = self._max_sharpe(mean_ret.values, cov.values, n)
+        opt_w = self._max_sharpe(mean_ret.values, cov.values, n, self._caps(kwargs, names))
         opt_ret, opt_vol, opt_sharpe = self._portfolio_stats(opt_w, mean_ret.values, cov.values)
 
         results = [f"📊 동일 비중 vs 최적 비중 비교"]
@@ -317,31 +307,15 @@ class PortfolioOptimizerTool(BaseTool):
         cov = returns_df.cov().values
         n = len(names)
 
-        # 타겟 수익률 범위에서 5개 포인트
-        min_w = self._min_variance(mean_ret, cov, n)
-        min_ret, _, _ = self._portfolio_stats(min_w, mean_ret, cov)
-        opt_w = self._max_sharpe(mean_ret, cov, n)
-        max_ret, _, _ = self._portfolio_stats(opt_w, mean_ret, cov)
-
-        targets = np.linspace(min_ret, max_ret * 1.2, 5)
+        # 최소분산 ~ 최고수익 구간 5개 포인트 (직전 해로 warm start)
+        frontier = mv.efficient_frontier(mean_ret, cov, points=5, caps=self._caps(kwargs, names))
         results = [f"📊 효율적 프론티어 (5개 포인트)"]
         results.append(f"{'수익률':>8} | {'변동성':>8} | {'샤프':>6} | 비중 배분")
         results.append("-" * 60)
 
-        np.random.seed(42)
-        for target in targets:
-            best_vol = 999
-            best_w = np.ones(n) / n
-            for _ in range(5000):
-                w = np.random.random(n)
-                w /= w.sum()
-                ret, vol, _ = self._portfolio_stats(w, mean_ret, cov)
-                if abs(ret - target) < 0.02 and vol < best_vol:
-                    best_vol = vol
-                    best_w = w
-
-            ret, vol, sharpe = self._portfolio_stats(best_w, mean_ret, cov)
-            alloc = ", ".join(f"{names[i][:3]}:{best_w[i]*100:.0f}%" for i in range(n))
+        for w in frontier:
+            ret, vol, sharpe = self._portfolio_stats(w, mean_ret, cov)
+            alloc = ", ".join(f"{names[i][:3]}:{w[i]*100:.0f}%" for i in range(n))
             results.append(f"  {ret*100:+5.1f}%  |  {vol*100:5.1f}%  | {sharpe:5.2f} | {alloc}")
 
         return "\n".join(results)
@@ -18,10 +18,11 @@
     최적화의 핵심 목적함수. SR > 1.0 = 우수, > 2.0 = 탁월
 
 사용 방법:
-  - action="optimize": 포트폴리오 최적화 (Markowitz + Risk Parity)
+  - action="optimize": 포트폴리오 최적화 (Markowitz + Risk Parity, target_return 지정 시 목표수익 포트폴리오)
   - action="kelly": Kelly Criterion 최적 비중
-  - action="efficient_frontier": 효율적 프론티어 시뮬레이션
+  - action="efficient_frontier": 효율적 프론티어 (제약 QP로 계산)
   - action="full": 전체 분석
+  - max_weight: 종목당 최대 비중 (기본 0.4, 종목 수가 적어 불가능하면 자동 완화)
 
 필요 환경변수: 없음
 의존 라이브러리: yfinance, numpy
@@ -29,8 +30,10 @@
 from __future__ import annotations
 
 import logging
+import math
 from typing import Any
 
+from src.tools import _mean_variance as mv
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.portfolio_optimizer_v2")
@@ -83,6 +86,28 @@ class PortfolioOptimizerV2Tool(BaseTool):
             return [s.upper().strip() for s in symbols if s.strip()]
         return [s.upper().strip() for s in str(symbols).replace(",", " ").split() if s.strip()]
 
+    @staticmethod
+    def _max_weight(kw: dict) -> float:
+        """종목당 최대 비중 (기본 0.4)."""
+        try:
+            return float(kw.get("max_weight") or 0.4)
+        except (TypeError, ValueError):
+            return 0.4
+
+    @staticmethod
+    def _target_return(kw: dict) -> tuple[float | None, str]:
+        """목표 연 수익률 (소수, 0.12 = 12%). 반환: (값, 오류 메시지) — 미지정이면 (None, "")."""
+        raw = kw.get("target_return")
+        if raw in (None, ""):
+            return None, ""
+        try:
+            value = float(raw)
+            if math.isfinite(value):
+                return value, ""
+        except (TypeError, ValueError):
+            pass
+        return None, f"target_return은 숫자여야 합니다 (연 수익률, 예: 0.12 = 12%). 입력값: {raw}"
+
     async def _get_returns(self, symbols: list, period: str = "1y"):
         """종목별 수익률 데이터 수집."""
         yf = _yf()
@@ -118,6 +143,9 @@ class PortfolioOptimizerV2Tool(BaseTool):
         symbols = self._parse_symbols(kw)
         if len(symbols) < 2:
             return "최소 2개 이상의 심볼이 필요합니다. (예: symbols=\"AAPL MSFT GOOGL\")"
+        target, target_err = self._target_return(kw)
+        if target_err:
+            return target_err
 
         np = _np()
         if not np:
@@ -127,7 +155,6 @@ class PortfolioOptimizerV2Tool(BaseTool):
         if returns is None:
             return "가격 데이터 조회 실패 (최소 2개 종목 필요)"
 
-        n = len(returns.columns)
         mean_returns = returns.mean().values * 252  # 연환산
         cov_matrix = returns.cov().values * 252
         valid_symbols = list(returns.columns)
@@ -150,34 +177,20 @@ class PortfolioOptimizerV2Tool(BaseTool):
             sharpe = (mean_returns[i] - rf) / float(np.sqrt(cov_matrix[i][i])) if cov_matrix[i][i] > 0 else 0
             lines.append(f"| {names.get(sym,sym)} ({sym}) | {ret:+.1f}% | {vol:.1f}% | {sharpe:.2f} |")
 
-        # ── Markowitz 최적화 (Monte Carlo 10000 시뮬레이션) ──
-        num_sim = 10000
-        best_sharpe = -999
-        best_weights_sharpe = None
-        min_vol = 999
-        best_weights_minvol = None
-
-        for _ in range(num_sim):
-            w = np.random.dirichlet(np.ones(n))
-            port_ret = float(np.dot(w, mean_returns))
-            port_vol = float(np.sqrt(np.dot(w.T, np.dot(cov_matrix, w))))
-            sharpe = (port_ret - rf) / port_vol if port_vol > 0 else 0
-
-            if sharpe > best_sharpe:
-                best_sharpe = sharpe
-                best_weights_sharpe = w.copy()
+        # ── Markowitz 최적화 (제약 QP: 롱온리 + 종목당 상한) ──
+        max_w = self._max_weight(kw)
+        best_weights_sharpe = mv.max_sharpe(mean_returns, cov_matrix, rf=rf, caps=max_w)
+        best_weights_minvol = mv.min_variance(cov_matrix, caps=max_w)
+        best_sharpe = float(np.dot(best_weights_sharpe, mean_returns) - rf) / float(
+            np.sqrt(best_weights_sharpe @ cov_matrix @ best_weights_sharpe))
+        min_vol = float(np.sqrt(best_weights_minvol @ cov_matrix @ best_weights_minvol))
 
-            if port_vol < min_vol:
-                min_vol = port_vol
-                best_weights_minvol = w.copy()
-
-        # ── Risk Parity (역변동성 비중) ──
-        vols = np.array([np.sqrt(cov_matrix[i][i]) for i in range(n)])
-        inv_vols = 1.0 / vols
-        rp_weights = inv_vols / inv_vols.sum()
+        # ── Risk Parity (위험기여도 균등, ERC) ──
+        vols = np.sqrt(np.diag(cov_matrix))
+        rp_weights = mv.risk_parity(cov_matrix, caps=max_w)
 
         # 결과 출력
-        lines.append(f"\n### 1. Markowitz 최대 Sharpe 포트폴리오 (10,000 시뮬레이션)")
+        lines.append(f"\n### 1. Markowitz 최대 Sharpe 포트폴리오 (종목당 최대 {max_w*100:.0f}%)")
         if best_weights_sharpe is not None:
             port_ret = float(np.dot(best_weights_sharpe, mean_returns)) * 100
             port_vol = float(np.sqrt(np.dot(best_weights_sharpe.T, np.dot(cov_matrix, best_weights_sharpe)))) * 100
@@ -215,11 +228,26 @@ class PortfolioOptimizerV2Tool(BaseTool):
             bar = "█" * int(w / 5)
             lines.append(f"| {sym} | {bar} {w:.1f}% | {v:.1f}% |")
 
+        # ── 목표 수익률 포트폴리오 (지정 시) ──
+        if target is not None:
+            tw = mv.target_return(mean_returns, cov_matrix, target, caps=max_w)
+            t_ret = float(np.dot(tw, mean_returns))
+            t_vol = float(np.sqrt(tw @ cov_matrix @ tw))
+            lines.append(f"\n### 4. 목표 수익률 {target*100:.1f}% 최소 변동성 포트폴리오")
+            if abs(t_ret - target) > 1e-6:
+                lines.append(f"- ⚠️ 목표 수익률 달성 불가 → 가능한 가장 가까운 {t_ret*100:+.1f}%로 계산")
+            lines.append(f"- 예상 수익률: {t_ret*100:+.1f}% | 변동성: {t_vol*100:.1f}% | "
+                         f"Sharpe: {(t_ret - rf) / t_vol if t_vol > 0 else 0:.2f}")
+            lines.append("| 종목 | 비중 |")
+            lines.append("|------|------|")
+            for i, sym in enumerate(valid_symbols):
+                lines.append(f"| {sym} | {'█' * int(tw[i] * 20)} {tw[i]*100:.1f}% |")
+
         # 상관행렬
         corr = returns.corr()
         lines.append(f"\n### 상관행렬")
         header = "| | " + " | ".join(valid_symbols) + " |"
-        sep = "|---|" + "|".join(["---"] * n) + "|"
+        sep = "|---|" + "|".join(["---"] * len(valid_symbols)) + "|"
         lines.append(header)
         lines.append(sep)
         for i, sym_i in enumerate(valid_symbols):
@@ -232,7 +260,7 @@ class PortfolioOptimizerV2Tool(BaseTool):
         lines.append("\n### 포트폴리오 선택 가이드")
         lines.append("- **최대 Sharpe**: 위험 대비 수익 최적. 적극적 투자자")
         lines.append("- **최소 변동성**: 안정성 최우선. 보수적 투자자")
-        lines.append("- **Risk Parity**: 리스크 균등 배분. All-Weather 전략")
+        lines.append("- **Risk Parity**: 종목별 위험기여도 균등. All-Weather 전략")
 
         return "\n".join(lines)
 
@@ -302,6 +330,9 @@ class PortfolioOptimizerV2Tool(BaseTool):
         symbols = self._parse_symbols(kw)
         if len(symbols) < 2:
             return "최소 2개 이상의 심볼이 필요합니다."
+        target_return, target_err = self._target_return(kw)
+        if target_err:
+            return target_err
 
         np = _np()
         if not np:
@@ -311,48 +342,40 @@ class PortfolioOptimizerV2Tool(BaseTool):
         if returns is None:
             return "가격 데이터 조회 실패"
 
-        n = len(returns.columns)
         mean_returns = returns.mean().values * 252
         cov_matrix = returns.cov().values * 252
         rf = 0.045
 
-        # 5000 포트폴리오 시뮬레이션
-        results = []
-        for _ in range(5000):
-            w = np.random.dirichlet(np.ones(n))
+        # 최소분산 ~ 최고수익 구간을 목표수익률로 나눠 QP (직전 해로 warm start)
+        max_w = self._max_weight(kw)
+
+        def _point(w):
             ret = float(np.dot(w, mean_returns))
-            vol = float(np.sqrt(np.dot(w.T, np.dot(cov_matrix, w))))
-            sharpe = (ret - rf) / vol if vol > 0 else 0
-            results.append({"ret": ret, "vol": vol, "sharpe": sharpe, "weights": w})
+            vol = float(np.sqrt(w @ cov_matrix @ w))
+            return {"ret": ret, "vol": vol, "sharpe": (ret - rf) / vol if vol > 0 else 0, "weights": w}
 
-        # 효율적 프론티어 포인트 (변동성 구간별 최대 수익)
-        vol_range = np.linspace(
-            min(r["vol"] for r in results),
-            max(r["vol"] for r in results),
-            10
-        )
+        frontier = [_point(w) for w in mv.efficient_frontier(mean_returns, cov_matrix, points=10, caps=max_w)]
 
         lines = [
             "## 효율적 프론티어 (Markowitz, 1952)\n",
-            f"### {', '.join(returns.columns)} — 5,000 시뮬레이션\n",
+            f"### {', '.join(returns.columns)} — 종목당 최대 {max_w*100:.0f}%\n",
             "### 효율적 프론티어 포인트",
             "| 변동성 | 수익률 | Sharpe | 그래프 |",
             "|--------|--------|--------|--------|",
         ]
 
-        for i in range(len(vol_range) - 1):
-            in_range = [r for r in results if vol_range[i] <= r["vol"] < vol_range[i+1]]
-            if in_range:
-                best = max(in_range, key=lambda x: x["ret"])
-                bar_ret = "█" * max(1, int(best["ret"] * 50))
-                lines.append(
-                    f"| {best['vol']*100:.1f}% | {best['ret']*100:+.1f}% | "
-                    f"{best['sharpe']:.2f} | {bar_ret} |"
-                )
+        for p in frontier:
+            bar_ret = "█" * max(1, int(p["ret"] * 50))
+            lines.append(f"| {p['vol']*100:.1f}% | {p['ret']*100:+.1f}% | {p['sharpe']:.2f} | {bar_ret} |")
 
         # 최적 포인트
-        optimal = max(results, key=lambda x: x["sharpe"])
-        min_vol_port = min(results, key=lambda x: x["vol"])
+        optimal = _point(mv.max_sharpe(mean_returns, cov_matrix, rf=rf, caps=max_w))
+        min_vol_port = frontier[0]
+
+        if target_return is not None:
+            target = _point(mv.target_return(mean_returns, cov_matrix, target_return, caps=max_w))
+            lines.append(f"\n- 🎯 **목표 수익률 {target_return*100:.1f}%**: 수익 {target['ret']*100:+.1f}%, "
+                         f"변동성 {target['vol']*100:.1f}%, SR {target['sharpe']:.2f}")
 
         lines.append(f"\n### 핵심 포인트")
         lines.append(f"- ⭐ **최대 Sharpe**: 수익 {optimal['ret']*100:+.1f}%, 변동성 {optimal['vol']*100:.1f}%, SR {optimal['sharpe']:.2f}")
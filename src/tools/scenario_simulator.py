@@ -1,7 +1,7 @@
 """
 시나리오 시뮬레이터 (Scenario Simulator) — 불확실한 미래를 확률로 예측합니다.
 
-Monte Carlo 시뮬레이션 10,000회 + 3-시나리오 분석 + 민감도 분석으로
+Monte Carlo 시뮬레이션 100,000회(최대 200만) + 3-시나리오 분석 + 민감도 분석으로
 "최악의 경우에도 견딜 수 있는가"를 정량적으로 검증합니다.
 
 학술 근거:
@@ -12,25 +12,28 @@ Monte Carlo 시뮬레이션 10,000회 + 3-시나리오 분석 + 민감도 분석
 
 사용 방법:
   - action="full"         : 전체 시뮬레이션 종합
-  - action="monte_carlo"  : Monte Carlo 10,000회 시뮬레이션
+  - action="monte_carlo"  : Monte Carlo 시뮬레이션 (기본 100,000회)
   - action="three_scenario": 보수/기본/낙관 3-시나리오
   - action="sensitivity"  : 토네이도 다이어그램 (민감도)
   - action="breakeven"    : 손익분기점 분석
 
 필요 환경변수: 없음
-필요 라이브러리: 없음 (random 표준 라이브러리 사용)
+필요 라이브러리: numpy (src/tools/_monte_carlo.py 벡터 커널)
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 import math
-import random
 from typing import Any
 
+from src.tools import _monte_carlo as mc
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.scenario_simulator")
 
+DEFAULT_SIMULATIONS = 100_000
+
 
 class ScenarioSimulator(BaseTool):
     """시나리오 시뮬레이터 — Monte Carlo + 3-Scenario + 민감도 분석."""
@@ -55,7 +58,7 @@ class ScenarioSimulator(BaseTool):
     # ── Full: 전체 종합 ──────────────────────────────────
 
     async def _full_simulation(self, p: dict) -> str:
-        mc = await self._monte_carlo(p)
+        mc_report = await self._monte_carlo(p)
         ts = await self._three_scenario(p)
         sens = await self._sensitivity(p)
         be = await self._breakeven(p)
@@ -63,8 +66,8 @@ class ScenarioSimulator(BaseTool):
         lines = [
             "# 🎲 시나리오 시뮬레이션 종합 보고서",
             "",
-            "## 1. Monte Carlo 시뮬레이션 (10,000회)",
-            mc,
+            "## 1. Monte Carlo 시뮬레이션",
+            mc_report,
             "",
             "## 2. 3-시나리오 분석",
             ts,
@@ -80,7 +83,7 @@ class ScenarioSimulator(BaseTool):
         ]
         return "\n".join(lines)
 
-    # ── Monte Carlo: 10,000회 시뮬레이션 ──────────────────
+    # ── Monte Carlo: 벡터 시뮬레이션 ──────────────────
 
     async def _monte_carlo(self, p: dict) -> str:
         # 핵심 변수: 각각 (최소, 최대, 기대값) 삼각분포
@@ -91,7 +94,8 @@ class ScenarioSimulator(BaseTool):
         cost_max = float(p.get("cost_max", 0))
         cost_mode = float(p.get("cost_mode", 0))
         currency = p.get("currency", "만원")
-        n_simulations = int(p.get("n_simulations", 10000))
+        n_simulations = mc.clamp_paths(p.get("n_simulations", DEFAULT_SIMULATIONS))
+        correlation = float(p.get("correlation", 0) or 0)  # 매출-비용 상관 (-1 ~ 1)
 
         if revenue_max <= 0 or cost_max <= 0:
             return self._monte_carlo_guide()
@@ -102,41 +106,23 @@ class ScenarioSimulator(BaseTool):
         if cost_mode <= 0:
             cost_mode = (cost_min + cost_max) / 2
 
-        profits = []
-        random.seed(42)  # 재현성 보장
-        for _ in range(n_simulations):
-            rev = random.triangular(revenue_min, revenue_max, revenue_mode)
-            cost = random.triangular(cost_min, cost_max, cost_mode)
-            profits.append(rev - cost)
-
-        profits.sort()
-        mean_profit = sum(profits) / len(profits)
-        median_profit = profits[len(profits) // 2]
-        p5 = profits[int(len(profits) * 0.05)]
-        p10 = profits[int(len(profits) * 0.10)]
-        p25 = profits[int(len(profits) * 0.25)]
-        p75 = profits[int(len(profits) * 0.75)]
-        p90 = profits[int(len(profits) * 0.90)]
-        p95 = profits[int(len(profits) * 0.95)]
-        min_profit = profits[0]
-        max_profit = profits[-1]
-
-        # 표준편차, 변동계수
-        variance = sum((x - mean_profit) ** 2 for x in profits) / len(profits)
-        std_dev = math.sqrt(variance)
-        cv = abs(std_dev / mean_profit) if mean_profit != 0 else float('inf')
-
-        # 손실 확률 (이익 < 0)
-        loss_count = sum(1 for x in profits if x < 0)
-        loss_prob = loss_count / len(profits) * 100
+        # NumPy 커널로 벡터 시뮬레이션 (스레드에서 실행 → 이벤트 루프 비차단)
+        st = await asyncio.to_thread(
+            self._simulate_profit, revenue_min, revenue_mode, revenue_max,
+            cost_min, cost_mode, cost_max, n_simulations, correlation,
+        )
+        pct = st["percentiles"]
+        mean_profit = st["mean"]
+        median_profit = pct[50]
+        p5, p10, p25, p75, p90, p95 = pct[5], pct[10], pct[25], pct[75], pct[90], pct[95]
+        min_profit = st["min"]
+        std_dev = st["std"]
+        cv = st["cv"]
+        loss_prob = st["loss_prob"] * 100
 
         # 히스토그램 (ASCII)
-        n_bins = 20
-        bin_width = (max_profit - min_profit) / n_bins if max_profit > min_profit else 1
-        bins = [0] * n_bins
-        for p_val in profits:
-            idx = min(int((p_val - min_profit) / bin_width), n_bins - 1)
-            bins[idx] += 1
+        bins, edges = st["histogram"]
+        bin_width = (edges[-1] - edges[0]) / len(bins) if edges[-1] > edges[0] else 1
         max_bin = max(bins) if bins else 1
 
         lines = [
@@ -145,6 +131,7 @@ class ScenarioSimulator(BaseTool):
             "**입력 변수 (삼각분포):**",
             f"- 매출: {revenue_min:,.0f} ~ {revenue_max:,.0f} (기대: {revenue_mode:,.0f}) {currency}",
             f"- 비용: {cost_min:,.0f} ~ {cost_max:,.0f} (기대: {cost_mode:,.0f}) {currency}",
+            f"- 매출-비용 상관계수: {correlation:+.2f}" if correlation else "- 매출-비용 독립",
             "",
             "**시뮬레이션 결과:**",
             "",
@@ -179,11 +166,25 @@ class ScenarioSimulator(BaseTool):
 
         lines.extend([
             "",
-            f"📌 **VaR(95%)**: 최악의 경우(5% 확률) 손실 = {abs(p5):,.0f} {currency}" if p5 < 0 else "",
+            f"📌 **VaR(95%)**: 최악의 경우(5% 확률) 손실 = {st['var']:,.0f} {currency}" if p5 < 0 else "",
+            f"📌 **CVaR(95%)**: 그 5% 구간의 평균 손실 = {st['cvar']:,.0f} {currency}" if st["cvar"] > 0 else "",
             f"📌 **결론**: {n_simulations:,}회 시뮬레이션 결과, 이익 발생 확률 {100 - loss_prob:.1f}%.",
         ])
         return "\n".join(lines)
 
+    @staticmethod
+    def _simulate_profit(rev_min: float, rev_mode: float, rev_max: float,
+                         cost_min: float, cost_mode: float, cost_max: float,
+                         n: int, correlation: float) -> dict:
+        """이익 = 매출 - 비용 (삼각분포, 선택적 순위상관) → 통계 요약."""
+        draws = mc.sample(
+            {"revenue": mc.triangular(rev_min, rev_mode, rev_max),
+             "cost": mc.triangular(cost_min, cost_mode, cost_max)},
+            n, rng=mc.make_rng(42),  # 재현성 보장
+            corr={("revenue", "cost"): correlation} if correlation else None,
+        )
+        return mc.summarize(draws["revenue"] - draws["cost"])
+
     def _monte_carlo_guide(self) -> str:
         return "\n".join([
             "### Monte Carlo 시뮬레이션을 위해 필요한 입력값:",
@@ -199,7 +200,8 @@ class ScenarioSimulator(BaseTool):
             "| cost_max | 비용 최대 | 3000 |",
             "| cost_mode | 비용 기대값 | 1500 |",
             "| currency | 단위 | 만원 |",
-            "| n_simulations | 시뮬레이션 횟수 | 10000 |",
+            f"| n_simulations | 시뮬레이션 횟수 (최대 {mc.MAX_PATHS:,}) | {DEFAULT_SIMULATIONS} |",
+            "| correlation | 매출-비용 상관계수 (선택, -1~1) | 0.5 |",
             "",
             "💡 삼각분포(Triangular): 최소, 최대, 가장 가능성 높은 값 3개로 불확실성을 표현합니다.",
         ])
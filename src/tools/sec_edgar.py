@@ -23,17 +23,13 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from src.tools import _sec_client as sec
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.sec_edgar")
 
-# SEC EDGAR API 엔드포인트
+# SEC EDGAR API 엔드포인트 (요청은 _sec_client의 공유·속도 제한 클라이언트로)
 EDGAR_BASE = "https://efts.sec.gov/LATEST"
-EDGAR_SUBMISSIONS = "https://data.sec.gov/submissions"
-SEC_HEADERS = {
-    "User-Agent": "CORTHEX-HQ/1.0 (corthex-hq.com; admin@corthex-hq.com)",
-    "Accept": "application/json",
-}
 
 # Form 4 거래 코드 해석 (SEC 공식)
 TRANSACTION_CODES = {
@@ -65,14 +61,6 @@ INSIDER_ROLES_KO = {
 }
 
 
-def _httpx():
-    try:
-        import httpx
-        return httpx
-    except ImportError:
-        return None
-
-
 def _yf():
     try:
         import yfinance as yf
@@ -106,27 +94,9 @@ class SecEdgarTool(BaseTool):
 
     # ── CIK 번호 조회 (ticker → CIK) ──
     async def _get_cik(self, symbol: str) -> str | None:
-        """SEC CIK 번호 조회 (회사 고유 식별번호)."""
-        httpx = _httpx()
-        if not httpx:
-            return None
+        """SEC CIK 번호 조회 (회사 고유 식별번호) — 로컬 티커 인덱스, 하루 1번 재검증."""
         try:
-            async with httpx.AsyncClient(timeout=15) as c:
-                r = await c.get(
-                    "https://efts.sec.gov/LATEST/search-index?q="
-                    f'"{symbol}"&dateRange=custom&startdt=2020-01-01&forms=10-K',
-                    headers=SEC_HEADERS,
-                )
-                # 대안: tickers.json에서 조회
-                r2 = await c.get(
-                    "https://www.sec.gov/files/company_tickers.json",
-                    headers=SEC_HEADERS,
-                )
-                if r2.status_code == 200:
-                    data = r2.json()
-                    for _, v in data.items():
-                        if v.get("ticker", "").upper() == symbol.upper():
-                            return str(v["cik_str"]).zfill(10)
+            return await sec.cik_for(symbol)
         except Exception as e:
             logger.warning("[SEC] CIK 조회 실패: %s", e)
         return None
@@ -196,35 +166,26 @@ class SecEdgarTool(BaseTool):
         return f"{symbol}의 SEC 공시를 조회할 수 없습니다. yfinance를 확인하세요."
 
     async def _fetch_edgar_filings(self, cik: str, form_type: str, limit: int) -> str:
-        """EDGAR submissions API로 직접 조회."""
-        httpx = _httpx()
-        if not httpx:
-            return "httpx 미설치"
+        """EDGAR submissions API로 직접 조회 (CIK별 캐시, ETag 재검증)."""
         try:
-            async with httpx.AsyncClient(timeout=15) as c:
-                r = await c.get(
-                    f"{EDGAR_SUBMISSIONS}/CIK{cik}.json",
-                    headers=SEC_HEADERS,
-                )
-                if r.status_code != 200:
-                    return f"EDGAR API 응답 오류: {r.status_code}"
-                data = r.json()
-                recent = data.get("filings", {}).get("recent", {})
-                forms = recent.get("form", [])
-                dates = recent.get("filingDate", [])
-                descs = recent.get("primaryDocDescription", [])
-                accessions = recent.get("accessionNumber", [])
-
-                lines = ["| 날짜 | 서식 | 설명 |", "|------|------|------|"]
-                count = 0
-                for i in range(min(len(forms), 50)):
-                    if form_type and form_type.upper() not in forms[i].upper():
-                        continue
-                    lines.append(f"| {dates[i]} | {forms[i]} | {descs[i] if i < len(descs) else ''} |")
-                    count += 1
-                    if count >= limit:
-                        break
-                return "\n".join(lines) if count > 0 else "해당 유형의 공시 없음"
+            data = await sec.submissions(cik)
+            if data is None:
+                return "EDGAR API 응답 오류 (캐시 없음)"
+            recent = data.get("filings", {}).get("recent", {})
+            forms = recent.get("form", [])
+            dates = recent.get("filingDate", [])
+            descs = recent.get("primaryDocDescription", [])
+
+            lines = ["| 날짜 | 서식 | 설명 |", "|------|------|------|"]
+            count = 0
+            for i in range(min(len(forms), 50)):
+                if form_type and form_type.upper() not in forms[i].upper():
+                    continue
+                lines.append(f"| {dates[i]} | {forms[i]} | {descs[i] if i < len(descs) else ''} |")
+                count += 1
+                if count >= limit:
+                    break
+            return "\n".join(lines) if count > 0 else "해당 유형의 공시 없음"
         except Exception as e:
             return f"EDGAR API 오류: {e}"
 
@@ -396,10 +357,6 @@ class SecEdgarTool(BaseTool):
         form_type = kw.get("form_type", "")
         limit = min(int(kw.get("limit", 10)), 20)
 
-        httpx = _httpx()
-        if not httpx:
-            return "httpx 미설치"
-
         try:
             params = {
                 "q": query,
@@ -410,35 +367,32 @@ class SecEdgarTool(BaseTool):
             if form_type:
                 params["forms"] = form_type
 
-            async with httpx.AsyncClient(timeout=15) as c:
-                r = await c.get(
-                    f"{EDGAR_BASE}/search-index",
-                    params=params,
-                    headers=SEC_HEADERS,
-                )
-                if r.status_code != 200:
-                    return f"EDGAR 검색 API 오류: {r.status_code}"
-
-                data = r.json()
-                hits = data.get("hits", {}).get("hits", [])
-
-                if not hits:
-                    return f"'{query}'에 대한 SEC 검색 결과 없음"
-
-                lines = [
-                    f"## SEC EDGAR 검색: '{query}'\n",
-                    f"총 {data.get('hits', {}).get('total', {}).get('value', 0)}건 중 상위 {limit}건\n",
-                    "| 날짜 | 회사 | 서식 | 내용 요약 |",
-                    "|------|------|------|----------|",
-                ]
-                for hit in hits[:limit]:
-                    src = hit.get("_source", {})
-                    date = str(src.get("file_date", ""))[:10]
-                    company = str(src.get("display_names", [""])[0] if src.get("display_names") else "")[:25]
-                    form = src.get("form_type", "")
-                    desc = str(src.get("display_description", ""))[:50]
-                    lines.append(f"| {date} | {company} | {form} | {desc} |")
+            r = await sec.get(f"{EDGAR_BASE}/search-index", params=params)
+            if r is None:
+                return "httpx 미설치"
+            if r.status_code != 200:
+                return f"EDGAR 검색 API 오류: {r.status_code}"
 
-                return "\n".join(lines)
+            data = r.json()
+            hits = data.get("hits", {}).get("hits", [])
+
+            if not hits:
+                return f"'{query}'에 대한 SEC 검색 결과 없음"
+
+            lines = [
+                f"## SEC EDGAR 검색: '{query}'\n",
+                f"총 {data.get('hits', {}).get('total', {}).get('value', 0)}건 중 상위 {limit}건\n",
+                "| 날짜 | 회사 | 서식 | 내용 요약 |",
+                "|------|------|------|----------|",
+            ]
+            for hit in hits[:limit]:
+                src = hit.get("_source", {})
+                date = str(src.get("file_date", ""))[:10]
+                company = str(src.get("display_names", [""])[0] if src.get("display_names") else "")[:25]
+                form = src.get("form_type", "")
+                desc = str(src.get("display_description", ""))[:50]
+                lines.append(f"| {date} | {company} | {form} | {desc} |")
+
+            return "\n".join(lines)
         except Exception as e:
             return f"EDGAR 검색 실패: {e}"
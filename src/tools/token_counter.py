@@ -1,6 +1,7 @@
 """토큰 카운터 도구 — AI 모델 토큰 수 계산 및 비용 예측."""
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from typing import Any
@@ -33,6 +34,46 @@ _MODEL_ENCODINGS: dict[str, str] = {
 }
 
 
+@functools.lru_cache(maxsize=8)
+def get_encoder(model: str = ""):
+    """모델에 맞는 tiktoken 인코더 (프로세스 내 캐시). tiktoken 없으면 None."""
+    tiktoken = _get_tiktoken()
+    if tiktoken is None:
+        return None
+    encoding_name = _MODEL_ENCODINGS.get(model, "cl100k_base")
+    try:
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    """토큰 수. tiktoken이 없으면 UTF-8 바이트/3 근사 (한글 1자≈1토큰, 영문은 다소 과대)."""
+    if not text:
+        return 0
+    encoder = get_encoder(model)
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "") -> str:
+    """앞에서부터 max_tokens 토큰까지만 남김."""
+    if not text or max_tokens <= 0:
+        return ""
+    encoder = get_encoder(model)
+    if encoder is not None:
+        tokens = encoder.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoder.decode(tokens[:max_tokens])
+    n = count_tokens(text, model)
+    if n <= max_tokens:
+        return text
+    return text[: max(1, len(text) * max_tokens // n)]
+
+
 class TokenCounterTool(BaseTool):
     """텍스트의 토큰 수 계산, 비용 예측, 토큰 한도 맞춤 자르기."""
 
@@ -57,15 +98,7 @@ class TokenCounterTool(BaseTool):
 
     def _get_encoder(self, model: str):
         """모델에 맞는 tiktoken 인코더 반환."""
-        tiktoken = _get_tiktoken()
-        if tiktoken is None:
-            return None
-
-        encoding_name = _MODEL_ENCODINGS.get(model, "cl100k_base")
-        try:
-            return tiktoken.get_encoding(encoding_name)
-        except Exception:
-            return tiktoken.get_encoding("cl100k_base")
+        return get_encoder(model)
 
     def _load_model_prices(self) -> dict[str, dict]:
         """models.yaml에서 모델별 가격 정보 로드."""
@@ -23,7 +23,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
-from src.tools.base import BaseTool
+from src.tools import _us_snapshot as snap
+from src.tools.base import BaseTool, ToolFailure
 
 logger = logging.getLogger("corthex.tools.us_stock")
 
@@ -143,9 +144,10 @@ class UsStockTool(BaseTool):
             pass
 
         try:
-            t = yf.Ticker(symbol)
-            info = t.info or {}
-            hist = t.history(period="5d")
+            t = snap.ticker(symbol)
+            info, hist = await asyncio.gather(
+                snap.info(symbol), asyncio.to_thread(t.history, period="5d"),
+            )
 
             if hist.empty:
                 return f"'{symbol}' 데이터를 찾을 수 없습니다. 심볼을 확인해주세요."
@@ -217,7 +219,7 @@ class UsStockTool(BaseTool):
 
         except Exception as e:
             logger.error("quote 실패 %s: %s", symbol, e)
-            return f"조회 실패 ({symbol}): {e}"
+            return ToolFailure(f"조회 실패 ({symbol}): {e}")
 
     # ── financials: 재무제표 ─────────────────
     async def _financials(self, kw: dict) -> str:
@@ -233,20 +235,21 @@ class UsStockTool(BaseTool):
         period = kw.get("period", "annual")  # annual, quarterly
 
         try:
-            t = yf.Ticker(symbol)
-            name = (t.info or {}).get("longName", symbol)
-
-            if stmt_type == "income":
-                df = t.quarterly_income_stmt if period == "quarterly" else t.income_stmt
-                title = "손익계산서"
-            elif stmt_type == "balance":
-                df = t.quarterly_balance_sheet if period == "quarterly" else t.balance_sheet
-                title = "대차대조표"
-            elif stmt_type == "cashflow":
-                df = t.quarterly_cashflow if period == "quarterly" else t.cashflow
-                title = "현금흐름표"
-            else:
+            stmt_attrs = {
+                "income": ("income_stmt", "quarterly_income_stmt", "손익계산서"),
+                "balance": ("balance_sheet", "quarterly_balance_sheet", "대차대조표"),
+                "cashflow": ("cashflow", "quarterly_cashflow", "현금흐름표"),
+            }
+            if stmt_type not in stmt_attrs:
                 return f"type은 income/balance/cashflow 중 하나. 입력값: {stmt_type}"
+            annual_attr, quarterly_attr, title = stmt_attrs[stmt_type]
+
+            t = snap.ticker(symbol)
+            info, df = await asyncio.gather(
+                snap.info(symbol),
+                asyncio.to_thread(getattr, t, quarterly_attr if period == "quarterly" else annual_attr),
+            )
+            name = info.get("longName", symbol)
 
             if df is None or df.empty:
                 return f"{symbol}의 {title} 데이터가 없습니다."
@@ -301,7 +304,7 @@ class UsStockTool(BaseTool):
 
         except Exception as e:
             logger.error("financials 실패 %s: %s", symbol, e)
-            return f"재무제표 조회 실패 ({symbol}): {e}"
+            return ToolFailure(f"재무제표 조회 실패 ({symbol}): {e}")
 
     # ── ohlcv: OHLCV 데이터 ──────────────────
     async def _ohlcv(self, kw: dict) -> str:
@@ -346,13 +349,13 @@ class UsStockTool(BaseTool):
             pass
 
         try:
-            t = yf.Ticker(symbol)
-            hist = t.history(period=period, interval=interval)
+            t = snap.ticker(symbol)
+            hist = await asyncio.to_thread(t.history, period=period, interval=interval)
 
             if hist.empty:
                 return f"'{symbol}' OHLCV 데이터가 없습니다."
 
-            name = (t.info or {}).get("longName", symbol)
+            name = (await snap.info(symbol)).get("longName", symbol)
             total_return = ((hist.iloc[-1]["Close"] - hist.iloc[0]["Close"]) / hist.iloc[0]["Close"]) * 100
             high_max = hist["High"].max()
             low_min = hist["Low"].min()
@@ -381,7 +384,7 @@ class UsStockTool(BaseTool):
 
         except Exception as e:
             logger.error("ohlcv 실패 %s: %s", symbol, e)
-            return f"OHLCV 조회 실패 ({symbol}): {e}"
+            return ToolFailure(f"OHLCV 조회 실패 ({symbol}): {e}")
 
     # ── indicators: 기술적 지표 ──────────────
     async def _indicators(self, kw: dict) -> str:
@@ -474,13 +477,13 @@ class UsStockTool(BaseTool):
             pass
 
         try:
-            t = yf.Ticker(symbol)
-            hist = t.history(period=f"{days}d")
+            t = snap.ticker(symbol)
+            hist = await asyncio.to_thread(t.history, period=f"{days}d")
 
             if hist.empty or len(hist) < 20:
                 return f"'{symbol}' 충분한 데이터가 없습니다 (최소 20일 필요)."
 
-            name = (t.info or {}).get("longName", symbol)
+            name = (await snap.info(symbol)).get("longName", symbol)
             close = hist["Close"]
             high = hist["High"]
             low = hist["Low"]
@@ -608,7 +611,7 @@ class UsStockTool(BaseTool):
 
         except Exception as e:
             logger.error("indicators 실패 %s: %s", symbol, e)
-            return f"기술적 지표 조회 실패 ({symbol}): {e}"
+            return ToolFailure(f"기술적 지표 조회 실패 ({symbol}): {e}")
 
     # ── peers: 동종업체 비교 ─────────────────
     async def _peers(self, kw: dict) -> str:
@@ -628,8 +631,7 @@ class UsStockTool(BaseTool):
                 peer_list = [s.upper().strip() for s in peers_str.split(",")]
         else:
             # 같은 섹터 대표종목 자동 매칭
-            t = yf.Ticker(symbol)
-            sector = (t.info or {}).get("sector", "")
+            sector = (await snap.info(symbol)).get("sector", "")
             peer_list = self._get_sector_peers(symbol, sector)
 
         all_symbols = [symbol] + [p for p in peer_list if p != symbol]
@@ -638,12 +640,19 @@ class UsStockTool(BaseTool):
         lines.append("| 종목 | 현재가 | 시총 | PER | PBR | 배당률 | 베타 | 52주 수익률 |")
         lines.append("|------|--------|------|-----|-----|--------|------|-----------|")
 
-        for sym in all_symbols[:8]:  # 최대 8개
+        all_symbols = all_symbols[:8]  # 최대 8개
+        # 1년 일봉은 일괄 조회 1회, info는 동시 조회 (거래일 메모)
+        prices, infos = await asyncio.gather(
+            snap.histories(all_symbols, "1y"), snap.infos(all_symbols),
+        )
+
+        for sym in all_symbols:
             try:
-                t = yf.Ticker(sym)
-                info = t.info or {}
-                price_data = t.history(period="5d")
-                cur_price = price_data.iloc[-1]["Close"] if not price_data.empty else 0
+                rows = prices.get(sym) or []
+                info = infos.get(sym) or {}
+                if not rows and not info:
+                    raise ValueError("데이터 없음")
+                cur_price = rows[-1]["close"] if rows else 0
 
                 mcap = info.get("marketCap", 0)
                 mcap_str = f"${mcap / 1e12:,.1f}T" if mcap >= 1e12 else f"${mcap / 1e9:,.0f}B" if mcap else "-"
@@ -657,9 +666,8 @@ class UsStockTool(BaseTool):
                 beta_str = f"{beta:.2f}" if beta else "-"
 
                 # 52주 수익률
-                hist_1y = t.history(period="1y")
-                if not hist_1y.empty and len(hist_1y) > 1:
-                    ret_1y = ((hist_1y.iloc[-1]["Close"] - hist_1y.iloc[0]["Close"]) / hist_1y.iloc[0]["Close"]) * 100
+                if len(rows) > 1 and rows[0]["close"]:
+                    ret_1y = ((rows[-1]["close"] - rows[0]["close"]) / rows[0]["close"]) * 100
                     ret_str = f"{ret_1y:+.1f}%"
                 else:
                     ret_str = "-"
@@ -685,11 +693,13 @@ class UsStockTool(BaseTool):
             return "symbol 파라미터가 필요합니다."
 
         try:
-            t = yf.Ticker(symbol)
-            name = (t.info or {}).get("longName", symbol)
+            t = snap.ticker(symbol)
+            info, earnings = await asyncio.gather(
+                snap.info(symbol), asyncio.to_thread(getattr, t, "quarterly_earnings", None),
+            )
+            name = info.get("longName", symbol)
 
             # 분기별 실적
-            earnings = getattr(t, "quarterly_earnings", None)
             if earnings is not None and not earnings.empty:
                 lines = [f"## {name} ({symbol}) 실적 서프라이즈\n"]
                 lines.append("| 분기 | 실제 EPS | 예상 EPS | 서프라이즈 |")
@@ -711,7 +721,7 @@ class UsStockTool(BaseTool):
                 return "\n".join(lines)
 
             # earnings_dates 폴백
-            dates = getattr(t, "earnings_dates", None)
+            dates = await asyncio.to_thread(getattr, t, "earnings_dates", None)
             if dates is not None and not dates.empty:
                 lines = [f"## {name} ({symbol}) 실적 발표 일정\n"]
                 lines.append("| 발표일 | 예상 EPS | 실제 EPS | 서프라이즈 |")
@@ -735,7 +745,7 @@ class UsStockTool(BaseTool):
 
         except Exception as e:
             logger.error("earnings 실패 %s: %s", symbol, e)
-            return f"실적 조회 실패 ({symbol}): {e}"
+            return ToolFailure(f"실적 조회 실패 ({symbol}): {e}")
 
     # ── screener: 종목 스크리닝 ──────────────
     async def _screener(self, kw: dict) -> str:
@@ -756,15 +766,17 @@ class UsStockTool(BaseTool):
         lines.append("| 종목 | 이름 | 현재가 | 등락률 | 시총 | PER |")
         lines.append("|------|------|--------|--------|------|-----|")
 
+        # 5일 일봉 일괄 조회 1회 + info 동시 조회 (거래일 메모)
+        prices, infos = await asyncio.gather(snap.histories(symbols, "5d"), snap.infos(symbols))
+
         for sym in symbols:
             try:
-                t = yf.Ticker(sym)
-                info = t.info or {}
-                hist = t.history(period="5d")
-                if hist.empty:
+                rows = prices.get(sym) or []
+                if not rows:
                     continue
-                cur = hist.iloc[-1]["Close"]
-                prev = hist.iloc[-2]["Close"] if len(hist) > 1 else cur
+                info = infos.get(sym) or {}
+                cur = rows[-1]["close"]
+                prev = rows[-2]["close"] if len(rows) > 1 else cur
                 chg = ((cur - prev) / prev) * 100 if prev else 0
                 name_short = (info.get("shortName") or sym)[:15]
                 mcap = info.get("marketCap", 0)
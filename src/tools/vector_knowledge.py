@@ -1,11 +1,19 @@
-"""벡터 지식베이스 도구 — 의미 기반 지식 검색 (RAG)."""
+"""벡터 지식베이스 도구 — 의미 기반 지식 검색 (RAG).
+
+임베딩은 src/tools/_embedding_service.py (요청 병합 배치 + 본문 해시 캐시),
+ChromaDB 클라이언트·컬렉션은 프로세스에서 한 번만 열어 재사용합니다.
+블로킹인 ChromaDB 호출은 asyncio.to_thread로 이벤트 루프 밖에서 실행합니다.
+"""
 from __future__ import annotations
 
-import json
+import asyncio
 import logging
 import os
+import threading
+from datetime import datetime
 from typing import Any
 
+from src.tools._embedding_service import EmbeddingError, default_model, embedding_service
 from src.tools.base import BaseTool
 
 logger = logging.getLogger("corthex.tools.vector_knowledge")
@@ -21,48 +29,67 @@ def _get_chromadb():
         return None
 
 
-def _get_openai():
-    try:
-        import openai
-        return openai
-    except ImportError:
-        return None
+_client = None
+_collections: dict[str, Any] = {}
+_client_lock = threading.Lock()
 
 
-class VectorKnowledgeTool(BaseTool):
-    """의미 기반 지식 검색 도구 — ChromaDB + OpenAI Embeddings으로 RAG 구현."""
+def _open_client():
+    """ChromaDB 영구 클라이언트 (프로세스당 1개). 반환: (client, 에러 메시지)."""
+    global _client
+    if _client is not None:
+        return _client, None
+    chromadb = _get_chromadb()
+    if chromadb is None:
+        return None, "chromadb 라이브러리가 설치되지 않았습니다. pip install chromadb"
+    with _client_lock:
+        if _client is None:
+            os.makedirs(VECTOR_DB_DIR, exist_ok=True)
+            try:
+                _client = chromadb.PersistentClient(path=VECTOR_DB_DIR)
+            except Exception as e:
+                return None, f"ChromaDB 초기화 실패: {e}"
+    return _client, None
 
-    EMBEDDING_MODEL = "text-embedding-3-small"
 
-    def _get_client(self):
-        """ChromaDB 영구 클라이언트 생성."""
-        chromadb = _get_chromadb()
-        if chromadb is None:
-            return None, "chromadb 라이브러리가 설치되지 않았습니다. pip install chromadb"
+def _collection(client, name: str, create: bool, model: str = ""):
+    """컬렉션 핸들 캐시. 임베딩 모델 메타데이터는 새로 만들 때만 기록 (기존 값은 덮어쓰지 않음).
 
-        os.makedirs(VECTOR_DB_DIR, exist_ok=True)
-        try:
-            client = chromadb.PersistentClient(path=VECTOR_DB_DIR)
-            return client, None
-        except Exception as e:
-            return None, f"ChromaDB 초기화 실패: {e}"
+    create=True면 model로 쓰려는 것 — 기존 컬렉션의 기록된 모델과 다르면 EmbeddingError
+    (차원·공간이 다른 벡터가 한 컬렉션에 섞이지 않게).
+    """
+    col = _collections.get(name)
+    if col is None:
+        if create:
+            try:
+                col = client.get_collection(name=name)
+            except Exception:
+                try:
+                    col = client.create_collection(name=name, metadata={"embedding_model": model})
+                except Exception:
+                    col = client.get_collection(name=name)   # 동시에 다른 쪽이 먼저 만든 경우
+        else:
+            col = client.get_collection(name=name)
+        _collections[name] = col
+    if create:
+        stored = (getattr(col, "metadata", None) or {}).get("embedding_model")
+        if stored and model and stored != model:
+            raise EmbeddingError(
+                f"컬렉션 '{name}'은(는) {stored} 임베딩으로 만들어졌습니다 (현재 모델: {model}). "
+                "같은 모델로 추가하거나 새 컬렉션을 사용하세요."
+            )
+    return col
 
-    def _get_embedding(self, text: str) -> list[float] | str:
-        """OpenAI 임베딩 생성."""
-        openai = _get_openai()
-        if openai is None:
-            return "openai 라이브러리가 설치되지 않았습니다."
 
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        if not api_key:
-            return "OPENAI_API_KEY 환경변수가 설정되지 않았습니다."
+def _collection_model(col) -> str:
+    return (getattr(col, "metadata", None) or {}).get("embedding_model") or default_model()
 
-        try:
-            client = openai.OpenAI(api_key=api_key)
-            response = client.embeddings.create(model=self.EMBEDDING_MODEL, input=text)
-            return response.data[0].embedding
-        except Exception as e:
-            return f"임베딩 생성 실패: {e}"
+
+class VectorKnowledgeTool(BaseTool):
+    """의미 기반 지식 검색 도구 — ChromaDB + 공통 임베딩 서비스로 RAG 구현."""
+
+    async def _get_client(self):
+        return await asyncio.to_thread(_open_client)
 
     async def execute(self, **kwargs: Any) -> Any:
         action = kwargs.get("action", "search")
@@ -94,24 +121,28 @@ class VectorKnowledgeTool(BaseTool):
         if not query:
             return "검색어(query)를 입력해주세요."
 
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
         try:
-            collection = client.get_collection(name=collection_name)
+            collection = await asyncio.to_thread(_collection, client, collection_name, False)
         except Exception:
             return f"컬렉션 '{collection_name}'을 찾을 수 없습니다. add action으로 먼저 지식을 추가하세요."
 
-        query_embedding = self._get_embedding(query)
-        if isinstance(query_embedding, str):
-            return query_embedding
-
         try:
-            results = collection.query(
-                query_embeddings=[query_embedding],
+            query_embedding = await embedding_service.embed_one(query, _collection_model(collection))
+        except EmbeddingError as e:
+            return str(e)
+
+        def _query():
+            return collection.query(
+                query_embeddings=[query_embedding.tolist()],
                 n_results=min(top_k, collection.count()),
             )
+
+        try:
+            results = await asyncio.to_thread(_query)
         except Exception as e:
             return f"검색 실패: {e}"
 
@@ -155,23 +186,32 @@ class VectorKnowledgeTool(BaseTool):
         if not text:
             return "추가할 텍스트(text)를 입력해주세요."
 
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
-        embedding = self._get_embedding(text)
-        if isinstance(embedding, str):
-            return embedding
-
         try:
-            collection = client.get_or_create_collection(name=collection_name)
+            collection = await asyncio.to_thread(
+                _collection, client, collection_name, True, default_model(),
+            )
+            embedding = await embedding_service.embed_one(text, _collection_model(collection))
+        except EmbeddingError as e:
+            return str(e)
+        except Exception as e:
+            return f"지식 추가 실패: {e}"
+
+        def _store():
             doc_id = f"doc_{collection.count() + 1}"
             collection.add(
                 documents=[text],
-                embeddings=[embedding],
-                metadatas=[{"source": source, "added_at": str(__import__("datetime").datetime.now())}],
+                embeddings=[embedding.tolist()],
+                metadatas=[{"source": source, "added_at": str(datetime.now())}],
                 ids=[doc_id],
             )
+            return doc_id
+
+        try:
+            doc_id = await asyncio.to_thread(_store)
             logger.info("지식 추가: %s (컬렉션: %s)", doc_id, collection_name)
             return (
                 f"## 지식 추가 완료\n\n"
@@ -220,32 +260,34 @@ class VectorKnowledgeTool(BaseTool):
             if chunk.strip():
                 chunks.append(chunk)
 
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
-        # 일괄 임베딩 + 저장
-        openai = _get_openai()
-        api_key = os.getenv("OPENAI_API_KEY", "")
-        if not openai or not api_key:
-            return "OPENAI_API_KEY가 필요합니다."
-
+        # 일괄 임베딩 (서비스가 배치 분할 + 캐시) + 저장
         try:
-            oa_client = openai.OpenAI(api_key=api_key)
-            response = oa_client.embeddings.create(model=self.EMBEDDING_MODEL, input=chunks)
-            embeddings = [item.embedding for item in response.data]
+            collection = await asyncio.to_thread(
+                _collection, client, collection_name, True, default_model(),
+            )
+            embeddings = await embedding_service.embed(chunks, _collection_model(collection))
+        except EmbeddingError as e:
+            return str(e)
+        except Exception as e:
+            return f"파일 지식 추가 실패: {e}"
 
-            collection = client.get_or_create_collection(name=collection_name)
-            base_id = collection.count()
-            source = os.path.basename(file_path)
+        source = os.path.basename(file_path)
 
+        def _store():
+            base_id = collection.count()
             collection.add(
                 documents=chunks,
-                embeddings=embeddings,
+                embeddings=embeddings.tolist(),
                 metadatas=[{"source": source, "chunk": i} for i in range(len(chunks))],
                 ids=[f"doc_{base_id + i + 1}" for i in range(len(chunks))],
             )
 
+        try:
+            await asyncio.to_thread(_store)
             logger.info("파일 지식 추가: %s (%d 청크)", file_path, len(chunks))
             return (
                 f"## 파일 지식 추가 완료\n\n"
@@ -260,20 +302,23 @@ class VectorKnowledgeTool(BaseTool):
 
     async def _list_collections(self, kwargs: dict) -> str:
         """컬렉션 목록 조회."""
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
+        def _list():
+            return [(col.name, col.count()) for col in client.list_collections()]
+
         try:
-            collections = client.list_collections()
+            collections = await asyncio.to_thread(_list)
             if not collections:
                 return "저장된 컬렉션이 없습니다. add action으로 지식을 추가하세요."
 
             lines = ["## 지식베이스 컬렉션 목록\n"]
             lines.append("| 컬렉션 | 문서 수 |")
             lines.append("|--------|--------|")
-            for col in collections:
-                lines.append(f"| {col.name} | {col.count()} |")
+            for name, count in collections:
+                lines.append(f"| {name} | {count} |")
 
             return "\n".join(lines)
         except Exception as e:
@@ -287,37 +332,44 @@ class VectorKnowledgeTool(BaseTool):
         if not collection_name:
             return "삭제할 컬렉션 이름(collection)을 입력해주세요."
 
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
-        try:
+        def _remove():
             if doc_id:
-                collection = client.get_collection(name=collection_name)
-                collection.delete(ids=[doc_id])
-                return f"문서 삭제 완료: {doc_id} (컬렉션: {collection_name})"
+                _collection(client, collection_name, False).delete(ids=[doc_id])
             else:
+                _collections.pop(collection_name, None)
                 client.delete_collection(name=collection_name)
-                return f"컬렉션 삭제 완료: {collection_name}"
+
+        try:
+            await asyncio.to_thread(_remove)
+            if doc_id:
+                return f"문서 삭제 완료: {doc_id} (컬렉션: {collection_name})"
+            return f"컬렉션 삭제 완료: {collection_name}"
         except Exception as e:
             return f"삭제 실패: {e}"
 
     async def _stats(self, kwargs: dict) -> str:
         """저장 통계."""
-        client, err = self._get_client()
+        client, err = await self._get_client()
         if err:
             return err
 
+        def _counts():
+            return [col.count() for col in client.list_collections()]
+
         try:
-            collections = client.list_collections()
-            total_docs = sum(col.count() for col in collections)
+            counts = await asyncio.to_thread(_counts)
+            total_docs = sum(counts)
 
             lines = [
                 f"## 벡터 지식베이스 통계\n",
-                f"- 컬렉션 수: {len(collections)}개",
+                f"- 컬렉션 수: {len(counts)}개",
                 f"- 총 문서 수: {total_docs}개",
                 f"- 저장 경로: {VECTOR_DB_DIR}",
-                f"- 임베딩 모델: {self.EMBEDDING_MODEL}",
+                f"- 임베딩 모델: {default_model()}",
             ]
 
             return "\n".join(lines)
@@ -0,0 +1,75 @@
+"""내부통신 병합 목록 keyset 페이지네이션 테스트.
+
+테스트 대상:
+  - /api/comms/messages: delegation_log + cross_agent_messages를 커서로 끝까지 넘기면
+    타임스탬프가 같은 행이 있어도 빠짐·중복 없이 전부 나오는지
+  - /api/delegation-log/{id}: 없는 id는 404
+"""
+import json
+import os
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+os.environ.setdefault("CORTHEX_DB_PATH", str(Path(__file__).parent / "_test_rework.db"))
+
+from db import get_connection, init_db
+from handlers.activity_handler import router
+from src.tools.cross_agent_protocol import _get_conn
+
+
+def _make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def setup_module():
+    init_db()
+    _get_conn().close()   # cross_agent_messages 테이블 생성
+    conn = get_connection()
+    try:
+        conn.execute("DELETE FROM delegation_log")
+        conn.execute("DELETE FROM cross_agent_messages")
+        # 같은 타임스탬프에 두 소스가 섞여 있는 경우를 일부러 만듦
+        stamps = ["2026-01-01 10:00:00"] * 5 + ["2026-01-01 09:00:00"] * 3
+        for i, ts in enumerate(stamps):
+            conn.execute(
+                "INSERT INTO delegation_log (sender, receiver, message, created_at) VALUES (?, ?, ?, ?)",
+                ("cio", "analyst", f"위임 {i}", ts),
+            )
+            conn.execute(
+                "INSERT INTO cross_agent_messages (id, msg_type, from_agent, to_agent, data, created_at) "
+                "VALUES (?, 'p2p', 'cto', 'cmo', ?, ?)",
+                (f"msg-{i:02d}", json.dumps({"message": f"협업 {i}"}), ts),
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_cursor_walk_covers_tied_timestamps():
+    client = _make_client()
+    seen: list[str] = []
+    cursor = ""
+    for _ in range(20):
+        resp = client.get("/api/comms/messages", params={"limit": 3, "cursor": cursor})
+        assert resp.status_code == 200
+        seen += [m["id"] for m in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor", "")
+        if not cursor:
+            break
+    assert len(seen) == 16
+    assert len(set(seen)) == 16
+    full = [m["id"] for m in client.get("/api/comms/messages", params={"limit": 100}).json()]
+    assert seen == full
+
+
+def test_delegation_log_detail_404():
+    resp = _make_client().get("/api/delegation-log/987654")
+    assert resp.status_code == 404
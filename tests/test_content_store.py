@@ -0,0 +1,124 @@
+"""본문 압축 저장소(content_blobs) 테스트.
+
+테스트 대상:
+  - pack/unpack: 큰 본문은 참조 문자열, 작은 본문은 그대로
+  - 같은 본문은 blob 1개만 (중복 제거)
+  - 작업·아카이브 삭제 시 참조가 남은 blob은 유지, 마지막 참조가 사라지면 정리
+  - 결과 본문 교체 시 이전 blob 참조 해제, gc_orphans의 참조 수 재집계
+"""
+import os
+import sys
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+os.environ.setdefault("CORTHEX_DB_PATH", str(Path(__file__).parent / "_test_rework.db"))
+
+import content_store
+from db import (
+    create_task,
+    delete_archive,
+    delete_task,
+    get_archive,
+    get_connection,
+    get_task,
+    init_db,
+    save_archive,
+    update_task,
+)
+
+_BIG = "분기 보고서 본문 " * 800     # MIN_BYTES 이상
+
+
+def setup_module():
+    init_db()
+    conn = get_connection()
+    try:
+        conn.execute("DELETE FROM content_blobs")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _blob_count() -> int:
+    conn = get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM content_blobs").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_pack_small_and_large():
+    conn = get_connection()
+    try:
+        assert content_store.pack(conn, "짧은 본문") == "짧은 본문"
+        ref = content_store.pack(conn, _BIG)
+        assert content_store.is_ref(ref)
+        assert content_store.unpack(conn, ref) == _BIG
+        conn.rollback()
+    finally:
+        conn.close()
+
+
+def test_task_blob_refcount_and_gc():
+    a = create_task("보고서 A")["task_id"]
+    b = create_task("보고서 B")["task_id"]
+    update_task(a, result_data=_BIG)
+    update_task(b, result_data=_BIG)
+    assert _blob_count() == 1                  # 같은 본문 → blob 1개
+    assert get_task(b)["result_data"] == _BIG
+
+    delete_task(a)
+    assert _blob_count() == 1                  # b가 아직 참조
+    assert get_task(b)["result_data"] == _BIG
+
+    delete_task(b)
+    assert _blob_count() == 0
+
+
+def test_archive_delete_collects_blob():
+    save_archive("finance", "gc_test.md", _BIG + "아카이브")
+    assert _blob_count() == 1
+    assert get_archive("finance", "gc_test.md")["content"] == _BIG + "아카이브"
+    assert delete_archive("finance", "gc_test.md")
+    assert _blob_count() == 0
+
+
+def _refs() -> dict:
+    conn = get_connection()
+    try:
+        return {r[0]: r[1] for r in conn.execute("SELECT hash, refs FROM content_blobs")}
+    finally:
+        conn.close()
+
+
+def test_result_overwrite_releases_old_blob():
+    t = create_task("보고서 C")["task_id"]
+    update_task(t, result_data=_BIG)
+    update_task(t, result_data=_BIG)           # 같은 본문 재저장 → 참조 수 그대로
+    assert list(_refs().values()) == [1]
+    update_task(t, result_data=_BIG + "수정본")
+    assert list(_refs().values()) == [1]       # 이전 본문 blob은 즉시 삭제
+    assert get_task(t)["result_data"] == _BIG + "수정본"
+    update_task(t, result_data="짧은 결과")
+    assert _blob_count() == 0
+    delete_task(t)
+
+
+def test_gc_orphans_recounts_refs():
+    a = create_task("보고서 D")["task_id"]
+    b = create_task("보고서 E")["task_id"]
+    update_task(a, result_data=_BIG)
+    update_task(b, result_data=_BIG)
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE content_blobs SET refs = 0")   # refs 도입 전 DB 흉내
+        assert content_store.gc_orphans(conn) == 0
+        conn.commit()
+    finally:
+        conn.close()
+    assert list(_refs().values()) == [2]
+    delete_task(a)
+    delete_task(b)
+    assert _blob_count() == 0
@@ -0,0 +1,47 @@
+"""대화 기록 캐시(conv_history) 테스트.
+
+테스트 대상:
+  - abuild(): 메시지 저장 직후 호출도 새 턴을 바로 반영 (저장 알림으로 stale 표시, SYNC_INTERVAL 대기 없음)
+  - 저장이 없으면 SYNC_INTERVAL 안의 재호출은 DB를 다시 읽지 않음
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+os.environ.setdefault("CORTHEX_DB_PATH", str(Path(__file__).parent / "_test_rework.db"))
+
+import conv_history
+from db import create_conversation, init_db, save_conversation_message
+
+
+def setup_module():
+    init_db()
+
+
+def test_saved_message_visible_without_waiting(monkeypatch):
+    cache = conv_history.ConversationHistoryCache()
+    conv_id = create_conversation(title="기록 캐시 테스트")["conversation_id"]
+    save_conversation_message("user", text="삼성전자 분석해줘", conversation_id=conv_id)
+    save_conversation_message("result", content="분석 결과입니다.", conversation_id=conv_id)
+
+    calls = []
+    real_tail = conv_history.load_conversation_tail
+    monkeypatch.setattr(conv_history, "load_conversation_tail",
+                        lambda *a, **kw: calls.append(1) or real_tail(*a, **kw))
+
+    async def run():
+        first = await cache.abuild(conv_id, "다음 질문")
+        again = await cache.abuild(conv_id, "다음 질문")          # 저장 없음 → DB 재조회 없음
+        save_conversation_message("user", text="SK하이닉스는?", conversation_id=conv_id)
+        after = await cache.abuild(conv_id, "다음 질문")
+        return first, again, after
+
+    first, again, after = asyncio.run(run())
+    assert [h["content"] for h in first] == ["삼성전자 분석해줘", "분석 결과입니다."]
+    assert again == first
+    assert after[-1] == {"role": "user", "content": "SK하이닉스는?"}
+    assert len(calls) == 2
@@ -0,0 +1,39 @@
+"""대시보드 정적 정보(도구 수·API 키) 캐시 테스트.
+
+테스트 대상:
+  - _dashboard_static_info(): ToolPool 공개 API(loaded_names)로 도구 수를 세고,
+    도구 스키마 재파싱(_load_tool_schemas) 폴백을 타지 않는지
+"""
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+os.environ.setdefault("CORTHEX_DB_PATH", str(Path(__file__).parent / "_test_rework.db"))
+
+import arm_server
+from src.tools.pool import ToolPool, _LazyTool
+
+
+def test_tool_count_uses_pool_without_schema_fallback(monkeypatch):
+    pool = ToolPool(model_router=None)
+    for tid in ("kr_stock", "dart_api"):
+        pool.register(_LazyTool(SimpleNamespace(tool_id=tid, name_ko=tid), f"x.{tid}", None))
+    broken = _LazyTool(SimpleNamespace(tool_id="broken", name_ko="broken"), "x.broken", None)
+    broken.error = "import 실패"
+    pool.register(broken)
+
+    def _fallback(*_a, **_kw):
+        raise AssertionError("스키마 재파싱 폴백이 호출됨")
+
+    monkeypatch.setattr(arm_server, "_init_tool_pool", lambda: pool)
+    monkeypatch.setattr(arm_server, "_load_tool_schemas", _fallback)
+    monkeypatch.setattr(arm_server, "get_available_providers", lambda: {})
+    arm_server._dashboard_static.clear()
+
+    info = arm_server._dashboard_static_info()
+    assert info["tool_count"] == 2
+    arm_server._dashboard_static.clear()
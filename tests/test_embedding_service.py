@@ -0,0 +1,107 @@
+"""임베딩 서비스 요청 병합(coalescing) 테스트.
+
+테스트 대상:
+  - 동시에 들어온 embed() 호출이 공급자 호출 1번으로 합쳐지는지
+  - 캐시 적중 시 공급자를 다시 부르지 않는지
+  - 캐시 저장 실패·공급자 실패 시 대기자가 멈추지 않고 끝나는지
+  - 이미 전송 중인 해시를 다른 호출이 요청하면 다시 보내지 않고 같은 결과를 기다리는지
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from src.tools._embedding_service import (
+    LOCAL_MODEL,
+    EmbeddingError,
+    EmbeddingService,
+    _EmbeddingCache,
+    hash_embed,
+)
+
+
+def _service(tmp_path) -> EmbeddingService:
+    return EmbeddingService(_EmbeddingCache(str(tmp_path / "emb.db")))
+
+
+def test_concurrent_calls_coalesce(tmp_path):
+    """동시 호출 3건(중복 포함) → 공급자 호출 1번, 결과는 로컬 임베더와 동일."""
+    svc = _service(tmp_path)
+
+    async def run():
+        return await asyncio.gather(
+            svc.embed(["가나다", "abc"], LOCAL_MODEL),
+            svc.embed(["abc"], LOCAL_MODEL),
+            svc.embed(["xyz 123"], LOCAL_MODEL),
+        )
+
+    a, b, c = asyncio.run(run())
+    assert svc.stats["api_calls"] == 1
+    assert svc.stats["embedded"] == 3          # "abc"는 한 번만
+    np.testing.assert_allclose(a[1], b[0])
+    np.testing.assert_allclose(c[0], hash_embed(["xyz 123"])[0])
+
+
+def test_cache_hit_skips_provider(tmp_path):
+    svc = _service(tmp_path)
+    asyncio.run(svc.embed(["캐시 테스트"], LOCAL_MODEL))
+    asyncio.run(svc.embed(["캐시 테스트"], LOCAL_MODEL))
+    assert svc.stats["api_calls"] == 1
+    assert svc.stats["cache_hits"] == 1
+
+
+def test_cache_write_failure_does_not_hang(tmp_path):
+    """put_many가 예외를 내도 결과는 그대로 반환."""
+    svc = _service(tmp_path)
+
+    def broken_put(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    svc.cache.put_many = broken_put
+    vecs = asyncio.run(asyncio.wait_for(svc.embed(["저장 실패"], LOCAL_MODEL), 5))
+    assert vecs.shape == (1, 256)
+
+
+def test_provider_failure_raises(tmp_path):
+    svc = _service(tmp_path)
+
+    async def broken_call(model, texts):
+        raise RuntimeError("boom")
+
+    svc._call_provider = broken_call
+    with pytest.raises(EmbeddingError):
+        asyncio.run(asyncio.wait_for(svc.embed(["실패"], LOCAL_MODEL), 5))
+
+
+def test_inflight_hash_not_resent(tmp_path):
+    """첫 호출의 공급자 요청이 진행 중일 때 같은 본문을 요청 → 재전송 없이 같은 벡터."""
+    svc = _service(tmp_path)
+    sent: list[list[str]] = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_provider(model, texts):
+        sent.append(list(texts))
+        started.set()
+        await release.wait()
+        return hash_embed(texts)
+
+    svc._call_provider = slow_provider
+
+    async def run():
+        first = asyncio.ensure_future(svc.embed(["전송 중인 문장"], LOCAL_MODEL))
+        await started.wait()                       # 첫 배치가 _pending에서 빠져 전송 중
+        second = asyncio.ensure_future(svc.embed(["전송 중인 문장", "새 문장"], LOCAL_MODEL))
+        await asyncio.sleep(0.05)
+        release.set()
+        return await first, await second
+
+    first, second = asyncio.run(run())
+    assert sent == [["전송 중인 문장"], ["새 문장"]]
+    assert np.allclose(first[0], second[0])
+    assert not svc._inflight[LOCAL_MODEL]
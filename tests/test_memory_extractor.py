@@ -0,0 +1,71 @@
+"""기억 추출 큐 스케줄링 테스트.
+
+테스트 대상:
+  - 디바운스 시간 안의 대화들이 추출 호출 1건으로 병합되는지
+  - 추출이 진행 중일 때 들어온 대화가 버려지지 않고 처리되는지
+  - parse_response: 번호별 사실 파싱
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+os.environ.setdefault("CORTHEX_DB_PATH", str(Path(__file__).parent / "_test_rework.db"))
+
+import memory_extractor as mx
+
+
+def _extractor(monkeypatch, calls: list, gate: asyncio.Event | None = None):
+    monkeypatch.setattr(mx, "DEBOUNCE_SEC", 0.05)
+    monkeypatch.setattr(mx, "load_setting", lambda key, default=None: default)
+    ext = mx.MemoryExtractor()
+
+    async def fake_extract(items):
+        calls.append([agent for agent, _, _ in items])
+        if gate is not None:
+            await gate.wait()
+
+    ext._extract = fake_extract
+    return ext
+
+
+def test_debounced_conversations_merge(monkeypatch):
+    calls: list = []
+
+    async def run():
+        ext = _extractor(monkeypatch, calls)
+        for agent in ("cio", "cto", "cmo"):
+            ext.enqueue(agent, "질문", "답변")
+        await asyncio.wait_for(ext._worker, 5)
+        return ext
+
+    ext = asyncio.run(run())
+    assert calls == [["cio", "cto", "cmo"]]
+    assert ext.stats()["pending"] == 0
+
+
+def test_enqueue_during_inflight_extraction_is_processed(monkeypatch):
+    calls: list = []
+
+    async def run():
+        gate = asyncio.Event()
+        ext = _extractor(monkeypatch, calls, gate)
+        ext.enqueue("cio", "질문1", "답변1")
+        while not calls:                       # 첫 추출이 시작될 때까지
+            await asyncio.sleep(0.01)
+        ext.enqueue("cto", "질문2", "답변2")   # 대기열은 비었고 추출은 진행 중
+        gate.set()
+        await asyncio.wait_for(ext._worker, 5)
+        return ext
+
+    ext = asyncio.run(run())
+    assert calls == [["cio"], ["cto"]]
+    assert ext.stats()["pending"] == 0
+
+
+def test_parse_response_numbered_facts():
+    text = '```json\n{"1": {"warnings": ["A 금지", "없음"]}, "x": {}, "2": {"context": "B 진행"}}\n```'
+    assert mx.parse_response(text) == {1: {"warnings": ["A 금지"]}, 2: {"context": ["B 진행"]}}
@@ -0,0 +1,41 @@
+"""요청 메트릭 미들웨어 테스트.
+
+테스트 대상:
+  - 라우트 템플릿 경로로 집계 (/items/{item_id})
+  - 라우트 템플릿이 없는 요청은 상태 코드와 관계없이 "<unmatched>" 라벨 하나로 (실제 URL 라벨 없음)
+"""
+import sys
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+
+import request_metrics
+
+
+def test_route_labels_have_bounded_cardinality(monkeypatch):
+    monkeypatch.setattr(request_metrics, "metrics", request_metrics.RequestMetrics())
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    async def raw_app(scope, receive, send):   # 라우트 템플릿 없이 200을 주는 마운트 앱
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    app.mount("/raw", raw_app)
+    app.add_middleware(request_metrics.RequestMetricsMiddleware)
+    client = TestClient(app)
+    for i in range(3):
+        client.get(f"/items/{i}")
+        client.get(f"/nope/{i}")
+        client.get(f"/raw/{i}")
+
+    labels = {r["route"]: r["count"] for r in request_metrics.metrics.snapshot()["routes"]}
+    assert labels == {"/items/{item_id}": 3, "<unmatched>": 6}
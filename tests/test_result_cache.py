@@ -0,0 +1,56 @@
+"""도구 결과 캐시(ToolResultCache) 테스트.
+
+테스트 대상:
+  - 성공 결과는 TTL 동안 재사용 (실행 1번)
+  - 실패 결과(ToolFailure, "❌"/"오류:" 접두사 문자열, {"error": ...})는 캐시하지 않고 다음 호출에서 재실행
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from src.tools._result_cache import ToolResultCache
+from src.tools.base import ToolFailure
+
+
+def _call_twice(result):
+    calls = []
+
+    async def run():
+        cache = ToolResultCache()
+
+        async def tool():
+            calls.append(1)
+            return result
+
+        first = await cache.get_or_run("kr_stock", {"ticker": "005930"}, 60, tool)
+        second = await cache.get_or_run("kr_stock", {"ticker": " 005930 "}, 60, tool)
+        return first, second, cache.stats()
+
+    first, second, stats = asyncio.run(run())
+    return len(calls), first, second, stats
+
+
+def test_success_is_cached():
+    n, first, second, stats = _call_twice("## 주가 데이터")
+    assert n == 1
+    assert first == second == "## 주가 데이터"
+    assert stats["tools"]["kr_stock"]["hits"] == 1
+
+
+@pytest.mark.parametrize("failed", [
+    ToolFailure("주가 데이터 조회 실패: timeout"),
+    "❌ KIS API가 설정되지 않았습니다.",
+    "오류: 외부 API 응답 없음",
+    {"error": "rate limited"},
+])
+def test_failed_call_is_not_cached(failed):
+    n, first, _second, stats = _call_twice(failed)
+    assert n == 2
+    assert first == failed
+    assert stats["entries"] == 0
+    assert stats["tools"]["kr_stock"]["hits"] == 0
@@ -3,7 +3,7 @@
 테스트 대상:
   - DB: save_collaboration_log / get_collaboration_logs / get_collaboration_summary
   - DB: get_quality_scores_timeline / get_top_rejection_reasons
-  - DB: save_setting / load_setting (memory_categorized 패턴)
+  - DB: add_agent_memory / select_agent_memory (거의-중복 억제, 상한 정리, 작업 관련 선택)
   - soul_evolution_handler: _extract_addition_text
 """
 import sys
@@ -21,8 +21,10 @@ os.environ["CORTHEX_DB_PATH"] = _TEST_DB
 
 from db import (
     init_db,
-    save_setting,
-    load_setting,
+    add_agent_memory,
+    select_agent_memory,
+    list_agent_memory,
+    get_connection,
     save_quality_review,
     get_quality_scores_timeline,
     get_top_rejection_reasons,
@@ -49,36 +51,45 @@ def teardown_module():
         pass
 
 
-# ── save_setting / load_setting (메모리 패턴) ──
-
-def test_save_load_memory():
-    """에이전트 메모리 저장/로드가 올바르게 작동하는지."""
-    mem = {
-        "ceo_preferences": "간결한 보고서 선호",
-        "decisions": "매수 비중 30% 이하",
-        "warnings": "02/25: Q4 반려 - 진입가 미명시",
-    }
-    save_setting("memory_categorized_test_agent", mem)
-    loaded = load_setting("memory_categorized_test_agent", {})
-    assert loaded["warnings"] == "02/25: Q4 반려 - 진입가 미명시"
-    assert loaded["ceo_preferences"] == "간결한 보고서 선호"
-
-
-def test_warnings_append():
-    """반려 학습 warnings 누적 패턴이 올바른지."""
-    mem = load_setting("memory_categorized_test_agent", {})
-    prev = mem.get("warnings", "")
-    new_lesson = "02/26: C3 반려 - 출처 미명시"
-    mem["warnings"] = (
-        (prev + " | " + new_lesson).strip(" |")
-        if prev else new_lesson
-    )
-    save_setting("memory_categorized_test_agent", mem)
+# ── 에이전트 기억 (agent_memory) ──
+
+def test_agent_memory_dedup():
+    """날짜 머리말·공백·문장부호만 다른 사실은 새 행 대신 기존 행을 강화하는지."""
+    assert add_agent_memory("mem_agent", "warnings", "02/25: Q4 반려 - 진입가 미명시")
+    assert not add_agent_memory("mem_agent", "warnings", "03/01:  q4 반려, 진입가 미명시!")
+    rows = list_agent_memory("mem_agent", "warnings")
+    assert len(rows) == 1
+    assert rows[0]["hits"] == 2          # 첫 저장 1 + 중복 1회
+    assert rows[0]["importance"] > 1.0
 
-    reloaded = load_setting("memory_categorized_test_agent", {})
-    assert "02/25:" in reloaded["warnings"]
-    assert "02/26:" in reloaded["warnings"]
-    assert " | " in reloaded["warnings"]
+
+def test_agent_memory_prune():
+    """카테고리 상한을 넘으면 점수 낮은 기억부터 삭제되는지."""
+    from agent_memory import prune
+    add_agent_memory("prune_agent", "context", "중요 거래처 A", importance=5.0)
+    for i in range(4):
+        add_agent_memory("prune_agent", "context", f"사소한 맥락 {i}번", importance=0.5)
+    conn = get_connection()
+    try:
+        assert prune(conn, "prune_agent", "context", limit=2) == 3
+        conn.commit()
+    finally:
+        conn.close()
+    contents = [r["content"] for r in list_agent_memory("prune_agent", "context")]
+    assert len(contents) == 2
+    assert "중요 거래처 A" in contents
+
+
+def test_agent_memory_selection():
+    """작업과 관련된 기억이 먼저 뽑히고, 토큰 예산·top_k를 지키며, 사용 기록이 남는지."""
+    add_agent_memory("sel_agent", "context", "삼성전자 목표가는 보수적으로 제시")
+    add_agent_memory("sel_agent", "context", "마케팅 보고서는 표 위주")
+    add_agent_memory("sel_agent", "decisions", "블로그 발행은 주 2회")
+    picked = select_agent_memory("sel_agent", "삼성전자 목표가 분석해줘", top_k=1)
+    assert [r["content"] for r in picked] == ["삼성전자 목표가는 보수적으로 제시"]
+    assert select_agent_memory("sel_agent", "아무 작업", token_budget=1) == []
+    used = {r["content"]: r["uses"] for r in list_agent_memory("sel_agent")}
+    assert used["삼성전자 목표가는 보수적으로 제시"] == 1
 
 
 # ── quality_reviews 테스트 ──
@@ -0,0 +1,146 @@
+"""텔레그램 발신 대기열 테스트.
+
+테스트 대상:
+  - split_text: 길이 상한, 코드블록 닫고 다시 열기, 강제 절단 시 ``` 표시 보존
+  - 분할 메시지: 순서 유지, 답장(reply_to)은 첫 조각에만, reply_markup은 마지막 조각에만
+  - RetryAfter: 지정 시간 뒤 같은 메시지 재전송 (유실 없음)
+  - status(): 대기 중 갱신 병합 + 이후 같은 메시지 수정
+  - enqueue(): "@channel" 같은 문자열 chat_id 그대로 전송, 실패는 log_failure 콜백이 로그로
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+
+from src.telegram import outbox as ob
+
+
+class RetryAfter(Exception):
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"Flood control exceeded. Retry in {seconds} seconds")
+        self.retry_after = seconds
+
+
+class _Msg:
+    def __init__(self, message_id: int) -> None:
+        self.message_id = message_id
+
+
+class _FakeBot:
+    def __init__(self, flood_once: bool = False) -> None:
+        self.sent: list[dict] = []
+        self.edited: list[dict] = []
+        self._flood = flood_once
+
+    async def send_message(self, chat_id, text, **kwargs):
+        if self._flood:
+            self._flood = False
+            raise RetryAfter(0.01)
+        self.sent.append({"chat_id": chat_id, "text": text, **kwargs})
+        return _Msg(len(self.sent))
+
+    async def edit_message_text(self, chat_id, message_id, text, **kwargs):
+        self.edited.append({"chat_id": chat_id, "message_id": message_id, "text": text})
+        return _Msg(message_id)
+
+
+@pytest.fixture(autouse=True)
+def _fast_rates(monkeypatch):
+    monkeypatch.setattr(ob, "PER_CHAT_INTERVAL", 0.0)
+    monkeypatch.setattr(ob, "GLOBAL_RATE", 10_000)
+
+
+def test_split_respects_limit_and_reopens_code_block():
+    text = "머리말\n```\n" + "\n".join(f"line {i}" for i in range(400)) + "\n```\n끝"
+    parts = ob.split_text(text, limit=500)
+    assert len(parts) > 1
+    assert all(len(p) <= 500 for p in parts)
+    assert all(p.count("```") % 2 == 0 for p in parts)
+    assert parts[1].startswith("```\n")
+
+
+def test_hard_cut_does_not_split_fence():
+    limit = 100
+    budget = limit - len("```") * 2 - 2
+    # 공백 없는 긴 덩어리 → 강제 절단, 절단 위치가 ``` 한가운데에 오도록 배치
+    text = "a" * (budget - 1) + "```" + "b" * 150 + "```"
+    parts = ob.split_text(text, limit=limit)
+    assert all(len(p) <= limit for p in parts)
+    assert parts[0] == "a" * (budget - 1)
+    assert parts[1].startswith("```b")
+    assert all("`" not in p.replace("```", "") for p in parts)   # 갈라진 ``/` 없음
+
+
+def test_split_message_order_and_reply_placement():
+    bot = _FakeBot()
+
+    async def run():
+        box = ob.TelegramOutbox(bot)
+        return await box.send(1, "문단입니다.\n\n" * 900, reply_to_message_id=77, reply_markup="KB")
+
+    msgs = asyncio.run(run())
+    assert len(msgs) == len(bot.sent) > 1
+    assert bot.sent[0]["reply_to_message_id"] == 77
+    assert all("reply_to_message_id" not in m for m in bot.sent[1:])
+    assert bot.sent[-1]["reply_markup"] == "KB"
+    assert all("reply_markup" not in m for m in bot.sent[:-1])
+    assert [m.message_id for m in msgs] == list(range(1, len(msgs) + 1))
+
+
+def test_retry_after_resends_same_message():
+    bot = _FakeBot(flood_once=True)
+
+    async def run():
+        box = ob.TelegramOutbox(bot)
+        await box.send(5, "첫 메시지")
+        await box.send(5, "둘째 메시지")
+        return box.stats()
+
+    stats = asyncio.run(run())
+    assert [m["text"] for m in bot.sent] == ["첫 메시지", "둘째 메시지"]
+    assert stats["retry_after"] == 1
+    assert stats["failed"] == 0
+
+
+def test_status_coalesces_and_edits():
+    bot = _FakeBot()
+
+    async def run():
+        box = ob.TelegramOutbox(bot)
+        box.status(9, "job", "10%")
+        await box.status(9, "job", "20%")       # 아직 안 보낸 10%를 덮어씀
+        await box.status(9, "job", "90%")       # 이미 보낸 메시지를 수정
+        return box.stats()
+
+    stats = asyncio.run(run())
+    assert [m["text"] for m in bot.sent] == ["20%"]
+    assert bot.edited == [{"chat_id": 9, "message_id": 1, "text": "90%"}]
+    assert stats["coalesced"] == 1
+
+
+def test_enqueue_keeps_channel_id_and_logs_failure(caplog):
+    class _Broken(_FakeBot):
+        async def send_message(self, chat_id, text, **kwargs):
+            if chat_id == "@broken":
+                raise RuntimeError("chat not found")
+            return await super().send_message(chat_id, text, **kwargs)
+
+    bot = _Broken()
+
+    async def run():
+        box = ob.TelegramOutbox(bot)
+        ok = box.enqueue("@corthex_alerts", "채널 알림")
+        bad = box.enqueue("@broken", "실패할 알림")
+        bad.add_done_callback(ob.log_failure("테스트 알림"))
+        await asyncio.gather(ok, bad, return_exceptions=True)
+        await asyncio.sleep(0)   # done-callback 실행
+
+    with caplog.at_level(logging.WARNING, logger="corthex.telegram.outbox"):
+        asyncio.run(run())
+    assert bot.sent == [{"chat_id": "@corthex_alerts", "text": "채널 알림"}]
+    assert any("테스트 알림 전송 실패" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,100 @@
+"""내부 도구 소켓 채널 테스트 (web/tool_ipc.py 서버 + src/mcp_ipc.py 클라이언트).
+
+테스트 대상:
+  - 프레이밍: encode → read_frame 왕복
+  - 큰 결과의 조각 프레임 → 클라이언트에서 이어 붙이기
+  - 연결 1개에서 동시 요청 다중화 (늦게 보낸 요청이 먼저 끝나도 각자 결과)
+  - 소켓이 없으면 IPCSendError (전송 전 실패 — 폴백 안전)
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+_PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT))
+sys.path.insert(0, str(_PROJECT_ROOT / "web"))
+
+import tool_ipc
+from src.mcp_ipc import IPCSendError, ToolIPCClient, encode, read_frame
+
+pytestmark = pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="Unix 소켓 미지원")
+
+
+class _FakePool:
+    """도구 이름에 따라 지연·큰 결과를 흉내 내는 ToolPool 대역."""
+
+    async def invoke(self, tool_name, caller_id="", **kwargs):
+        if tool_name == "slow":
+            await asyncio.sleep(0.2)
+            return {"tool": "slow", "caller": caller_id}
+        if tool_name == "big":
+            return "가" * kwargs["size"]
+        if tool_name == "fail":
+            raise ValueError("도구 실패")
+        return f"{tool_name}:{kwargs}"
+
+
+def _run_with_server(tmp_path, monkeypatch, body):
+    monkeypatch.setattr(tool_ipc, "_pool", _FakePool())
+    monkeypatch.setattr(tool_ipc, "CHUNK_CHARS", 1000)   # 조각 분할이 일어나게 작게
+    path = str(tmp_path / "ipc" / "tools.sock")
+
+    async def run():
+        assert await tool_ipc.start_tool_ipc(path) == path
+        client = ToolIPCClient(path)
+        try:
+            return await body(client, path)
+        finally:
+            await client.aclose()
+            await tool_ipc.stop_tool_ipc()
+
+    return asyncio.run(run())
+
+
+def test_frame_roundtrip():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode({"id": 1, "text": "한글 ✓"}) + encode({"id": 2, "end": True}))
+        reader.feed_eof()
+        return [await read_frame(reader), await read_frame(reader), await read_frame(reader)]
+
+    assert asyncio.run(run()) == [{"id": 1, "text": "한글 ✓"}, {"id": 2, "end": True}, None]
+
+
+def test_chunked_result_reassembled(tmp_path, monkeypatch):
+    async def body(client, path):
+        text = await client.invoke("big", {"size": 4321})
+        assert oct(os.stat(os.path.dirname(path)).st_mode & 0o777) == oct(0o700)
+        return text
+
+    assert _run_with_server(tmp_path, monkeypatch, body) == "가" * 4321
+    assert tool_ipc.stats()["streamed"] >= 1
+
+
+def test_concurrent_requests_multiplexed(tmp_path, monkeypatch):
+    async def body(client, _path):
+        order: list[str] = []
+
+        async def call(tool, args):
+            result = await client.invoke(tool, args, caller_id="tester")
+            order.append(tool)
+            return result
+
+        results = await asyncio.gather(call("slow", {}), call("quick", {"a": 1}), return_exceptions=True)
+        failure = await asyncio.gather(client.invoke("fail", {}), return_exceptions=True)
+        return order, results, failure
+
+    order, results, failure = _run_with_server(tmp_path, monkeypatch, body)
+    assert order == ["quick", "slow"]                     # 같은 연결, 끝난 순서대로
+    assert results[0] == '{"tool": "slow", "caller": "tester"}'
+    assert results[1] == "quick:{'a': 1}"
+    assert isinstance(failure[0], RuntimeError) and "도구 실패" in str(failure[0])
+
+
+def test_missing_socket_is_send_error(tmp_path):
+    client = ToolIPCClient(str(tmp_path / "none.sock"))
+    with pytest.raises(IPCSendError):
+        asyncio.run(client.invoke("x", {}))
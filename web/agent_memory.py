@@ -0,0 +1,247 @@
+"""
+에이전트 기억 저장소 — settings의 memory_categorized_{agent_id} 문자열 묶음을 대체하는 전용 테이블.
+
+이전에는 대화마다 추출한 사실을 카테고리 문자열 뒤에 " | "로 이어 붙이기만 해서
+같은 내용이 반복·누적되고 상한도 없었으며, 에이전트 호출마다 전부를 소울 앞에 넣었습니다.
+이제는:
+- agent_memory 테이블에 (에이전트, 카테고리, 사실) 1행씩 저장
+- 정규화 텍스트(날짜 머리말·공백·문장부호·대소문자 무시) 해시로 거의-중복 억제
+  → 같은 사실이 다시 나오면 새 행 대신 importance·hits만 올림
+- 점수 = importance × 카테고리 가중치 × 반감기 감쇠(마지막 사용/갱신 시점 기준)
+  카테고리별 MAX_PER_CATEGORY를 넘으면 점수 낮은 것부터 삭제
+- 호출마다 현재 작업과의 관련도 × 점수로 top-k를 골라 토큰 예산 안에서만 주입,
+  뽑힌 행은 last_used_at 갱신 (LRU)
+- 기존 settings 값은 init_db 때 1회 이관
+
+db.py가 연결을 넘겨 호출합니다 (content_store와 같은 방식).
+
+사용법:
+    from db import add_agent_memory, select_agent_memory
+    add_agent_memory("cio", "warnings", "목표가 근거 없이 제시하지 말 것")
+    block = render(select_agent_memory("cio", task_text))
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import re
+import sqlite3
+from datetime import datetime, timezone
+
+try:
+    from src.tools.token_counter import count_tokens
+except ImportError:  # 토크나이저 없는 환경 → 근사
+    def count_tokens(text: str) -> int:
+        return max(1, len(text) // 2)
+
+CATEGORIES = ("ceo_preferences", "decisions", "warnings", "context")
+CATEGORY_LABELS = {
+    "ceo_preferences": "CEO 취향/선호",
+    "decisions": "주요 결정",
+    "warnings": "주의사항",
+    "context": "중요 맥락",
+}
+_CATEGORY_WEIGHT = {"warnings": 1.5, "ceo_preferences": 1.3, "decisions": 1.1, "context": 1.0}
+
+MAX_PER_CATEGORY = 50        # 에이전트·카테고리별 보관 상한
+HALF_LIFE_DAYS = 30.0        # 사용·갱신이 없으면 30일마다 점수 절반
+MAX_IMPORTANCE = 5.0
+DEFAULT_TOKEN_BUDGET = 300   # 호출당 주입 기억 토큰 상한
+DEFAULT_TOP_K = 12
+LEGACY_SEPARATOR = " | "
+LEGACY_KEY_PREFIX = "memory_categorized_"
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS agent_memory (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_id        TEXT NOT NULL,
+    category        TEXT NOT NULL,
+    content         TEXT NOT NULL,
+    norm_hash       TEXT NOT NULL,              -- 정규화 텍스트 sha1 (거의-중복 억제)
+    importance      REAL NOT NULL DEFAULT 1.0,
+    hits            INTEGER NOT NULL DEFAULT 1,  -- 같은 사실이 다시 추출된 횟수
+    uses            INTEGER NOT NULL DEFAULT 0,  -- 프롬프트에 주입된 횟수
+    created_at      TEXT NOT NULL,
+    updated_at      TEXT NOT NULL,
+    last_used_at    TEXT DEFAULT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_agent_memory_uq ON agent_memory(agent_id, category, norm_hash);
+CREATE INDEX IF NOT EXISTS idx_agent_memory_agent ON agent_memory(agent_id);
+"""
+
+_DATE_PREFIX_RE = re.compile(r"^\s*\d{1,4}[/.-]\d{1,2}(?:[/.-]\d{1,2})?\s*[:：]\s*")
+_NORM_STRIP_RE = re.compile(r"[\s\W_]+", re.UNICODE)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z]{2,}|\d+")
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def normalize(text: str) -> str:
+    """중복 판정용 정규화 — 날짜 머리말·공백·문장부호 제거, 소문자."""
+    return _NORM_STRIP_RE.sub("", _DATE_PREFIX_RE.sub("", text).lower())
+
+
+def _terms(text: str) -> set[str]:
+    """관련도 계산용 토큰 — 한글은 음절 2-gram, 영문/숫자는 단어."""
+    out: set[str] = set()
+    for w in _TOKEN_RE.findall(text.lower()):
+        if "가" <= w[0] <= "힣":
+            out.update(w[i:i + 2] for i in range(len(w) - 1))
+        else:
+            out.add(w)
+    return out
+
+
+def _age_days(row: dict, now: datetime) -> float:
+    stamp = row.get("last_used_at") or row.get("updated_at") or row.get("created_at")
+    try:
+        then = datetime.strptime(stamp, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return 0.0
+    return max(0.0, (now - then).total_seconds() / 86400)
+
+
+def score(row: dict, now: datetime | None = None) -> float:
+    """보존/선택 점수 = importance × 카테고리 가중치 × 반감기 감쇠."""
+    now = now or datetime.now(timezone.utc)
+    decay = 0.5 ** (_age_days(row, now) / HALF_LIFE_DAYS)
+    return row["importance"] * _CATEGORY_WEIGHT.get(row["category"], 1.0) * decay
+
+
+def _rows(conn: sqlite3.Connection, sql: str, args: tuple) -> list[dict]:
+    cur = conn.execute(sql, args)
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+def add(conn: sqlite3.Connection, agent_id: str, category: str, content: str,
+        importance: float = 1.0) -> bool:
+    """사실 1개 저장. 새로 추가되면 True, 기존 사실 갱신(중복)이면 False."""
+    content = content.strip()
+    norm = normalize(content)
+    if not norm:
+        return False
+    norm_hash = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+    now = _now_iso()
+    existed = conn.execute(
+        "SELECT 1 FROM agent_memory WHERE agent_id=? AND category=? AND norm_hash=?",
+        (agent_id, category, norm_hash),
+    ).fetchone() is not None
+    conn.execute(
+        "INSERT INTO agent_memory (agent_id, category, content, norm_hash, importance, created_at, updated_at) "
+        "VALUES (?,?,?,?,?,?,?) "
+        "ON CONFLICT(agent_id, category, norm_hash) DO UPDATE SET "
+        "content=excluded.content, hits=hits+1, updated_at=excluded.updated_at, "
+        "importance=MIN(importance + 0.5 * excluded.importance, ?)",
+        (agent_id, category, content, norm_hash, min(importance, MAX_IMPORTANCE), now, now, MAX_IMPORTANCE),
+    )
+    if not existed:
+        prune(conn, agent_id, category)
+    return not existed
+
+
+def prune(conn: sqlite3.Connection, agent_id: str, category: str,
+          limit: int = MAX_PER_CATEGORY) -> int:
+    """카테고리 상한 초과분을 점수 낮은 순으로 삭제. 삭제 행 수 반환."""
+    rows = _rows(conn, "SELECT * FROM agent_memory WHERE agent_id=? AND category=?", (agent_id, category))
+    if len(rows) <= limit:
+        return 0
+    now = datetime.now(timezone.utc)
+    rows.sort(key=lambda r: score(r, now))
+    doomed = [r["id"] for r in rows[: len(rows) - limit]]
+    conn.executemany("DELETE FROM agent_memory WHERE id=?", [(i,) for i in doomed])
+    return len(doomed)
+
+
+def list_rows(conn: sqlite3.Connection, agent_id: str, category: str | None = None) -> list[dict]:
+    if category:
+        return _rows(conn, "SELECT * FROM agent_memory WHERE agent_id=? AND category=? ORDER BY id",
+                     (agent_id, category))
+    return _rows(conn, "SELECT * FROM agent_memory WHERE agent_id=? ORDER BY id", (agent_id,))
+
+
+def categorized(conn: sqlite3.Connection, agent_id: str) -> dict[str, str]:
+    """기존 memory_categorized 형태 {카테고리: "사실 | 사실"} (API·소울 진화 호환)."""
+    out: dict[str, list[str]] = {}
+    for row in list_rows(conn, agent_id):
+        out.setdefault(row["category"], []).append(row["content"])
+    return {cat: LEGACY_SEPARATOR.join(items) for cat, items in out.items()}
+
+
+def clear(conn: sqlite3.Connection, agent_id: str, category: str | None = None) -> int:
+    if category:
+        cur = conn.execute("DELETE FROM agent_memory WHERE agent_id=? AND category=?", (agent_id, category))
+    else:
+        cur = conn.execute("DELETE FROM agent_memory WHERE agent_id=?", (agent_id,))
+    return cur.rowcount
+
+
+def select(conn: sqlite3.Connection, agent_id: str, task: str,
+           token_budget: int = DEFAULT_TOKEN_BUDGET, top_k: int = DEFAULT_TOP_K) -> list[dict]:
+    """현재 작업에 주입할 기억 — (1 + 2×관련도) × 점수 순 top-k, 토큰 예산 안에서. 뽑힌 행은 사용 기록."""
+    rows = list_rows(conn, agent_id)
+    if not rows:
+        return []
+    now = datetime.now(timezone.utc)
+    task_terms = _terms(task)
+    ranked = []
+    for row in rows:
+        terms = _terms(row["content"])
+        relevance = len(terms & task_terms) / math.sqrt(len(terms)) if terms else 0.0
+        ranked.append((min(relevance, 1.0), score(row, now), row))
+    ranked.sort(key=lambda t: (1 + 2 * t[0]) * t[1], reverse=True)
+
+    chosen: list[dict] = []
+    used = 0
+    for _, _, row in ranked:
+        cost = count_tokens(row["content"]) + 4
+        if used + cost > token_budget:
+            continue
+        chosen.append(row)
+        used += cost
+        if len(chosen) >= top_k:
+            break
+    if chosen:
+        conn.executemany(
+            "UPDATE agent_memory SET uses=uses+1, last_used_at=? WHERE id=?",
+            [(_now_iso(), r["id"]) for r in chosen],
+        )
+    return chosen
+
+
+def render(rows: list[dict]) -> str:
+    """선택된 기억 → 프롬프트 블록 (카테고리별 묶음). 없으면 빈 문자열."""
+    if not rows:
+        return ""
+    grouped: dict[str, list[str]] = {}
+    for row in rows:
+        grouped.setdefault(row["category"], []).append(row["content"])
+    lines = []
+    for cat in list(CATEGORIES) + [c for c in grouped if c not in CATEGORIES]:
+        if cat in grouped:
+            lines.append(f"- {CATEGORY_LABELS.get(cat, cat)}: " + LEGACY_SEPARATOR.join(grouped[cat]))
+    return "[에이전트 기억]\n" + "\n".join(lines)
+
+
+def migrate_settings(conn: sqlite3.Connection) -> int:
+    """settings의 memory_categorized_* 값을 agent_memory로 이관 후 삭제. 이관한 사실 수 반환."""
+    rows = conn.execute(
+        "SELECT key, value FROM settings WHERE key LIKE ?", (LEGACY_KEY_PREFIX + "%",)
+    ).fetchall()
+    moved = 0
+    for key, value in rows:
+        agent_id = key[len(LEGACY_KEY_PREFIX):]
+        try:
+            data = json.loads(value) or {}
+        except (TypeError, ValueError):
+            data = {}
+        if isinstance(data, dict):
+            for category, blob in data.items():
+                for fact in str(blob or "").split(LEGACY_SEPARATOR.strip()):
+                    if fact.strip():
+                        moved += add(conn, agent_id, category, fact)
+        conn.execute("DELETE FROM settings WHERE key=?", (key,))
+    return moved
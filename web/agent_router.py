@@ -28,10 +28,13 @@ from pathlib import Path
 from ws_manager import wm
 from state import app_state
 from db import (
-    save_activity_log, save_archive, save_setting, load_setting,
+    save_activity_log, save_archive, load_setting,
     get_today_cost, update_task, save_quality_review, get_connection,
-    load_conversation_messages, load_conversation_messages_by_id,
+    add_agent_memory, select_agent_memory,
 )
+from agent_memory import render as render_agent_memory
+from memory_extractor import memory_extractor
+from conv_history import history_cache
 from config_loader import (
     _log, _diag, _extract_title_summary, logger,
     KST, BASE_DIR, CONFIG_DIR, _load_config,
@@ -52,10 +55,11 @@ except ImportError:
     def get_available_providers(): return {"anthropic": False, "google": False, "openai": False}
     def _load_tool_schemas(allowed_tools=None): return {}
 
-# batch_system 참조 (QA 재작업에서 _save_chain 사용 — 현재 QA 비활성)
+# batch_system 참조 (QA 재작업 _save_chain, /배치실행·/배치상태 명령)
 try:
-    from batch_system import _save_chain, _flush_batch_api_queue
+    from batch_system import _save_chain, _flush_batch_api_queue, status as _batch_status
 except ImportError:
+    def _batch_status(): return {"requests": {}, "active_jobs": []}
     def _save_chain(chain): pass
     async def _flush_batch_api_queue(): return {"error": "batch_system 미설치"}
 
@@ -646,15 +650,9 @@ async def _quality_review_specialists(
                     logger.debug("반려사유 기밀문서 저장 실패: %s", _ae)
 
                 try:
-                    _mem_key = f"memory_categorized_{agent_id}"
-                    _existing_mem = load_setting(_mem_key, {})
                     _warning_lesson = f"{_dt_rej.now().strftime('%m/%d')}: {reason[:100]}"
-                    _prev_warnings = _existing_mem.get("warnings", "")
-                    _existing_mem["warnings"] = (
-                        (_prev_warnings + " | " + _warning_lesson).strip(" |")
-                        if _prev_warnings else _warning_lesson
-                    )
-                    save_setting(_mem_key, _existing_mem)
+                    # 반려 사유는 일반 추출 기억보다 중요도 높게 (같은 사유 반복 시 강화)
+                    add_agent_memory(agent_id, "warnings", _warning_lesson, importance=2.0)
                     _log(f"[QA] 반려 학습 저장: {agent_id} ← {_warning_lesson[:60]}")
                 except Exception as _me:
                     logger.debug("반려 학습 저장 실패: %s", _me)
@@ -877,57 +875,6 @@ async def _broadcast_comms(msg_data: dict):
     await wm.broadcast_sse(msg_data)
 
 
-async def _extract_and_save_memory(agent_id: str, task: str, response: str):
-    """대화 후 기억할 정보 추출 → save_setting에 저장 (비동기 백그라운드)."""
-    try:
-        extraction_prompt = (
-            "아래 대화에서 에이전트가 기억해야 할 정보가 있으면 JSON으로 추출해라. "
-            "없으면 빈 dict {} 반환.\n\n"
-            f"[대화]\n사용자: {task[:400]}\n에이전트: {response[:400]}\n\n"
-            "[추출 항목]\n"
-            "- ceo_preferences: CEO가 선호하거나 싫어하는 것 (있으면)\n"
-            "- decisions: '~하기로 결정', '~로 확정' 등 중요 결정 (있으면)\n"
-            "- warnings: 이 방법은 안 됨, CEO가 싫다고 함 등 주의사항 (있으면)\n"
-            "- context: 프로젝트 상태, 거래처, 일정 등 중요 맥락 (있으면)\n\n"
-            "JSON만 반환 (설명 없이):"
-        )
-
-        from ai_handler import _USE_CLI_FOR_CLAUDE
-        _mem_providers = get_available_providers()
-        if _mem_providers.get("google"):
-            _mem_model = "gemini-2.5-flash"
-        elif _mem_providers.get("openai"):
-            _mem_model = "gpt-5-mini"
-        elif _USE_CLI_FOR_CLAUDE:
-            _mem_model = "claude-haiku-4-5-20251001"  # CLI 라우팅 → API 크레딧 소진 방지
-        else:
-            _mem_model = "claude-sonnet-4-6"
-        result = await ask_ai(
-            user_message=extraction_prompt,
-            model=_mem_model,
-            max_tokens=400,
-            system_prompt="JSON만 반환. 설명 없이."
-        )
-
-        text_resp = result.get("content", "") if isinstance(result, dict) else str(result)
-        text_resp = text_resp.strip()
-        if "```" in text_resp:
-            text_resp = text_resp.split("```")[1].strip()
-            if text_resp.startswith("json"):
-                text_resp = text_resp[4:].strip()
-
-        new_facts = json.loads(text_resp)
-        if new_facts and isinstance(new_facts, dict):
-            existing = load_setting(f"memory_categorized_{agent_id}", {})
-            for key, val in new_facts.items():
-                if val and val not in ("null", "없음", ""):
-                    prev = existing.get(key, "")
-                    existing[key] = (prev + " | " + str(val)).strip(" |") if prev else str(val)
-            save_setting(f"memory_categorized_{agent_id}", existing)
-    except Exception as e:
-        logger.debug(f"기억 추출 건너뜀 ({agent_id}): {e}")
-
-
 def _is_sequential_command(text: str) -> bool:
     """순차 협업 명령인지 확인합니다."""
     return any(kw in text for kw in _SEQUENTIAL_KEYWORDS)
@@ -1082,30 +1029,10 @@ def _get_agent_reasoning_effort(agent_id: str) -> str:
     return ""
 
 
-def _build_conv_history(conversation_id: str | None, current_text: str) -> list | None:
-    """대화 세션에서 AI conversation_history를 구성합니다."""
+async def _build_conv_history(conversation_id: str | None, current_text: str) -> list | None:
+    """대화 세션에서 AI conversation_history를 구성합니다 (conv_history 캐시, 토큰 예산 기준)."""
     try:
-        if conversation_id:
-            recent = load_conversation_messages_by_id(conversation_id, limit=200)
-        else:
-            recent = load_conversation_messages(limit=100)
-
-        tail = recent[-20:] if len(recent) > 20 else recent
-        if not tail:
-            return None
-
-        conv_history = []
-        for m in tail:
-            if m["type"] == "user" and m.get("text"):
-                conv_history.append({"role": "user", "content": m["text"][:2000]})
-            elif m["type"] == "result" and m.get("content"):
-                conv_history.append({"role": "assistant", "content": m["content"][:2000]})
-
-        if (conv_history and conv_history[-1].get("role") == "user"
-                and conv_history[-1].get("content", "").strip() == current_text[:2000].strip()):
-            conv_history.pop()
-
-        return conv_history if conv_history else None
+        return await history_cache.abuild(conversation_id, current_text)
     except Exception as e:
         logger.debug("대화 기록 로드 실패 (무시): %s", e)
         return None
@@ -1125,21 +1052,13 @@ async def _call_agent(agent_id: str, text: str, conversation_id: str | None = No
 
     soul = _load_agent_prompt(agent_id)
 
-    # 에이전트 기억 주입 (카테고리별 기억 → system_prompt 앞에 삽입)
-    mem = load_setting(f"memory_categorized_{agent_id}", {})
-    if mem:
-        mem_lines = []
-        if mem.get("ceo_preferences"):
-            mem_lines.append(f"- CEO 취향/선호: {mem['ceo_preferences']}")
-        if mem.get("decisions"):
-            mem_lines.append(f"- 주요 결정: {mem['decisions']}")
-        if mem.get("warnings"):
-            mem_lines.append(f"- 주의사항: {mem['warnings']}")
-        if mem.get("context"):
-            mem_lines.append(f"- 중요 맥락: {mem['context']}")
-        if mem_lines:
-            memory_block = "[에이전트 기억]\n" + "\n".join(mem_lines) + "\n\n"
-            soul = memory_block + soul
+    # 에이전트 기억 주입 — 현재 작업과 관련된 기억만 토큰 예산 안에서.
+    # 소울 뒤에 붙여 system_prompt 앞부분(소울)은 호출 간 동일하게 유지 (프롬프트 캐시)
+    memory_block = render_agent_memory(select_agent_memory(
+        agent_id, text, token_budget=int(load_setting("agent_memory_token_budget", 300) or 300),
+    ))
+    if memory_block:
+        soul = soul.rstrip() + "\n\n" + memory_block
 
     override = _get_model_override(agent_id)
     model = select_model(text, override=override)
@@ -1189,7 +1108,7 @@ async def _call_agent(agent_id: str, text: str, conversation_id: str | None = No
             tool_executor_fn = _tool_executor
 
     # 최근 대화 기록 로드
-    conv_history = _build_conv_history(conversation_id, text)
+    conv_history = await _build_conv_history(conversation_id, text)
 
     # v5: 에이전트별 cli_owner 확인 (saju 본부 에이전트 → sister 계정)
     _agent_cli_owner = _AGENTS_DETAIL.get(agent_id, {}).get("cli_owner", "ceo")
@@ -1250,9 +1169,9 @@ async def _call_agent(agent_id: str, text: str, conversation_id: str | None = No
         today_cost = cost
     await wm.send_cost_update(today_cost)
 
-    # 기억 자동 추출 (비동기 백그라운드)
+    # 기억 자동 추출 (큐에 적재 → 디바운스 후 여러 대화를 묶어 1회 추출)
     if content and len(content) > 30:
-        asyncio.create_task(_extract_and_save_memory(agent_id, text, content))
+        memory_extractor.enqueue(agent_id, text, content)
 
     # 산출물 저장 (노션 + 아카이브 DB)
     if content and len(content) > 20:
@@ -2342,13 +2261,12 @@ async def _process_ai_command(text: str, task_id: str, target_agent_id: str | No
         return {"content": content, "handled_by": "비서실장", "agent_id": "chief_of_staff"}
 
     if text_lower in ("/배치상태", "/batch_status", "배치상태", "배치 상태"):
-        pending_batches = load_setting("pending_batches") or []
-        active = [b for b in pending_batches if b.get("status") in ("pending", "processing")]
         try:
-            _batch_queue = app_state.batch_api_queue
-            queue_count = len(_batch_queue)
+            _bs = _batch_status()
         except Exception:
-            queue_count = 0
+            _bs = {"requests": {}, "active_jobs": []}
+        active = _bs["active_jobs"]
+        queue_count = _bs["requests"].get("queued", 0)
         content = f"📦 **배치 상태**\n\n"
         content += f"- 대기열: {queue_count}건\n"
         content += f"- 처리 중인 배치: {len(active)}건\n"
@@ -2408,7 +2326,7 @@ async def _process_ai_command(text: str, task_id: str, target_agent_id: str | No
         soul = app_state.chief_prompt if app_state.chief_prompt else _load_agent_prompt("chief_of_staff")
         override = _get_model_override("chief_of_staff")
         model = select_model(text, override=override)
-        _chief_history = _build_conv_history(conversation_id, text)
+        _chief_history = await _build_conv_history(conversation_id, text)
         result = await ask_ai(text, system_prompt=soul, model=model,
                               conversation_history=_chief_history)
 
@@ -2541,7 +2459,7 @@ def _init_tool_pool():
         tools_config = _load_config("tools")
         pool.build_from_config(tools_config)
 
-        loaded = len(pool._tools)
+        loaded = len(pool.loaded_names())
         app_state.tool_pool = pool
         for a in AGENTS:
             _temp = _AGENTS_DETAIL.get(a["agent_id"], {}).get("temperature", 0.7)
@@ -5,6 +5,11 @@ AGORA Engine - AI 법학 토론 시스템 핵심 엔진
 - 고동희(kodh): Claude Opus - 블루팀 (논문 저자, 자기 주장 옹호)
 - 박성범(psb): GPT-5.2 xhigh - 레드팀 (철학적 반박)
 - 권대옥(kdw): GPT-5.2 xhigh / Claude Sonnet (역할별 모델 전환)
+
+쟁점 스케줄링:
+- 의존 관계(depends_on)가 없는 쟁점은 동시에 토론 (최대 AGORA_MAX_CONCURRENT_ISSUES개)
+- 쟁점 프롬프트에는 논문 전문 대신 섹션 색인(BM25)으로 고른 관련 섹션만 포함
+- 논문 수정은 관련 섹션만 받아 수정하고, 잠금 아래에서 최신 논문에 섹션 단위로 병합
 """
 
 import asyncio
@@ -12,7 +17,11 @@ import difflib
 import html
 import json
 import logging
+import math
+import os
+import re
 import time
+from collections import Counter
 from typing import Any
 
 from ai_handler import ask_ai
@@ -65,6 +74,8 @@ AGENTS = {
 }
 
 MAX_ROUNDS_PER_ISSUE = 20
+MAX_CONCURRENT_ISSUES = int(os.getenv("AGORA_MAX_CONCURRENT_ISSUES", "3"))
+PAPER_WINDOW_CHARS = 12_000      # 쟁점별 프롬프트에 넣는 논문 분량 상한 (이보다 짧은 논문은 전문)
 
 # ──────────────────────────────────────────────
 # 시스템 프롬프트
@@ -116,10 +127,12 @@ SYSTEM_PROMPTS = {
         '## 출력 형식 (반드시 JSON 배열)\n'
         '```json\n'
         '[\n'
-        '  {"title": "쟁점 제목", "description": "쟁점 설명 (2~3문장)"},\n'
+        '  {"title": "쟁점 제목", "description": "쟁점 설명 (2~3문장)", "depends_on": []},\n'
         '  ...\n'
         ']\n'
         '```\n'
+        "depends_on에는 그 쟁점의 결론을 전제로 해야만 토론할 수 있는 앞선 쟁점의 번호(1부터)를 적고,\n"
+        "독립적으로 토론 가능한 쟁점은 빈 배열로 두십시오.\n"
         "3~7개 쟁점을 추출하십시오. JSON 외 다른 텍스트를 출력하지 마십시오."
     ),
     "kdw_consensus": (
@@ -144,16 +157,18 @@ SYSTEM_PROMPTS = {
     "kdw_paper_revision": (
         "당신은 권대옥 교수입니다. 토론 결과를 바탕으로 논문을 수정합니다.\n\n"
         "## 임무\n"
-        "토론에서 합의된 내용을 반영하여 원본 논문을 수정하십시오.\n\n"
+        "토론에서 합의된 내용을 반영하여 논문의 해당 섹션들을 수정하십시오.\n"
+        "논문 전체가 아니라 쟁점과 관련된 섹션만 주어집니다.\n\n"
         "## 수정 원칙\n"
         "- 합의된 내용만 반영 (한쪽 주장만 수용하지 않음)\n"
         "- 원문의 문체와 구조를 최대한 유지\n"
         "- 수정 부분에 각주로 토론 근거 표시\n"
         "- 삭제보다는 보완/확장 우선\n\n"
         "## 출력 형식\n"
-        "수정된 논문 전문을 마크다운으로 출력하십시오.\n"
+        "수정한 섹션마다 입력과 같은 `<<<SECTION 번호>>>` 줄로 시작해 그 섹션 전문을 마크다운으로 출력하십시오.\n"
+        "제목 줄도 그대로 포함하고, 수정할 필요가 없는 섹션은 생략하십시오.\n"
         "수정된 부분은 **볼드**로 표시하십시오.\n"
-        "논문 전문만 출력하고, 부가 설명은 하지 마십시오."
+        "섹션 본문 외 부가 설명은 하지 마십시오."
     ),
     "kdw_chapter": (
         "당신은 권대옥 교수입니다. 토론 대화록을 학술 서적의 한 챕터로 편찬합니다.\n\n"
@@ -223,6 +238,145 @@ def _generate_diff_html(original: str, revised: str) -> str:
     return "\n".join(html_parts)
 
 
+# ──────────────────────────────────────────────
+# 논문 섹션 색인 (쟁점별 윈도우)
+# ──────────────────────────────────────────────
+
+# 마크다운 제목, "제1장", "Ⅰ.", "1.", "가." 형태의 짧은 줄을 섹션 제목으로 봅니다.
+_HEADING_RE = re.compile(r"^\s{0,3}(?:#{1,6}\s+\S|(?:제\s*\d+\s*[편장절]|[IVXⅠ-Ⅻ]+\.|\d{1,2}\.|[가-하]\.)\s+\S)")
+_FALLBACK_CHUNK_CHARS = 3_000
+_SECTION_MARK_RE = re.compile(r"^<<<SECTION (\d+)>>>[ \t]*$", re.MULTILINE)
+_TOKEN_RE = re.compile(r"[가-힣]+|[a-z]{2,}|\d+")
+
+
+def _split_sections(text: str) -> list[dict]:
+    """논문 → 섹션 목록 [{heading, text}]. 섹션 text를 이어 붙이면 원문과 정확히 같습니다.
+
+    제목 줄이 없으면 문단 경계에서 약 3,000자 단위로 나눕니다.
+    """
+    lines = text.splitlines(keepends=True)
+    sections: list[dict] = []
+    current: list[str] = []
+    heading = ""
+    for line in lines:
+        if _HEADING_RE.match(line) and len(line.strip()) <= 80 and current:
+            sections.append({"heading": heading, "text": "".join(current)})
+            current, heading = [], ""
+        if not current:
+            heading = line.strip() if _HEADING_RE.match(line) else ""
+        current.append(line)
+    if current:
+        sections.append({"heading": heading, "text": "".join(current)})
+
+    if len(sections) > 1 or len(text) <= _FALLBACK_CHUNK_CHARS:
+        return sections
+    # 제목 없는 긴 글 → 문단 단위 묶음
+    chunks: list[dict] = []
+    buf = ""
+    for para in re.split(r"(?<=\n\n)", text):
+        if buf and len(buf) + len(para) > _FALLBACK_CHUNK_CHARS:
+            chunks.append({"heading": "", "text": buf})
+            buf = ""
+        buf += para
+    if buf:
+        chunks.append({"heading": "", "text": buf})
+    return chunks
+
+
+def _terms(text: str) -> list[str]:
+    """검색어 토큰 — 한글은 음절 2-gram (조사가 붙어도 매칭), 영문/숫자는 단어."""
+    out: list[str] = []
+    for w in _TOKEN_RE.findall(text.lower()):
+        if "가" <= w[0] <= "힣":
+            out.extend(w[i:i + 2] for i in range(len(w) - 1))
+        else:
+            out.append(w)
+    return out
+
+
+def _rank_sections(sections: list[dict], query: str) -> list[float]:
+    """섹션별 BM25 점수."""
+    k1, b = 1.5, 0.75
+    docs = [Counter(_terms(sec["text"])) for sec in sections]
+    avg_len = (sum(sum(d.values()) for d in docs) / len(docs)) if docs else 0
+    df = Counter(t for d in docs for t in d)
+    n = len(docs)
+    q_terms = set(_terms(query))
+    scores = []
+    for d in docs:
+        dl = sum(d.values())
+        score = 0.0
+        for t in q_terms:
+            tf = d.get(t)
+            if not tf:
+                continue
+            idf = math.log(1 + (n - df[t] + 0.5) / (df[t] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * dl / (avg_len or 1)))
+        scores.append(score)
+    return scores
+
+
+def _select_sections(sections: list[dict], query: str, budget: int = PAPER_WINDOW_CHARS) -> list[int]:
+    """쟁점과 관련된 섹션 번호 (문서 순서). 전체가 budget 이하면 전부."""
+    if sum(len(sec["text"]) for sec in sections) <= budget:
+        return list(range(len(sections)))
+    scores = _rank_sections(sections, query)
+    chosen: list[int] = []
+    used = 0
+    # 첫 섹션(제목·초록)은 짧으면 방향 잡기용으로 항상 포함
+    if sections and len(sections[0]["text"]) <= budget // 6:
+        chosen.append(0)
+        used += len(sections[0]["text"])
+    for idx in sorted(range(len(sections)), key=lambda i: -scores[i]):
+        if scores[idx] <= 0 or idx in chosen:
+            continue
+        size = len(sections[idx]["text"])
+        if used + size > budget:
+            continue
+        chosen.append(idx)
+        used += size
+    if len(chosen) <= (1 if 0 in chosen else 0):
+        # 매칭이 없으면 앞부분부터 budget만큼
+        chosen, used = [], 0
+        for idx, sec in enumerate(sections):
+            if chosen and used + len(sec["text"]) > budget:
+                break
+            chosen.append(idx)
+            used += len(sec["text"])
+    return sorted(chosen)
+
+
+def _render_sections(sections: list[dict], indices: list[int], marked: bool = False) -> str:
+    """선택 섹션을 문서 순서로 이어 붙임. 건너뛴 부분은 '(중략)', marked면 섹션 번호 표시."""
+    parts: list[str] = []
+    prev = -1
+    for idx in indices:
+        if not marked and idx != prev + 1:
+            parts.append("[… 중략 …]\n\n")
+        text = sections[idx]["text"]
+        parts.append(f"<<<SECTION {idx}>>>\n{text.rstrip()}\n\n" if marked else text)
+        prev = idx
+    if not marked and prev != len(sections) - 1:
+        parts.append("\n[… 이하 생략 …]")
+    return "".join(parts).rstrip() + "\n"
+
+
+def _parse_revised_sections(text: str) -> dict[int, str]:
+    """`<<<SECTION n>>>` 블록으로 된 수정본 → {섹션 번호: 수정 텍스트}."""
+    parts = _SECTION_MARK_RE.split(text)
+    revised: dict[int, str] = {}
+    for i in range(1, len(parts) - 1, 2):
+        body = parts[i + 1].strip("\n")
+        if body.strip():
+            revised[int(parts[i])] = body
+    return revised
+
+
+def _with_trailing(new_text: str, original: str) -> str:
+    """원래 섹션의 끝 공백/빈 줄을 유지 (섹션 경계 보존)."""
+    return new_text.rstrip() + original[len(original.rstrip()):]
+
+
 # ──────────────────────────────────────────────
 # JSON 파싱 유틸리티
 # ──────────────────────────────────────────────
@@ -260,11 +414,16 @@ class AgoraEngine:
     합의 결과를 논문에 반영하며, 토론 대화록을 학술 서적으로 편찬합니다.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, max_concurrent_issues: int = MAX_CONCURRENT_ISSUES) -> None:
         self._paused: bool = False
         self._active_session_id: int | None = None
         self._total_cost_usd: float = 0.0
         self._task: asyncio.Task | None = None
+        self.max_concurrent_issues = max(1, max_concurrent_issues)
+        # 동시 토론 중 공유 상태 — 현재 논문(메모리)과 수정 병합 잠금
+        self._paper_text: str = ""
+        self._paper_lock = asyncio.Lock()
+        self._chapter_seq: int = 0
 
     # ── 제어 API ─────────────────────────────
 
@@ -346,6 +505,8 @@ class AgoraEngine:
         """토론의 전체 흐름을 실행합니다."""
         session = agora_get_session(session_id)
         paper_text = session["paper_text"]
+        self._paper_text = paper_text
+        self._chapter_seq = 0
 
         try:
             # 1단계: 쟁점 추출
@@ -366,34 +527,8 @@ class AgoraEngine:
                 })
                 return
 
-            # 2단계: 각 쟁점별 토론
-            issue_queue = list(issues)  # 파생 쟁점이 추가될 수 있음
-            chapter_num = 0
-
-            while issue_queue:
-                issue = issue_queue.pop(0)
-                issue_id = issue["id"]
-
-                # 일시정지 체크
-                await self._wait_if_paused()
-
-                # 2a: 토론 라운드
-                resolution = await self._debate_issue(session_id, issue)
-
-                # 2b: 합의 후 논문 수정
-                if resolution:
-                    paper_text = await self._revise_paper(session_id, issue, paper_text, resolution)
-
-                # 2c: 대화록 챕터 작성
-                chapter_num += 1
-                await self._write_chapter(session_id, issue, chapter_num)
-
-                # 2d: 파생 쟁점 판단
-                derived = await self._check_derived_issues(session_id, issue)
-                if derived:
-                    issue_queue.extend(derived)
-
-                agora_update_issue(issue_id, status="completed")
+            # 2단계: 쟁점별 토론 (독립 쟁점은 동시에, 파생 쟁점은 부모 완료 후)
+            await self._schedule_issues(session_id, issues)
 
             # 3단계: 세션 완료
             agora_update_session(
@@ -425,6 +560,58 @@ class AgoraEngine:
             logger.exception("토론 중 예외 발생: session=%d", session_id)
             raise
 
+    # ── 2단계 스케줄러 ───────────────────────
+
+    async def _schedule_issues(self, session_id: int, issues: list[dict]) -> None:
+        """의존 쟁점이 모두 끝난 쟁점부터 최대 max_concurrent_issues개씩 동시에 처리합니다."""
+        pending = list(issues)
+        done_ids: set[int] = set()
+        running: dict[asyncio.Task, dict] = {}
+        try:
+            while pending or running:
+                ready = [iss for iss in pending if set(iss.get("depends_on", [])) <= done_ids]
+                for issue in ready[: self.max_concurrent_issues - len(running)]:
+                    pending.remove(issue)
+                    running[asyncio.create_task(self._process_issue(session_id, issue))] = issue
+                if not running:
+                    # 순환·누락된 의존 → 의존을 무시하고 순서대로 진행
+                    logger.warning("쟁점 의존 관계를 풀 수 없어 무시합니다: %s",
+                                   [iss["id"] for iss in pending])
+                    for iss in pending:
+                        iss["depends_on"] = []
+                    continue
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    issue = running.pop(task)
+                    pending.extend(task.result())   # 파생 쟁점 (예외는 그대로 전파)
+                    done_ids.add(issue["id"])
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def _process_issue(self, session_id: int, issue: dict) -> list[dict]:
+        """쟁점 하나의 전체 처리 (토론 → 논문 수정 → 챕터 → 파생 쟁점). 파생 쟁점 목록 반환."""
+        await self._wait_if_paused()
+
+        # 2a: 토론 라운드
+        resolution = await self._debate_issue(session_id, issue)
+
+        # 2b: 합의 후 논문 수정
+        if resolution:
+            await self._revise_paper(session_id, issue, resolution)
+
+        # 2c: 대화록 챕터 작성 (완료 순서대로 장 번호)
+        self._chapter_seq += 1
+        await self._write_chapter(session_id, issue, self._chapter_seq)
+
+        # 2d: 파생 쟁점 판단
+        derived = await self._check_derived_issues(session_id, issue)
+
+        agora_update_issue(issue["id"], status="completed")
+        return derived
+
     # ── 1단계: 쟁점 추출 ─────────────────────
 
     async def _extract_issues(self, session_id: int, paper_text: str) -> list[dict]:
@@ -456,7 +643,17 @@ class AgoraEngine:
                 title=item["title"],
                 description=item.get("description", ""),
             )
-            db_issue = {"id": issue_id, "title": item["title"], "description": item.get("description", "")}
+            # depends_on: 앞선 쟁점 번호(1부터) → 쟁점 ID
+            depends_on = [
+                db_issues[n - 1]["id"] for n in item.get("depends_on") or []
+                if isinstance(n, int) and 1 <= n <= len(db_issues)
+            ]
+            db_issue = {
+                "id": issue_id,
+                "title": item["title"],
+                "description": item.get("description", ""),
+                "depends_on": depends_on,
+            }
             db_issues.append(db_issue)
 
             await self._broadcast("issue_created", {
@@ -483,15 +680,16 @@ class AgoraEngine:
 
         agora_update_issue(issue_id, status="in_progress")
 
-        session = agora_get_session(session_id)
-        paper_text = session["paper_text"]
+        # 논문 전문 대신 쟁점과 관련된 섹션만 (현재 수정본 기준)
+        sections = _split_sections(self._paper_text)
+        window = _render_sections(sections, _select_sections(sections, f"{issue_title}\n{issue_desc}"))
 
         # 대화 기록 (에이전트 간 맥락 공유)
         conversation: list[dict] = []
         context_msg = (
             f"## 토론 쟁점: {issue_title}\n\n"
             f"{issue_desc}\n\n"
-            f"## 관련 논문 원문\n\n{paper_text}"
+            f"## 관련 논문 원문\n\n{window}"
         )
 
         resolution = None
@@ -683,11 +881,15 @@ class AgoraEngine:
         self,
         session_id: int,
         issue: dict,
-        current_paper: str,
         resolution: str,
     ) -> str:
-        """권대옥(Sonnet)이 합의 결과를 반영하여 논문을 수정합니다."""
+        """권대옥(Sonnet)이 합의 결과를 관련 섹션에 반영하고, 최신 논문에 섹션 단위로 병합합니다.
+
+        LLM 수정은 잠금 밖에서 스냅샷 기준으로 하고, 병합만 잠금 안에서 합니다.
+        그 사이 다른 쟁점이 같은 섹션을 바꿨으면(충돌) 잠금 안에서 최신 섹션으로 다시 수정합니다.
+        """
         issue_id = issue["id"]
+        query = f"{issue['title']}\n{issue.get('description', '')}\n{resolution}"
 
         # 토론 라운드 가져오기
         rounds = agora_get_rounds(issue_id)
@@ -696,12 +898,91 @@ class AgoraEngine:
             for r in rounds
         )
 
+        base_sections = _split_sections(self._paper_text)
+        targets = _select_sections(base_sections, query)
+        revised, cost = await self._revise_sections(issue, resolution, debate_summary, base_sections, targets)
+        if revised is None:
+            return self._paper_text
+
+        async with self._paper_lock:
+            current_paper = self._paper_text
+            sections = _split_sections(current_paper)
+            position = {sec["text"]: i for i, sec in enumerate(sections)}
+            conflicts: list[int] = []
+            for idx, new_text in revised.items():
+                base = base_sections[idx]["text"]
+                if base in position:
+                    cur = position[base]
+                    sections[cur] = {**sections[cur], "text": _with_trailing(new_text, base)}
+                else:
+                    conflicts.append(idx)
+
+            if conflicts:
+                # 충돌 섹션: 최신 논문에서 같은 제목의 섹션을 찾아 다시 수정
+                by_heading = {sec["heading"]: i for i, sec in enumerate(sections) if sec["heading"]}
+                retry = sorted({by_heading[base_sections[i]["heading"]]
+                                for i in conflicts if base_sections[i]["heading"] in by_heading})
+                logger.info("논문 수정 충돌 %d개 섹션 재수정: issue=%d", len(conflicts), issue_id)
+                if retry:
+                    again, retry_cost = await self._revise_sections(
+                        issue, resolution, debate_summary, sections, retry,
+                    )
+                    cost += retry_cost
+                    for idx, new_text in (again or {}).items():
+                        sections[idx] = {**sections[idx], "text": _with_trailing(new_text, sections[idx]["text"])}
+
+            revised_text = "".join(sec["text"] for sec in sections)
+            if revised_text == current_paper:
+                logger.info("논문 변경 없음: issue=%d", issue_id)
+                return current_paper
+
+            # Diff 생성
+            diff_html = _generate_diff_html(current_paper, revised_text)
+
+            # 버전 번호 결정 (잠금 안이라 동시 수정 간 번호 충돌 없음)
+            latest = agora_get_paper_latest(session_id)
+            version_num = (latest["version_num"] + 1) if latest else 1
+
+            agora_save_paper_version(
+                session_id=session_id,
+                version_num=version_num,
+                full_text=revised_text,
+                diff_html=diff_html,
+                change_summary=f"쟁점 '{issue['title']}' 합의 반영",
+                issue_id=issue_id,
+            )
+
+            # 세션의 paper_text도 갱신
+            self._paper_text = revised_text
+            agora_update_session(session_id, paper_text=revised_text)
+
+        await self._broadcast("paper_updated", {
+            "session_id": session_id,
+            "issue_id": issue_id,
+            "version_num": version_num,
+            "change_summary": f"쟁점 '{issue['title']}' 합의 반영",
+            "cost_usd": cost,
+        })
+
+        logger.info("논문 수정 완료: version=%d", version_num)
+        return revised_text
+
+    async def _revise_sections(
+        self,
+        issue: dict,
+        resolution: str,
+        debate_summary: str,
+        sections: list[dict],
+        targets: list[int],
+    ) -> tuple[dict[int, str] | None, float]:
+        """지정 섹션들의 수정본 {섹션 번호: 텍스트}와 비용. 실패 시 (None, 비용)."""
         revision_prompt = (
             f"## 토론 쟁점: {issue['title']}\n\n"
             f"## 합의 내용\n{resolution}\n\n"
             f"## 토론 기록 요약\n{debate_summary}\n\n"
-            f"## 현재 논문\n{current_paper}\n\n"
-            f"위 합의 내용을 반영하여 논문을 수정하십시오."
+            f"## 수정 대상 섹션 (논문 {len(sections)}개 섹션 중 {len(targets)}개)\n\n"
+            f"{_render_sections(sections, targets, marked=True)}\n"
+            f"위 합의 내용을 반영하여 섹션을 수정하십시오."
         )
 
         result = await self._call_ai(
@@ -710,43 +991,16 @@ class AgoraEngine:
             system_prompt=SYSTEM_PROMPTS["kdw_paper_revision"],
             user_message=revision_prompt,
         )
-
-        revised_text = result.get("content", current_paper)
-        revision_cost = result.get("cost_usd", 0)
+        cost = result.get("cost_usd", 0)
 
         if "error" in result:
             logger.error("논문 수정 실패: %s", result["error"])
-            return current_paper
-
-        # Diff 생성
-        diff_html = _generate_diff_html(current_paper, revised_text)
+            return None, cost
 
-        # 버전 번호 결정
-        latest = agora_get_paper_latest(session_id)
-        version_num = (latest["version_num"] + 1) if latest else 1
-
-        agora_save_paper_version(
-            session_id=session_id,
-            version_num=version_num,
-            full_text=revised_text,
-            diff_html=diff_html,
-            change_summary=f"쟁점 '{issue['title']}' 합의 반영",
-            issue_id=issue_id,
-        )
-
-        # 세션의 paper_text도 갱신
-        agora_update_session(session_id, paper_text=revised_text)
-
-        await self._broadcast("paper_updated", {
-            "session_id": session_id,
-            "issue_id": issue_id,
-            "version_num": version_num,
-            "change_summary": f"쟁점 '{issue['title']}' 합의 반영",
-            "cost_usd": revision_cost,
-        })
-
-        logger.info("논문 수정 완료: version=%d", version_num)
-        return revised_text
+        revised = {i: t for i, t in _parse_revised_sections(result.get("content", "")).items() if i in targets}
+        if not revised:
+            logger.warning("논문 수정 응답에 섹션 블록 없음: issue=%d", issue["id"])
+        return revised, cost
 
     # ── 2c: 대화록 챕터 작성 ─────────────────
 
@@ -862,7 +1116,8 @@ class AgoraEngine:
         new_issues = []
         for item in parsed.get("issues", []):
             title = item.get("title", "")
-            if title in existing_titles:
+            # 동시에 끝난 다른 쟁점이 방금 같은 파생 쟁점을 만들었을 수 있어 생성 직전 다시 확인
+            if title in existing_titles or any(iss["title"] == title for iss in agora_get_issues(session_id)):
                 logger.info("중복 파생 쟁점 건너뜀: %s", title)
                 continue
 
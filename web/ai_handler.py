@@ -12,12 +12,14 @@ arm_server.py에서 import하여 사용합니다.
 from __future__ import annotations
 
 import copy
+import hashlib
 import json
 import os
 import time
 import logging
 import asyncio
 import random
+import tempfile
 from pathlib import Path
 
 logger = logging.getLogger("corthex.ai")
@@ -605,6 +607,71 @@ _USE_CLI_FOR_CLAUDE = True
 _MCP_SERVER_PATH = str(Path(__file__).resolve().parent.parent / "src" / "mcp_tool_server.py")
 _VENV_PYTHON = "/home/ubuntu/venv/bin/python3"
 
+# MCP 설정/스키마 스냅샷 — 호출마다 임시 파일을 새로 쓰지 않고 (caller, 허용 도구) 조합별 고정 파일 재사용
+_MCP_RUNTIME_DIR = Path(tempfile.gettempdir()) / "corthex_mcp"
+_MCP_SCHEMA_SNAPSHOT = _MCP_RUNTIME_DIR / "tool_schemas.json"
+_mcp_snapshot_sig: tuple | None = None
+
+
+def _write_if_changed(path: Path, text: str) -> None:
+    """내용이 다를 때만 원자적으로 기록 (동시 CLI 호출이 읽는 중에도 안전)."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            return
+    except OSError:
+        pass
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _ensure_mcp_schema_snapshot() -> str:
+    """MCP 서버용 도구 스키마 스냅샷 (MCP Tool 포맷으로 미리 변환) — tools 설정이 바뀔 때만 재생성."""
+    global _mcp_snapshot_sig
+    sig = tuple(
+        p.stat().st_mtime_ns if p.exists() else 0
+        for p in (_PROJECT_ROOT / "config" / "tools.json", _PROJECT_ROOT / "config" / "tools.yaml")
+    )
+    if sig != _mcp_snapshot_sig or not _MCP_SCHEMA_SNAPSHOT.exists():
+        snapshot = {
+            t["name"]: {
+                "description": (t.get("description") or t["name"])[:200],
+                "inputSchema": t.get("input_schema") or {"type": "object", "properties": {}},
+            }
+            for t in _load_tool_schemas().get("anthropic", [])
+        }
+        _MCP_RUNTIME_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        _write_if_changed(_MCP_SCHEMA_SNAPSHOT, json.dumps(snapshot, ensure_ascii=False))
+        _mcp_snapshot_sig = sig
+    return str(_MCP_SCHEMA_SNAPSHOT)
+
+
+def _mcp_config_path(caller_id: str, allowed_tools: list[str]) -> str:
+    """(caller, 허용 도구) 조합별 고정 MCP 설정 파일 경로 (없거나 바뀌었을 때만 기록)."""
+    from tool_ipc import socket_path as _tool_socket_path
+    snapshot = _ensure_mcp_schema_snapshot()
+    tools_csv = ",".join(sorted(set(allowed_tools)))
+    env = {
+        "MCP_CALLER_ID": caller_id,
+        "MCP_ALLOWED_TOOLS": tools_csv,
+        "MCP_SCHEMA_SNAPSHOT": snapshot,
+    }
+    if _tool_socket_path():
+        env["MCP_TOOL_SOCKET"] = _tool_socket_path()   # 도구 호출을 HTTP 대신 Unix 소켓으로
+    mcp_config = {
+        "mcpServers": {
+            "corthex": {
+                "command": _VENV_PYTHON,
+                "args": [_MCP_SERVER_PATH],
+                "env": env,
+            }
+        }
+    }
+    digest = hashlib.sha1(f"{caller_id}|{tools_csv}".encode()).hexdigest()[:16]
+    path = _MCP_RUNTIME_DIR / f"mcp_{digest}.json"
+    _write_if_changed(path, json.dumps(mcp_config, ensure_ascii=False))
+    return str(path)
+
 
 async def _call_claude_cli(
     user_message: str,
@@ -625,8 +692,6 @@ async def _call_claude_cli(
     도구 호출은 MCP 프로토콜을 통해 CORTHEX 서버로 위임됩니다.
     비용: Max 구독 = 추가 과금 없음.
     """
-    import tempfile
-
     # Model name → CLI alias
     model_alias = model
     if model.startswith("claude-"):
@@ -663,28 +728,9 @@ async def _call_claude_cli(
     if system_prompt:
         cmd.extend(["--system-prompt", system_prompt])
 
-    # MCP 설정 — 도구가 있으면 MCP 서버 연결
-    config_file_path = None
+    # MCP 설정 — 도구가 있으면 MCP 서버 연결 (고정 설정 파일 재사용)
     if tools and cli_allowed_tools:
-        mcp_config = {
-            "mcpServers": {
-                "corthex": {
-                    "command": _VENV_PYTHON,
-                    "args": [_MCP_SERVER_PATH],
-                    "env": {
-                        "MCP_CALLER_ID": cli_caller_id,
-                        "MCP_ALLOWED_TOOLS": ",".join(cli_allowed_tools),
-                    },
-                }
-            }
-        }
-        # MCP config 임시 파일
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".json", delete=False, prefix="mcp_"
-        ) as f:
-            json.dump(mcp_config, f)
-            config_file_path = f.name
-        cmd.extend(["--mcp-config", config_file_path])
+        cmd.extend(["--mcp-config", _mcp_config_path(cli_caller_id, cli_allowed_tools)])
         cmd.append("--dangerously-skip-permissions")
 
     # 사용자 메시지는 stdin으로 전달 (--tools 등 variadic 옵션과 충돌 방지)
@@ -785,13 +831,6 @@ async def _call_claude_cli(
             "input_tokens": 0, "output_tokens": 0,
             "cost_usd": 0, "time_seconds": elapsed,
         }
-    finally:
-        # MCP config 임시 파일 정리
-        if config_file_path and os.path.exists(config_file_path):
-            try:
-                os.unlink(config_file_path)
-            except Exception:
-                pass
 
 
 # ── 프로바이더별 API 호출 ──
@@ -268,6 +268,8 @@ async def shutdown() -> None:
         scheduler.stop()
     if model_router:
         await model_router.close()
+    if memory_manager:
+        memory_manager.close()
     logger.info("CORTHEX HQ 시스템 종료")
 
 
@@ -1151,7 +1153,7 @@ async def get_memory(agent_id: str) -> list[dict]:
     """에이전트의 기억 목록을 반환합니다."""
     if not memory_manager:
         return []
-    return memory_manager.get_all(agent_id)
+    return await memory_manager.aget_all(agent_id)
 
 
 @app.post("/api/memory/{agent_id}")
@@ -1163,7 +1165,7 @@ async def add_memory(agent_id: str, body: dict) -> dict:
     value = body.get("value", "").strip()
     if not key or not value:
         return {"error": "key와 value가 필요합니다"}
-    entry = memory_manager.add(agent_id, key, value, source="manual")
+    entry = await memory_manager.aadd(agent_id, key, value, source="manual")
     return {"success": True, **entry.to_dict()}
 
 
@@ -1172,7 +1174,7 @@ async def delete_memory(agent_id: str, memory_id: str) -> dict:
     """에이전트의 기억을 삭제합니다."""
     if not memory_manager:
         return {"error": "시스템 미초기화"}
-    ok = memory_manager.delete(agent_id, memory_id)
+    ok = await memory_manager.adelete(agent_id, memory_id)
     return {"success": ok}
 
 
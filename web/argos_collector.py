@@ -788,9 +788,15 @@ async def _argos_collect_sector_safe():
 # 월간 강화학습 패턴 분석 (Phase 6-9)
 # ══════════════════════════════════════════════════════════════════
 
+ARGOS_MONTHLY_RL_ORIGIN = "argos_monthly_rl"   # batch_system origin
+
+
 async def _argos_monthly_rl_analysis():
     """월 1회: AI에게 최근 오답 패턴 분석 요청 → error_patterns 테이블 업데이트.
     Phase 6-9 강화학습 파이프라인.
+
+    즉시 결과가 필요 없는 작업이라 Batch API(~50% 할인)로 제출하고,
+    결과는 _argos_monthly_rl_result()가 받아서 저장합니다.
     """
     _argos_logger.info("📊 월간 강화학습 패턴 분석 시작")
     save_activity_log("system", "📊 월간 강화학습 패턴 분석 시작 (크론)", "info")
@@ -824,33 +830,43 @@ async def _argos_monthly_rl_analysis():
             "③ 다음 분석 시 주의사항 3가지를 간결하게 요약하세요."
         )
 
-        from ai_handler import ask_ai
-        result = await ask_ai(
-            agent_id="secretary",
-            messages=[{"role": "user", "content": prompt}],
-            model=None,  # config/models.yaml에서 자동 선택
-            task_id=f"rl_monthly_{datetime.now(KST).strftime('%Y%m')}",
+        import batch_system
+        ids = await batch_system.submit(
+            [{"message": prompt}],
+            origin=ARGOS_MONTHLY_RL_ORIGIN,
         )
-
-        analysis_text = result.get("content", "")
-        if analysis_text:
-            conn = get_connection()
-            conn.execute(
-                """INSERT INTO error_patterns
-                   (pattern_type, description, ticker_filter, direction_filter,
-                    confidence_threshold, active, created_at, updated_at)
-                   VALUES(?,?,?,?,?,?,?,?)""",
-                ("monthly_rl", analysis_text[:2000], "", "", 0.0, 1,
-                 datetime.now(KST).isoformat(), datetime.now(KST).isoformat())
-            )
-            conn.commit()
-            conn.close()
-            save_activity_log("system", f"📊 월간 RL 패턴 분석 완료 ({len(rows)}건 분석)", "success")
-            _argos_logger.info("월간 RL 패턴 분석 완료: %d건", len(rows))
+        save_activity_log("system", f"📊 월간 RL 패턴 분석 배치 제출 ({len(rows)}건)", "info")
+        _argos_logger.info("월간 RL 패턴 분석 배치 제출: %s", ids[0])
     except Exception as e:
         _argos_logger.error("월간 RL 패턴 분석 실패: %s", e)
 
 
+async def _argos_monthly_rl_result(row: dict) -> None:
+    """batch_system 결과 핸들러 — 분석 결과를 error_patterns에 저장."""
+    if row.get("error"):
+        _argos_logger.error("월간 RL 패턴 분석 배치 실패: %s", row["error"])
+        save_activity_log("system", f"📊 월간 RL 패턴 분석 실패: {str(row['error'])[:100]}", "error")
+        return
+    analysis_text = row.get("content") or ""
+    if not analysis_text:
+        return
+    now_iso = datetime.now(KST).isoformat()
+    conn = get_connection()
+    try:
+        conn.execute(
+            """INSERT INTO error_patterns
+               (pattern_type, description, ticker_filter, direction_filter,
+                confidence_threshold, active, created_at, updated_at)
+               VALUES(?,?,?,?,?,?,?,?)""",
+            ("monthly_rl", analysis_text[:2000], "", "", 0.0, 1, now_iso, now_iso)
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    save_activity_log("system", "📊 월간 RL 패턴 분석 완료 (배치)", "success")
+    _argos_logger.info("월간 RL 패턴 분석 완료 (배치 %s)", row.get("custom_id", ""))
+
+
 # ══════════════════════════════════════════════════════════════════
 # ARGOS 컨텍스트 빌더 (팀장 프롬프트 주입용)
 # ══════════════════════════════════════════════════════════════════
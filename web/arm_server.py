@@ -22,6 +22,7 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from ws_manager import wm  # WebSocket/SSE 브로드캐스트 매니저
 from state import app_state  # 전역 상태 관리 (관리사무소)
+from dashboard_snapshot import dashboard_snapshot  # 대시보드 스냅샷 캐시 + delta
 from db import (
     init_db, get_connection, save_message, create_task, get_task as db_get_task,
     update_task, list_tasks, toggle_bookmark as db_toggle_bookmark,
@@ -33,7 +34,7 @@ from db import (
     delete_task as db_delete_task, bulk_delete_tasks, bulk_archive_tasks,
     set_task_tags, mark_task_read, bulk_mark_read,
     save_quality_review, get_quality_stats,
-    save_collaboration_log,
+    save_collaboration_log, list_batch_chains,
 )
 
 # ── 설정/유틸/에이전트 로딩 (config_loader.py에서 분리) ──
@@ -107,7 +108,7 @@ except ImportError:
 # ── ToolPool → app_state.tool_pool 직접 사용 ──
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Body, Request
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 from typing import Optional
@@ -117,92 +118,36 @@ from typing import Optional
 
 app = FastAPI(title="CORTHEX HQ")
 
-# ── 전체 활동 로깅 미들웨어 (CEO 요청: 웹에서 일어나는 일 전부 로그) ──
-# 정적 파일, 헬스체크 등 노이즈를 제외한 모든 API 요청을 activity_log에 기록
-_LOG_SKIP_PREFIXES = ("/static", "/favicon", "/deploy-status", "/ws", "/api/comms")
-_LOG_SKIP_EXACT = {"/", "/api/health", "/api/agents/status", "/api/dashboard/stats",
-                   "/api/activity-logs", "/api/batch/chain/status",
-                   "/api/budget", "/api/trading/summary", "/api/trading/history",
-                   "/api/trading/strategies", "/api/trading/signals",
-                   "/api/trading/watchlist/prices"}
+# ── 요청 메트릭 미들웨어 (순수 ASGI → request_metrics.py) ──
+# 요청마다 activity_log INSERT 하던 ActivityLogMiddleware 대체:
+# 라우트별 지연/상태코드/in-flight는 메모리 집계 → /metrics, /api/debug/metrics
+# 매매 주문·설정 변경 같은 감사 대상만 버퍼링 후 일괄 저장 + 5분마다 요약 1행
 _LOG_DESCRIPTION: dict[str, str] = {
-    # 채팅/AI
-    "POST /api/chat": "💬 채팅 메시지 전송",
-    "POST /api/chat/send": "💬 채팅 메시지 전송",
-    # 에이전트
-    "GET /api/agents": "📋 에이전트 목록 조회",
-    "GET /api/agents/status": "🔵 에이전트 상태 조회",
     # 자동매매
     "POST /api/trading/bot/run-now": "🚀 즉시 매매 실행",
     "POST /api/trading/bot/toggle": "⚡ 자동매매 봇 ON/OFF",
-    "GET /api/trading/portfolio": "💰 포트폴리오 조회",
-    "GET /api/trading/signals": "📊 매매 시그널 조회",
-    "GET /api/trading/watchlist": "👁️ 관심종목 조회",
     "POST /api/trading/watchlist": "👁️ 관심종목 추가",
-    # KIS
-    "GET /api/kis/balance": "💳 KIS 잔고 조회",
-    "GET /api/kis/status": "🔌 KIS 연결 상태",
     # 배치
     "POST /api/batch/chain/start": "⛓️ 배치 체인 시작",
-    "GET /api/batch/chain/status": "⛓️ 배치 체인 상태",
-    # 콘텐츠 파이프라인
-    "GET /api/content-pipeline": "📰 콘텐츠 파이프라인 현황",
-    "POST /api/content-pipeline/run": "🚀 콘텐츠 파이프라인 실행",
-    "POST /api/content-pipeline/approve": "✅ 콘텐츠 승인",
-    "POST /api/content-pipeline/reject": "❌ 콘텐츠 거절",
-    # 아카이브
-    "GET /api/archives": "📁 아카이브 조회",
-    # 작업
-    "POST /api/tasks": "📝 작업 생성",
-    "GET /api/tasks": "📝 작업 목록 조회",
     # 설정
-    "GET /api/settings": "⚙️ 설정 조회",
     "POST /api/settings": "⚙️ 설정 저장",
-    # 워크플로우
-    "POST /api/workflows/run": "🔄 워크플로우 실행",
-    # 디버그
-    "GET /api/debug/kis-token": "🔍 KIS 토큰 디버그",
-    "GET /api/debug/auto-trading-pipeline": "🔍 자동매매 파이프라인 디버그",
 }
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request as StarletteRequest
+from request_metrics import RequestMetricsMiddleware, metrics as request_metrics
+from fastapi.responses import PlainTextResponse
 
-class ActivityLogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: StarletteRequest, call_next):
-        path = request.url.path
-        method = request.method
+app.add_middleware(RequestMetricsMiddleware, descriptions=_LOG_DESCRIPTION)
 
-        # 노이즈 제외
-        if path in _LOG_SKIP_EXACT or any(path.startswith(p) for p in _LOG_SKIP_PREFIXES):
-            return await call_next(request)
 
-        start = time.time()
-        response = await call_next(request)
-        elapsed = time.time() - start
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics(request: Request):
+    """Prometheus 텍스트 포맷 요청 메트릭 — localhost 스크레이프 또는 로그인한 사용자만."""
+    from handlers.auth_handler import is_local_or_authed
+    if not is_local_or_authed(request):
+        return PlainTextResponse("forbidden", status_code=403)
+    return PlainTextResponse(request_metrics.render_prometheus(),
+                             media_type="text/plain; version=0.0.4")
 
-        # 로그 기록 (비동기 WebSocket broadcast는 startup 이후에만 가능)
-        key = f"{method} {path}"
-        desc = _LOG_DESCRIPTION.get(key, "")
-        status = response.status_code
-        level = "info" if status < 400 else ("warning" if status < 500 else "error")
-
-        # 짧은 요약 생성
-        if desc:
-            action = f"{desc} ({elapsed:.1f}s)"
-        else:
-            action = f"🌐 {method} {path} → {status} ({elapsed:.1f}s)"
-
-        try:
-            log_entry = save_activity_log("system", action, level)
-            # 시스템 HTTP 로그는 브로드캐스트하지 않음 (노이즈 감소)
-            # 에이전트 활동로그만 실시간 전송
-        except Exception as e:
-            logger.debug("활동 로그 저장 실패: %s", e)
-
-        return response
-
-app.add_middleware(ActivityLogMiddleware)
 
 @app.get("/", response_class=HTMLResponse)
 async def index():
@@ -557,17 +502,41 @@ from handlers.tools_handler import router as tools_router
 app.include_router(tools_router)
 
 
-@app.get("/api/dashboard")
-async def get_dashboard(request: Request):
-    now = datetime.now(KST).isoformat()
-    _role = get_auth_role(request)
-    _org = get_auth_org(request)
+_DASHBOARD_STATIC_TTL = 600.0   # 도구 수·API 키 상태 (재시작·배포 때만 바뀜)
+_dashboard_static: dict = {}
 
-    # orgScope 기반 에이전트 필터 (누나는 자신의 에이전트 비용만)
-    _scope_agents = None  # None = 전체
-    if _org:
-        _scope_agents = [a["agent_id"] for a in AGENTS if a.get("org") == _org or a.get("cli_owner") == _role]
 
+def _dashboard_static_info() -> dict:
+    """도구 수 + API 키 상태 — 10분 캐시 (tools.json 재파싱·프로바이더 확인을 매 요청 반복하지 않음)."""
+    if _dashboard_static and time.monotonic() - _dashboard_static["at"] < _DASHBOARD_STATIC_TTL:
+        return _dashboard_static
+
+    # ── 도구 수 ──
+    tool_count = 0
+    try:
+        pool = _init_tool_pool()
+        if pool:
+            tool_count = len(pool.loaded_names())
+    except Exception as e:
+        logger.debug("도구 풀 카운트 실패: %s", e)
+    if tool_count == 0:
+        tool_count = len(_load_tool_schemas().get("anthropic", []))
+
+    # ── API 키 상태 ──
+    providers = get_available_providers()
+    api_keys = {
+        "anthropic": providers.get("anthropic", False),
+        "google": providers.get("google", False),
+        "openai": providers.get("openai", False),
+        "notion": bool(os.getenv("NOTION_API_KEY", "")),
+        "telegram": bool(os.getenv("TELEGRAM_BOT_TOKEN", "")),
+    }
+    _dashboard_static.update(at=time.monotonic(), tool_count=tool_count, api_keys=api_keys)
+    return _dashboard_static
+
+
+def _build_dashboard(_scope_agents: list[str] | None) -> dict:
+    """대시보드 스냅샷 계산 (동기 — dashboard_snapshot이 스레드에서 실행, 변경 시에만 재계산)."""
     stats = get_dashboard_stats()
     today_cost = get_today_cost()
 
@@ -615,29 +584,13 @@ async def get_dashboard(request: Request):
     total_ai_calls = sum(provider_calls.values())
 
     # ── 배치 현황 ──
-    chains = load_setting("batch_chains") or []
+    chains = list_batch_chains()
     batch_active = len([c for c in chains if c.get("status") in ("running", "pending")])
     batch_done = len([c for c in chains if c.get("status") == "completed"])
 
-    # ── 도구 수 ──
-    tool_count = 0
-    try:
-        pool = _init_tool_pool()
-        if pool:
-            tool_count = len(pool.registry)
-    except Exception as e:
-        logger.debug("도구 풀 카운트 실패: %s", e)
-    if tool_count == 0:
-        tool_count = len(_load_tool_schemas().get("anthropic", []))
-
-    # ── API 키 상태 ──
-    api_keys = {
-        "anthropic": get_available_providers().get("anthropic", False),
-        "google": get_available_providers().get("google", False),
-        "openai": get_available_providers().get("openai", False),
-        "notion": bool(os.getenv("NOTION_API_KEY", "")),
-        "telegram": bool(os.getenv("TELEGRAM_BOT_TOKEN", "")),
-    }
+    static = _dashboard_static_info()
+    tool_count = static["tool_count"]
+    api_keys = dict(static["api_keys"])
     api_connected = sum(1 for v in api_keys.values() if v)
     api_total = len(api_keys)
 
@@ -672,7 +625,6 @@ async def get_dashboard(request: Request):
         "total_tokens": stats["total_tokens"],
         "notion_connected": bool(os.getenv("NOTION_API_KEY", "")),
         "system_status": sys_status,
-        "uptime": now,
         "agents": AGENTS,
         "recent_completed": stats["recent_completed"],
         "api_keys": api_keys,
@@ -688,6 +640,28 @@ async def get_dashboard(request: Request):
     }
 
 
+dashboard_snapshot.set_builder(_build_dashboard)
+
+
+@app.get("/api/dashboard")
+async def get_dashboard(request: Request):
+    _role = get_auth_role(request)
+    _org = get_auth_org(request)
+
+    # orgScope 기반 에이전트 필터 (누나는 자신의 에이전트 비용만)
+    _scope_agents = None  # None = 전체
+    if _org:
+        _scope_agents = [a["agent_id"] for a in AGENTS if a.get("org") == _org or a.get("cli_owner") == _role]
+
+    payload, etag = await dashboard_snapshot.get(_scope_agents)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    inm = request.headers.get("if-none-match", "")
+    if etag in [t.strip() for t in inm.split(",")]:
+        dashboard_snapshot.note_not_modified()
+        return Response(status_code=304, headers=headers)
+    return JSONResponse({**payload, "uptime": datetime.now(KST).isoformat()}, headers=headers)
+
+
 # ── 예산(Budget) · 모델모드 → handlers/agent_handler.py로 분리 ──
 
 # ── 품질검수 통계 + 프리셋 → handlers/quality_handler.py, handlers/preset_handler.py로 분리 ──
@@ -1013,8 +987,10 @@ async def internal_tool_invoke(request: Request):
     CLI 에이전트가 MCP를 통해 도구를 사용할 때,
     MCP 서버가 이 엔드포인트로 도구 실행을 위임합니다.
     localhost에서만 접근 가능 (nginx가 외부 차단).
+    평소에는 tool_ipc의 Unix 소켓 채널을 쓰고, 이 HTTP 경로는 소켓을 못 쓸 때의 폴백.
     """
-    from agent_router import _init_tool_pool
+    from tool_ipc import invoke_tool
+    body: dict = {}
     try:
         body = await request.json()
         tool_name = body.get("tool_name", "")
@@ -1024,11 +1000,7 @@ async def internal_tool_invoke(request: Request):
         if not tool_name:
             return JSONResponse({"error": "tool_name 필수"}, status_code=400)
 
-        pool = _init_tool_pool()
-        if not pool:
-            return JSONResponse({"error": "ToolPool 초기화 실패"}, status_code=500)
-
-        result = await pool.invoke(tool_name, caller_id=caller_id, **arguments)
+        result = await invoke_tool(tool_name, arguments, caller_id)
         return {"result": result}
     except Exception as e:
         logger.error("[InternalTool] %s 실행 오류: %s", body.get("tool_name", "?"), e)
@@ -1087,6 +1059,9 @@ async def on_startup():
         _diag["tg_error"] = f"startup 예외: {tg_err}"
     # 도구 실행 엔진 초기화 (비동기 아닌 동기 — 첫 요청 시 lazy 로드도 지원)
     _init_tool_pool()
+    # MCP 프록시용 내부 도구 소켓 (HTTP 스택 우회)
+    from tool_ipc import start_tool_ipc
+    await start_tool_ipc()
     # cross_agent_protocol 실시간 콜백 등록
     try:
         from src.tools.cross_agent_protocol import register_call_agent, register_sse_broadcast, register_valid_agents, register_collaboration_log_callback
@@ -1115,6 +1090,8 @@ async def on_shutdown():
     cancelled = await app_state.cancel_all_bg_tasks()
     _log(f"[SHUTDOWN] 백그라운드 태스크 {cancelled}개 취소")
     await _stop_telegram_bot()
+    from tool_ipc import stop_tool_ipc
+    await stop_tool_ipc()
     _log("[SHUTDOWN] 서버 종료 완료")
 
 
@@ -0,0 +1,213 @@
+"""
+배치 작업 저장소 — batch_system 전용 SQLite 테이블.
+
+이전에는 Batch API 대기열이 app_state.batch_api_queue(메모리 리스트)라 재시작하면 사라졌고,
+배치 체인은 settings의 batch_chains JSON 한 덩어리를 통째로 읽고-고쳐-쓰기 했습니다.
+여기서는:
+- batch_requests: 요청 1건 = 1행 (queued → submitted → done / failed), 출처(origin)·task_id로 결과 회신
+- batch_jobs: 프로바이더에 제출된 배치 1건 = 1행, 다음 폴링 시각·폴링 횟수 보관 (재시작 후 이어서 폴링)
+- batch_chains: 체인 1건 = 1행 (JSON 본문), 체인 하나만 갱신해도 다른 체인은 건드리지 않음
+- 기존 settings의 batch_chains 값은 init_db 때 1회 이관
+
+db.py가 연결을 넘겨 호출합니다 (content_store와 같은 방식).
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime, timezone
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    batch_id      TEXT PRIMARY KEY,
+    provider      TEXT NOT NULL,
+    model         TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'processing',  -- processing / completed / failed / expired
+    count         INTEGER NOT NULL DEFAULT 0,
+    progress      TEXT DEFAULT NULL,                   -- JSON {"completed", "total"}
+    poll_count    INTEGER NOT NULL DEFAULT 0,
+    next_poll_at  REAL NOT NULL DEFAULT 0,             -- epoch 초
+    error         TEXT DEFAULT NULL,
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_status ON batch_jobs(status, next_poll_at);
+
+CREATE TABLE IF NOT EXISTS batch_requests (
+    custom_id     TEXT PRIMARY KEY,
+    origin        TEXT NOT NULL DEFAULT '',            -- 결과 회신 핸들러 키 (soul_gym, argos ...)
+    task_id       TEXT DEFAULT NULL,
+    model         TEXT NOT NULL,
+    provider      TEXT NOT NULL,
+    payload       TEXT NOT NULL,                       -- batch_submit 요청 dict JSON
+    status        TEXT NOT NULL DEFAULT 'queued',      -- queued / submitted / done / failed
+    batch_id      TEXT DEFAULT NULL,
+    position      INTEGER DEFAULT NULL,                -- 배치 안 순번 (custom_id 매핑 유실 대비)
+    result        TEXT DEFAULT NULL,                   -- JSON (content, cost_usd, ...)
+    error         TEXT DEFAULT NULL,
+    created_at    TEXT NOT NULL,
+    completed_at  TEXT DEFAULT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batch_requests_status ON batch_requests(status, provider, model);
+CREATE INDEX IF NOT EXISTS idx_batch_requests_batch ON batch_requests(batch_id);
+
+CREATE TABLE IF NOT EXISTS batch_chains (
+    chain_id      TEXT PRIMARY KEY,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    data          TEXT NOT NULL,                       -- 체인 dict JSON
+    created_at    TEXT NOT NULL,
+    updated_at    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_batch_chains_status ON batch_chains(status);
+"""
+
+ACTIVE_JOB_STATUSES = ("processing",)
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _rows(conn: sqlite3.Connection, sql: str, args: tuple = ()) -> list[dict]:
+    cur = conn.execute(sql, args)
+    cols = [c[0] for c in cur.description]
+    return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+
+# ── 요청 ──
+
+def add_requests(conn: sqlite3.Connection, items: list[dict]) -> int:
+    """[{custom_id, origin, task_id, model, provider, payload(dict)}] → queued 행 추가 (이미 있으면 무시)."""
+    now = _now_iso()
+    cur = conn.executemany(
+        "INSERT OR IGNORE INTO batch_requests "
+        "(custom_id, origin, task_id, model, provider, payload, created_at) VALUES (?,?,?,?,?,?,?)",
+        [(it["custom_id"], it.get("origin", ""), it.get("task_id"), it["model"], it["provider"],
+          json.dumps(it["payload"], ensure_ascii=False), now) for it in items],
+    )
+    return cur.rowcount
+
+
+def queued_requests(conn: sqlite3.Connection) -> list[dict]:
+    rows = _rows(conn, "SELECT * FROM batch_requests WHERE status='queued' ORDER BY created_at")
+    for r in rows:
+        r["payload"] = json.loads(r["payload"])
+    return rows
+
+
+def mark_submitted(conn: sqlite3.Connection, batch_id: str, custom_ids: list[str]) -> None:
+    conn.executemany(
+        "UPDATE batch_requests SET status='submitted', batch_id=?, position=? WHERE custom_id=?",
+        [(batch_id, i, cid) for i, cid in enumerate(custom_ids)],
+    )
+
+
+def mark_failed(conn: sqlite3.Connection, custom_ids: list[str], error: str) -> None:
+    now = _now_iso()
+    conn.executemany(
+        "UPDATE batch_requests SET status='failed', error=?, completed_at=? WHERE custom_id=?",
+        [(error[:500], now, cid) for cid in custom_ids],
+    )
+
+
+def job_requests(conn: sqlite3.Connection, batch_id: str) -> list[dict]:
+    return _rows(conn, "SELECT custom_id, origin, task_id, position, status FROM batch_requests "
+                       "WHERE batch_id=? ORDER BY position", (batch_id,))
+
+
+def save_result(conn: sqlite3.Connection, custom_id: str, result: dict) -> None:
+    error = result.get("error")
+    conn.execute(
+        "UPDATE batch_requests SET status=?, result=?, error=?, completed_at=? WHERE custom_id=?",
+        ("failed" if error else "done", json.dumps(result, ensure_ascii=False),
+         str(error)[:500] if error else None, _now_iso(), custom_id),
+    )
+
+
+def get_request(conn: sqlite3.Connection, custom_id: str) -> dict | None:
+    rows = _rows(conn, "SELECT * FROM batch_requests WHERE custom_id=?", (custom_id,))
+    if not rows:
+        return None
+    row = rows[0]
+    row["payload"] = json.loads(row["payload"])
+    row["result"] = json.loads(row["result"]) if row["result"] else None
+    return row
+
+
+# ── 배치 작업 ──
+
+def add_job(conn: sqlite3.Connection, batch_id: str, provider: str, model: str,
+            count: int, next_poll_at: float) -> None:
+    now = _now_iso()
+    conn.execute(
+        "INSERT OR REPLACE INTO batch_jobs "
+        "(batch_id, provider, model, status, count, next_poll_at, created_at, updated_at) "
+        "VALUES (?,?,?,'processing',?,?,?,?)",
+        (batch_id, provider, model, count, next_poll_at, now, now),
+    )
+
+
+def update_job(conn: sqlite3.Connection, batch_id: str, **fields) -> None:
+    if "progress" in fields and not isinstance(fields["progress"], (str, type(None))):
+        fields["progress"] = json.dumps(fields["progress"])
+    fields["updated_at"] = _now_iso()
+    cols = ", ".join(f"{k}=?" for k in fields)
+    conn.execute(f"UPDATE batch_jobs SET {cols} WHERE batch_id=?", (*fields.values(), batch_id))
+
+
+def active_jobs(conn: sqlite3.Connection) -> list[dict]:
+    return _rows(conn, "SELECT * FROM batch_jobs WHERE status='processing' ORDER BY next_poll_at")
+
+
+def summary(conn: sqlite3.Connection) -> dict:
+    """대기열·작업 현황 집계."""
+    req = dict(conn.execute("SELECT status, COUNT(*) FROM batch_requests GROUP BY status").fetchall())
+    jobs = _rows(conn, "SELECT batch_id, provider, model, status, count, progress, poll_count, created_at "
+                       "FROM batch_jobs WHERE status='processing' ORDER BY created_at")
+    for j in jobs:
+        j["progress"] = json.loads(j["progress"]) if j["progress"] else {}
+    return {"requests": req, "active_jobs": jobs}
+
+
+# ── 체인 ──
+
+def save_chain(conn: sqlite3.Connection, chain: dict) -> None:
+    now = _now_iso()
+    conn.execute(
+        "INSERT INTO batch_chains (chain_id, status, data, created_at, updated_at) VALUES (?,?,?,?,?) "
+        "ON CONFLICT(chain_id) DO UPDATE SET status=excluded.status, data=excluded.data, "
+        "updated_at=excluded.updated_at",
+        (chain["chain_id"], chain.get("status", "pending"),
+         json.dumps(chain, ensure_ascii=False, default=str), now, now),
+    )
+
+
+def list_chains(conn: sqlite3.Connection, statuses: tuple[str, ...] | None = None,
+                limit: int | None = None) -> list[dict]:
+    sql = "SELECT data FROM batch_chains"
+    args: tuple = ()
+    if statuses:
+        sql += f" WHERE status IN ({','.join('?' * len(statuses))})"
+        args = tuple(statuses)
+    sql += " ORDER BY created_at"
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+    return [json.loads(r[0]) for r in conn.execute(sql, args).fetchall()]
+
+
+def migrate_settings(conn: sqlite3.Connection) -> int:
+    """settings의 batch_chains 값을 batch_chains 테이블로 이관 후 삭제. 이관한 체인 수 반환."""
+    row = conn.execute("SELECT value FROM settings WHERE key='batch_chains'").fetchone()
+    if row is None:
+        return 0
+    try:
+        chains = json.loads(row[0]) or []
+    except (TypeError, ValueError):
+        chains = []
+    moved = 0
+    for chain in chains if isinstance(chains, list) else []:
+        if isinstance(chain, dict) and chain.get("chain_id"):
+            save_chain(conn, chain)
+            moved += 1
+    conn.execute("DELETE FROM settings WHERE key='batch_chains'")
+    return moved
@@ -0,0 +1,357 @@
+"""
+배치 시스템 — 프로바이더 Batch API(~50% 할인) 작업을 SQLite에 기록하며 제출·폴링·결과 회신.
+
+Soul Gym, ARGOS 월간 분석, 대량 보고서처럼 즉시 응답이 필요 없는 작업을 실시간 호출 대신
+Batch API로 보내기 위한 모듈입니다. batch_system이 없어 agent_router가 오류 스텁으로
+떨어지던 _save_chain / _flush_batch_api_queue / _broadcast_chain_status도 여기서 제공합니다.
+- submit(): 요청을 batch_requests 테이블에 queued로 기록 (재시작해도 유지) → 잠시 모아서 제출
+- 제출 시 (프로바이더, 모델)별로 묶고, 프로바이더 한도(요청 수·바이트)를 넘으면 여러 배치로 분할
+- 폴링: 배치마다 다음 폴링 시각을 저장, 30초에서 시작해 ×1.6씩 늘려 최대 30분 간격 (지수 백오프)
+  → 재시작 후에도 batch_jobs의 processing 행을 이어서 폴링
+- 완료 시 결과를 batch_requests에 저장하고 origin별 핸들러 호출, task_id가 있으면 작업 갱신,
+  WebSocket으로 batch_update 이벤트 전송
+
+사용법:
+    import batch_system
+    batch_system.register_handler("soul_gym", on_result)   # async def on_result(row: dict)
+    ids = await batch_system.submit([{"message": "...", "system_prompt": "...", "model": "..."}],
+                                    origin="soul_gym")
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+import batch_store
+from db import get_connection, list_batch_chains, save_batch_chain, update_task
+from ws_manager import wm
+
+try:
+    from ai_handler import _get_provider, batch_check, batch_retrieve, batch_submit
+except ImportError:
+    def _get_provider(model: str) -> str: return "anthropic"
+    async def batch_submit(*a, **kw): return {"error": "ai_handler 미설치"}
+    async def batch_check(*a, **kw): return {"error": "ai_handler 미설치"}
+    async def batch_retrieve(*a, **kw): return {"error": "ai_handler 미설치"}
+
+logger = logging.getLogger("corthex.batch")
+
+# 프로바이더별 배치 1건 한도 (요청 수, 요청 본문 바이트 합) — 공식 한도보다 약간 낮게
+PROVIDER_LIMITS: dict[str, tuple[int, int]] = {
+    "anthropic": (100_000, 200 * 1024 * 1024),
+    "openai": (50_000, 180 * 1024 * 1024),
+    "google": (2_000, 18 * 1024 * 1024),      # 인라인 요청 20MB 제한
+}
+_DEFAULT_LIMIT = (1_000, 18 * 1024 * 1024)
+
+FLUSH_DELAY_SEC = 30.0       # submit 후 이만큼 모아서 제출
+FLUSH_NOW_COUNT = 200        # 대기열이 이만큼 쌓이면 바로 제출
+POLL_BASE_SEC = 30.0
+POLL_FACTOR = 1.6
+POLL_MAX_SEC = 1800.0
+JOB_EXPIRE_SEC = 26 * 3600   # 프로바이더 처리 기한(24h) + 여유
+
+ResultHandler = Callable[[dict], Awaitable[None]]
+_handlers: dict[str, ResultHandler] = {}
+_poller: asyncio.Task | None = None
+_flush_timer: asyncio.TimerHandle | None = None
+_wake: asyncio.Event | None = None
+_flush_lock = asyncio.Lock()
+
+
+def _db(fn, *args, **kwargs):
+    """batch_store 함수를 연결 열고-커밋-닫기로 실행."""
+    conn = get_connection()
+    try:
+        out = fn(conn, *args, **kwargs)
+        conn.commit()
+        return out
+    finally:
+        conn.close()
+
+
+def register_handler(origin: str, handler: ResultHandler) -> None:
+    """origin으로 제출한 요청의 결과를 받을 코루틴 등록. row: custom_id, task_id, content, error, ..."""
+    _handlers[origin] = handler
+
+
+def next_poll_delay(poll_count: int) -> float:
+    return min(POLL_MAX_SEC, POLL_BASE_SEC * POLL_FACTOR ** poll_count)
+
+
+# ── 제출 ──
+
+async def submit(requests: list[dict], origin: str = "", task_id: str | None = None) -> list[str]:
+    """요청을 배치 대기열에 기록하고 custom_id 목록 반환 (제출은 잠시 뒤 묶어서)."""
+    items = []
+    for req in requests:
+        req = dict(req)
+        req.setdefault("model", "claude-sonnet-4-6")
+        req.setdefault("custom_id", f"{origin or 'req'}-{uuid.uuid4().hex[:16]}")
+        items.append({
+            "custom_id": req["custom_id"], "origin": origin, "task_id": req.pop("task_id", task_id),
+            "model": req["model"], "provider": _get_provider(req["model"]), "payload": req,
+        })
+    await asyncio.to_thread(_db, batch_store.add_requests, items)
+    queued = (await asyncio.to_thread(_db, batch_store.summary))["requests"].get("queued", 0)
+    _schedule_flush(0 if queued >= FLUSH_NOW_COUNT else FLUSH_DELAY_SEC)
+    return [it["custom_id"] for it in items]
+
+
+def _schedule_flush(delay: float) -> None:
+    global _flush_timer
+    loop = asyncio.get_running_loop()
+    if _flush_timer is not None and not _flush_timer.cancelled():
+        if delay > 0:
+            return  # 이미 예약됨 — 그때 함께 제출
+        _flush_timer.cancel()
+    _flush_timer = loop.call_later(delay, lambda: asyncio.ensure_future(_flush_batch_api_queue()))
+
+
+def _chunks(rows: list[dict], provider: str) -> list[list[dict]]:
+    """한 (프로바이더, 모델) 그룹을 요청 수·바이트 한도 안의 덩어리로 분할."""
+    max_count, max_bytes = PROVIDER_LIMITS.get(provider, _DEFAULT_LIMIT)
+    out: list[list[dict]] = [[]]
+    size = 0
+    for row in rows:
+        n = len(json.dumps(row["payload"], ensure_ascii=False).encode("utf-8"))
+        if out[-1] and (len(out[-1]) >= max_count or size + n > max_bytes):
+            out.append([])
+            size = 0
+        out[-1].append(row)
+        size += n
+    return [c for c in out if c]
+
+
+async def _flush_batch_api_queue() -> dict:
+    """대기 중인 요청을 (프로바이더, 모델)별로 묶어 Batch API에 제출.
+
+    Returns: 첫 제출 결과 + jobs 목록, 대기열이 비었으면 {"message": ...}, 전부 실패면 {"error": ...}
+    """
+    global _flush_timer
+    _flush_timer = None
+    async with _flush_lock:
+        rows = await asyncio.to_thread(_db, batch_store.queued_requests)
+        if not rows:
+            return {"message": "배치 대기열이 비어있습니다"}
+        groups: dict[tuple[str, str], list[dict]] = defaultdict(list)
+        for row in rows:
+            groups[(row["provider"], row["model"])].append(row)
+
+        jobs, errors = [], []
+        for (provider, model), group in groups.items():
+            for chunk in _chunks(group, provider):
+                ids = [r["custom_id"] for r in chunk]
+                result = await batch_submit([r["payload"] for r in chunk], model=model)
+                if "error" in result:
+                    errors.append(result["error"])
+                    await asyncio.to_thread(_db, batch_store.mark_failed, ids, result["error"])
+                    await _fan_back([{"custom_id": i, "content": "", "error": result["error"]} for i in ids])
+                    continue
+                batch_id = result["batch_id"]
+                await asyncio.to_thread(_db, _record_job, batch_id, provider, model, ids)
+                jobs.append({"batch_id": batch_id, "provider": provider, "model": model, "count": len(ids)})
+                logger.info("[BATCH] 제출: %s (%s/%s, %d건)", batch_id, provider, model, len(ids))
+
+    if jobs:
+        _ensure_poller()
+        await wm.broadcast("batch_update", {"event": "submitted", "jobs": jobs})
+        return {**jobs[0], "status": "submitted", "jobs": jobs, "errors": errors}
+    return {"error": "; ".join(errors)[:500] or "제출된 배치 없음"}
+
+
+def _record_job(conn, batch_id: str, provider: str, model: str, ids: list[str]) -> None:
+    batch_store.add_job(conn, batch_id, provider, model, len(ids), time.time() + POLL_BASE_SEC)
+    batch_store.mark_submitted(conn, batch_id, ids)
+
+
+# ── 폴링 ──
+
+def _ensure_poller() -> None:
+    global _poller, _wake
+    if _poller is None or _poller.done():
+        _wake = asyncio.Event()
+        _poller = asyncio.get_running_loop().create_task(_poll_loop())
+    _wake.set()
+
+
+def start_poller() -> bool:
+    """서버 시작 시 호출 — 미완료 배치나 대기 요청이 있으면 폴링/제출 재개."""
+    s = _db(batch_store.summary)
+    if s["active_jobs"]:
+        _ensure_poller()
+    if s["requests"].get("queued"):
+        _schedule_flush(FLUSH_DELAY_SEC)
+    return bool(s["active_jobs"] or s["requests"].get("queued"))
+
+
+async def _poll_loop() -> None:
+    while True:
+        jobs = await asyncio.to_thread(_db, batch_store.active_jobs)
+        if not jobs:
+            return
+        now = time.time()
+        due = [j for j in jobs if j["next_poll_at"] <= now]
+        if not due:
+            _wake.clear()
+            try:
+                await asyncio.wait_for(_wake.wait(), timeout=min(j["next_poll_at"] for j in jobs) - now)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        for job in due:
+            try:
+                await _poll_job(job)
+            except Exception as e:
+                logger.warning("[BATCH] 폴링 실패 %s: %s", job["batch_id"], e)
+                await asyncio.to_thread(_db, batch_store.update_job, job["batch_id"],
+                                        poll_count=job["poll_count"] + 1,
+                                        next_poll_at=time.time() + next_poll_delay(job["poll_count"] + 1))
+
+
+def _age_sec(created_at: str) -> float:
+    try:
+        then = datetime.strptime(created_at, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return 0.0
+    return (datetime.now(timezone.utc) - then).total_seconds()
+
+
+async def _poll_job(job: dict) -> None:
+    batch_id, provider = job["batch_id"], job["provider"]
+    status = await batch_check(batch_id, provider)
+    state = status.get("status", "processing") if "error" not in status else "processing"
+    if state == "processing" and _age_sec(job["created_at"]) > JOB_EXPIRE_SEC:
+        state = "expired"
+
+    if state == "processing":
+        await asyncio.to_thread(_db, batch_store.update_job, batch_id,
+                                poll_count=job["poll_count"] + 1, progress=status.get("progress") or None,
+                                next_poll_at=time.time() + next_poll_delay(job["poll_count"] + 1),
+                                error=status.get("error"))
+        return
+
+    if state == "completed":
+        retrieved = await batch_retrieve(batch_id, provider)
+        if "error" in retrieved:
+            raise RuntimeError(retrieved["error"])
+        results = await asyncio.to_thread(_db, _store_results, batch_id, retrieved.get("results", []))
+    else:
+        reason = f"배치 {state}"
+        results = await asyncio.to_thread(_db, _fail_job, batch_id, reason)
+    await asyncio.to_thread(_db, batch_store.update_job, batch_id, status=state,
+                            poll_count=job["poll_count"] + 1, progress=status.get("progress") or None)
+    logger.info("[BATCH] %s: %s (%d건)", state, batch_id, len(results))
+    await _fan_back(results)
+    await wm.broadcast("batch_update", {
+        "event": state, "batch_id": batch_id, "provider": provider,
+        "count": len(results), "failed": sum(1 for r in results if r.get("error")),
+    })
+
+
+def _store_results(conn, batch_id: str, results: list[dict]) -> list[dict]:
+    """결과 저장. custom_id 매핑이 유실된 경우(req-N)는 배치 안 순번으로 되찾음."""
+    reqs = batch_store.job_requests(conn, batch_id)
+    known = {r["custom_id"] for r in reqs}
+    by_position = {r["position"]: r["custom_id"] for r in reqs}
+    out = []
+    for res in results:
+        cid = res.get("custom_id", "")
+        if cid not in known and cid.startswith("req-") and cid[4:].isdigit():
+            cid = by_position.get(int(cid[4:]), cid)
+        if cid not in known:
+            continue
+        res = {**res, "custom_id": cid}
+        batch_store.save_result(conn, cid, res)
+        out.append(res)
+    # 결과에 없는 요청은 실패 처리
+    missing = [r["custom_id"] for r in reqs if r["status"] == "submitted"
+               and r["custom_id"] not in {o["custom_id"] for o in out}]
+    if missing:
+        batch_store.mark_failed(conn, missing, "배치 결과에 없음")
+        out.extend({"custom_id": cid, "content": "", "error": "배치 결과에 없음"} for cid in missing)
+    return out
+
+
+def _fail_job(conn, batch_id: str, reason: str) -> list[dict]:
+    ids = [r["custom_id"] for r in batch_store.job_requests(conn, batch_id) if r["status"] == "submitted"]
+    batch_store.mark_failed(conn, ids, reason)
+    return [{"custom_id": cid, "content": "", "error": reason} for cid in ids]
+
+
+# ── 결과 회신 ──
+
+def _apply_results(results: list[dict]) -> list[tuple[dict, dict]]:
+    """요청 행 조회 + 작업(task) 갱신을 한 번에 (동기 DB — 스레드에서 실행). 반환: (결과, 요청 행) 목록."""
+    matched = []
+    for res in results:
+        row = _db(batch_store.get_request, res["custom_id"])
+        if row is None:
+            continue
+        matched.append((res, row))
+        if not row["task_id"]:
+            continue
+        content = res.get("content") or ""
+        try:
+            if res.get("error"):
+                update_task(row["task_id"], status="failed",
+                            result_summary=f"배치 실패: {str(res['error'])[:180]}", success=0)
+            else:
+                update_task(row["task_id"], status="completed", result_data=content,
+                            result_summary=content[:500], success=1,
+                            cost_usd=res.get("cost_usd", 0) or 0)
+        except Exception as e:
+            logger.debug("[BATCH] 작업 갱신 실패 %s: %s", row["task_id"], e)
+    return matched
+
+
+async def _fan_back(results: list[dict]) -> None:
+    """결과를 출처 핸들러·작업(task)에 전달. DB 작업은 스레드 1번에 모아서."""
+    matched = await asyncio.to_thread(_apply_results, results)
+    for res, row in matched:
+        handler = _handlers.get(row["origin"])
+        if handler is not None:
+            payload = {**res, "origin": row["origin"], "task_id": row["task_id"]}
+            try:
+                await handler(payload)
+            except Exception as e:
+                logger.warning("[BATCH] %s 결과 핸들러 오류 (%s): %s", row["origin"], res["custom_id"], e)
+
+
+def get_result(custom_id: str) -> dict | None:
+    """요청 1건의 현재 상태/결과 (queued/submitted/done/failed)."""
+    return _db(batch_store.get_request, custom_id)
+
+
+def status() -> dict:
+    """대기열·진행 중 배치 현황."""
+    return _db(batch_store.summary)
+
+
+# ── 배치 체인 ──
+
+def _save_chain(chain: dict) -> None:
+    """체인 1건 저장 (batch_chains 테이블, chain_id 기준)."""
+    save_batch_chain(chain)
+
+
+def list_chains(statuses: tuple[str, ...] | None = None) -> list[dict]:
+    return list_batch_chains(statuses)
+
+
+async def _broadcast_chain_status(chain: dict, message: str) -> None:
+    """체인 진행 상황 저장 + WebSocket batch_chain_progress 전송."""
+    save_batch_chain(chain)
+    step = chain.get("step", "") if chain.get("status") not in ("completed", "failed") else chain["status"]
+    await wm.broadcast("batch_chain_progress", {
+        "chain_id": chain.get("chain_id", ""),
+        "step": step,
+        "step_label": chain.get("step_label", step),
+        "message": message,
+    })
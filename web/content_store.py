@@ -0,0 +1,212 @@
+"""
+대용량 본문 압축 저장소 (content-addressed, 중복 제거).
+
+tasks.result_data / archives.content 같은 보고서 본문은 수~수십 KB 텍스트라
+핫 테이블 페이지를 차지하며 DB 파일을 키웁니다. MIN_BYTES 이상 본문은:
+- SHA-256 해시를 키로 content_blobs 테이블에 압축 저장 (zstd 있으면 zstd, 없으면 zlib)
+- 원래 컬럼에는 짧은 참조 문자열(REF_PREFIX + 해시)만 남김
+- 같은 보고서가 여러 번 저장되면 blob 1개만 유지하고 refs(참조 수)만 증가
+- 행 삭제·본문 교체 시 release()로 참조 수를 줄이고 0이 되면 그 blob만 삭제
+  (전체 테이블 스캔 GC 없음 — pack/release 모두 호출자의 쓰기 트랜잭션 안에서 실행되므로
+  "pack이 blob 확인 → 다른 연결이 삭제 → 행은 없는 blob을 참조" 경쟁이 생기지 않음)
+
+읽을 때는 db.py의 get_task / get_archive / _row_to_task_detail이 unpack()으로 투명하게 복원.
+
+사용법:
+    from content_store import pack, unpack
+    stored = pack(conn, text)       # 작으면 text 그대로, 크면 참조 문자열 (refs +1)
+    text = unpack(conn, stored)     # 참조면 압축 해제, 아니면 그대로
+    release(conn, [old_stored])     # 행 삭제/교체 시 (refs -1, 0이면 blob 삭제)
+
+기존 행 이관: python scripts/migrate_content_store.py [--dry-run] [--vacuum]
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+
+logger = logging.getLogger("corthex.content_store")
+
+try:
+    import zstandard as _zstd
+    _HAS_ZSTD = True
+except ImportError:
+    _zstd = None
+    _HAS_ZSTD = False
+
+MIN_BYTES = 4096            # 이보다 작은 본문은 그대로 TEXT 저장
+REF_PREFIX = "@@cblob:"     # 참조 문자열 접두사 (+ sha256 hex 64자)
+_ZLIB_LEVEL = 6
+_ZSTD_LEVEL = 9
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS content_blobs (
+    hash        TEXT PRIMARY KEY,          -- 원문 UTF-8의 sha256 hex
+    codec       TEXT NOT NULL,             -- zstd / zlib
+    raw_size    INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    data        BLOB NOT NULL,
+    created_at  TEXT NOT NULL,
+    refs        INTEGER NOT NULL DEFAULT 0  -- REF_COLUMNS에서 이 blob을 참조하는 행 수
+);
+"""
+
+# 참조를 담는 (테이블, 본문 컬럼, 행 키 컬럼) — GC·이관 대상
+REF_COLUMNS: tuple[tuple[str, str, str], ...] = (
+    ("tasks", "result_data", "task_id"),
+    ("archives", "content", "id"),
+)
+
+
+def _compress(raw: bytes) -> tuple[str, bytes]:
+    if _HAS_ZSTD:
+        return "zstd", _zstd.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if not _HAS_ZSTD:
+            raise RuntimeError("zstd로 압축된 본문 — zstandard 패키지 필요")
+        return _zstd.ZstdDecompressor().decompress(data)
+    raise ValueError(f"알 수 없는 codec: {codec}")
+
+
+def is_ref(value) -> bool:
+    """저장값이 blob 참조 문자열인지."""
+    return isinstance(value, str) and value.startswith(REF_PREFIX)
+
+
+def pack(conn: sqlite3.Connection, text: str | None) -> str | None:
+    """본문이 MIN_BYTES 이상이면 압축 blob으로 저장하고 참조 문자열 반환.
+
+    반환된 참조 1개만큼 refs를 올리므로, 호출자는 같은 트랜잭션에서 그 참조를 행에 쓰고
+    커밋하거나 롤백해야 함. refs 갱신(UPDATE/INSERT)이 곧 쓰기 잠금이라 커밋 전까지
+    다른 연결의 release()가 이 blob을 지울 수 없음.
+    """
+    if not text or is_ref(text):
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < MIN_BYTES:
+        return text
+    digest = hashlib.sha256(raw).hexdigest()
+    cur = conn.execute("UPDATE content_blobs SET refs = refs + 1 WHERE hash = ?", (digest,))
+    if cur.rowcount == 0:
+        codec, data = _compress(raw)
+        if len(data) >= len(raw):
+            return text  # 압축 이득 없음 (이미 압축된 데이터 등)
+        conn.execute(
+            "INSERT INTO content_blobs (hash, codec, raw_size, stored_size, data, created_at, refs) "
+            "VALUES (?, ?, ?, ?, ?, ?, 1) ON CONFLICT(hash) DO UPDATE SET refs = refs + 1",
+            (digest, codec, len(raw), len(data), data,
+             datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")),
+        )
+    return REF_PREFIX + digest
+
+
+def release(conn: sqlite3.Connection, values) -> int:
+    """삭제·교체되는 저장값들의 참조 해제. refs가 0이 된 blob만 삭제. 반환: 삭제 수.
+
+    values는 행에 있던 원래 저장값(참조가 아닌 값은 무시). 커밋은 호출자 몫 —
+    행 DELETE/UPDATE와 같은 트랜잭션에서 호출.
+    """
+    counts = Counter(v[len(REF_PREFIX):] for v in values if is_ref(v))
+    if not counts:
+        return 0
+    conn.executemany(
+        "UPDATE content_blobs SET refs = refs - ? WHERE hash = ?",
+        [(n, h) for h, n in counts.items()],
+    )
+    hashes = list(counts)
+    placeholders = ",".join("?" * len(hashes))
+    cur = conn.execute(
+        f"DELETE FROM content_blobs WHERE refs <= 0 AND hash IN ({placeholders})", hashes
+    )
+    return cur.rowcount
+
+
+def unpack(conn: sqlite3.Connection, value: str | None) -> str | None:
+    """참조 문자열이면 blob을 읽어 원문 반환, 아니면 그대로."""
+    if not is_ref(value):
+        return value
+    digest = value[len(REF_PREFIX):]
+    row = conn.execute(
+        "SELECT codec, data FROM content_blobs WHERE hash = ?", (digest,)
+    ).fetchone()
+    if not row:
+        logger.warning("content_blobs 누락: %s", digest[:12])
+        return ""
+    return _decompress(row[0], row[1]).decode("utf-8")
+
+
+def gc_orphans(conn: sqlite3.Connection) -> int:
+    """refs를 실제 참조 행 수로 다시 세고 참조 없는 blob 삭제. 반환: 삭제 수. 커밋은 호출자 몫.
+
+    전체 스캔이라 평소 삭제 경로에서는 쓰지 않음 — 이관 스크립트·refs 컬럼 도입 시 1회용.
+    """
+    n = len(REF_PREFIX) + 1
+    counts: Counter = Counter()
+    for table, col, _ in REF_COLUMNS:
+        for (digest,) in conn.execute(
+            f"SELECT substr({col}, {n}) FROM {table} WHERE {col} LIKE '{REF_PREFIX}%'"
+        ):
+            counts[digest] += 1
+    conn.execute("UPDATE content_blobs SET refs = 0")
+    conn.executemany("UPDATE content_blobs SET refs = ? WHERE hash = ?",
+                     [(c, h) for h, c in counts.items()])
+    cur = conn.execute("DELETE FROM content_blobs WHERE refs <= 0")
+    return cur.rowcount
+
+
+def migrate_refs(conn: sqlite3.Connection) -> bool:
+    """refs 컬럼이 없는 기존 DB에 컬럼 추가 후 1회 재집계. 반환: 이관 수행 여부."""
+    cols = {r[1] for r in conn.execute("PRAGMA table_info(content_blobs)")}
+    if "refs" in cols:
+        return False
+    conn.execute("ALTER TABLE content_blobs ADD COLUMN refs INTEGER NOT NULL DEFAULT 0")
+    gc_orphans(conn)
+    conn.commit()
+    return True
+
+
+def migrate_existing(conn: sqlite3.Connection, dry_run: bool = False, batch_size: int = 200) -> dict:
+    """기존 행 중 MIN_BYTES 이상 본문을 blob으로 이관. 반환: 테이블별 통계."""
+    conn.executescript(SCHEMA_SQL)
+    migrate_refs(conn)
+    stats: dict[str, dict] = {}
+    for table, col, key in REF_COLUMNS:
+        moved = 0
+        raw_bytes = 0
+        rows = conn.execute(
+            f"SELECT {key}, {col} FROM {table} "
+            f"WHERE length(CAST({col} AS BLOB)) >= ? AND {col} NOT LIKE '{REF_PREFIX}%'",
+            (MIN_BYTES,),
+        ).fetchall()
+        for i, (row_key, body) in enumerate(rows, 1):
+            raw_bytes += len(body.encode("utf-8"))
+            if not dry_run:
+                ref = pack(conn, body)
+                if ref != body:
+                    conn.execute(f"UPDATE {table} SET {col} = ? WHERE {key} = ?", (ref, row_key))
+                    moved += 1
+                if i % batch_size == 0:
+                    conn.commit()
+            else:
+                moved += 1
+        if not dry_run:
+            conn.commit()
+        stats[table] = {"rows": moved, "raw_bytes": raw_bytes}
+    if not dry_run:
+        stats["orphans_removed"] = gc_orphans(conn)
+        conn.commit()
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM content_blobs"
+    ).fetchone()
+    stats["blobs"] = {"count": row[0], "raw_bytes": row[1], "stored_bytes": row[2]}
+    return stats
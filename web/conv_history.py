@@ -0,0 +1,268 @@
+"""
+대화 기록 캐시 — 에이전트 호출용 conversation_history를 대화 세션별로 증분 유지.
+
+이전 _build_conv_history는 에이전트 호출마다 conversation_messages를 최대 200행 다시 읽고
+마지막 20개를 2000자씩 잘랐습니다. 명령 1건에 팀장·전문가 수십 명이 호출되면 같은 조회가
+수십 번 반복되고, 글자 수 기준이라 실제 토큰 사용량과도 맞지 않았습니다. 이제는:
+- 대화별 캐시에 턴을 보관하고, 이후에는 커서 이후 새 메시지만 이어 붙임 (증분 조회)
+- 턴마다 토큰 수를 한 번만 계산 (src.tools.token_counter 토크나이저, tiktoken 없으면 근사)
+- 최신 턴부터 토큰 예산(settings: conv_history_token_budget)만큼만 담음
+- 예산 밖으로 밀려난 옛 턴은 conversations.summary 롤링 요약으로 대체 (선택,
+  settings: conv_history_rolling_summary = true 일 때 백그라운드로 요약 갱신)
+- 프로세스 전역 캐시라 한 명령의 팬아웃(팀장/전문가 동시 호출)이 같은 항목을 공유
+- 메시지 저장 시 db 변경 알림("conversation")으로 항목을 stale 표시 → 다음 호출에서 증분 조회
+  (SYNC_INTERVAL은 다른 프로세스가 쓴 메시지용 안전망)
+- DB 조회는 잠금 밖에서, 비동기 경로(abuild)는 스레드에서 실행 — 이벤트 루프를 막지 않음
+
+사용법:
+    from conv_history import history_cache
+    history = await history_cache.abuild(conversation_id, current_text)   # list | None
+    history = history_cache.build(conversation_id, current_text)          # 동기 (스레드에서)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from db import (
+    add_change_listener,
+    encode_cursor,
+    get_conversation,
+    load_conversation_tail,
+    load_setting,
+    update_conversation,
+)
+from src.tools.token_counter import count_tokens, truncate_tokens
+
+logger = logging.getLogger("corthex.conv_history")
+
+DEFAULT_TOKEN_BUDGET = 6000   # 대화 기록 전체 토큰 예산 (settings로 조정)
+TURN_TOKEN_CAP = 1500         # 턴 1개 최대 토큰 (긴 보고서는 앞부분만)
+CACHE_TURNS = 60              # 대화당 캐시에 보관할 최대 턴 수
+SYNC_INTERVAL = 30.0          # 저장 알림이 없을 때 DB 재확인 주기 (다른 프로세스의 쓰기 대비)
+SUMMARY_MIN_TURNS = 6         # 요약 안 된 밀려난 턴이 이만큼 쌓이면 요약 갱신
+SUMMARY_MAX_CHARS = 2000
+_MAX_CONVERSATIONS = 256      # 캐시 보관 대화 수 (LRU)
+_GLOBAL_KEY = "__global__"    # conversation_id 없는 호출 (세션 구분 없는 전체 기록)
+
+
+class _Turn:
+    __slots__ = ("id", "role", "content", "tokens")
+
+    def __init__(self, msg_id: int, role: str, content: str) -> None:
+        self.id = msg_id
+        self.role = role
+        self.content = truncate_tokens(content, TURN_TOKEN_CAP)
+        self.tokens = count_tokens(self.content)
+
+
+class _Entry:
+    """대화 1개의 캐시 상태."""
+
+    __slots__ = ("turns", "cursor", "synced_at", "dirty", "complete", "summary", "summary_until_id", "memo")
+
+    def __init__(self) -> None:
+        self.turns: list[_Turn] = []
+        self.cursor = ""
+        self.synced_at = 0.0
+        self.dirty = True            # 메시지 저장 알림 이후 아직 동기화 안 함
+        self.complete = False        # 대화 시작부터 전부 캐시에 있는지
+        self.summary = ""
+        self.summary_until_id = 0
+        self.memo: dict[tuple[int, bool], tuple[list[_Turn], list[_Turn]]] = {}
+
+
+class ConversationHistoryCache:
+    """대화별 기록 캐시 (프로세스 전역)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._summarizing: set[str] = set()
+        self._budget = DEFAULT_TOKEN_BUDGET
+        self._rolling_summary = False
+        add_change_listener(self._on_db_change)
+
+    # ── 동기화 ──
+
+    def _on_db_change(self, kind: str) -> None:
+        """db 변경 알림 — 메시지가 저장되면 모든 항목을 stale로 (다음 호출에서 증분 조회)."""
+        if kind != "conversation":
+            return
+        with self._lock:
+            for entry in self._entries.values():
+                entry.dirty = True
+
+    def _sync(self, conversation_id: str | None) -> _Entry:
+        """캐시 항목을 DB와 맞춤. DB 조회는 잠금 밖 — 스레드에서 불러도 됨."""
+        key = conversation_id or _GLOBAL_KEY
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+                while len(self._entries) > _MAX_CONVERSATIONS:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(key)
+            if not entry.dirty and time.monotonic() - entry.synced_at < SYNC_INTERVAL:
+                return entry
+            # 조회 중에 온 저장 알림은 dirty를 다시 세워 다음 호출이 한 번 더 확인
+            entry.dirty = False
+            cursor = entry.cursor
+            synced_at = time.monotonic()
+
+        budget = int(load_setting("conv_history_token_budget", DEFAULT_TOKEN_BUDGET)
+                     or DEFAULT_TOKEN_BUDGET)
+        rolling_summary = bool(load_setting("conv_history_rolling_summary", False))
+        first_load = not cursor
+        rows = load_conversation_tail(conversation_id, limit=CACHE_TURNS, cursor=cursor)
+        conv = (get_conversation(conversation_id) or {}) if first_load and conversation_id else None
+        new_turns = []
+        for m in rows:
+            if m["type"] == "user" and m.get("text"):
+                new_turns.append(_Turn(m["id"], "user", m["text"]))
+            elif m["type"] == "result" and m.get("content"):
+                new_turns.append(_Turn(m["id"], "assistant", m["content"]))
+
+        with self._lock:
+            self._budget = budget
+            self._rolling_summary = rolling_summary
+            if entry.cursor != cursor:
+                return entry   # 동시에 돈 다른 동기화가 이미 반영함
+            if first_load:
+                entry.complete = len(rows) < CACHE_TURNS
+                if conv is not None:
+                    entry.summary = conv.get("summary") or ""
+                    entry.summary_until_id = conv.get("summary_until_id") or 0
+            elif len(rows) >= CACHE_TURNS:
+                # 마지막 동기화 이후 캐시 크기보다 많이 쌓임 → 중간이 비므로 새로 채움
+                entry.turns.clear()
+                entry.complete = False
+
+            if rows:
+                entry.cursor = encode_cursor(rows[-1]["timestamp"], rows[-1]["id"])
+                entry.turns.extend(new_turns)
+                entry.memo.clear()
+            if len(entry.turns) > CACHE_TURNS:
+                del entry.turns[:-CACHE_TURNS]
+                entry.complete = False
+            entry.synced_at = synced_at
+            return entry
+
+    def _trim(self, entry: _Entry, budget: int, drop_last: bool) -> tuple[list[_Turn], list[_Turn]]:
+        """최신 턴부터 예산 안에 드는 것만. 반환: (유지 턴, 밀려난 턴)."""
+        memo_key = (budget, drop_last)
+        cached = entry.memo.get(memo_key)
+        if cached is not None:
+            return cached
+        turns = entry.turns[:-1] if drop_last else entry.turns
+        used = 0
+        start = len(turns)
+        while start > 0 and used + turns[start - 1].tokens <= budget:
+            start -= 1
+            used += turns[start].tokens
+        result = (turns[start:], turns[:start])
+        entry.memo[memo_key] = result
+        return result
+
+    # ── 조회 ──
+
+    def build(self, conversation_id: str | None, current_text: str,
+              budget: int | None = None) -> list | None:
+        """AI conversation_history 구성. 마지막 user 턴이 현재 명령과 같으면 제외. (동기 — DB 조회 포함)"""
+        return self._compose(self._sync(conversation_id), conversation_id, current_text, budget)
+
+    async def abuild(self, conversation_id: str | None, current_text: str,
+                     budget: int | None = None) -> list | None:
+        """build()의 비동기판 — DB 동기화는 스레드에서."""
+        entry = await asyncio.to_thread(self._sync, conversation_id)
+        return self._compose(entry, conversation_id, current_text, budget)
+
+    def _compose(self, entry: _Entry, conversation_id: str | None, current_text: str,
+                 budget: int | None) -> list | None:
+        current = truncate_tokens(current_text, TURN_TOKEN_CAP).strip()
+        with self._lock:   # 다른 스레드의 _sync가 turns를 바꾸는 중일 수 있음 (메모리 작업만)
+            if not entry.turns:
+                return None
+            last = entry.turns[-1]
+            drop_last = last.role == "user" and last.content.strip() == current
+            kept, dropped = self._trim(entry, budget or self._budget, drop_last)
+
+        history = [{"role": t.role, "content": t.content} for t in kept]
+        if entry.summary and (dropped or not entry.complete):
+            note = f"[이전 대화 요약]\n{entry.summary}"
+            if history and history[0]["role"] == "user":
+                history[0] = {"role": "user", "content": f"{note}\n\n{history[0]['content']}"}
+            else:
+                history.insert(0, {"role": "user", "content": note})
+
+        if conversation_id and self._rolling_summary:
+            pending = [t for t in dropped if t.id > entry.summary_until_id]
+            if len(pending) >= SUMMARY_MIN_TURNS:
+                self._schedule_summary(conversation_id, entry, pending)
+        return history or None
+
+    def invalidate(self, conversation_id: str | None = None) -> None:
+        """캐시 항목 폐기 (대화 삭제 등). None이면 전체."""
+        with self._lock:
+            if conversation_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(conversation_id, None)
+
+    # ── 롤링 요약 ──
+
+    def _schedule_summary(self, conversation_id: str, entry: _Entry, pending: list[_Turn]) -> None:
+        if conversation_id in self._summarizing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._summarizing.add(conversation_id)
+        loop.create_task(self._refresh_summary(conversation_id, entry, list(pending)))
+
+    async def _refresh_summary(self, conversation_id: str, entry: _Entry, pending: list[_Turn]) -> None:
+        """밀려난 턴 + 기존 요약 → 새 요약 (저렴한 모델, 백그라운드)."""
+        try:
+            from ai_handler import ask_ai, get_available_providers, _USE_CLI_FOR_CLAUDE
+
+            lines = [f"[{t.role}]: {truncate_tokens(t.content, 400)}" for t in pending]
+            prompt = (
+                "아래 대화를 이후 대화에서 참고할 수 있도록 한국어로 요약해라. "
+                "결정 사항, CEO 요청/선호, 진행 중인 작업, 중요한 수치 위주로 "
+                f"{SUMMARY_MAX_CHARS // 2}자 이내.\n\n"
+                + (f"[기존 요약]\n{entry.summary}\n\n" if entry.summary else "")
+                + "[이어지는 대화]\n" + "\n".join(lines)
+            )
+            providers = get_available_providers()
+            if providers.get("google"):
+                model = "gemini-2.5-flash"
+            elif providers.get("openai"):
+                model = "gpt-5-mini"
+            elif _USE_CLI_FOR_CLAUDE:
+                model = "claude-haiku-4-5-20251001"
+            else:
+                model = "claude-sonnet-4-6"
+            result = await ask_ai(user_message=prompt, model=model, max_tokens=800,
+                                  system_prompt="요약문만 반환. 설명 없이.")
+            text = (result.get("content", "") if isinstance(result, dict) else str(result)).strip()
+            if not text or (isinstance(result, dict) and result.get("error")):
+                return
+            summary = text[:SUMMARY_MAX_CHARS]
+            until_id = pending[-1].id
+            await asyncio.to_thread(update_conversation, conversation_id,
+                                    summary=summary, summary_until_id=until_id)
+            with self._lock:
+                entry.summary = summary
+                entry.summary_until_id = until_id
+        except Exception as e:
+            logger.debug("대화 요약 갱신 건너뜀 (%s): %s", conversation_id, e)
+        finally:
+            self._summarizing.discard(conversation_id)
+
+
+history_cache = ConversationHistoryCache()
@@ -0,0 +1,145 @@
+"""
+대시보드 스냅샷 — /api/dashboard 응답을 한 번 계산해 두고 변경 이벤트로만 무효화.
+
+대시보드는 가장 자주 열리는 화면인데, 이전에는 요청마다 get_dashboard_stats / get_today_cost
+집계 + 임시 get_connection() 쿼리 3개 + 배치 체인 로드 + 도구 스키마 재파싱 +
+get_available_providers() 3회를 전부 다시 했습니다. 이제는:
+- 범위(전체 / orgScope 에이전트 목록)별 스냅샷을 보관, db 변경 알림(task/cost/batch)이 오면 무효화
+  (알림이 없어도 "오늘"·"최근 1시간" 경계가 움직이므로 MAX_AGE초 후 재계산)
+- 스냅샷 내용 해시로 ETag 생성 → If-None-Match 일치 시 304
+- 변경 후 DEBOUNCE_SEC 뒤 전체 범위 스냅샷을 다시 계산해 바뀐 키만 WebSocket dashboard_delta로 전송
+  (비용 필드는 orgScope별로 달라 제외 — 기존 cost_update 이벤트가 담당)
+
+계산 자체는 arm_server의 빌더 함수가 담당하고, 여기서는 캐시·무효화·전송만 합니다.
+
+사용법:
+    from dashboard_snapshot import dashboard_snapshot
+    dashboard_snapshot.set_builder(_build_dashboard)         # (scope_agents) -> dict, 동기
+    payload, etag = await dashboard_snapshot.get(scope_agents)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+from db import add_change_listener
+from ws_manager import wm
+
+logger = logging.getLogger("corthex.dashboard")
+
+MAX_AGE = 60.0           # 변경 알림이 없어도 이 시간이 지나면 재계산
+DEBOUNCE_SEC = 1.0       # 연속 변경을 모아서 delta 1번 전송
+VOLATILE_KEYS = ("uptime",)                    # ETag·delta 계산에서 제외 (요청마다 바뀜)
+SCOPED_KEYS = ("today_cost", "total_cost")     # orgScope별로 다른 값 — 전체 broadcast 제외
+
+
+def _etag(payload: dict) -> str:
+    stable = {k: v for k, v in payload.items() if k not in VOLATILE_KEYS}
+    raw = json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return 'W/"' + hashlib.sha1(raw).hexdigest()[:20] + '"'
+
+
+class DashboardSnapshot:
+    """범위별 대시보드 스냅샷 캐시 + 변경 시 WebSocket delta."""
+
+    def __init__(self) -> None:
+        self._builder: Callable[[list[str] | None], dict] | None = None
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries: dict[tuple, tuple[int, float, dict, str]] = {}   # 범위 → (버전, 계산 시각, 내용, ETag)
+        self._build_locks: dict[tuple, asyncio.Lock] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._push_handle: asyncio.TimerHandle | None = None
+        self._pushed: dict | None = None
+        self._stats = {"hits": 0, "builds": 0, "not_modified": 0, "invalidations": 0, "deltas": 0}
+        add_change_listener(self.invalidate)
+
+    def set_builder(self, builder: Callable[[list[str] | None], dict]) -> None:
+        self._builder = builder
+
+    # ── 무효화 ──
+
+    def invalidate(self, kind: str = "") -> None:
+        """db 변경 알림 콜백 (어느 스레드에서든 호출됨)."""
+        if kind == "conversation":
+            return   # 대화 메시지는 대시보드 지표와 무관
+        with self._lock:
+            self._version += 1
+            self._stats["invalidations"] += 1
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._schedule_push)
+            except RuntimeError:
+                pass
+
+    def _schedule_push(self) -> None:
+        if self._push_handle is not None or wm.client_count == 0:
+            return
+        self._push_handle = self._loop.call_later(
+            DEBOUNCE_SEC, lambda: asyncio.ensure_future(self._push()))
+
+    async def _push(self) -> None:
+        self._push_handle = None
+        try:
+            payload, etag = await self.get(None)
+        except Exception as e:
+            logger.debug("대시보드 delta 계산 실패: %s", e)
+            return
+        prev = self._pushed or {}
+        changes = {k: v for k, v in payload.items()
+                   if k not in VOLATILE_KEYS and k not in SCOPED_KEYS and prev.get(k) != v}
+        self._pushed = payload
+        if changes and prev:
+            self._stats["deltas"] += 1
+            await wm.broadcast("dashboard_delta", {"etag": etag, "changes": changes})
+
+    # ── 조회 ──
+
+    async def get(self, scope_agents: list[str] | None = None) -> tuple[dict, str]:
+        """(스냅샷, ETag). 유효하면 캐시, 아니면 빌더를 스레드에서 실행."""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        key = tuple(sorted(scope_agents)) if scope_agents is not None else ("*",)
+        entry = self._fresh(key)
+        if entry is not None:
+            self._stats["hits"] += 1
+            return entry
+        lock = self._build_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # 기다리는 동안 다른 요청이 계산했으면 그 결과 사용
+            entry = self._fresh(key)
+            if entry is not None:
+                self._stats["hits"] += 1
+                return entry
+            version = self._version
+            payload = await asyncio.to_thread(self._builder, scope_agents)
+            etag = _etag(payload)
+            self._entries[key] = (version, time.monotonic(), payload, etag)
+            self._stats["builds"] += 1
+            if key == ("*",) and self._pushed is None:
+                self._pushed = payload
+            return payload, etag
+
+    def _fresh(self, key: tuple) -> tuple[dict, str] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        version, built_at, payload, etag = entry
+        if version != self._version or time.monotonic() - built_at > MAX_AGE:
+            return None
+        return payload, etag
+
+    def note_not_modified(self) -> None:
+        self._stats["not_modified"] += 1
+
+    def stats(self) -> dict:
+        return {**self._stats, "version": self._version, "entries": len(self._entries)}
+
+
+dashboard_snapshot = DashboardSnapshot()
@@ -5,6 +5,8 @@ CORTHEX HQ - SQLite Database Module
 - 서버 환경: /home/ubuntu/corthex.db
 - 로컬 개발: ./corthex_dev.db
 """
+import base64
+import binascii
 import json
 import os
 import sqlite3
@@ -13,9 +15,41 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 
+try:
+    import content_store as _content_store  # 서버 환경 (web/ 기준)
+except ImportError:
+    from web import content_store as _content_store  # 로컬 환경
+try:
+    import agent_memory as _agent_memory
+except ImportError:
+    from web import agent_memory as _agent_memory
+try:
+    import batch_store as _batch_store
+except ImportError:
+    from web import batch_store as _batch_store
+
 KST = timezone(timedelta(hours=9))
 
 
+# ── 변경 알림 (대시보드 스냅샷 무효화 등) ──
+# 작업·비용·배치 체인 행이 바뀌면 등록된 콜백에 종류("task"/"cost"/"batch")를 알림.
+# 콜백은 쓰기 스레드에서 동기로 불리므로 가볍게 유지할 것 (예외는 무시).
+_change_listeners: list = []
+
+
+def add_change_listener(fn) -> None:
+    if fn not in _change_listeners:
+        _change_listeners.append(fn)
+
+
+def _notify_change(kind: str) -> None:
+    for fn in _change_listeners:
+        try:
+            fn(kind)
+        except Exception:
+            pass
+
+
 # ── DB 경로 결정 ──
 
 def _get_db_path() -> str:
@@ -540,7 +574,32 @@ def init_db() -> None:
     conn = get_connection()
     try:
         conn.executescript(_SCHEMA_SQL)
+        conn.executescript(_content_store.SCHEMA_SQL)
+        conn.executescript(_agent_memory.SCHEMA_SQL)
+        conn.executescript(_batch_store.SCHEMA_SQL)
         conn.commit()
+        # content_blobs.refs 컬럼 도입 전 DB → 컬럼 추가 + 참조 수 1회 재집계
+        try:
+            if _content_store.migrate_refs(conn):
+                print("[DB] content_blobs 참조 수 재집계 완료")
+        except sqlite3.OperationalError as e:
+            print(f"[DB] content_blobs 참조 수 이관 실패: {e}")
+        # settings의 memory_categorized_* → agent_memory 테이블 이관 (1회, 이관 후 settings 행 삭제)
+        try:
+            moved = _agent_memory.migrate_settings(conn)
+            conn.commit()
+            if moved:
+                print(f"[DB] 에이전트 기억 이관: {moved}건 → agent_memory")
+        except sqlite3.OperationalError as e:
+            print(f"[DB] 에이전트 기억 이관 실패: {e}")
+        # settings의 batch_chains JSON → batch_chains 테이블 이관 (1회)
+        try:
+            moved = _batch_store.migrate_settings(conn)
+            conn.commit()
+            if moved:
+                print(f"[DB] 배치 체인 이관: {moved}건 → batch_chains")
+        except sqlite3.OperationalError as e:
+            print(f"[DB] 배치 체인 이관 실패: {e}")
         # tasks 테이블에 신규 컬럼 추가 (기존 DB 호환 — 없으면 추가)
         _migrate_columns = [
             ("tags", "TEXT NOT NULL DEFAULT '[]'"),
@@ -570,6 +629,12 @@ def init_db() -> None:
             conn.commit()
         except sqlite3.OperationalError:
             pass
+        # conversations에 롤링 요약 범위 컬럼 추가 (summary가 어느 메시지 id까지 요약했는지)
+        try:
+            conn.execute("ALTER TABLE conversations ADD COLUMN summary_until_id INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass
         # cio_predictions에 신뢰도 파이프라인 컬럼 추가
         _cio_migrate = [
             ("return_pct_3d", "REAL DEFAULT NULL"),
@@ -596,6 +661,21 @@ def init_db() -> None:
                 conn.commit()
             except sqlite3.OperationalError:
                 pass
+        # 커서 페이지네이션용 (created_at, id) 복합 인덱스 — ORDER BY + keyset seek를 인덱스만으로 처리
+        _keyset_indexes = [
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON tasks(created_at, task_id)",
+            "CREATE INDEX IF NOT EXISTS idx_archives_created_id ON archives(created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_archives_div_created_id ON archives(division, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_conversation_conv_created_id "
+            "ON conversation_messages(conversation_id, created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_delegation_log_created_id ON delegation_log(created_at, id)",
+        ]
+        for ddl in _keyset_indexes:
+            try:
+                conn.execute(ddl)
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass
         print(f"[DB] 초기화 완료: {DB_PATH}")
     except Exception as e:
         print(f"[DB] 초기화 실패: {e}")
@@ -620,6 +700,27 @@ def _gen_task_id() -> str:
     return str(uuid.uuid4())[:8]
 
 
+# ── 커서(keyset) 페이지네이션 ──
+# OFFSET 대신 마지막 행의 (created_at, id)를 불투명 문자열로 넘겨 다음 페이지를 인덱스 seek로 조회
+
+def encode_cursor(created_at: str, row_id) -> str:
+    """(created_at, id) → URL-safe 커서 문자열."""
+    raw = json.dumps([created_at or "", row_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[tuple]:
+    """커서 문자열 → (created_at, id). 잘못된 커서면 None (첫 페이지로 취급)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded).decode("utf-8"))
+        return created_at, row_id
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
 def _row_to_task(row: sqlite3.Row) -> dict:
     """sqlite3.Row를 프론트엔드가 기대하는 task dict로 변환."""
     # 신규 컬럼이 없는 이전 DB와 호환
@@ -667,10 +768,23 @@ def _row_to_task(row: sqlite3.Row) -> dict:
     }
 
 
-def _row_to_task_detail(row: sqlite3.Row) -> dict:
-    """sqlite3.Row를 상세 task dict로 변환 (result_data 포함)."""
+def _resolve_body(value, conn: sqlite3.Connection = None):
+    """content_blobs 참조면 압축 해제한 원문, 아니면 그대로. conn 없으면 필요할 때만 연결."""
+    if not _content_store.is_ref(value):
+        return value
+    if conn is not None:
+        return _content_store.unpack(conn, value)
+    own = get_connection()
+    try:
+        return _content_store.unpack(own, value)
+    finally:
+        own.close()
+
+
+def _row_to_task_detail(row: sqlite3.Row, conn: sqlite3.Connection = None) -> dict:
+    """sqlite3.Row를 상세 task dict로 변환 (result_data 포함, 압축 본문은 복원)."""
     d = _row_to_task(row)
-    d["result_data"] = row["result_data"] or ""
+    d["result_data"] = _resolve_body(row["result_data"], conn) or ""
     d["success"] = bool(row["success"]) if row["success"] is not None else None
     d["tokens_used"] = row["tokens_used"]
     return d
@@ -708,6 +822,7 @@ def create_task(command: str, source: str = "websocket", agent_id: str = None) -
             (task_id, command, now, source, agent_id),
         )
         conn.commit()
+        _notify_change("task")
         return {
             "task_id": task_id,
             "command": command,
@@ -729,7 +844,7 @@ def get_task(task_id: str) -> Optional[dict]:
         ).fetchone()
         if not row:
             return None
-        return _row_to_task_detail(row)
+        return _row_to_task_detail(row, conn)
     finally:
         conn.close()
 
@@ -755,26 +870,49 @@ def update_task(task_id: str, **kwargs) -> None:
         return
 
     set_clause = ", ".join(f"{k} = ?" for k in filtered)
-    values = list(filtered.values()) + [task_id]
 
     conn = get_connection()
     try:
+        old_body = None
+        if "result_data" in filtered:
+            # 본문 교체: 이전 참조 읽기 → 새 본문 pack → 행 갱신 → 이전 참조 해제를 한 쓰기 트랜잭션으로
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT result_data FROM tasks WHERE task_id = ?", (task_id,)).fetchone()
+            if row is not None:
+                old_body = row[0]
+                # 큰 보고서 본문은 content_blobs로 압축 저장하고 참조만 남김
+                filtered["result_data"] = _content_store.pack(conn, filtered["result_data"])
+        values = list(filtered.values()) + [task_id]
         conn.execute(
             f"UPDATE tasks SET {set_clause} WHERE task_id = ?", values
         )
+        _content_store.release(conn, [old_body])
         conn.commit()
     finally:
         conn.close()
+    if "status" in filtered or "cost_usd" in filtered or "tokens_used" in filtered:
+        _notify_change("task")
+
+
+# 목록 조회용 컬럼 — result_data(보고서 본문)는 제외하고 상세 조회(get_task)에서만 읽음
+_TASK_LIST_COLUMNS = (
+    "task_id, command, status, created_at, completed_at, result_summary, time_seconds, "
+    "cost_usd, bookmarked, correlation_id, source, agent_id, tags, is_read, archived, "
+    "version, parent_task_id, rejected_sections"
+)
 
 
 def list_tasks(keyword: str = "", status: str = "",
                bookmarked: bool = False, limit: int = 50,
-               archived: bool = False, tag: str = "") -> list:
-    """작업 목록 조회 (검색/필터/페이징)."""
+               archived: bool = False, tag: str = "", cursor: str = "") -> list:
+    """작업 목록 조회 (검색/필터/커서 페이징).
+
+    cursor: 이전 페이지 마지막 작업의 encode_cursor(created_at, task_id) — 그보다 오래된 작업부터.
+    """
     conn = get_connection()
     try:
-        query = "SELECT * FROM tasks WHERE 1=1"
         params = []
+        query = f"SELECT {_TASK_LIST_COLUMNS} FROM tasks WHERE 1=1"
         if keyword:
             query += " AND (command LIKE ? OR result_summary LIKE ?)"
             params.extend([f"%{keyword}%", f"%{keyword}%"])
@@ -784,17 +922,18 @@ def list_tasks(keyword: str = "", status: str = "",
         if bookmarked:
             query += " AND bookmarked = 1"
         # 아카이브 필터: 기본적으로 아카이브 안 된 것만 보여줌
-        try:
-            if archived:
-                query += " AND archived = 1"
-            else:
-                query += " AND (archived = 0 OR archived IS NULL)"
-        except Exception:
-            pass  # archived 컬럼이 없는 이전 DB 호환
+        if archived:
+            query += " AND archived = 1"
+        else:
+            query += " AND (archived = 0 OR archived IS NULL)"
         if tag:
             query += " AND tags LIKE ?"
             params.append(f'%"{tag}"%')
-        query += " ORDER BY created_at DESC LIMIT ?"
+        after = decode_cursor(cursor)
+        if after:
+            query += " AND (created_at < ? OR (created_at = ? AND task_id < ?))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY created_at DESC, task_id DESC LIMIT ?"
         params.append(limit)
         rows = conn.execute(query, params).fetchall()
         return [_row_to_task(r) for r in rows]
@@ -802,11 +941,24 @@ def list_tasks(keyword: str = "", status: str = "",
         conn.close()
 
 
+def _delete_with_bodies(conn: sqlite3.Connection, table: str, body_col: str,
+                        where: str, params: tuple | list = ()) -> int:
+    """행 삭제 + 그 행들이 참조하던 content_blobs 참조 해제 (한 쓰기 트랜잭션). 반환: 삭제 행 수."""
+    conn.execute("BEGIN IMMEDIATE")
+    bodies = [r[0] for r in conn.execute(
+        f"SELECT {body_col} FROM {table} WHERE ({where}) AND {body_col} LIKE ?",
+        [*params, _content_store.REF_PREFIX + "%"],
+    )]
+    cur = conn.execute(f"DELETE FROM {table} WHERE {where}", params)
+    _content_store.release(conn, bodies)
+    return cur.rowcount
+
+
 def delete_task(task_id: str) -> bool:
     """작업을 삭제합니다."""
     conn = get_connection()
     try:
-        conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+        _delete_with_bodies(conn, "tasks", "result_data", "task_id = ?", (task_id,))
         conn.commit()
         return True
     finally:
@@ -820,9 +972,10 @@ def bulk_delete_tasks(task_ids: list) -> int:
     conn = get_connection()
     try:
         placeholders = ",".join(["?"] * len(task_ids))
-        cur = conn.execute(f"DELETE FROM tasks WHERE task_id IN ({placeholders})", task_ids)
+        deleted = _delete_with_bodies(conn, "tasks", "result_data",
+                                      f"task_id IN ({placeholders})", task_ids)
         conn.commit()
-        return cur.rowcount
+        return deleted
     finally:
         conn.close()
 
@@ -1023,6 +1176,38 @@ def save_activity_log(agent_id: str, message: str,
         conn.close()
 
 
+def save_activity_logs_bulk(entries: list[dict]) -> int:
+    """활동 로그 여러 건을 한 트랜잭션으로 저장합니다. 반환: 저장된 수.
+
+    entries: [{"agent_id", "message", "level", "time", "timestamp"}] — 요청 메트릭
+    미들웨어의 감사 로그 버퍼처럼 모아서 쓰는 경로용. 정리(5000건 초과 삭제)도 1회만 수행.
+    """
+    if not entries:
+        return 0
+    created = _now_iso()
+    rows = [
+        (e.get("agent_id", "system"), e.get("message", ""), e.get("level", "info"),
+         e.get("time") or _now_kst().strftime("%H:%M:%S"),
+         e.get("timestamp") or int(_now_kst().timestamp() * 1000), created)
+        for e in entries
+    ]
+    conn = get_connection()
+    try:
+        conn.executemany(
+            "INSERT INTO activity_logs (agent_id, message, level, time, timestamp, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+        conn.execute(
+            "DELETE FROM activity_logs WHERE id NOT IN "
+            "(SELECT id FROM activity_logs ORDER BY timestamp DESC LIMIT 5000)"
+        )
+        conn.commit()
+        return len(rows)
+    finally:
+        conn.close()
+
+
 def list_activity_logs(limit: int = 50, agent_id: str = None) -> list:
     """활동 로그를 조회합니다."""
     conn = get_connection()
@@ -1044,13 +1229,14 @@ def list_activity_logs(limit: int = 50, agent_id: str = None) -> list:
 
 def save_archive(division: str, filename: str, content: str,
                  correlation_id: str = None, agent_id: str = None) -> int:
-    """아카이브 보고서를 저장합니다. 반환: row id."""
+    """아카이브 보고서를 저장합니다. 반환: row id. (큰 본문은 content_blobs로 압축 저장)"""
     conn = get_connection()
     try:
+        stored = _content_store.pack(conn, content)
         cur = conn.execute(
             "INSERT INTO archives (division, filename, content, correlation_id, "
             "agent_id, created_at, size) VALUES (?, ?, ?, ?, ?, ?, ?)",
-            (division, filename, content, correlation_id, agent_id,
+            (division, filename, stored, correlation_id, agent_id,
              _now_iso(), len(content)),
         )
         conn.commit()
@@ -1059,16 +1245,23 @@ def save_archive(division: str, filename: str, content: str,
         conn.close()
 
 
-def list_archives(division: str = None, limit: int = 100) -> list:
-    """아카이브 목록을 조회합니다."""
+def list_archives(division: str = None, limit: int = 100, cursor: str = "") -> list:
+    """아카이브 목록을 조회합니다 (본문 제외 — 본문은 get_archive).
+
+    cursor: 이전 페이지 마지막 행의 encode_cursor(created_at, id).
+    """
     conn = get_connection()
     try:
-        query = "SELECT division, filename, agent_id, created_at, size FROM archives"
+        query = "SELECT id, division, filename, agent_id, created_at, size FROM archives WHERE 1=1"
         params = []
         if division and division != "all":
-            query += " WHERE division = ?"
+            query += " AND division = ?"
             params.append(division)
-        query += " ORDER BY created_at DESC LIMIT ?"
+        after = decode_cursor(cursor)
+        if after:
+            query += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
         params.append(limit)
         rows = conn.execute(query, params).fetchall()
         return [dict(r) for r in rows]
@@ -1089,7 +1282,7 @@ def get_archive(division: str, filename: str) -> Optional[dict]:
         return {
             "division": row["division"],
             "filename": row["filename"],
-            "content": row["content"],
+            "content": _resolve_body(row["content"], conn),
             "created_at": row["created_at"],
         }
     finally:
@@ -1100,12 +1293,10 @@ def delete_archive(division: str, filename: str) -> bool:
     """아카이브 보고서를 삭제합니다. 반환: 삭제 성공 여부."""
     conn = get_connection()
     try:
-        cur = conn.execute(
-            "DELETE FROM archives WHERE division = ? AND filename = ?",
-            (division, filename),
-        )
+        deleted = _delete_with_bodies(conn, "archives", "content",
+                                      "division = ? AND filename = ?", (division, filename))
         conn.commit()
-        return cur.rowcount > 0
+        return deleted > 0
     finally:
         conn.close()
 
@@ -1114,9 +1305,9 @@ def delete_all_archives() -> int:
     """모든 아카이브(기밀문서)를 삭제합니다. 반환: 삭제된 건수."""
     conn = get_connection()
     try:
-        cursor = conn.execute("DELETE FROM archives")
+        deleted = _delete_with_bodies(conn, "archives", "content", "1=1")
         conn.commit()
-        return cursor.rowcount
+        return deleted
     finally:
         conn.close()
 
@@ -1307,6 +1498,94 @@ def load_setting(key: str, default=None):
         conn.close()
 
 
+# ── 배치 체인 (batch_chains) ──
+
+def save_batch_chain(chain: dict) -> None:
+    """배치 체인 1건 저장 (chain_id 기준 upsert — 다른 체인은 건드리지 않음)."""
+    conn = get_connection()
+    try:
+        _batch_store.save_chain(conn, chain)
+        conn.commit()
+    finally:
+        conn.close()
+    _notify_change("batch")
+
+
+def list_batch_chains(statuses: tuple[str, ...] | None = None, limit: int | None = None) -> list[dict]:
+    """배치 체인 목록 (생성 순). statuses 지정 시 해당 상태만."""
+    conn = get_connection()
+    try:
+        return _batch_store.list_chains(conn, statuses, limit)
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+# ── 에이전트 기억 (agent_memory) ──
+
+def add_agent_memory(agent_id: str, category: str, content: str, importance: float = 1.0) -> bool:
+    """에이전트 기억 1건 저장 (거의-중복이면 기존 행 강화). 새로 추가되면 True."""
+    conn = get_connection()
+    try:
+        added = _agent_memory.add(conn, agent_id, category, content, importance)
+        conn.commit()
+        return added
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+def select_agent_memory(agent_id: str, task: str,
+                        token_budget: int = _agent_memory.DEFAULT_TOKEN_BUDGET,
+                        top_k: int = _agent_memory.DEFAULT_TOP_K) -> list[dict]:
+    """현재 작업과 관련된 기억 top-k (토큰 예산 안). 선택된 기억은 사용 시각 갱신."""
+    conn = get_connection()
+    try:
+        rows = _agent_memory.select(conn, agent_id, task, token_budget, top_k)
+        conn.commit()
+        return rows
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def list_agent_memory(agent_id: str, category: str | None = None) -> list[dict]:
+    conn = get_connection()
+    try:
+        return _agent_memory.list_rows(conn, agent_id, category)
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def get_agent_memory_categorized(agent_id: str) -> dict:
+    """{카테고리: "사실 | 사실"} — 기존 memory_categorized 설정과 같은 형태."""
+    conn = get_connection()
+    try:
+        return _agent_memory.categorized(conn, agent_id)
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+
+
+def clear_agent_memory(agent_id: str, category: str | None = None) -> int:
+    """에이전트 기억 삭제 (category 지정 시 해당 카테고리만). 삭제 건수 반환."""
+    conn = get_connection()
+    try:
+        n = _agent_memory.clear(conn, agent_id, category)
+        conn.commit()
+        return n
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
 # ── Conversation Messages CRUD ──
 
 def save_conversation_message(message_type: str, **kwargs) -> int:
@@ -1343,6 +1622,7 @@ def save_conversation_message(message_type: str, **kwargs) -> int:
             values
         )
         conn.commit()
+        _notify_change("conversation")
         return cur.lastrowid
     except sqlite3.OperationalError:
         # conversation_messages 테이블이 아직 없는 경우 (init_db 전)
@@ -1466,7 +1746,7 @@ def get_conversation(conversation_id: str) -> dict | None:
 
 def update_conversation(conversation_id: str, **kwargs) -> None:
     """대화 세션 메타데이터를 업데이트합니다."""
-    allowed = {"title", "agent_id", "turn_count", "summary", "total_cost", "is_active"}
+    allowed = {"title", "agent_id", "turn_count", "summary", "summary_until_id", "total_cost", "is_active"}
     filtered = {k: v for k, v in kwargs.items() if k in allowed}
     if not filtered:
         return
@@ -1485,46 +1765,115 @@ def update_conversation(conversation_id: str, **kwargs) -> None:
         conn.close()
 
 
-def load_conversation_messages_by_id(conversation_id: str, limit: int = 200) -> list:
-    """특정 대화 세션의 메시지를 조회합니다."""
+def _row_to_conv_message(row: sqlite3.Row, preview_chars: int = 0) -> dict:
+    """conversation_messages 행 → 프론트엔드 메시지 dict.
+
+    preview_chars > 0이고 SELECT에 content_length가 있으면 content는 미리보기만 담기고
+    content_truncated=True — 전체 본문은 get_conversation_message(id)로 지연 조회.
+    """
+    msg = {"id": row["id"], "type": row["type"], "timestamp": row["created_at"]}
+    if row["type"] == "user":
+        msg["text"] = row["text"]
+        if row["source"]:
+            msg["source"] = row["source"]
+    elif row["type"] == "result":
+        msg.update({
+            "content": row["content"],
+            "sender_id": row["sender_id"],
+            "handled_by": row["handled_by"],
+            "delegation": row["delegation"] or "",
+            "model": row["model"] or "",
+            "time_seconds": row["time_seconds"],
+            "cost": row["cost"],
+            "quality_score": row["quality_score"],
+            "task_id": row["task_id"] or "",
+            "collapsed": False,
+            "feedbackSent": False,
+            "feedbackRating": None,
+            "source": row["source"] or "web",
+        })
+        if preview_chars and (row["content_length"] or 0) > preview_chars:
+            msg["content_truncated"] = True
+    return msg
+
+
+def load_conversation_messages_by_id(conversation_id: str, limit: int = 200,
+                                     cursor: str = "", preview_chars: int = 0) -> list:
+    """특정 대화 세션의 메시지를 조회합니다 (오래된 순).
+
+    cursor: 이전 페이지 마지막 메시지의 encode_cursor(created_at, id) — 그 이후부터.
+    preview_chars: > 0이면 result 본문을 앞부분만 잘라서 반환 (목록 화면용).
+    """
     conn = get_connection()
     try:
-        rows = conn.execute(
-            "SELECT * FROM conversation_messages WHERE conversation_id = ? "
-            "ORDER BY created_at ASC LIMIT ?",
-            (conversation_id, limit),
-        ).fetchall()
-        messages = []
-        for row in rows:
-            msg = {"type": row["type"], "timestamp": row["created_at"]}
-            if row["type"] == "user":
-                msg["text"] = row["text"]
-                if row["source"]:
-                    msg["source"] = row["source"]
-            elif row["type"] == "result":
-                msg.update({
-                    "content": row["content"],
-                    "sender_id": row["sender_id"],
-                    "handled_by": row["handled_by"],
-                    "delegation": row["delegation"] or "",
-                    "model": row["model"] or "",
-                    "time_seconds": row["time_seconds"],
-                    "cost": row["cost"],
-                    "quality_score": row["quality_score"],
-                    "task_id": row["task_id"] or "",
-                    "collapsed": False,
-                    "feedbackSent": False,
-                    "feedbackRating": None,
-                    "source": row["source"] or "web",
-                })
-            messages.append(msg)
-        return messages
+        if preview_chars:
+            cols = ("id, type, text, substr(content, 1, ?) AS content, length(content) AS content_length, "
+                    "sender_id, handled_by, delegation, model, time_seconds, cost, quality_score, "
+                    "task_id, source, created_at")
+            params: list = [preview_chars, conversation_id]
+        else:
+            cols = "*"
+            params = [conversation_id]
+        query = f"SELECT {cols} FROM conversation_messages WHERE conversation_id = ?"
+        after = decode_cursor(cursor)
+        if after:
+            query += " AND (created_at > ? OR (created_at = ? AND id > ?))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY created_at ASC, id ASC LIMIT ?"
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        return [_row_to_conv_message(r, preview_chars) for r in rows]
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+def load_conversation_tail(conversation_id: str | None, limit: int = 40, cursor: str = "") -> list:
+    """대화 끝부분 최근 limit개 메시지 (오래된 순). 에이전트 대화 기록 구성용.
+
+    conversation_id가 None이면 세션 구분 없이 전체 메시지 기준.
+    cursor: encode_cursor(created_at, id) — 그 이후 메시지만 (증분 조회).
+    """
+    conn = get_connection()
+    try:
+        where: list[str] = []
+        params: list = []
+        if conversation_id:
+            where.append("conversation_id = ?")
+            params.append(conversation_id)
+        after = decode_cursor(cursor)
+        if after:
+            where.append("(created_at > ? OR (created_at = ? AND id > ?))")
+            params.extend([after[0], after[0], after[1]])
+        query = "SELECT * FROM conversation_messages"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query = (f"SELECT * FROM ({query} ORDER BY created_at DESC, id DESC LIMIT ?) "
+                 "ORDER BY created_at ASC, id ASC")
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        return [_row_to_conv_message(r) for r in rows]
     except sqlite3.OperationalError:
         return []
     finally:
         conn.close()
 
 
+def get_conversation_message(message_id: int) -> dict | None:
+    """대화 메시지 1건 전체 본문 조회 (미리보기 목록의 지연 로딩용)."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT * FROM conversation_messages WHERE id = ?", (message_id,)
+        ).fetchone()
+        return _row_to_conv_message(row) if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
 def delete_conversation(conversation_id: str) -> None:
     """대화 세션과 관련 메시지를 삭제합니다."""
     conn = get_connection()
@@ -1558,6 +1907,7 @@ def save_agent_call(agent_id: str, task_id: str | None = None,
              datetime.now(timezone.utc).isoformat()),
         )
         conn.commit()
+        _notify_change("cost")
         return cur.lastrowid
     finally:
         conn.close()
@@ -1618,35 +1968,60 @@ def save_delegation_log(sender: str, receiver: str, message: str,
         conn.close()
 
 
-def list_delegation_logs(agent: str = None, limit: int = 100) -> list:
+def list_delegation_logs(agent: str = None, limit: int = 100,
+                         cursor: str = "", preview_chars: int = 0) -> list:
     """위임 로그를 최근순으로 조회합니다.
 
     agent 파라미터 지정 시 해당 에이전트가 sender 또는 receiver인 로그만 반환합니다.
+    cursor: 이전 페이지 마지막 행의 encode_cursor(created_at, id).
+    preview_chars: > 0이면 message를 앞부분만 반환하고 message_truncated 표시.
     """
     conn = get_connection()
     try:
-        if agent:
-            rows = conn.execute(
-                "SELECT id, sender, receiver, message, task_id, log_type, tools_used, created_at "
-                "FROM delegation_log "
-                "WHERE sender = ? OR receiver = ? "
-                "ORDER BY created_at DESC LIMIT ?",
-                (agent, agent, limit),
-            ).fetchall()
+        if preview_chars:
+            msg_col = "substr(message, 1, ?) AS message, length(message) > ? AS message_truncated"
+            params: list = [preview_chars, preview_chars]
         else:
-            rows = conn.execute(
-                "SELECT id, sender, receiver, message, task_id, log_type, tools_used, created_at "
-                "FROM delegation_log "
-                "ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-        return [dict(r) for r in rows]
+            msg_col = "message"
+            params = []
+        query = (f"SELECT id, sender, receiver, {msg_col}, task_id, log_type, tools_used, created_at "
+                 "FROM delegation_log WHERE 1=1")
+        if agent:
+            query += " AND (sender = ? OR receiver = ?)"
+            params.extend([agent, agent])
+        after = decode_cursor(cursor)
+        if after:
+            query += " AND (created_at < ? OR (created_at = ? AND id < ?))"
+            params.extend([after[0], after[0], after[1]])
+        query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        logs = [dict(r) for r in rows]
+        if preview_chars:
+            for log in logs:
+                log["message_truncated"] = bool(log["message_truncated"])
+        return logs
     except sqlite3.OperationalError:
         return []
     finally:
         conn.close()
 
 
+def get_delegation_log(log_id: int) -> dict | None:
+    """위임 로그 1건 전체 조회 (미리보기 목록의 지연 로딩용)."""
+    conn = get_connection()
+    try:
+        row = conn.execute(
+            "SELECT id, sender, receiver, message, task_id, log_type, tools_used, created_at "
+            "FROM delegation_log WHERE id = ?", (log_id,)
+        ).fetchone()
+        return dict(row) if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
 # ── CIO Predictions CRUD ──
 
 def save_cio_prediction(
@@ -3,13 +3,14 @@
 비유: 관제탑 — 에이전트 간 위임, 협업, 내부 메시지를 기록하고 실시간 중계.
 """
 import asyncio
+import heapq
 import json
 import logging
 import sqlite3
 import time as _time
 
 from fastapi import APIRouter, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from db import (
     list_activity_logs,
@@ -17,7 +18,10 @@ from db import (
     get_connection,
     get_collaboration_logs,
     get_collaboration_summary,
+    decode_cursor,
+    encode_cursor,
 )
+from json_response import fast_json
 from ws_manager import wm
 
 logger = logging.getLogger("corthex")
@@ -120,11 +124,14 @@ async def delete_delegation_logs():
 # ── 협업 로그 API ──
 
 @router.get("/api/delegation-log")
-async def get_delegation_log(agent: str = None, division: str = None, limit: int = 100):
+async def get_delegation_log(request: Request, agent: str = None, division: str = None, limit: int = 100,
+                             cursor: str = "", preview: int = 0):
     """에이전트 간 위임/협업 로그를 조회합니다.
 
     ?agent=비서실장 — 특정 에이전트 관련 로그만 반환
     ?division=cio  — 해당 처 팀 전체 관련 로그 반환 (cio/cto/cmo/cso/clo/cpo)
+    ?cursor=       — 다음 페이지 (X-Next-Cursor 헤더 값, agent/전체 조회에서 지원)
+    ?preview=300   — message를 300자 미리보기로 (전체는 /api/delegation-log/{id})
     """
     try:
         from db import list_delegation_logs
@@ -161,12 +168,25 @@ async def get_delegation_log(agent: str = None, division: str = None, limit: int
             finally:
                 conn.close()
         else:
-            logs = list_delegation_logs(agent=agent, limit=limit)
-            return logs
+            logs = list_delegation_logs(agent=agent, limit=limit, cursor=cursor,
+                                        preview_chars=max(preview, 0))
+            next_cursor = (encode_cursor(logs[-1]["created_at"], logs[-1]["id"])
+                           if logs and len(logs) >= limit else None)
+            return fast_json(request, logs, next_cursor=next_cursor)
     except Exception:
         return []
 
 
+@router.get("/api/delegation-log/{log_id}")
+async def get_delegation_log_detail(log_id: int):
+    """위임 로그 1건 전체 본문 (미리보기 목록에서 펼칠 때)."""
+    from db import get_delegation_log as db_get_delegation_log
+    log = db_get_delegation_log(log_id)
+    if not log:
+        return JSONResponse({"error": "not found", "id": log_id}, status_code=404)
+    return log
+
+
 @router.post("/api/delegation-log")
 async def post_delegation_log(request: Request):
     """에이전트 간 위임/협업 로그를 저장합니다.
@@ -205,75 +225,119 @@ async def post_delegation_log(request: Request):
 
 # ── 내부통신 통합 API (delegation_log + cross_agent_messages 통합) ──
 
+# 병합 정렬 순서: (created_at, 소스 순위, id) 내림차순 — 타임스탬프가 같아도 순서가 하나로 정해짐
+_COMMS_RANK = {"dl_": 1, "ca_": 0}
+
+
+def _comms_raw_id(cid: str):
+    """"dl_12" → 12, "ca_uuid" → "uuid" (테이블 id 컬럼과 같은 타입)."""
+    prefix, raw = cid[:3], cid[3:]
+    return int(raw) if prefix == "dl_" and raw.isdigit() else raw
+
+
+def _comms_sort_key(msg: dict) -> tuple:
+    cid = msg["id"]
+    return (msg.get("created_at") or "", _COMMS_RANK.get(cid[:3], -1), _comms_raw_id(cid))
+
+
+def _comms_keyset(after: tuple | None, own_prefix: str) -> tuple[str, list]:
+    """병합 커서 → 소스별 keyset 조건.
+
+    커서 id는 "dl_12" / "ca_uuid" 형태. 같은 소스면 (created_at, id) 튜플 비교,
+    다른 소스면 (created_at, 소스 순위) 비교 — 동일 타임스탬프 행도 빠지거나 겹치지 않음.
+    """
+    if not after:
+        return "", []
+    ts, cid = after
+    cid = str(cid)
+    if cid.startswith(own_prefix):
+        return " AND (created_at < ? OR (created_at = ? AND id < ?))", [ts, ts, _comms_raw_id(cid)]
+    return (" AND (created_at < ? OR (created_at = ? AND ? < ?))",
+            [ts, ts, _COMMS_RANK[own_prefix], _COMMS_RANK.get(cid[:3], -1)])
+
+
 @router.get("/api/comms/messages")
-async def get_comms_messages(limit: int = 100, msg_type: str = ""):
-    """내부통신 통합 메시지 조회 — delegation_log + cross_agent_messages 병합."""
+async def get_comms_messages(request: Request, limit: int = 100, msg_type: str = "",
+                             cursor: str = "", preview: int = 0):
+    """내부통신 통합 메시지 조회 — delegation_log + cross_agent_messages 병합.
+
+    두 테이블 모두 SQL에서 msg_type 필터 + keyset + LIMIT 후, 이미 정렬된 두 목록을
+    heapq.merge로 limit개까지만 병합. cursor는 X-Next-Cursor 헤더 값.
+    preview > 0이면 본문을 N자 미리보기로 자름.
+    """
+    after = decode_cursor(cursor)
+    preview = max(preview, 0)
+    delegation: list[dict] = []
+    cross: list[dict] = []
     try:
         conn = get_connection()
-        messages = []
-
+    except Exception:
+        return []
+    try:
         # 1) delegation_log
         try:
-            rows = conn.execute(
-                "SELECT id, sender, receiver, message, log_type, tools_used, created_at "
-                "FROM delegation_log ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-            for r in rows:
-                lt = r["log_type"] or "delegation"
-                if msg_type and lt != msg_type:
-                    continue
+            msg_col = "substr(message, 1, ?) AS message" if preview else "message"
+            params: list = [preview] if preview else []
+            query = (f"SELECT id, sender, receiver, {msg_col}, log_type, tools_used, created_at "
+                     "FROM delegation_log WHERE 1=1")
+            if msg_type:
+                query += " AND COALESCE(log_type, 'delegation') = ?"
+                params.append(msg_type)
+            cond, cparams = _comms_keyset(after, "dl_")
+            query += cond + " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params += cparams + [limit]
+            for r in conn.execute(query, params).fetchall():
                 _tu = r["tools_used"] or ""
-                _tools_list = [t.strip() for t in _tu.split(",") if t.strip()] if _tu else []
-                messages.append({
+                delegation.append({
                     "id": f"dl_{r['id']}",
                     "sender": r["sender"],
                     "receiver": r["receiver"],
                     "message": r["message"],
-                    "log_type": lt,
-                    "tools_used": _tools_list,
+                    "log_type": r["log_type"] or "delegation",
+                    "tools_used": [t.strip() for t in _tu.split(",") if t.strip()],
                     "source": "delegation",
                     "created_at": r["created_at"],
                 })
         except Exception as e:
             logger.debug("위임 로그 조회 실패: %s", e)
 
-        # 2) cross_agent_messages
+        # 2) cross_agent_messages — data JSON 전체 대신 표시용 텍스트만 json_extract
         try:
-            rows2 = conn.execute(
-                "SELECT id, msg_type, from_agent, to_agent, data, status, created_at "
-                "FROM cross_agent_messages ORDER BY created_at DESC LIMIT ?",
-                (limit,),
-            ).fetchall()
-            for r in rows2:
-                try:
-                    data = json.loads(r["data"]) if r["data"] else {}
-                except Exception:
-                    data = {}
-                lt = r["msg_type"] or "p2p"
-                if msg_type and lt != msg_type:
-                    continue
-                msg_text = data.get("task", data.get("message", data.get("next_task", "")))
-                messages.append({
+            text_expr = ("COALESCE(json_extract(data, '$.task'), json_extract(data, '$.message'), "
+                         "json_extract(data, '$.next_task'), '')")
+            if preview:
+                text_expr = f"substr({text_expr}, 1, {int(preview)})"
+            params = []
+            query = (f"SELECT id, msg_type, from_agent, to_agent, {text_expr} AS msg_text, status, created_at "
+                     "FROM cross_agent_messages WHERE 1=1")
+            if msg_type:
+                query += " AND COALESCE(msg_type, 'p2p') = ?"
+                params.append(msg_type)
+            cond, cparams = _comms_keyset(after, "ca_")
+            query += cond + " ORDER BY created_at DESC, id DESC LIMIT ?"
+            params += cparams + [limit]
+            for r in conn.execute(query, params).fetchall():
+                cross.append({
                     "id": f"ca_{r['id']}",
                     "sender": r["from_agent"],
                     "receiver": r["to_agent"],
-                    "message": msg_text,
-                    "log_type": lt,
+                    "message": r["msg_text"],
+                    "log_type": r["msg_type"] or "p2p",
                     "source": "cross_agent",
                     "status": r["status"],
                     "created_at": r["created_at"],
                 })
         except Exception as e:
             logger.debug("교차 에이전트 메시지 조회 실패: %s", e)
-
+    finally:
         conn.close()
 
-        # 시간순 정렬 (최신 먼저)
-        messages.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-        return messages[:limit]
-    except Exception:
-        return []
+    # 두 목록 모두 (created_at, id) 내림차순 → keyset과 같은 순서로 병합 후 limit개 (최신 먼저)
+    merged = list(heapq.merge(delegation, cross, key=_comms_sort_key, reverse=True))
+    messages = merged[:limit]
+    next_cursor = (encode_cursor(messages[-1]["created_at"], messages[-1]["id"])
+                   if len(merged) >= limit and messages else None)
+    return fast_json(request, messages, next_cursor=next_cursor)
 
 
 # ── SSE 엔드포인트 (B안: 내부통신 실시간 스트림) ──
@@ -19,7 +19,9 @@ from db import (
     delete_archive as db_delete_archive,
     delete_all_archives,
     save_activity_log,
+    encode_cursor,
 )
+from json_response import fast_json
 
 logger = logging.getLogger("corthex")
 
@@ -85,18 +87,23 @@ async def delete_all_archives_api():
 
 
 @router.get("")
-async def get_archive_list(request: Request, division: str = None, limit: int = 100, org: str = ""):
+async def get_archive_list(request: Request, division: str = None, limit: int = 100, org: str = "",
+                           cursor: str = ""):
+    """기밀문서 목록 (본문 제외). 다음 페이지는 X-Next-Cursor 헤더 값을 ?cursor=로 전달."""
     from handlers.auth_handler import get_auth_org
     auth_org = get_auth_org(request)
     effective_org = auth_org or org  # 인증 org 우선 (sister→saju 강제)
-    docs = list_archives(division=division, limit=limit)
+    docs = list_archives(division=division, limit=limit, cursor=cursor)
+    # 커서는 org 필터 전 마지막 행 기준 (필터로 줄어든 페이지도 다음 페이지가 이어지도록)
+    next_cursor = (encode_cursor(docs[-1]["created_at"], docs[-1]["id"])
+                   if docs and len(docs) >= limit else None)
     # v5: org 스코프 필터 (ADR-7 — 탭 숨김 아닌 데이터 스코프)
     if effective_org:
         docs = [d for d in docs if d.get("division", "").startswith(effective_org)]
     for doc in docs:
         doc.setdefault("importance", "일반")
         doc.setdefault("tags", [])
-    return docs
+    return fast_json(request, docs, next_cursor=next_cursor)
 
 
 @router.post("")
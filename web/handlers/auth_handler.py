@@ -47,6 +47,21 @@ def check_auth(request: Request) -> bool:
     return _get_session(_extract_token(request)) is not None
 
 
+_LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+_PROXY_HEADERS = ("x-forwarded-for", "x-real-ip", "cf-connecting-ip")
+
+
+def is_local_request(request: Request) -> bool:
+    """서버 자신(루프백)에서 직접 온 요청인지 — nginx·Cloudflare를 거친 요청은 프록시 헤더가 붙음."""
+    host = request.client.host if request.client else ""
+    return host in _LOOPBACK_HOSTS and not any(h in request.headers for h in _PROXY_HEADERS)
+
+
+def is_local_or_authed(request: Request) -> bool:
+    """운영 엔드포인트(메트릭 등) 접근 조건 — localhost 직접 요청이거나 로그인한 사용자."""
+    return is_local_request(request) or check_auth(request)
+
+
 def get_auth_role(request: Request) -> str:
     """인증된 사용자의 역할 반환. 미인증 시 'viewer'."""
     s = _get_session(_extract_token(request))
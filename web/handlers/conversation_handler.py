@@ -18,7 +18,11 @@ from db import (
     update_conversation,
     load_conversation_messages_by_id,
     delete_conversation,
+    get_conversation_message,
+    encode_cursor,
 )
+from json_response import fast_json
+from conv_history import history_cache
 
 logger = logging.getLogger("corthex")
 
@@ -66,14 +70,32 @@ async def patch_session(conversation_id: str, data: dict = Body(...)):
 async def delete_session(conversation_id: str):
     """대화 세션과 관련 메시지를 삭제합니다."""
     delete_conversation(conversation_id)
+    history_cache.invalidate(conversation_id)
     return {"success": True}
 
 
 @router.get("/sessions/{conversation_id}/messages")
-async def get_session_messages(conversation_id: str, limit: int = Query(200)):
-    """특정 대화 세션의 메시지를 조회합니다."""
-    messages = load_conversation_messages_by_id(conversation_id, limit=limit)
-    return messages
+async def get_session_messages(request: Request, conversation_id: str, limit: int = Query(200),
+                               cursor: str = "", preview: int = Query(0)):
+    """특정 대화 세션의 메시지를 조회합니다.
+
+    cursor: 다음 페이지 (X-Next-Cursor 헤더 값). preview: > 0이면 본문을 N자 미리보기로
+    잘라 보내고 전체 본문은 /api/conversation/messages/{id}로 지연 조회.
+    """
+    messages = load_conversation_messages_by_id(conversation_id, limit=limit,
+                                                cursor=cursor, preview_chars=max(preview, 0))
+    next_cursor = (encode_cursor(messages[-1]["timestamp"], messages[-1]["id"])
+                   if messages and len(messages) >= limit else None)
+    return fast_json(request, messages, next_cursor=next_cursor)
+
+
+@router.get("/messages/{message_id}")
+async def get_single_message(message_id: int):
+    """메시지 1건 전체 본문 (미리보기 목록에서 펼칠 때)."""
+    msg = get_conversation_message(message_id)
+    if not msg:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    return msg
 
 
 # ── Legacy endpoints (하위 호환) ──
@@ -117,6 +139,7 @@ async def delete_conversation_legacy():
     """[레거시] 대화 기록을 모두 삭제합니다."""
     try:
         clear_conversation_messages()
+        history_cache.invalidate()
         return {"success": True}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -10,7 +10,7 @@ import sys
 import time
 from datetime import datetime, timezone, timedelta
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
 from db import load_setting
@@ -560,6 +560,18 @@ async def refresh_fx_rate():
     return {"success": False, "rate": _get_fx_rate(), "message": "갱신 실패 — 기존 값 유지"}
 
 
+@router.get("/api/debug/metrics")
+async def debug_request_metrics(request: Request, top: int = 20):
+    """요청 메트릭 — 라우트별 지연(p50/p95/max), 상태코드, 처리 중 요청 수.
+    Prometheus 텍스트 포맷은 /metrics. localhost 또는 로그인한 사용자만.
+    """
+    from handlers.auth_handler import is_local_or_authed
+    if not is_local_or_authed(request):
+        return JSONResponse({"error": "forbidden"}, status_code=403)
+    from request_metrics import metrics
+    return metrics.snapshot(top=min(max(top, 1), 200))
+
+
 @router.get("/api/debug/server-logs")
 async def debug_server_logs(lines: int = 50, service: str = "corthex"):
     """서버 로그 디버그 — SSH 터널 또는 localhost에서만 접근 가능.
@@ -1,22 +1,23 @@
 """미디어 서빙/삭제 API — 이미지·영상 파일 관리.
 
 비유: 사진관 — 에이전트가 만든 이미지/영상을 보여주고 정리하는 곳.
+썸네일 생성·목록 캐시는 src/tools/_media_thumbs.py (프로세스 풀, 이벤트 루프 밖).
 """
-import io
 import logging
 import os
 from pathlib import Path
 
 from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.responses import FileResponse, JSONResponse
+
+from src.tools import _media_thumbs as thumbs
 
 router = APIRouter(prefix="/api/media", tags=["media"])
 logger = logging.getLogger("corthex.media")
 
 # 프로젝트 루트의 output/ 디렉토리 (os.getcwd() 의존 제거 — 서버 cwd와 무관)
 _MEDIA_BASE = str(Path(__file__).resolve().parent.parent.parent / "output")
-_THUMB_DIR = os.path.join(_MEDIA_BASE, "thumbs")
-_THUMB_SIZE = (300, 300)
+_THUMB_CACHE = {"Cache-Control": "public, max-age=86400"}
 
 
 @router.get("/images/{filename}")
@@ -40,53 +41,28 @@ async def serve_video(filename: str):
 
 
 @router.get("/thumbs/{filename}")
-async def serve_thumbnail(filename: str):
-    """이미지 썸네일 서빙 (300x300, 자동 생성)."""
+async def serve_thumbnail(filename: str, size: str = thumbs.DEFAULT_SIZE, kind: str = "images"):
+    """썸네일 서빙 (size=sm/md/lg, WebP). 없으면 프로세스 풀에서 생성 — 동시 요청은 1번만 생성."""
     safe_name = os.path.basename(filename)
-    thumb_path = os.path.join(_THUMB_DIR, safe_name)
-
-    # 캐시된 썸네일 있으면 바로 서빙
-    if os.path.isfile(thumb_path):
-        return FileResponse(thumb_path, media_type="image/jpeg")
-
-    # 원본에서 썸네일 생성
-    original = os.path.join(_MEDIA_BASE, "images", safe_name)
+    kind = kind if kind in ("images", "videos") else "images"
+    original = os.path.join(_MEDIA_BASE, kind, safe_name)
     if not os.path.isfile(original):
         return JSONResponse({"error": "원본 파일 없음"}, status_code=404)
 
-    try:
-        from PIL import Image
-        os.makedirs(_THUMB_DIR, exist_ok=True)
-        img = Image.open(original)
-        img.thumbnail(_THUMB_SIZE, Image.LANCZOS)
-        # JPEG로 저장 (PNG 대비 ~90% 용량 감소)
-        thumb_jpeg = thumb_path.rsplit(".", 1)[0] + ".jpg"
-        img = img.convert("RGB")
-        img.save(thumb_jpeg, "JPEG", quality=75)
-        return FileResponse(thumb_jpeg, media_type="image/jpeg")
-    except Exception as e:
-        logger.warning("[Media] 썸네일 생성 실패 %s: %s", safe_name, e)
-        # 실패 시 원본 서빙
-        return FileResponse(original, media_type="image/png")
+    thumb_path = await thumbs.ensure(kind, safe_name, size)
+    if thumb_path:
+        media_type = "image/webp" if thumb_path.endswith(".webp") else "image/jpeg"
+        return FileResponse(thumb_path, media_type=media_type, headers=_THUMB_CACHE)
+    if kind == "videos":
+        return JSONResponse({"error": "썸네일 생성 불가"}, status_code=404)
+    # 생성 실패 시 원본 서빙
+    return FileResponse(original, media_type="image/png")
 
 
 @router.get("/list")
 async def list_media():
-    """생성된 미디어 파일 목록 (썸네일 URL 포함)."""
-    images_dir = os.path.join(_MEDIA_BASE, "images")
-    videos_dir = os.path.join(_MEDIA_BASE, "videos")
-    images = sorted(os.listdir(images_dir), reverse=True) if os.path.isdir(images_dir) else []
-    videos = sorted(os.listdir(videos_dir), reverse=True) if os.path.isdir(videos_dir) else []
-    return {
-        "images": [
-            {"filename": f, "url": f"/api/media/images/{f}", "thumb": f"/api/media/thumbs/{f}"}
-            for f in images if f.endswith(".png")
-        ],
-        "videos": [
-            {"filename": f, "url": f"/api/media/videos/{f}"}
-            for f in videos if f.endswith(".mp4")
-        ],
-    }
+    """생성된 미디어 파일 목록 (썸네일 URL·srcset 포함). 디렉토리가 바뀔 때만 다시 읽음."""
+    return thumbs.manifest()
 
 
 @router.delete("/{media_type}/{filename}")
@@ -99,6 +75,7 @@ async def delete_media_file(media_type: str, filename: str):
     if not os.path.isfile(filepath):
         return JSONResponse({"error": "파일을 찾을 수 없습니다"}, status_code=404)
     os.remove(filepath)
+    thumbs.drop(media_type, safe_name)
     return {"success": True, "deleted": safe_name}
 
 
@@ -115,6 +92,7 @@ async def delete_all_media(media_type: str):
     for f in os.listdir(target_dir):
         if f.endswith(ext):
             os.remove(os.path.join(target_dir, f))
+            thumbs.drop(media_type, f)
             count += 1
     return {"success": True, "deleted": count}
 
@@ -135,6 +113,7 @@ async def delete_media_batch(request: Request):
         filepath = os.path.join(_MEDIA_BASE, media_type, filename)
         if os.path.isfile(filepath):
             os.remove(filepath)
+            thumbs.drop(media_type, filename)
             deleted += 1
         else:
             errors.append(f"파일 없음: {filename}")
@@ -8,7 +8,7 @@ from datetime import datetime, timezone, timedelta
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 
-from db import save_setting, load_setting
+from db import save_setting, load_setting, get_agent_memory_categorized, list_agent_memory, clear_agent_memory
 
 logger = logging.getLogger("corthex")
 
@@ -30,14 +30,21 @@ def _save_data(name: str, data) -> None:
     save_setting(name, data)
 
 
+@router.get("/extraction/status")
+async def get_extraction_status():
+    """백그라운드 기억 추출 큐 상태 (대기 건수, 시간당 호출 수 등)."""
+    from memory_extractor import memory_extractor
+    return memory_extractor.stats()
+
+
 @router.get("/{agent_id}")
 async def get_memory(agent_id: str):
     all_memories = _load_data("memories", {})
-    # 수동 기억 + 자동 추출된 카테고리 기억 함께 반환
-    categorized = load_setting(f"memory_categorized_{agent_id}", {})
+    # 수동 기억 + 자동 추출된 카테고리 기억 함께 반환 (items: 기억별 중요도·사용 기록)
     return {
         "memories": all_memories.get(agent_id, []),
-        "categorized": categorized,
+        "categorized": get_agent_memory_categorized(agent_id),
+        "items": list_agent_memory(agent_id),
     }
 
 
@@ -62,8 +69,7 @@ async def add_memory(agent_id: str, request: Request):
 @router.delete("/{agent_id}/categorized")
 async def delete_categorized_memory(agent_id: str):
     """에이전트 자동 추출 카테고리 기억 초기화."""
-    save_setting(f"memory_categorized_{agent_id}", {})
-    return {"success": True}
+    return {"success": True, "deleted": clear_agent_memory(agent_id)}
 
 
 @router.delete("/{agent_id}/{memory_id}")
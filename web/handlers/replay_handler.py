@@ -7,7 +7,7 @@ import sys
 
 from fastapi import APIRouter
 
-from db import load_setting
+from db import list_batch_chains
 
 logger = logging.getLogger("corthex")
 
@@ -35,7 +35,7 @@ async def get_replay(correlation_id: str):
     """배치 체인의 단계별 결과를 트리 형태로 반환합니다."""
     agent_names = _agent_names()
     specialist_names = _specialist_names()
-    chains = load_setting("batch_chains") or []
+    chains = list_batch_chains()
 
     # correlation_id 또는 chain_id로 검색
     chain = None
@@ -140,8 +140,7 @@ async def get_replay(correlation_id: str):
 @router.get("/api/replay/latest")
 async def get_replay_latest():
     """가장 최근 완료된 배치 체인의 replay를 반환합니다."""
-    chains = load_setting("batch_chains") or []
-    completed = [c for c in chains if c.get("status") == "completed"]
+    completed = list_batch_chains(("completed",))
     if not completed:
         return {"steps": []}
     latest = max(completed, key=lambda c: c.get("completed_at", ""))
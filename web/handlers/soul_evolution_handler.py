@@ -13,7 +13,10 @@ from zoneinfo import ZoneInfo
 
 from fastapi import APIRouter, Request
 
-from db import load_setting, save_setting, save_activity_log
+from db import (
+    load_setting, save_setting, save_activity_log,
+    get_agent_memory_categorized, clear_agent_memory,
+)
 
 logger = logging.getLogger("corthex.soul_evolution")
 router = APIRouter(tags=["soul-evolution"])
@@ -82,8 +85,7 @@ async def run_soul_evolution_analysis() -> dict:
         aid = agent.get("agent_id", "")
         if not aid or agent.get("dormant"):
             continue
-        mem = load_setting(f"memory_categorized_{aid}", {})
-        w = mem.get("warnings", "").strip()
+        w = get_agent_memory_categorized(aid).get("warnings", "").strip()
         if w:
             warnings_by_agent[aid] = w
 
@@ -160,11 +162,8 @@ async def run_soul_evolution_analysis() -> dict:
             logger.info("Soul 진화 자동 적용: %s — 소울 업데이트 완료", aid)
 
             # warnings 초기화
-            mem_key = f"memory_categorized_{aid}"
-            mem = load_setting(mem_key, {})
-            proposal["cleared_warnings"] = mem.get("warnings", "")
-            mem["warnings"] = ""
-            save_setting(mem_key, mem)
+            proposal["cleared_warnings"] = get_agent_memory_categorized(aid).get("warnings", "")
+            clear_agent_memory(aid, "warnings")
 
         proposals.append(proposal)
 
@@ -243,11 +242,8 @@ async def approve_proposal(proposal_id: str):
         logger.warning("Soul 진화: %s — 추가할 텍스트 추출 실패", aid)
 
     # 2) warnings 초기화
-    mem_key = f"memory_categorized_{aid}"
-    mem = load_setting(mem_key, {})
-    cleared_warnings = mem.get("warnings", "")
-    mem["warnings"] = ""
-    save_setting(mem_key, mem)
+    cleared_warnings = get_agent_memory_categorized(aid).get("warnings", "")
+    clear_agent_memory(aid, "warnings")
 
     # 3) 상태 업데이트 + 히스토리
     target["status"] = "approved"
@@ -20,7 +20,9 @@ from db import (
     set_task_tags,
     mark_task_read,
     bulk_mark_read,
+    encode_cursor,
 )
+from json_response import fast_json
 
 logger = logging.getLogger("corthex")
 
@@ -28,12 +30,15 @@ router = APIRouter(prefix="/api/tasks", tags=["tasks"])
 
 
 @router.get("")
-async def get_tasks(keyword: str = "", status: str = "", bookmarked: bool = False,
-                    limit: int = 50, archived: bool = False, tag: str = ""):
+async def get_tasks(request: Request, keyword: str = "", status: str = "", bookmarked: bool = False,
+                    limit: int = 50, archived: bool = False, tag: str = "", cursor: str = ""):
+    """작업 목록 (요약 컬럼만). 다음 페이지는 X-Next-Cursor 헤더 값을 ?cursor=로 전달."""
     tasks = list_tasks(keyword=keyword, status=status,
                        bookmarked=bookmarked, limit=limit,
-                       archived=archived, tag=tag)
-    return tasks
+                       archived=archived, tag=tag, cursor=cursor)
+    next_cursor = (encode_cursor(tasks[-1]["created_at"], tasks[-1]["task_id"])
+                   if tasks and len(tasks) >= limit else None)
+    return fast_json(request, tasks, next_cursor=next_cursor)
 
 
 @router.get("/{task_id}")
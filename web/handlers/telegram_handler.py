@@ -55,10 +55,12 @@ async def telegram_test():
         return {"ok": False, "error": "TELEGRAM_CEO_CHAT_ID 미설정"}
     try:
         now = datetime.now(KST).strftime("%Y-%m-%d %H:%M:%S")
-        msg = await app_state.telegram_app.bot.send_message(
-            chat_id=int(ceo_id),
-            text=f"CORTHEX HQ 텔레그램 봇 테스트\n시간: {now} KST\n상태: 정상",
+        from src.telegram.outbox import get_outbox
+        outbox = get_outbox(app_state.telegram_app.bot)
+        sent = await outbox.send(
+            int(ceo_id), f"CORTHEX HQ 텔레그램 봇 테스트\n시간: {now} KST\n상태: 정상",
         )
-        return {"ok": True, "message_id": msg.message_id, "chat_id": ceo_id}
+        return {"ok": True, "message_id": sent[-1].message_id, "chat_id": ceo_id,
+                "outbox": outbox.stats()}
     except Exception as e:
         return {"ok": False, "error": str(e)}
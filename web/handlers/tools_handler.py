@@ -88,11 +88,17 @@ async def get_tools_status():
             "total_defined": len(tools_list),
         }
 
-    loaded = list(pool._tools.keys())
+    entries = pool.list_tools()
+    loaded = [t["id"] for t in entries]
+    # 지연 로드: 등록(loaded) ≠ 실제 import 완료(imported)
+    import_ms = {t["id"]: t["import_ms"] for t in entries if t["import_ms"] is not None}
     return {
         "pool_status": "ready",
         "loaded_tools": loaded,
         "loaded_count": len(loaded),
+        "imported_count": sum(1 for t in entries if t["loaded"]),
+        "import_ms": import_ms,
+        "cache": pool.cache_stats(),
         "total_defined": len(tools_list),
     }
 
@@ -111,7 +117,7 @@ async def get_tools_health():
     """
     tools_list = _get_tools_list()
     pool = _init_tool_pool()
-    loaded_tools = set(pool._tools.keys()) if pool else set()
+    loaded_tools = pool.loaded_names() if pool else set()
 
     # API 키 환경변수 매핑
     _API_KEY_MAP = {
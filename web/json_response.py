@@ -0,0 +1,55 @@
+"""
+대용량 목록 응답용 JSON 헬퍼 (orjson + gzip, 엔드포인트 단위 opt-in).
+
+FastAPI 기본 JSONResponse는 표준 json으로 직렬화하고 압축하지 않습니다.
+작업/아카이브/교신 목록처럼 수십~수백 KB가 나가는 엔드포인트만 이 헬퍼로 응답해서:
+- orjson이 설치돼 있으면 orjson으로 직렬화 (없으면 json 폴백)
+- 클라이언트가 gzip을 받고 본문이 GZIP_MIN_BYTES 이상이면 gzip 압축
+- 다음 페이지 커서를 X-Next-Cursor 헤더로 전달 (본문 형태는 기존 그대로 list)
+
+사용법:
+    from json_response import fast_json
+    return fast_json(request, items, next_cursor=cursor)
+"""
+from __future__ import annotations
+
+import gzip
+import json
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+GZIP_MIN_BYTES = 4096
+_GZIP_LEVEL = 5
+
+
+def dumps(content) -> bytes:
+    """content → UTF-8 JSON bytes."""
+    if _HAS_ORJSON:
+        try:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # orjson이 못 다루는 타입 → 표준 json 폴백
+    return json.dumps(content, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def fast_json(request: Request, content, status_code: int = 200,
+              next_cursor: str | None = None, headers: dict | None = None) -> Response:
+    """orjson 직렬화 + 조건부 gzip JSON 응답."""
+    body = dumps(content)
+    out_headers = dict(headers or {})
+    out_headers["Vary"] = "Accept-Encoding"
+    if next_cursor:
+        out_headers["X-Next-Cursor"] = next_cursor
+        out_headers["Access-Control-Expose-Headers"] = "X-Next-Cursor"
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=_GZIP_LEVEL)
+        out_headers["Content-Encoding"] = "gzip"
+    return Response(content=body, status_code=status_code,
+                    media_type="application/json", headers=out_headers)
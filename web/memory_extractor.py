@@ -0,0 +1,286 @@
+"""
+기억 추출 큐 — _call_agent 완료 후 백그라운드 기억 추출을 모아서 한 번에 처리.
+
+이전에는 에이전트 호출이 끝날 때마다 asyncio.create_task(_extract_and_save_memory(...))로
+ask_ai를 1번 더 불렀습니다. 전문가 6명 팬아웃이면 가장 바쁜 순간에 LLM 호출 6건이 추가되어
+사용자 응답용 호출과 프로바이더 레이트 리미터(_GoogleRateLimiter 2슬롯 등)를 두고 경쟁했습니다.
+이제는:
+- enqueue()는 대화만 쌓고 즉시 반환 (LLM 호출 없음)
+- 에이전트별 디바운스: 마지막 대화 후 DEBOUNCE_SEC 동안 조용하면 처리 대상
+  (계속 호출돼도 첫 대화 후 MAX_WAIT_SEC가 지나면 처리), 에이전트당 최근 PER_AGENT_MAX건만 보관
+- 처리 시점에 대기 중인 대화 전부를 최대 BATCH_MAX건씩 묶어 구조화 추출 요청 1건으로 병합
+  → {"번호": {카테고리: [사실...]}} JSON 하나로 응답
+- 동시 추출 호출 상한 + 시간당 호출 예산 (초과분은 다음 시간 창까지 대기, 큐 상한 넘으면 오래된 것부터 버림)
+
+설정 (settings 테이블):
+    memory_extraction_hourly_budget  — 시간당 추출 LLM 호출 수 (기본 30, 0이면 추출 중단)
+    memory_extraction_concurrency    — 동시 추출 호출 수 (기본 1)
+
+사용법:
+    from memory_extractor import memory_extractor
+    memory_extractor.enqueue(agent_id, task_text, response_text)
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+
+from db import add_agent_memory, load_setting
+
+logger = logging.getLogger("corthex.memory_extractor")
+
+DEBOUNCE_SEC = 20.0       # 에이전트의 마지막 대화 후 이만큼 조용하면 추출
+MAX_WAIT_SEC = 120.0      # 첫 대화 후 최대 대기
+PER_AGENT_MAX = 3         # 에이전트당 보관할 최근 대화 수
+BATCH_MAX = 8             # 추출 요청 1건에 묶을 대화 수
+MAX_PENDING = 200         # 전체 대기 대화 상한
+EXCERPT_CHARS = 400       # 대화 한쪽당 프롬프트에 넣는 글자 수
+DEFAULT_HOURLY_BUDGET = 30
+DEFAULT_CONCURRENCY = 1
+
+_SYSTEM_PROMPT = "JSON만 반환. 설명 없이."
+_EMPTY_VALUES = ("null", "없음", "")
+
+
+def _pick_model() -> str:
+    """추출용 저가 모델 — 기존 _extract_and_save_memory와 같은 우선순위."""
+    from ai_handler import _USE_CLI_FOR_CLAUDE, get_available_providers
+    providers = get_available_providers()
+    if providers.get("google"):
+        return "gemini-2.5-flash"
+    if providers.get("openai"):
+        return "gpt-5-mini"
+    if _USE_CLI_FOR_CLAUDE:
+        return "claude-haiku-4-5-20251001"  # CLI 라우팅 → API 크레딧 소진 방지
+    return "claude-sonnet-4-6"
+
+
+def build_prompt(items: list[tuple[str, str, str]]) -> str:
+    """(agent_id, task, response) 목록 → 병합 추출 프롬프트."""
+    blocks = []
+    for i, (agent_id, task, response) in enumerate(items, 1):
+        blocks.append(
+            f"[대화 {i}] (에이전트: {agent_id})\n"
+            f"사용자: {task[:EXCERPT_CHARS]}\n에이전트: {response[:EXCERPT_CHARS]}"
+        )
+    return (
+        "아래 대화들 각각에서 에이전트가 기억해야 할 정보가 있으면 JSON으로 추출해라.\n\n"
+        + "\n\n".join(blocks)
+        + "\n\n[추출 항목]\n"
+        "- ceo_preferences: CEO가 선호하거나 싫어하는 것 (있으면)\n"
+        "- decisions: '~하기로 결정', '~로 확정' 등 중요 결정 (있으면)\n"
+        "- warnings: 이 방법은 안 됨, CEO가 싫다고 함 등 주의사항 (있으면)\n"
+        "- context: 프로젝트 상태, 거래처, 일정 등 중요 맥락 (있으면)\n\n"
+        '형식: {"1": {"warnings": ["..."]}, "3": {"context": ["..."]}} '
+        "— 대화 번호별로, 기억할 것이 없는 대화는 생략. 전부 없으면 {} 반환.\n"
+        "JSON만 반환 (설명 없이):"
+    )
+
+
+def parse_response(text: str) -> dict:
+    """LLM 응답 → {번호(int): {카테고리: [사실...]}}. 파싱 실패 시 빈 dict."""
+    text = (text or "").strip()
+    if "```" in text:
+        text = text.split("```")[1].strip()
+        if text.startswith("json"):
+            text = text[4:].strip()
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    out: dict[int, dict[str, list[str]]] = {}
+    for key, facts in data.items():
+        try:
+            idx = int(key)
+        except (TypeError, ValueError):
+            continue
+        if not isinstance(facts, dict):
+            continue
+        cats: dict[str, list[str]] = {}
+        for cat, val in facts.items():
+            values = [str(v).strip() for v in (val if isinstance(val, list) else [val]) if v]
+            values = [v for v in values if v not in _EMPTY_VALUES]
+            if values:
+                cats[cat] = values
+        if cats:
+            out[idx] = cats
+    return out
+
+
+class MemoryExtractor:
+    """에이전트별 디바운스 + 병합 추출 + 동시성/시간당 예산 제한."""
+
+    def __init__(self) -> None:
+        self._pending: dict[str, deque] = {}          # agent_id → deque[(task, response)]
+        self._first_at: dict[str, float] = {}
+        self._last_at: dict[str, float] = {}
+        self._wake: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self._sem_size = 0
+        self._calls: deque[float] = deque()            # 최근 1시간 추출 호출 시각
+        self._stats = {"enqueued": 0, "dropped": 0, "calls": 0, "conversations": 0,
+                       "facts": 0, "failures": 0, "budget_waits": 0}
+
+    # ── 입력 ──
+
+    def enqueue(self, agent_id: str, task: str, response: str) -> None:
+        """대화 1건을 추출 대기열에 추가 (즉시 반환)."""
+        now = time.monotonic()
+        q = self._pending.setdefault(agent_id, deque(maxlen=PER_AGENT_MAX))
+        if len(q) == q.maxlen:
+            self._stats["dropped"] += 1
+        q.append((task, response))
+        self._first_at.setdefault(agent_id, now)
+        self._last_at[agent_id] = now
+        self._stats["enqueued"] += 1
+        self._trim()
+        self._ensure_worker()
+
+    def _trim(self) -> None:
+        """전체 대기 상한 초과 시 가장 오래 기다린 에이전트의 옛 대화부터 버림."""
+        total = sum(len(q) for q in self._pending.values())
+        while total > MAX_PENDING:
+            oldest = min(self._first_at, key=self._first_at.get)
+            q = self._pending[oldest]
+            q.popleft()
+            total -= 1
+            self._stats["dropped"] += 1
+            if not q:
+                self._forget(oldest)
+
+    def _forget(self, agent_id: str) -> None:
+        self._pending.pop(agent_id, None)
+        self._first_at.pop(agent_id, None)
+        self._last_at.pop(agent_id, None)
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._wake = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        self._wake.set()
+
+    # ── 스케줄링 ──
+
+    def _due_at(self, agent_id: str) -> float:
+        return min(self._last_at[agent_id] + DEBOUNCE_SEC, self._first_at[agent_id] + MAX_WAIT_SEC)
+
+    def _budget_wait(self, now: float) -> float:
+        """시간당 예산이 남았으면 0, 아니면 다음 호출 가능까지 남은 초 (예산 0이면 -1)."""
+        budget = int(load_setting("memory_extraction_hourly_budget", DEFAULT_HOURLY_BUDGET) or 0)
+        if budget <= 0:
+            return -1
+        while self._calls and now - self._calls[0] >= 3600:
+            self._calls.popleft()
+        if len(self._calls) < budget:
+            return 0.0
+        return 3600 - (now - self._calls[0])
+
+    def _take_batch(self) -> list[tuple[str, str, str]]:
+        """대기 중인 대화를 BATCH_MAX건까지 꺼냄 — 오래 기다린 에이전트 먼저."""
+        items: list[tuple[str, str, str]] = []
+        for agent_id in sorted(self._pending, key=self._first_at.get):
+            q = self._pending[agent_id]
+            while q and len(items) < BATCH_MAX:
+                task, response = q.popleft()
+                items.append((agent_id, task, response))
+            if not q:
+                self._forget(agent_id)
+            if len(items) >= BATCH_MAX:
+                break
+        return items
+
+    async def _run(self) -> None:
+        inflight: set[asyncio.Task] = set()
+        # 진행 중 추출이 남아 있는 동안은 끝내지 않음 — 그 사이 enqueue된 대화도 이 작업자가 처리
+        while self._pending or inflight:
+            if not self._pending:
+                await self._sleep(60.0)   # 새 enqueue 또는 추출 완료(_release)가 깨움
+                continue
+            now = time.monotonic()
+            next_due = min(self._due_at(a) for a in self._pending)
+            if next_due > now:
+                await self._sleep(next_due - now)
+                continue
+            wait = self._budget_wait(now)
+            if wait < 0:
+                # 예산 0 = 추출 중단 — 대기열 비움
+                self._stats["dropped"] += sum(len(q) for q in self._pending.values())
+                self._pending.clear()
+                self._first_at.clear()
+                self._last_at.clear()
+                continue
+            if wait > 0:
+                self._stats["budget_waits"] += 1
+                await self._sleep(min(wait, 60.0))
+                continue
+
+            # 하나라도 기한이 되면 그때 대기 중인 대화를 모두 모아서 처리 (늦게 온 에이전트도 같은 호출에 합류)
+            items = self._take_batch()
+            if not items:
+                continue
+            self._calls.append(now)
+            sem = self._semaphore()
+            await sem.acquire()
+            t = asyncio.create_task(self._extract(items))
+            inflight.add(t)
+
+            def _release(done: asyncio.Task, sem: asyncio.Semaphore = sem) -> None:
+                inflight.discard(done)
+                sem.release()
+                self._wake.set()
+
+            t.add_done_callback(_release)
+
+    async def _sleep(self, seconds: float) -> None:
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=max(0.05, seconds))
+        except asyncio.TimeoutError:
+            pass
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        size = max(1, int(load_setting("memory_extraction_concurrency", DEFAULT_CONCURRENCY) or 1))
+        if self._sem is None or size != self._sem_size:
+            self._sem, self._sem_size = asyncio.Semaphore(size), size
+        return self._sem
+
+    # ── 추출 ──
+
+    async def _extract(self, items: list[tuple[str, str, str]]) -> None:
+        from ai_handler import ask_ai
+        self._stats["calls"] += 1
+        self._stats["conversations"] += len(items)
+        try:
+            result = await ask_ai(
+                user_message=build_prompt(items),
+                model=_pick_model(),
+                max_tokens=min(1600, 300 + 200 * len(items)),
+                system_prompt=_SYSTEM_PROMPT,
+            )
+            text = result.get("content", "") if isinstance(result, dict) else str(result)
+            for idx, cats in parse_response(text).items():
+                if not 1 <= idx <= len(items):
+                    continue
+                agent_id = items[idx - 1][0]
+                for cat, facts in cats.items():
+                    for fact in facts:
+                        add_agent_memory(agent_id, cat, fact)
+                        self._stats["facts"] += 1
+        except Exception as e:
+            self._stats["failures"] += 1
+            logger.debug("기억 추출 건너뜀 (%d건): %s", len(items), e)
+
+    def stats(self) -> dict:
+        return {**self._stats,
+                "pending": sum(len(q) for q in self._pending.values()),
+                "pending_agents": len(self._pending),
+                "calls_last_hour": len(self._calls)}
+
+
+memory_extractor = MemoryExtractor()
@@ -0,0 +1,294 @@
+"""
+요청 메트릭 미들웨어 (순수 ASGI).
+
+이전 ActivityLogMiddleware는 API 요청마다 activity_logs에 1행씩 동기 INSERT +
+COUNT(*)를 했습니다. 이제는 요청 정보를 메모리에만 모으고:
+- 라우트별 지연시간 히스토그램 / 상태코드 카운트 / 처리 중(in-flight) 게이지
+- /metrics (Prometheus 텍스트) + /api/debug/metrics (JSON) 로 노출
+- 주기적으로 집계 요약 1행만 activity_logs에 저장
+- 감사 대상 라우트(매매 주문, 설정 변경)만 버퍼에 모았다가 한 번에 저장
+
+사용법:
+    from request_metrics import RequestMetricsMiddleware, metrics
+    app.add_middleware(RequestMetricsMiddleware)
+    metrics.snapshot()            # JSON 요약
+    metrics.render_prometheus()   # 텍스트 포맷
+
+비유: 출입 기록부 — 방문객마다 장부에 한 줄씩 쓰던 것을 카운터로 세고,
+     중요 방문(금고 출입)만 따로 모아 하루 몇 번 장부에 옮겨 적음.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+
+logger = logging.getLogger("corthex.metrics")
+
+_KST = timezone(timedelta(hours=9))
+
+# 히스토그램 버킷 (초) — Prometheus 기본값과 동일
+_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 계측 제외 (정적 파일, WebSocket 등)
+_SKIP_PREFIXES = ("/static", "/favicon", "/ws")
+
+# 라우트 템플릿이 없는 요청의 집계 라벨 (실제 URL을 라벨로 쓰면 카디널리티 폭증)
+_UNMATCHED_ROUTE = "<unmatched>"
+
+# 감사 로그 대상: 상태를 바꾸는 매매/설정 요청 (GET 제외)
+_AUDIT_PREFIXES = ("/api/trading/", "/api/kis/", "/api/settings", "/api/batch/chain/start")
+_AUDIT_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+# 요약 저장 주기 (초)
+SUMMARY_INTERVAL = 300
+AUDIT_FLUSH_INTERVAL = 10
+
+
+class _RouteStats:
+    """라우트 1개의 누적 통계."""
+
+    __slots__ = ("count", "total_seconds", "max_seconds", "buckets", "statuses")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(_BUCKETS) + 1)  # 마지막 칸 = +Inf
+        self.statuses: dict[int, int] = {}
+
+    def observe(self, elapsed: float, status: int) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        if elapsed > self.max_seconds:
+            self.max_seconds = elapsed
+        self.buckets[bisect.bisect_left(_BUCKETS, elapsed)] += 1
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한 기준 근사 분위수."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        acc = 0
+        for i, n in enumerate(self.buckets):
+            acc += n
+            if acc >= target:
+                return _BUCKETS[i] if i < len(_BUCKETS) else self.max_seconds
+        return self.max_seconds
+
+
+class RequestMetrics:
+    """프로세스 전역 요청 메트릭 저장소 (메모리 전용)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[str, str], _RouteStats] = {}
+        self._in_flight = 0
+        self._in_flight_paths: dict[str, int] = {}  # "GET /api/x" → 처리 중 개수
+        self._started_at = time.time()
+        self._audit_buffer: list[dict] = []
+        self._last_summary_count = 0
+
+    # ── 기록 ──
+
+    def _stats(self, method: str, route: str) -> _RouteStats:
+        key = (method, route)
+        st = self._routes.get(key)
+        if st is None:
+            st = self._routes[key] = _RouteStats()
+        return st
+
+    def begin(self, method: str, path: str) -> None:
+        key = f"{method} {path}"
+        with self._lock:
+            self._in_flight += 1
+            self._in_flight_paths[key] = self._in_flight_paths.get(key, 0) + 1
+
+    def end(self, method: str, path: str, route: str, elapsed: float, status: int) -> None:
+        """요청 종료 기록. path=실제 경로(in-flight 키), route=라우트 템플릿(집계 키)."""
+        key = f"{method} {path}"
+        with self._lock:
+            self._in_flight -= 1
+            left = self._in_flight_paths.get(key, 1) - 1
+            if left > 0:
+                self._in_flight_paths[key] = left
+            else:
+                self._in_flight_paths.pop(key, None)
+            self._stats(method, route).observe(elapsed, status)
+
+    def add_audit(self, method: str, path: str, status: int, elapsed: float, desc: str = "") -> None:
+        """감사 로그 1건을 버퍼에 추가 (flush_audit에서 일괄 저장)."""
+        now = datetime.now(_KST)
+        level = "info" if status < 400 else ("warning" if status < 500 else "error")
+        action = f"{desc} ({elapsed:.1f}s)" if desc else f"🌐 {method} {path} → {status} ({elapsed:.1f}s)"
+        with self._lock:
+            self._audit_buffer.append({
+                "agent_id": "system",
+                "message": action,
+                "level": level,
+                "time": now.strftime("%H:%M:%S"),
+                "timestamp": int(now.timestamp() * 1000),
+            })
+
+    # ── 조회 ──
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def snapshot(self, top: int = 20) -> dict:
+        """JSON 요약 (/api/debug/metrics용). 느린 순 상위 top개 라우트."""
+        with self._lock:
+            items = list(self._routes.items())
+            total = sum(st.count for _, st in items)
+            errors = sum(n for _, st in items for s, n in st.statuses.items() if s >= 500)
+            routes = [{
+                "method": m,
+                "route": r,
+                "count": st.count,
+                "avg_ms": round(st.total_seconds / st.count * 1000, 1) if st.count else 0,
+                "p50_ms": round(st.quantile(0.5) * 1000, 1),
+                "p95_ms": round(st.quantile(0.95) * 1000, 1),
+                "max_ms": round(st.max_seconds * 1000, 1),
+                "statuses": {str(s): n for s, n in sorted(st.statuses.items())},
+            } for (m, r), st in items]
+            in_flight = self._in_flight
+            in_flight_paths = dict(self._in_flight_paths)
+            audit_pending = len(self._audit_buffer)
+        routes.sort(key=lambda x: x["p95_ms"], reverse=True)
+        return {
+            "uptime_seconds": int(time.time() - self._started_at),
+            "total_requests": total,
+            "server_errors": errors,
+            "in_flight": in_flight,
+            "in_flight_paths": in_flight_paths,
+            "audit_pending": audit_pending,
+            "routes": routes[:top],
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (0.0.4)."""
+        out = [
+            "# HELP corthex_http_requests_in_flight Requests currently being served.",
+            "# TYPE corthex_http_requests_in_flight gauge",
+            f"corthex_http_requests_in_flight {self._in_flight}",
+            "# HELP corthex_http_requests_total Requests by route and status.",
+            "# TYPE corthex_http_requests_total counter",
+        ]
+        with self._lock:
+            items = sorted(self._routes.items())
+            for (m, r), st in items:
+                for s, n in sorted(st.statuses.items()):
+                    out.append(f'corthex_http_requests_total{{method="{m}",route="{r}",status="{s}"}} {n}')
+            out += [
+                "# HELP corthex_http_request_duration_seconds Request latency by route.",
+                "# TYPE corthex_http_request_duration_seconds histogram",
+            ]
+            for (m, r), st in items:
+                if not st.count:
+                    continue
+                labels = f'method="{m}",route="{r}"'
+                acc = 0
+                for i, n in enumerate(st.buckets):
+                    acc += n
+                    le = f"{_BUCKETS[i]}" if i < len(_BUCKETS) else "+Inf"
+                    out.append(f'corthex_http_request_duration_seconds_bucket{{{labels},le="{le}"}} {acc}')
+                out.append(f"corthex_http_request_duration_seconds_sum{{{labels}}} {st.total_seconds:.6f}")
+                out.append(f"corthex_http_request_duration_seconds_count{{{labels}}} {st.count}")
+        return "\n".join(out) + "\n"
+
+    # ── 영속화 ──
+
+    def flush_audit(self) -> int:
+        """감사 버퍼를 activity_logs에 일괄 저장. 반환: 저장 건수."""
+        with self._lock:
+            pending, self._audit_buffer = self._audit_buffer, []
+        if not pending:
+            return 0
+        try:
+            from db import save_activity_logs_bulk
+            return save_activity_logs_bulk(pending)
+        except Exception as e:
+            logger.debug("감사 로그 일괄 저장 실패: %s", e)
+            return 0
+
+    def persist_summary(self) -> dict | None:
+        """직전 요약 이후 요청이 있었으면 집계 요약 1행을 activity_logs에 저장."""
+        snap = self.snapshot(top=3)
+        delta = snap["total_requests"] - self._last_summary_count
+        if delta <= 0:
+            return None
+        self._last_summary_count = snap["total_requests"]
+        slow = ", ".join(f"{r['method']} {r['route']} p95={r['p95_ms']:.0f}ms" for r in snap["routes"])
+        level = "warning" if snap["server_errors"] else "info"
+        message = (f"📈 API 요청 {delta}건 (누적 {snap['total_requests']}, 5xx {snap['server_errors']})"
+                   + (f" · 느린 라우트: {slow}" if slow else ""))
+        try:
+            from db import save_activity_log
+            return save_activity_log("system", message, level)
+        except Exception as e:
+            logger.debug("메트릭 요약 저장 실패: %s", e)
+            return None
+
+    async def flush_loop(self) -> None:
+        """감사 버퍼는 AUDIT_FLUSH_INTERVAL마다, 요약은 SUMMARY_INTERVAL마다 저장."""
+        last_summary = time.time()
+        while True:
+            try:
+                await asyncio.sleep(AUDIT_FLUSH_INTERVAL)
+                await asyncio.to_thread(self.flush_audit)
+                if time.time() - last_summary >= SUMMARY_INTERVAL:
+                    last_summary = time.time()
+                    await asyncio.to_thread(self.persist_summary)
+            except asyncio.CancelledError:
+                self.flush_audit()
+                break
+            except Exception as e:
+                logger.warning("메트릭 flush 루프 오류: %s", e)
+
+
+metrics = RequestMetrics()
+
+
+def _is_audit(method: str, path: str) -> bool:
+    return method in _AUDIT_METHODS and path.startswith(_AUDIT_PREFIXES)
+
+
+class RequestMetricsMiddleware:
+    """순수 ASGI 계측 레이어. BaseHTTPMiddleware와 달리 응답 스트림을 감싸지 않음."""
+
+    def __init__(self, app, descriptions: dict[str, str] | None = None) -> None:
+        self.app = app
+        self.descriptions = descriptions or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(_SKIP_PREFIXES):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+        status_holder = [500]
+
+        async def _send(message):
+            if message["type"] == "http.response.start":
+                status_holder[0] = message["status"]
+            await send(message)
+
+        metrics.begin(method, path)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            elapsed = time.perf_counter() - start
+            # 라우팅 후 scope["route"]의 템플릿 경로 사용 (/api/tasks/{task_id}) — 라벨 폭증 방지.
+            # 라우트 템플릿이 없는 요청(404, 마운트된 앱 등)은 상태와 관계없이 고정 라벨 하나로
+            route = getattr(scope.get("route"), "path", None) or _UNMATCHED_ROUTE
+            metrics.end(method, path, route, elapsed, status_holder[0])
+            if _is_audit(method, path):
+                metrics.add_audit(method, path, status_holder[0], elapsed,
+                                  self.descriptions.get(f"{method} {path}", ""))
@@ -39,8 +39,10 @@ from trading_engine import (
     _FX_UPDATE_INTERVAL,
 )
 from argos_collector import (
+    ARGOS_MONTHLY_RL_ORIGIN,
     _argos_sequential_collect,
     _argos_monthly_rl_analysis,
+    _argos_monthly_rl_result,
     _build_argos_context_section,
 )
 
@@ -311,10 +313,11 @@ async def _run_scheduled_command(command: str, schedule_name: str):
             if ceo_id:
                 try:
                     who = result.get("handled_by", "시스템")
+                    from src.telegram.outbox import get_outbox, log_failure
                     msg = f"⏰ [{schedule_name}]\n\n{content}"
-                    if len(msg) > 3900:
-                        msg = msg[:3900] + "\n\n... (전체는 웹에서 확인)"
-                    await app_state.telegram_app.bot.send_message(chat_id=int(ceo_id), text=msg)
+                    # 크론 루프는 전송 완료를 기다리지 않음 — 실패는 done-callback이 로그로
+                    get_outbox(app_state.telegram_app.bot).enqueue(ceo_id, msg).add_done_callback(
+                        log_failure(f"크론 결과 [{schedule_name}]"))
                 except Exception as tg_err:
                     logger.warning("크론 결과 텔레그램 발송 실패: %s", tg_err)
     except Exception as e:
@@ -493,10 +496,21 @@ async def start_background_tasks():
     app_state._cleanup_task = asyncio.create_task(app_state.periodic_cleanup())
     _log("[CLEANUP] 메모리 자동 정리 태스크 시작 ✅ (10분 간격)")
 
+    # 요청 메트릭 감사 로그 일괄 저장 + 5분 요약
+    from request_metrics import metrics as _request_metrics
+    asyncio.create_task(_request_metrics.flush_loop())
+    _log("[METRICS] 요청 메트릭 flush 루프 시작 ✅ (감사 10초 / 요약 5분)")
+
     # Soul Gym 24/7 상시 루프
     asyncio.create_task(_soul_gym_loop())
     _log("[SOUL GYM] 24/7 상시 진화 루프 시작 ✅ (라운드당 ~$0.012)")
 
-    # PENDING 배치 또는 진행 중인 체인 있으면 폴러 시작
-    pending_batches = load_setting("pending_batches") or []
-    # v5: batch_system 제거됨 — 미완료 배치 폴러 비활성
+    # 미완료 배치(batch_jobs)나 제출 대기 요청이 있으면 폴러 재개
+    try:
+        import batch_system
+        # 결과 핸들러는 폴러보다 먼저 등록 (재시작 후 이어받은 배치 결과도 전달되게)
+        batch_system.register_handler(ARGOS_MONTHLY_RL_ORIGIN, _argos_monthly_rl_result)
+        if batch_system.start_poller():
+            _log("[BATCH] 미완료 배치 폴링 재개 ✅")
+    except Exception as e:
+        _log(f"[BATCH] 배치 폴러 시작 실패: {e}")
@@ -101,9 +101,8 @@ def _load_watchlist() -> list[dict]:
 
 def _load_warnings(agent_id: str) -> str:
     """에이전트의 반복 실수 기록(warnings)을 로드합니다."""
-    from db import load_setting
-    mem = load_setting(f"memory_categorized_{agent_id}", {})
-    return mem.get("warnings", "").strip() if isinstance(mem, dict) else ""
+    from db import get_agent_memory_categorized
+    return get_agent_memory_categorized(agent_id).get("warnings", "").strip()
 
 
 def _load_gym_history(agent_id: str, limit: int = 5) -> list[dict]:
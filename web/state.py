@@ -53,7 +53,6 @@ class AppState:
         # ── 배치 처리 ──
         self.batch_queue: list[dict] = []     # 배치 대기열 (로컬 순차/병렬)
         self.batch_running: bool = False      # 배치 실행 중 플래그
-        self.batch_api_queue: list[dict] = [] # Batch API 대기열 (프로바이더 배치)
         self.batch_lock: asyncio.Lock = asyncio.Lock()    # batch_queue 동시 접근 방지
         self.batch_poller_task: asyncio.Task | None = None  # 배치 폴러 루프 태스크
 
@@ -121,7 +121,7 @@ function corthexApp() {
     presets: { items: [], showModal: false, editName: '', editCommand: '' },
 
     // ── Task History (작업내역) ──
-    taskHistory: { items: [], search: '', filterStatus: 'all', filterDateFrom: '', filterDateTo: '', bookmarkOnly: false, selectedIds: [], expandedId: null, replayData: {}, compareMode: false, compareA: null, compareB: null, loaded: false, isSample: false, loading: false, error: null },
+    taskHistory: { items: [], search: '', filterStatus: 'all', filterDateFrom: '', filterDateTo: '', bookmarkOnly: false, selectedIds: [], expandedId: null, nextCursor: '', replayData: {}, compareMode: false, compareA: null, compareB: null, loaded: false, isSample: false, loading: false, error: null },
 
     // ── Performance (성능) ──
     performance: { agents: [], totalCalls: 0, totalCost: 0, totalTasks: 0, avgSuccessRate: 0, maxCost: 0, loaded: false },
@@ -282,7 +282,7 @@ function corthexApp() {
     knowledge: { files: [], loading: false, selectedFile: null, content: '', editMode: false, saving: false, newFileName: '', newFolder: '', showCreateForm: false, uploadFolder: '', dragOver: false },
 
     // Archive browser
-    archive: { files: [], loading: false, selectedReport: null, content: '', filterDivision: 'all', filterTier: 'all', searchCorrelation: '', selectedFiles: [], selectMode: false },
+    archive: { files: [], nextCursor: '', loading: false, selectedReport: null, content: '', filterDivision: 'all', filterTier: 'all', searchCorrelation: '', selectedFiles: [], selectMode: false },
     archiveImportanceFilter: 'all',
     archiveTagFilter: [],
     showDeleteAllArchiveModal: false,
@@ -514,6 +514,7 @@ function corthexApp() {
     // Task history pagination (#14)
     taskHistoryPage: 1,
     taskHistoryPageSize: 20,
+    convPreviewChars: 4000,   // 대화 결과 본문 미리보기 길이 (넘으면 펼칠 때 전체 조회)
 
     // Batch mode toggle (#5)
     useBatch: false,
@@ -804,6 +805,13 @@ function corthexApp() {
           this.dashboard.todayCost = msg.data.total_cost;
           break;
 
+        case 'dashboard_delta':
+          // 서버 스냅샷에서 바뀐 키만 옴 — 처음 로드 전이면 무시 (탭 열 때 전체 로드)
+          if (this.dashboard.loaded && msg.data && msg.data.changes) {
+            this._applyDashboard(msg.data.changes, true);
+          }
+          break;
+
         case 'delegation_log_update':
           if (msg.data) {
             // SSE와 중복 방지: ID를 dl_ 접두사로 정규화하여 통일
@@ -2342,29 +2350,7 @@ function corthexApp() {
           fetch('/api/quality').then(r => r.ok ? r.json() : {}),
         ]);
         this.loadModelMode();
-        this.dashboard = {
-          todayTasks: data.total_tasks_today || 0,
-          todayCompleted: data.today_completed || 0,
-          todayFailed: data.today_failed || 0,
-          runningCount: data.active_agents || 0,
-          totalCost: data.total_cost || 0,
-          todayCost: data.today_cost || 0,
-          totalTokens: data.total_tokens || 0,
-          agentCount: data.total_agents || 0,
-          notionConnected: data.notion_connected || false,
-          recentCompleted: data.recent_completed || [],
-          systemHealth: data.system_status || 'ok',
-          apiKeys: data.api_keys || {},
-          providerCalls: data.provider_calls || {},
-          totalAiCalls: data.total_ai_calls || 0,
-          dailyLimit: data.daily_limit || 7,
-          batchActive: data.batch_active || 0,
-          batchDone: data.batch_done || 0,
-          toolCount: data.tool_count || 0,
-          apiConnected: data.api_connected || 0,
-          apiTotal: data.api_total || 5,
-          loaded: true,
-        };
+        this._applyDashboard(data);
         this.budget = budgetRes;
         this.quality = qualityRes;
       } catch (e) { console.error('Dashboard load failed:', e); }
@@ -2372,6 +2358,28 @@ function corthexApp() {
       this.loadDeployStatus();
     },
 
+    // 서버 대시보드 키 → this.dashboard 키 (전체 로드 + WebSocket dashboard_delta 공용)
+    _applyDashboard(data, partial = false) {
+      const map = {
+        total_tasks_today: ['todayTasks', 0], today_completed: ['todayCompleted', 0],
+        today_failed: ['todayFailed', 0], active_agents: ['runningCount', 0],
+        total_cost: ['totalCost', 0], today_cost: ['todayCost', 0],
+        total_tokens: ['totalTokens', 0], total_agents: ['agentCount', 0],
+        notion_connected: ['notionConnected', false], recent_completed: ['recentCompleted', []],
+        system_status: ['systemHealth', 'ok'], api_keys: ['apiKeys', {}],
+        provider_calls: ['providerCalls', {}], total_ai_calls: ['totalAiCalls', 0],
+        daily_limit: ['dailyLimit', 7], batch_active: ['batchActive', 0],
+        batch_done: ['batchDone', 0], tool_count: ['toolCount', 0],
+        api_connected: ['apiConnected', 0], api_total: ['apiTotal', 5],
+      };
+      const next = partial ? { ...this.dashboard } : { loaded: true };
+      for (const [src, [dst, fallback]] of Object.entries(map)) {
+        if (partial && !(src in data)) continue;
+        next[dst] = data[src] || fallback;
+      }
+      this.dashboard = next;
+    },
+
     async loadDeployStatus() {
       // 1) 서버의 deploy-status.json 읽기
       try {
@@ -2698,9 +2706,9 @@ function corthexApp() {
           params.set('status', this.taskHistory.filterStatus);
         }
         if (this.taskHistory.bookmarkOnly) params.set('bookmarked', 'true');
-        const resp = await fetch('/api/tasks?' + params.toString());
-        if (!resp.ok) throw new Error('API 응답 오류: ' + resp.status);
-        const data = await resp.json();
+        this._taskHistoryParams = params;
+        const { items: data, nextCursor } = await this._fetchPage('/api/tasks?' + params.toString());
+        this.taskHistory.nextCursor = nextCursor;
         if (data && data.length > 0) {
           this.taskHistory.items = data;
           this.taskHistory.isSample = false;
@@ -3377,11 +3385,7 @@ function corthexApp() {
 
         if (this.currentConversationId) {
           // 특정 세션 로드
-          const res = await fetch(`/api/conversation/sessions/${this.currentConversationId}/messages`);
-          if (res.ok) {
-            const messages = await res.json();
-            this.messages = Array.isArray(messages) ? messages : [];
-          }
+          this.messages = await this._loadSessionMessages(this.currentConversationId);
         } else {
           // 레거시: 전체 대화 로드
           const res = await fetch('/api/conversation');
@@ -3657,12 +3661,25 @@ function corthexApp() {
           params.set('division', this.archive.filterDivision);
         }
         const query = params.toString() ? `?${params.toString()}` : '';
-        const res = await fetch(`/api/archive${query}`);
-        if (res.ok) this.archive.files = await res.json();
+        const { items, nextCursor } = await this._fetchPage(`/api/archive${query}`);
+        this.archive.files = items;
+        this.archive.nextCursor = nextCursor;
+        this._archiveParams = params;
       } catch { this.showToast('아카이브를 불러올 수 없습니다.', 'error'); }
       finally { this.archive.loading = false; }
     },
 
+    async loadMoreArchive() {
+      if (!this.archive.nextCursor) return;
+      const params = new URLSearchParams(this._archiveParams || '');
+      params.set('cursor', this.archive.nextCursor);
+      try {
+        const { items, nextCursor } = await this._fetchPage(`/api/archive?${params.toString()}`);
+        this.archive.files = this.archive.files.concat(items);
+        this.archive.nextCursor = nextCursor;
+      } catch { this.showToast('아카이브를 더 불러올 수 없습니다.', 'error'); }
+    },
+
     async readArchiveReport(file) {
       this.archive.selectedReport = file;
       try {
@@ -4905,15 +4922,28 @@ function corthexApp() {
         return [];
       }
     },
-    loadMoreTasks() {
+    async loadMoreTasks() {
+      // 받아둔 목록을 다 보여줬으면 서버에서 다음 페이지(커서)를 이어 받음
+      if ((this.taskHistoryPage + 1) * this.taskHistoryPageSize > this.taskHistory.items.length
+          && this.taskHistory.nextCursor && !this.taskHistory.isSample) {
+        const params = new URLSearchParams(this._taskHistoryParams || '');
+        params.set('cursor', this.taskHistory.nextCursor);
+        try {
+          const { items, nextCursor } = await this._fetchPage('/api/tasks?' + params.toString());
+          this.taskHistory.items = this.taskHistory.items.concat(items);
+          this.taskHistory.nextCursor = nextCursor;
+        } catch (e) { console.error('Task history page load failed:', e); }
+      }
       this.taskHistoryPage++;
     },
     hasMoreTasks() {
-      return this.taskHistoryPage * this.taskHistoryPageSize < this.taskHistory.items.length;
+      return this.taskHistoryPage * this.taskHistoryPageSize < this.taskHistory.items.length
+        || !!this.taskHistory.nextCursor;
     },
 
     // ── #15: Conversation Export ──
-    exportConversation() {
+    async exportConversation() {
+      await Promise.all(this.messages.map(m => this._ensureFullContent(m)));
       let md = '# CORTHEX HQ 대화 기록\n\n';
       md += `날짜: ${new Date().toLocaleDateString('ko-KR')}\n\n---\n\n`;
       this.messages.forEach(msg => {
@@ -4995,6 +5025,40 @@ function corthexApp() {
       }
     },
 
+    // 목록 API 공통: 본문은 배열, 다음 페이지 커서는 X-Next-Cursor 헤더
+    async _fetchPage(url) {
+      const res = await fetch(url);
+      if (!res.ok) throw new Error('API 응답 오류: ' + res.status);
+      const data = await res.json();
+      return { items: Array.isArray(data) ? data : [], nextCursor: res.headers.get('X-Next-Cursor') || '' };
+    },
+
+    // 세션 메시지를 커서로 끝까지 받되, 긴 결과 본문은 미리보기만 (전체는 _ensureFullContent)
+    async _loadSessionMessages(conversationId) {
+      const base = `/api/conversation/sessions/${conversationId}/messages?limit=200&preview=${this.convPreviewChars}`;
+      let messages = [];
+      let cursor = '';
+      do {
+        const page = await this._fetchPage(cursor ? `${base}&cursor=${encodeURIComponent(cursor)}` : base);
+        messages = messages.concat(page.items);
+        cursor = page.nextCursor;
+      } while (cursor);
+      return messages;
+    },
+
+    async _ensureFullContent(msg) {
+      if (!msg || !msg.content_truncated || !msg.id) return;
+      try {
+        const res = await fetch(`/api/conversation/messages/${msg.id}`);
+        if (!res.ok) return;
+        const full = await res.json();
+        msg.content = full.content || msg.content;
+        msg.content_truncated = false;
+      } catch (e) {
+        console.warn('메시지 본문 로딩 실패:', e);
+      }
+    },
+
     async loadConversationList() {
       try {
         // v5.1: workspace.orgScope 기반 대화 필터 (네이버 모델)
@@ -5010,9 +5074,7 @@ function corthexApp() {
 
     async switchConversation(conversationId) {
       try {
-        const res = await fetch(`/api/conversation/sessions/${conversationId}/messages`);
-        if (!res.ok) return;
-        this.messages = await res.json();
+        this.messages = await this._loadSessionMessages(conversationId);
         this.currentConversationId = conversationId;
         const meta = await fetch(`/api/conversation/sessions/${conversationId}`);
         if (meta.ok) {
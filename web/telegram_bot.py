@@ -15,6 +15,7 @@ from state import app_state
 from db import (
     save_message, create_task, update_task,
     save_activity_log, save_setting, load_setting, get_today_cost,
+    list_batch_chains,
 )
 from config_loader import (
     _log, _diag, logger, _extract_title_summary, KST, AGENTS,
@@ -25,6 +26,7 @@ except ImportError:
     def is_ai_ready(): return False
 
 from agent_router import _process_ai_command, _tg_convert_names
+from src.telegram.outbox import get_outbox, log_failure
 
 # ── 텔레그램 라이브러리 (선택적 로드) ──
 _telegram_available = False
@@ -63,17 +65,14 @@ async def _forward_web_response_to_telegram(
     tg_who = _tg_convert_names(handled_by) if handled_by else ""
     cost = result_data.get("cost", 0)
     try:
-        # 텔레그램 메시지 길이 제한 (4096자)
+        # 4096자 넘으면 발신 대기열이 나눠서 보냄
         cmd_preview = user_command[:60] + ("..." if len(user_command) > 60 else "")
         header = f"💬 [{tg_who}] 웹 응답\n📝 \"{cmd_preview}\"\n─────\n"
         footer = f"\n─────\n💰 ${cost:.4f}" if cost else ""
-        max_content = 4096 - len(header) - len(footer) - 50
-        if len(content) > max_content:
-            content = content[:max_content] + "\n\n... (전체는 웹에서 확인)"
         msg = f"{header}{content}{footer}"
-        await app_state.telegram_app.bot.send_message(
-            chat_id=int(ceo_id), text=msg,
-        )
+        # 웹 응답 처리는 텔레그램 전송을 기다리지 않음 — 실패는 done-callback이 로그로
+        get_outbox(app_state.telegram_app.bot).enqueue(ceo_id, msg).add_done_callback(
+            log_failure("웹 응답 전달"))
     except Exception as e:
         _log(f"[TG] 웹 응답 전송 실패: {e}")
 
@@ -216,8 +215,7 @@ async def _start_telegram_bot() -> None:
         async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
             if not _is_tg_ceo(update):
                 return
-            chains = load_setting("batch_chains") or []
-            active = [c for c in chains if c.get("status") in ("running", "pending")]
+            active = list_batch_chains(("running", "pending"))
             if not active:
                 await update.message.reply_text("현재 진행 중인 배치가 없습니다.")
                 return
@@ -416,17 +414,14 @@ async def _start_telegram_bot() -> None:
                         update_task(tid, status="completed",
                                     result_summary=_extract_title_summary(content or ""),
                                     success=1, cost_usd=cost, agent_id=tg_agent_id)
-                    if len(content) > 3900:
-                        content = content[:3900] + "\n\n... (결과가 잘렸습니다. 웹에서 전체 확인)"
-                    await app_state.telegram_app.bot.send_message(
-                        chat_id=int(cid),
-                        text=f"{content}\n\n─────\n💰 ${cost:.4f}",
+                    await get_outbox(app_state.telegram_app.bot).send(
+                        int(cid), f"{content}\n\n─────\n💰 ${cost:.4f}",
                     )
                 except Exception as e:
                     update_task(tid, status="failed",
                                 result_summary=str(e)[:200], success=0)
                     try:
-                        await app_state.telegram_app.bot.send_message(chat_id=int(cid), text=f"❌ 오류: {e}")
+                        await get_outbox(app_state.telegram_app.bot).send(int(cid), f"❌ 오류: {e}")
                     except Exception as e2:
                         logger.debug("TG 오류 메시지 전송 실패: %s", e2)
 
@@ -589,9 +584,6 @@ async def _start_telegram_bot() -> None:
                     content = result.get("content", "")
                     cost = result.get("cost_usd", 0)
                     model = result.get("model", "")
-                    # 텔레그램 메시지 길이 제한 (4096자)
-                    if len(content) > 3900:
-                        content = content[:3900] + "\n\n... (결과가 잘렸습니다. 웹에서 전체 확인)"
                     delegation = result.get("delegation", "")
                     model_short = model.split("-")[1] if "-" in model else model
                     # 담당자 표시: 팀장 이름 또는 비서실장
@@ -601,11 +593,13 @@ async def _start_telegram_bot() -> None:
                                 success=1, cost_usd=cost,
                                 time_seconds=result.get("time_seconds", 0),
                                 agent_id=tg_rt_agent_id)
-                    await update.message.reply_text(
+                    # 4096자 넘으면 발신 대기열이 나눠서 보냄
+                    await get_outbox(context.bot).send(
+                        update.effective_chat.id,
                         f"{content}\n\n"
                         f"─────\n"
                         f"👤 {footer_who} | 💰 ${cost:.4f} | 🤖 {model_short}",
-                        parse_mode=None,
+                        reply_to_message_id=update.message.message_id,
                     )
             else:
                 # AI 미연결 → 접수만
@@ -0,0 +1,157 @@
+"""
+내부 도구 실행 채널 (서버 쪽) — MCP 프록시가 HTTP 대신 Unix 소켓으로 ToolPool.invoke 호출.
+
+이전에는 /api/internal/tool-invoke 한 곳뿐이라 CLI 에이전트의 도구 호출마다
+HTTP 파싱 + 미들웨어 체인 + 라우팅을 거쳤고, 요청마다 _init_tool_pool()을 다시 불렀습니다.
+여기서는:
+- 메인 서버 이벤트 루프 안의 asyncio Unix 소켓 서버 (미들웨어·라우팅 없음, 디렉토리 0700 · 파일 0600)
+- 프레이밍·클라이언트는 src/mcp_ipc.py — 연결 1개에서 요청 여러 개를 동시에 처리 (요청마다 태스크)
+- 큰 결과는 조각 프레임으로 흘려 보냄
+- ToolPool은 처음 한 번만 찾아서 재사용
+HTTP 엔드포인트는 소켓을 못 쓰는 환경용으로 남겨 두고 같은 invoke_tool()을 씁니다.
+
+사용법:
+    from tool_ipc import start_tool_ipc, stop_tool_ipc, invoke_tool
+    await start_tool_ipc()      # startup
+    await stop_tool_ipc()       # shutdown
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+
+from src.mcp_ipc import (
+    CHUNK_CHARS,
+    MAX_FRAME,
+    default_socket_path,
+    encode,
+    read_frame,
+    result_text,
+    secure_socket_dir,
+)
+
+logger = logging.getLogger("corthex.tool_ipc")
+
+_pool = None
+_server: asyncio.base_events.Server | None = None
+_socket_path: str = ""
+_connections: set[asyncio.StreamWriter] = set()
+_stats = {"connections": 0, "requests": 0, "errors": 0, "streamed": 0}
+
+
+def _get_pool():
+    """ToolPool 참조 (찾을 때까지만 _init_tool_pool 호출)."""
+    global _pool
+    if _pool is None:
+        from agent_router import _init_tool_pool
+        _pool = _init_tool_pool()
+    return _pool
+
+
+async def invoke_tool(tool_name: str, arguments: dict, caller_id: str = "cli_agent"):
+    """ToolPool.invoke — HTTP 엔드포인트와 소켓 채널 공용."""
+    pool = _get_pool()
+    if not pool:
+        raise RuntimeError("ToolPool 초기화 실패")
+    return await pool.invoke(tool_name, caller_id=caller_id, **(arguments or {}))
+
+
+async def _handle_request(frame: dict, writer: asyncio.StreamWriter, write_lock: asyncio.Lock) -> None:
+    req_id = frame.get("id")
+    _stats["requests"] += 1
+    try:
+        tool = frame.get("tool", "")
+        if not tool:
+            raise ValueError("tool 필수")
+        text = result_text(await invoke_tool(tool, frame.get("arguments") or {},
+                                             frame.get("caller_id") or "cli_agent"))
+        reply = [{"id": req_id, "chunk": text[i:i + CHUNK_CHARS]}
+                 for i in range(0, max(len(text) - CHUNK_CHARS, 0), CHUNK_CHARS)]
+        tail_start = len(reply) * CHUNK_CHARS
+        reply.append({"id": req_id, "end": True, "text": text[tail_start:]})
+        if len(reply) > 1:
+            _stats["streamed"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.error("[ToolIPC] %s 실행 오류: %s", frame.get("tool", "?"), e)
+        reply = [{"id": req_id, "end": True, "error": str(e)}]
+    try:
+        for msg in reply:
+            # 조각마다 락을 놓아 다른 요청의 응답이 사이사이 끼어들 수 있게
+            async with write_lock:
+                writer.write(encode(msg))
+                await writer.drain()
+    except (ConnectionError, RuntimeError) as e:
+        logger.debug("[ToolIPC] 응답 전송 실패 (연결 끊김): %s", e)
+
+
+async def _serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    _stats["connections"] += 1
+    _connections.add(writer)
+    write_lock = asyncio.Lock()
+    tasks: set[asyncio.Task] = set()
+    try:
+        while True:
+            frame = await read_frame(reader)
+            if frame is None:
+                break
+            task = asyncio.create_task(_handle_request(frame, writer, write_lock))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except asyncio.CancelledError:
+        pass   # 서버 종료 — 연결 정리만
+    except Exception as e:
+        logger.warning("[ToolIPC] 연결 처리 오류: %s", e)
+    finally:
+        for task in tasks:
+            task.cancel()
+        _connections.discard(writer)
+        writer.close()
+
+
+async def start_tool_ipc(path: str | None = None) -> str | None:
+    """소켓 서버 시작. 반환: 소켓 경로 (Unix 소켓 미지원 환경이면 None)."""
+    global _server, _socket_path
+    if _server is not None:
+        return _socket_path
+    if not hasattr(asyncio, "start_unix_server"):
+        return None
+    path = path or default_socket_path()
+    try:
+        secure_socket_dir(path)   # 디렉토리 0700 + 소유자 확인
+        if os.path.exists(path):
+            os.remove(path)   # 이전 프로세스가 남긴 소켓
+        _server = await asyncio.start_unix_server(_serve_connection, path=path, limit=MAX_FRAME)
+        os.chmod(path, 0o600)
+    except OSError as e:
+        logger.warning("[ToolIPC] 소켓 서버 시작 실패 (HTTP만 사용): %s", e)
+        _server = None
+        return None
+    _socket_path = path
+    logger.info("[ToolIPC] 도구 소켓 서버 시작: %s", path)
+    return path
+
+
+async def stop_tool_ipc() -> None:
+    global _server
+    if _server is None:
+        return
+    _server.close()
+    for writer in list(_connections):   # 열린 연결도 닫아야 wait_closed가 끝남
+        writer.close()
+    await _server.wait_closed()
+    _server = None
+    try:
+        os.remove(_socket_path)
+    except OSError:
+        pass
+
+
+def socket_path() -> str:
+    """실행 중인 소켓 경로 (없으면 빈 문자열) — MCP 설정에 넣음."""
+    return _socket_path if _server is not None else ""
+
+
+def stats() -> dict:
+    return {**_stats, "socket": socket_path()}
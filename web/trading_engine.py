@@ -537,10 +537,10 @@ async def _cio_prediction_verifier():
                                 f"전체 7일 정확도: {perf.get('overall_accuracy', '-')}%{brier_text}\n"
                                 f"전문가 ELO:\n{elo_section}"
                             )
-                            await app_state.telegram_app.bot.send_message(
-                                chat_id=int(ceo_id),
-                                text=msg,
-                            )
+                            from src.telegram.outbox import get_outbox, log_failure
+                            # 루프는 전송 완료를 기다리지 않음 — 실패는 done-callback이 로그로
+                            get_outbox(app_state.telegram_app.bot).enqueue(ceo_id, msg).add_done_callback(
+                                log_failure("[CIO검증] 자기학습 알림"))
                     except Exception as te:
                         _logger_v.warning("[CIO검증] 텔레그램 알림 실패: %s", te)
 
@@ -714,12 +714,11 @@ async def _shadow_trading_alert():
                             ceo_id = os.getenv("TELEGRAM_CEO_CHAT_ID", "")
                             if ceo_id:
                                 try:
-                                    await app_state.telegram_app.bot.send_message(
-                                        chat_id=int(ceo_id),
-                                        text=msg,
-                                    )
+                                    from src.telegram.outbox import get_outbox, log_failure
+                                    get_outbox(app_state.telegram_app.bot).enqueue(ceo_id, msg).add_done_callback(
+                                        log_failure("[Shadow알림] 실거래 전환 추천"))
                                     _logger_a.info(
-                                        "[Shadow알림] 실거래 전환 추천 알림 발송 (수익률 %.1f%%)", profit_rate
+                                        "[Shadow알림] 실거래 전환 추천 알림 발송 예약 (수익률 %.1f%%)", profit_rate
                                     )
                                     save_activity_log(
                                         "system",